@@ -39,6 +39,20 @@ vcs_sim:
 	make vcs_compile -C $(OUTPUTDIR)/test
 	make vcs_run -C $(OUTPUTDIR)/test
 
+.PHONY: verilator_sim
+verilator_sim:
+	make verilator_compile -C $(OUTPUTDIR)/test
+	make verilator_run -C $(OUTPUTDIR)/test
+
+.PHONY: trace
+trace:
+	make compile -C $(OUTPUTDIR)/test
+	make trace -C $(OUTPUTDIR)/test
+
+.PHONY: bench_replay
+bench_replay:
+	$(PYTHON) $(ROOTDIR)/ipgen/analysis/bench_replay.py $(OUTPUTDIR)/test
+
 .PHONY: view
 view:
 	make view -C $(OUTPUTDIR)/test
@@ -0,0 +1,155 @@
+/* Allocation throughput and fragmentation of the buddy allocator on an
+ * anonymous mapping, in place of the DMA region of UIO or udmabuf.
+ * The head and the tail of each block are marked with a serial number of the
+ * allocation, and checked when the block is freed.
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <unistd.h>
+#include <time.h>
+#include <sys/mman.h>
+#include "buddy.h"
+
+#define MAX_LIVE (1024)
+
+void mark(char* p, size_t bytes, long id)
+{
+  memcpy(p, &id, sizeof(long));
+  memcpy(p + bytes - sizeof(long), &id, sizeof(long));
+}
+
+int check(char* p, size_t bytes, long id)
+{
+  long head, tail;
+  memcpy(&head, p, sizeof(long));
+  memcpy(&tail, p + bytes - sizeof(long), sizeof(long));
+  return head == id && tail == id;
+}
+
+double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+void usage()
+{
+  printf("usage: bench_buddy [-m <region MB>] [-n <operations>] [-p <max pages>] [-s <seed>] [-h]\n");
+}
+
+int main(int argc, char *argv[])
+{
+  int c;
+  size_t region = 64;
+  long ops = 1000000;
+  size_t max_pages = 64;
+  unsigned int seed = 1;
+
+  while ((c = getopt(argc, argv, "m:n:p:s:h")) != -1) {
+    switch(c) {
+    case 'm':
+      region = atol(optarg);
+      break;
+    case 'n':
+      ops = atol(optarg);
+      break;
+    case 'p':
+      max_pages = atol(optarg);
+      break;
+    case 's':
+      seed = atoi(optarg);
+      break;
+    case 'h':
+      usage();
+      return 0;
+    default:
+      printf("invalid option: %c\n", c);
+      usage();
+      return -1;
+    }
+  }
+
+  size_t size = region * 1024 * 1024;
+  char* base = (char*) mmap(NULL, size, PROT_READ|PROT_WRITE, MAP_PRIVATE|MAP_ANONYMOUS, -1, 0);
+  if(base == MAP_FAILED){
+    printf("mmap failed.\n");
+    return -1;
+  }
+
+  struct buddy b;
+  if(buddy_init(&b, base, size) < 0){
+    return -1;
+  }
+
+  char* live[MAX_LIVE];
+  size_t live_size[MAX_LIVE];
+  long live_id[MAX_LIVE];
+  int num_live = 0;
+  long num_alloc = 0;
+  long num_fail = 0;
+  long errors = 0;
+  long i;
+
+  srand(seed);
+  double start = now();
+  for(i=0; i<ops; i++){
+    if(num_live == MAX_LIVE || (num_live > 0 && rand() % 2 == 0)){
+      int j = rand() % num_live;
+      if(!check(live[j], live_size[j], live_id[j])){
+        errors++;
+      }
+      buddy_free(&b, live[j]);
+      num_live--;
+      live[j] = live[num_live];
+      live_size[j] = live_size[num_live];
+      live_id[j] = live_id[num_live];
+    }else{
+      size_t bytes = 2 * sizeof(long) + rand() % (max_pages * BUDDY_PAGE_SIZE);
+      char* p = (char*) buddy_alloc(&b, bytes, (rand() % 8 == 0)? 8 * BUDDY_PAGE_SIZE : 0);
+      if(p == NULL){
+        num_fail++;
+        continue;
+      }
+      live[num_live] = p;
+      live_size[num_live] = bytes;
+      live_id[num_live] = num_alloc;
+      mark(p, bytes, num_alloc);
+      num_live++;
+      num_alloc++;
+    }
+  }
+  double elapsed = now() - start;
+
+  size_t in_use = size - buddy_free_bytes(&b);
+  buddy_flush(&b);
+  size_t free_bytes = buddy_free_bytes(&b);
+  size_t largest = buddy_largest_free(&b);
+
+  printf("[bench_buddy] operations: %ld\n", ops);
+  printf("[bench_buddy] allocations: %ld (failed: %ld)\n", num_alloc, num_fail);
+  printf("[bench_buddy] throughput: %.2f Mops/s\n", ops / elapsed / 1e6);
+  printf("[bench_buddy] live blocks: %d, in use: %lu KB\n", num_live, (unsigned long)(in_use / 1024));
+  printf("[bench_buddy] free: %lu KB, largest free block: %lu KB\n",
+         (unsigned long)(free_bytes / 1024), (unsigned long)(largest / 1024));
+  printf("[bench_buddy] fragmentation: %.3f\n", free_bytes ? 1.0 - (double) largest / free_bytes : 0.0);
+
+  while(num_live > 0){
+    num_live--;
+    if(!check(live[num_live], live_size[num_live], live_id[num_live])){
+      errors++;
+    }
+    buddy_free(&b, live[num_live]);
+  }
+  buddy_flush(&b);
+  if(buddy_free_bytes(&b) != size){
+    errors++;
+  }
+  printf("[bench_buddy] free after release: %lu KB\n", (unsigned long)(buddy_free_bytes(&b) / 1024));
+  printf("[bench_buddy] errors: %ld\n", errors);
+
+  buddy_destroy(&b);
+  munmap(base, size);
+  return errors ? 1 : 0;
+}
@@ -0,0 +1,245 @@
+#ifndef BUDDY_H
+#define BUDDY_H
+
+/* Page-granular buddy allocator of a memory region.
+ * A block of order k is 2^k pages, aligned to its size from the head of the
+ * region. Freed blocks of small orders are cached for each order, and are
+ * reused without splitting and coalescing.
+ */
+
+#define BUDDY_PAGE_SIZE (4*1024)
+#define BUDDY_MAX_ORDER (31)
+#define BUDDY_CACHE_ORDERS (4)
+#define BUDDY_CACHE_SIZE (8)
+
+#define BUDDY_NONE   (0)
+#define BUDDY_FREE   (1)
+#define BUDDY_USED   (2)
+#define BUDDY_CACHED (3)
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <stddef.h>
+#include <stdint.h>
+
+struct buddy {
+  char* base;
+  size_t npages;
+  unsigned int max_order;
+  long free_head[BUDDY_MAX_ORDER+1];
+  long* next;
+  long* prev;
+  unsigned char* order;
+  unsigned char* state;
+  long cache[BUDDY_CACHE_ORDERS][BUDDY_CACHE_SIZE];
+  int num_cache[BUDDY_CACHE_ORDERS];
+};
+
+void buddy_push(struct buddy* b, long page, unsigned int order)
+{
+  b->order[page] = order;
+  b->state[page] = BUDDY_FREE;
+  b->prev[page] = -1;
+  b->next[page] = b->free_head[order];
+  if(b->free_head[order] >= 0){
+    b->prev[b->free_head[order]] = page;
+  }
+  b->free_head[order] = page;
+}
+
+void buddy_remove(struct buddy* b, long page)
+{
+  unsigned int order = b->order[page];
+  if(b->prev[page] >= 0){
+    b->next[b->prev[page]] = b->next[page];
+  }else{
+    b->free_head[order] = b->next[page];
+  }
+  if(b->next[page] >= 0){
+    b->prev[b->next[page]] = b->prev[page];
+  }
+  b->state[page] = BUDDY_NONE;
+}
+
+int buddy_init(struct buddy* b, void* base, size_t size)
+{
+  unsigned int k;
+  b->base = (char*) base;
+  b->npages = size / BUDDY_PAGE_SIZE;
+  b->max_order = 0;
+  while(b->max_order < BUDDY_MAX_ORDER && ((size_t)2 << b->max_order) <= b->npages){
+    b->max_order++;
+  }
+  for(k=0; k<=BUDDY_MAX_ORDER; k++){
+    b->free_head[k] = -1;
+  }
+  for(k=0; k<BUDDY_CACHE_ORDERS; k++){
+    b->num_cache[k] = 0;
+  }
+
+  b->next = (long*) malloc(sizeof(long) * b->npages);
+  b->prev = (long*) malloc(sizeof(long) * b->npages);
+  b->order = (unsigned char*) calloc(b->npages, 1);
+  b->state = (unsigned char*) calloc(b->npages, 1);
+  if(b->next == NULL || b->prev == NULL || b->order == NULL || b->state == NULL){
+    printf("buddy_init(): No memory for %lu pages.\n", (unsigned long) b->npages);
+    return -1;
+  }
+
+  /* the largest aligned blocks in the region */
+  size_t page = 0;
+  while(page < b->npages){
+    k = b->max_order;
+    while(k > 0 && ((page & (((size_t)1 << k) - 1)) != 0 || page + ((size_t)1 << k) > b->npages)){
+      k--;
+    }
+    buddy_push(b, page, k);
+    page += (size_t)1 << k;
+  }
+  return 0;
+}
+
+void buddy_release(struct buddy* b, long page, unsigned int order)
+{
+  while(order < b->max_order){
+    long buddy = page ^ ((long)1 << order);
+    if((size_t)buddy >= b->npages || b->state[buddy] != BUDDY_FREE || b->order[buddy] != order){
+      break;
+    }
+    buddy_remove(b, buddy);
+    b->state[page] = BUDDY_NONE;
+    page = page < buddy ? page : buddy;
+    order++;
+  }
+  buddy_push(b, page, order);
+}
+
+/* returns the cached blocks to the free lists */
+void buddy_flush(struct buddy* b)
+{
+  unsigned int k;
+  for(k=0; k<BUDDY_CACHE_ORDERS; k++){
+    while(b->num_cache[k] > 0){
+      b->num_cache[k]--;
+      buddy_release(b, b->cache[k][b->num_cache[k]], k);
+    }
+  }
+}
+
+long buddy_take(struct buddy* b, unsigned int order)
+{
+  unsigned int k = order;
+  while(k <= b->max_order && b->free_head[k] < 0){
+    k++;
+  }
+  if(k > b->max_order){
+    return -1;
+  }
+  long page = b->free_head[k];
+  buddy_remove(b, page);
+  while(k > order){
+    k--;
+    buddy_push(b, page + ((long)1 << k), k);
+  }
+  return page;
+}
+
+/* align: alignment in bytes from the head of the region (a power of 2) */
+void* buddy_alloc(struct buddy* b, size_t bytes, size_t align)
+{
+  size_t numpages = (bytes + BUDDY_PAGE_SIZE - 1) / BUDDY_PAGE_SIZE;
+  size_t alignpages = (align + BUDDY_PAGE_SIZE - 1) / BUDDY_PAGE_SIZE;
+  unsigned int order = 0;
+  long page = -1;
+
+  if(numpages == 0){
+    numpages = 1;
+  }
+  while(order <= b->max_order && (((size_t)1 << order) < numpages ||
+                                  ((size_t)1 << order) < alignpages)){
+    order++;
+  }
+  if(order > b->max_order){
+    return NULL;
+  }
+
+  if(order < BUDDY_CACHE_ORDERS && b->num_cache[order] > 0){
+    b->num_cache[order]--;
+    page = b->cache[order][b->num_cache[order]];
+  }else{
+    page = buddy_take(b, order);
+    if(page < 0){
+      buddy_flush(b);
+      page = buddy_take(b, order);
+    }
+  }
+  if(page < 0){
+    return NULL;
+  }
+
+  b->order[page] = order;
+  b->state[page] = BUDDY_USED;
+  return (void*)(b->base + (size_t)page * BUDDY_PAGE_SIZE);
+}
+
+void buddy_free(struct buddy* b, void* ptr)
+{
+  if(ptr == NULL){
+    return;
+  }
+  size_t offset = (size_t)((char*)ptr - b->base);
+  long page = (long)(offset / BUDDY_PAGE_SIZE);
+  if(offset % BUDDY_PAGE_SIZE != 0 || (size_t)page >= b->npages || b->state[page] != BUDDY_USED){
+    printf("buddy_free(): Not allocated: %p\n", ptr);
+    return;
+  }
+  unsigned int order = b->order[page];
+  if(order < BUDDY_CACHE_ORDERS && b->num_cache[order] < BUDDY_CACHE_SIZE){
+    b->state[page] = BUDDY_CACHED;
+    b->cache[order][b->num_cache[order]++] = page;
+    return;
+  }
+  buddy_release(b, page, order);
+}
+
+size_t buddy_free_bytes(struct buddy* b)
+{
+  size_t pages = 0;
+  unsigned int k;
+  for(k=0; k<=b->max_order; k++){
+    long page;
+    for(page=b->free_head[k]; page>=0; page=b->next[page]){
+      pages += (size_t)1 << k;
+    }
+  }
+  for(k=0; k<BUDDY_CACHE_ORDERS; k++){
+    pages += ((size_t)1 << k) * b->num_cache[k];
+  }
+  return pages * BUDDY_PAGE_SIZE;
+}
+
+size_t buddy_largest_free(struct buddy* b)
+{
+  int k;
+  for(k=b->max_order; k>=0; k--){
+    if(b->free_head[k] >= 0){
+      return ((size_t)1 << k) * BUDDY_PAGE_SIZE;
+    }
+  }
+  return 0;
+}
+
+void buddy_destroy(struct buddy* b)
+{
+  free(b->next);
+  free(b->prev);
+  free(b->order);
+  free(b->state);
+  b->next = NULL;
+  b->prev = NULL;
+  b->order = NULL;
+  b->state = NULL;
+  b->npages = 0;
+}
+
+#endif
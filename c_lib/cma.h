@@ -28,10 +28,12 @@
 #include <assert.h>
 #include <sys/mman.h>
 #include <fcntl.h>
+#include <stdint.h>
+#include "buddy.h"
 
 int fd_cma = -1;
 volatile char* cma_ptr = NULL;
-unsigned int cma_used = 0;
+struct buddy cma_buddy;
 unsigned int cma_offset = 0;
 unsigned int cma_size = 0;
 
@@ -112,35 +114,37 @@ void cma_open(unsigned int sync_mode)
     printf("cma_open(): mmap failed.\n");
     exit(1);
   }
-  cma_used = 0;
+  if(buddy_init(&cma_buddy, (void*) cma_ptr, cma_size) < 0){
+    exit(1);
+  }
 }
 
-void* cma_malloc(unsigned int bytes)
+void* cma_malloc_aligned(size_t bytes, size_t align)
 {
   if(cma_ptr == NULL){
     printf("cma_malloc(): CMA is not opened.\n");
     return NULL;
   }
+  return buddy_alloc(&cma_buddy, bytes, align);
+}
 
-  unsigned int numpages = bytes / CMA_PAGE_SIZE;
-  if(bytes % CMA_PAGE_SIZE != 0){
-    numpages++;
-  }
-
-  unsigned int size = CMA_PAGE_SIZE*numpages;
+void* cma_malloc(size_t bytes)
+{
+  return cma_malloc_aligned(bytes, CMA_PAGE_SIZE);
+}
 
-  if(cma_used + size > cma_size){
-    return NULL;
+void cma_free(void* ptr)
+{
+  if(cma_ptr == NULL){
+    printf("cma_free(): CMA is not opened.\n");
+    return;
   }
-
-  void* ptr = (void*)(cma_ptr + cma_used);
-  cma_used += size;
-  return ptr;
+  buddy_free(&cma_buddy, ptr);
 }
 
-unsigned int cma_get_physical_address(void* ptr)
+uint64_t cma_get_physical_address(void* ptr)
 {
-  return cma_offset + ((unsigned int) ptr) - ((unsigned int)cma_ptr);
+  return (uint64_t) cma_offset + (uint64_t)((uintptr_t) ptr - (uintptr_t) cma_ptr);
 }
 
 void cma_cache_clean(char* addr, unsigned int bytes)
@@ -155,6 +159,7 @@ void cma_close()
     printf("cma_close(): CMA is not opened.\n");
     return;
   }
+  buddy_destroy(&cma_buddy);
   munmap((void*) cma_ptr, cma_size);
   cma_ptr = NULL;
   close(fd_cma);
@@ -10,6 +10,10 @@
 #include <assert.h>
 #include <sys/mman.h>
 #include <fcntl.h>
+#include <time.h>
+#include <stdint.h>
+#include <limits.h>
+#include <poll.h>
 
 int fd_ipgen = -1;
 volatile int* ipgen_ptr = NULL;
@@ -35,6 +39,81 @@ void ipgen_read_4b(unsigned int* data)
   *data = r;
 }
 
+/* offsets in bytes, as the register maps of sw/ipgen_<top>_regs.h */
+void ipgen_write(unsigned int offset, unsigned int data)
+{
+  ipgen_ptr[offset / sizeof(int)] = data;
+}
+
+unsigned int ipgen_read(unsigned int offset)
+{
+  return ipgen_ptr[offset / sizeof(int)];
+}
+
+/* consecutive registers in one call, without the overhead of each access */
+void ipgen_write_burst(unsigned int offset, const unsigned int* data, int count)
+{
+  volatile int* p = ipgen_ptr + offset / sizeof(int);
+  int i;
+  for(i=0; i<count; i++){
+    p[i] = data[i];
+  }
+}
+
+void ipgen_read_burst(unsigned int offset, unsigned int* data, int count)
+{
+  volatile int* p = ipgen_ptr + offset / sizeof(int);
+  int i;
+  for(i=0; i<count; i++){
+    data[i] = p[i];
+  }
+}
+
+/* waits until (register & mask) == value, with an exponential backoff of the
+   interval up to 1 ms. Returns -1 at the timeout. */
+int ipgen_poll(unsigned int offset, unsigned int mask, unsigned int value,
+               unsigned int* data, long timeout_us)
+{
+  struct timespec interval = {0, 1000};
+  long elapsed = 0;
+  unsigned int r;
+  while(1){
+    r = ipgen_read(offset);
+    if(data != NULL) *data = r;
+    if((r & mask) == value) return 0;
+    if(elapsed > timeout_us) return -1;
+    nanosleep(&interval, NULL);
+    elapsed += interval.tv_nsec / 1000;
+    if(interval.tv_nsec < 1000000) interval.tv_nsec *= 2;
+  }
+}
+
+/* enables the interrupt of the UIO device and waits for it.
+   Returns the total number of the interrupts, or -1 on an error. */
+int ipgen_wait_interrupt()
+{
+  uint32_t info = 1;
+  if(write(fd_ipgen, &info, sizeof(info)) != sizeof(info)) return -1;
+  if(read(fd_ipgen, &info, sizeof(info)) != sizeof(info)) return -1;
+  return (int) info;
+}
+
+/* same as ipgen_wait_interrupt(), but returns 0 at the timeout.
+   The timeout is rounded up to milliseconds, and a negative one never expires. */
+int ipgen_wait_interrupt_timeout(long timeout_us)
+{
+  uint32_t info = 1;
+  struct pollfd fds = {fd_ipgen, POLLIN, 0};
+  long timeout_ms = (timeout_us < 0)? -1 : (timeout_us + 999) / 1000;
+  int r;
+  if(timeout_ms > INT_MAX) timeout_ms = INT_MAX;
+  if(write(fd_ipgen, &info, sizeof(info)) != sizeof(info)) return -1;
+  r = poll(&fds, 1, (int) timeout_ms);
+  if(r <= 0) return r;
+  if(read(fd_ipgen, &info, sizeof(info)) != sizeof(info)) return -1;
+  return (int) info;
+}
+
 void ipgen_close()
 {
   if(ipgen_ptr == NULL){
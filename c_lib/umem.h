@@ -17,10 +17,12 @@
 #include <assert.h>
 #include <sys/mman.h>
 #include <fcntl.h>
+#include <stdint.h>
+#include "buddy.h"
 
 int fd_umem = -1;
 volatile char* umem_ptr = NULL;
-unsigned int umem_used = 0;
+struct buddy umem_buddy;
 
 void umem_open()
 {
@@ -30,35 +32,37 @@ void umem_open()
     exit(1);
   }
   umem_ptr = (volatile char*) mmap(NULL, UMEM_SIZE, PROT_READ|PROT_WRITE, MAP_SHARED, fd_umem, 0);
-  umem_used = 0;
+  if(buddy_init(&umem_buddy, (void*) umem_ptr, UMEM_SIZE) < 0){
+    exit(1);
+  }
 }
 
-void* umem_malloc(unsigned int bytes)
+void* umem_malloc_aligned(size_t bytes, size_t align)
 {
   if(umem_ptr == NULL){
     printf("umem_malloc(): UMEM is not opened.\n");
     return NULL;
   }
+  return buddy_alloc(&umem_buddy, bytes, align);
+}
 
-  unsigned int numpages = bytes / UMEM_PAGE_SIZE;
-  if(bytes % UMEM_PAGE_SIZE != 0){
-    numpages++;
-  }
-
-  unsigned int size = UMEM_PAGE_SIZE*numpages;
+void* umem_malloc(size_t bytes)
+{
+  return umem_malloc_aligned(bytes, UMEM_PAGE_SIZE);
+}
 
-  if(umem_used + size > UMEM_SIZE){
-    return NULL;
+void umem_free(void* ptr)
+{
+  if(umem_ptr == NULL){
+    printf("umem_free(): UMEM is not opened.\n");
+    return;
   }
-
-  void* ptr = (void*)(umem_ptr + umem_used);
-  umem_used += size;
-  return ptr;
+  buddy_free(&umem_buddy, ptr);
 }
 
-unsigned int umem_get_physical_address(void* ptr)
+uint64_t umem_get_physical_address(void* ptr)
 {
-  return UMEM_OFFSET + ((unsigned int) ptr) - ((unsigned int)umem_ptr);
+  return (uint64_t) UMEM_OFFSET + (uint64_t)((uintptr_t) ptr - (uintptr_t) umem_ptr);
 }
 
 void umem_cache_clean(char* addr, unsigned int bytes)
@@ -72,6 +76,7 @@ void umem_close()
     printf("umem_close(): UMEM is not opened.\n");
     return;
   }
+  buddy_destroy(&umem_buddy);
   munmap((void*) umem_ptr, UMEM_SIZE);
   umem_ptr = NULL;
   close(fd_umem);
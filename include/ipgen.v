@@ -4,6 +4,13 @@
 // - ipgen_slave_memory:   memory-mapped access interface (slave)
 // - ipgen_master_lite_memory:  memory-mapped access lite interface (master)
 // - ipgen_slave_lite_memory:   memory-mapped access lite interface (slave)
+// - ipgen_master_cached_memory:  memory-mapped access interface with read cache (master)
+// - ipgen_master_cached_lite_memory:  lite interface with read cache (master)
+// - ipgen_master_combining_lite_memory:  lite interface with write combining (master)
+// - ipgen_master_dma:     descriptor-based DMA engine (master)
+// - ipgen_master_stream:  stream interface (master)
+// - ipgen_slave_stream:   stream interface (slave)
+// - ipgen_interrupt:      level-sensitive interrupt request (output)
 //------------------------------------------------------------------------------
 
 //------------------------------------------------------------------------------
@@ -12,7 +19,16 @@ module ipgen_master_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter ID_WIDTH = 1, // 2 ** ID_WIDTH transaction IDs
+   parameter OUT_OF_ORDER = 0, // 0: in-order completion, 1: tagged by awid/arid/rid
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter MAX_BURST_LEN = 0, // max beats per external burst (up to 256), 0: configuration default
+   parameter BURST_SPLIT = 0, // 1: split bursts at MAX_BURST_LEN and 4KB boundaries, 0: configuration default
+   parameter FIFO_DEPTH = 0, // split bursts in flight (power of 2), 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -22,6 +38,7 @@ module ipgen_master_memory #
    input wire                     awvalid,
    input wire  [ADDR_WIDTH-1:0]   awaddr,
    input wire  [8-1:0]            awlen,
+   input wire  [ID_WIDTH-1:0]     awid,
    output wire                    awready,
   
    // Write Data
@@ -35,11 +52,13 @@ module ipgen_master_memory #
    input wire                     arvalid,
    input wire  [ADDR_WIDTH-1:0]   araddr,
    input wire  [8-1:0]            arlen,
+   input wire  [ID_WIDTH-1:0]     arid,
    output wire                    arready,
 
    // Read Data
    output wire [DATA_WIDTH-1:0]   rdata,
    output wire                    rlast,
+   output wire [ID_WIDTH-1:0]     rid,
    output wire                    rvalid,
    input wire                     rready
    );
@@ -51,7 +70,8 @@ module ipgen_slave_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -90,7 +110,8 @@ module ipgen_master_lite_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -126,7 +147,8 @@ module ipgen_slave_lite_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -155,3 +177,248 @@ module ipgen_slave_lite_memory #
    );
 endmodule
 
+//------------------------------------------------------------------------------
+module ipgen_master_cached_memory #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter ID_WIDTH = 1, // 2 ** ID_WIDTH transaction IDs, completed in-order
+   parameter LINE_SIZE = 8, // words per line (power of 2), a line is filled by a burst
+   parameter LINES = 64, // lines of the cache (WAYS * power of 2)
+   parameter WAYS = 2, // associativity
+   parameter PREFETCH = 1, // next lines prefetched on a miss (0 to 15), 0: no prefetch
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Write Address
+   input wire                     awvalid,
+   input wire  [ADDR_WIDTH-1:0]   awaddr,
+   input wire  [8-1:0]            awlen,
+   input wire  [ID_WIDTH-1:0]     awid,
+   output wire                    awready,
+  
+   // Write Data
+   input wire  [DATA_WIDTH-1:0]   wdata,
+   input wire  [DATA_WIDTH/8-1:0] wstrb,
+   input wire                     wlast,
+   input wire                     wvalid,
+   output wire                    wready,
+
+   // Read Address
+   input wire                     arvalid,
+   input wire  [ADDR_WIDTH-1:0]   araddr,
+   input wire  [8-1:0]            arlen,
+   input wire  [ID_WIDTH-1:0]     arid,
+   output wire                    arready,
+
+   // Read Data
+   output wire [DATA_WIDTH-1:0]   rdata,
+   output wire                    rlast,
+   output wire [ID_WIDTH-1:0]     rid,
+   output wire                    rvalid,
+   input wire                     rready,
+
+   // Cache Statistics
+   output wire [32-1:0]           hits,
+   output wire [32-1:0]           misses
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_cached_lite_memory #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter LINE_SIZE = 8, // words per line (power of 2), a line is filled by a burst
+   parameter LINES = 64, // lines of the cache (WAYS * power of 2)
+   parameter WAYS = 2, // associativity
+   parameter PREFETCH = 1, // next lines prefetched on a miss (0 to 15), 0: no prefetch
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Write Address
+   input wire                     awvalid,
+   input wire  [ADDR_WIDTH-1:0]   awaddr,
+   output wire                    awready,
+  
+   // Write Data
+   input wire  [DATA_WIDTH-1:0]   wdata,
+   input wire  [DATA_WIDTH/8-1:0] wstrb,
+   input wire                     wvalid,
+   output wire                    wready,
+
+   // Read Address
+   input wire                     arvalid,
+   input wire  [ADDR_WIDTH-1:0]   araddr,
+   output wire                    arready,
+
+   // Read Data
+   output wire [DATA_WIDTH-1:0]   rdata,
+   output wire                    rvalid,
+   input wire                     rready,
+
+   // Cache Statistics
+   output wire [32-1:0]           hits,
+   output wire [32-1:0]           misses
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_combining_lite_memory #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter WC_SIZE = 16, // words of the buffer (power of 2), written by a burst
+   parameter WC_TIMEOUT = 64, // cycles without stores before a flush, 0: no timeout
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Write Address
+   input wire                     awvalid,
+   input wire  [ADDR_WIDTH-1:0]   awaddr,
+   output wire                    awready,
+  
+   // Write Data
+   input wire  [DATA_WIDTH-1:0]   wdata,
+   input wire  [DATA_WIDTH/8-1:0] wstrb,
+   input wire                     wvalid,
+   output wire                    wready,
+
+   // Read Address
+   input wire                     arvalid,
+   input wire  [ADDR_WIDTH-1:0]   araddr,
+   output wire                    arready,
+
+   // Read Data
+   output wire [DATA_WIDTH-1:0]   rdata,
+   output wire                    rvalid,
+   input wire                     rready,
+
+   // Write Combining
+   input wire                     flush, // writes the buffered stores
+   output wire                    idle // no store is buffered or being written
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_dma #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter MAX_BURST_LEN = 0, // max beats per burst (up to 256), 0: 16
+   parameter BUFFER_DEPTH = 0, // words of each data FIFO (power of 2, MAX_BURST_LEN or more), 0: 4 bursts
+   parameter QUEUE_DEPTH = 4, // descriptors queued per direction (power of 2)
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Descriptor: op[0] reads src, op[1] writes dst, chain: src points a descriptor chain
+   input wire                     desc_valid,
+   output wire                    desc_ready,
+   input wire  [ADDR_WIDTH-1:0]   desc_src,
+   input wire  [ADDR_WIDTH-1:0]   desc_dst,
+   input wire  [32-1:0]           desc_len, // in words
+   input wire  [ADDR_WIDTH-1:0]   desc_stride, // in bytes, 0: contiguous
+   input wire  [2-1:0]            desc_op,
+   input wire                     desc_chain,
+
+   // Read Data Stream: rd_last at the last word of each descriptor
+   output wire [DATA_WIDTH-1:0]   rd_data,
+   output wire                    rd_last,
+   output wire                    rd_valid,
+   input wire                     rd_ready,
+
+   // Write Data Stream: wr_done when the last word of a descriptor is sent
+   input wire  [DATA_WIDTH-1:0]   wr_data,
+   input wire                     wr_valid,
+   output wire                    wr_ready,
+   output wire                    wr_done,
+
+   output wire                    busy
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_stream #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   input wire  [DATA_WIDTH-1:0]   tdata,
+   input wire  [DATA_WIDTH/8-1:0] tkeep,
+   input wire                     tlast,
+   input wire                     tvalid,
+   output wire                    tready
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_slave_stream #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   output wire [DATA_WIDTH-1:0]   tdata,
+   output wire [DATA_WIDTH/8-1:0] tkeep,
+   output wire                    tlast,
+   output wire                    tvalid,
+   input wire                     tready
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_interrupt #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0
+   )
+  (
+   input CLK,
+   input RST,
+   
+   input wire                     irq // held high until cleared by the host
+   );
+endmodule
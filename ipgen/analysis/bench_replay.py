@@ -0,0 +1,105 @@
+#-------------------------------------------------------------------------------
+# bench_replay.py
+#
+# Accuracy and speed of the trace-replay engine against RTL simulation
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import sys
+import os
+import time
+import subprocess
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import ipgen.utils.version
+from ipgen.analysis.replay import read_requests
+from ipgen.analysis.run_replay import add_model_options, make_engine
+
+#-------------------------------------------------------------------------------
+def simulate(testdir, compile_target, run_target, tracefile, read_latency, write_latency):
+    defines = '-DMEM_READ_LATENCY=%d -DMEM_WRITE_LATENCY=%d' % (read_latency, write_latency)
+    subprocess.check_call(['make', '-s', compile_target, 'DEFINES=' + defines],
+                          cwd=testdir, stdout=subprocess.PIPE)
+    start = time.time()
+    subprocess.check_call(['make', '-s', run_target, 'TRACEFILE=' + tracefile],
+                          cwd=testdir, stdout=subprocess.PIPE)
+    elapsed = time.time() - start
+    requests = read_requests(os.path.join(testdir, tracefile))
+    if not requests:
+        raise ValueError("No request in trace: %s" % tracefile)
+    first = min([r.issue for r in requests])
+    last = max([r.completion for r in requests if r.completion is not None])
+    return requests, last - first, elapsed
+
+#-------------------------------------------------------------------------------
+def main():
+    INFO = "Trace-replay benchmark against RTL simulation"
+    VERSION = ipgen.utils.version.VERSION
+    USAGE = "Usage: python bench_replay.py [options] testdir"
+
+    def showVersion():
+        print(INFO)
+        print(VERSION)
+        print(USAGE)
+        sys.exit()
+
+    optparser = OptionParser()
+    optparser.add_option("-v","--version",action="store_true",dest="showversion",
+                         default=False,help="Show the version")
+    optparser.add_option("--compile",dest="compile_target",
+                         default="compile",help="Make target to compile the testbench, Default=compile")
+    optparser.add_option("--run",dest="run_target",
+                         default="trace",help="Make target to run the testbench with trace, Default=trace")
+    optparser.add_option("--scale",dest="scale",
+                         default="1,2,4",help="Comma-separated latency scales to evaluate, Default=1,2,4")
+    add_model_options(optparser)
+    (options, args) = optparser.parse_args()
+
+    if options.showversion:
+        showVersion()
+
+    if len(args) != 1:
+        showVersion()
+
+    testdir = args[0]
+    if not os.path.exists(os.path.join(testdir, 'Makefile')):
+        raise IOError("Makefile not found in " + testdir)
+
+    scales = [int(v) for v in options.scale.split(',')]
+    scenarios = []
+    for s in scales:
+        scenarios.append(('read x%d' % s if s != 1 else 'baseline',
+                          options.read_latency * s, options.write_latency))
+        if s != 1:
+            scenarios.append(('write x%d' % s, options.read_latency, options.write_latency * s))
+
+    base_requests = None
+    rows = []
+    for i, (name, read_latency, write_latency) in enumerate(scenarios):
+        requests, sim_cycles, sim_time = simulate(testdir, options.compile_target,
+                                                  options.run_target, 'bench_%d.bin' % i,
+                                                  read_latency, write_latency)
+        if base_requests is None:
+            base_requests = requests
+        num_ports = max([r.port for r in base_requests]) + 1
+        engine = make_engine(options, num_ports, read_latency, write_latency)
+        start = time.time()
+        result = engine.run(base_requests)
+        replay_time = time.time() - start
+        error = (result.cycles - sim_cycles) / sim_cycles * 100
+        rows.append((name, sim_cycles, result.cycles, error, sim_time, replay_time))
+
+    print("----------------------------------------")
+    print("%-10s %12s %12s %8s %10s %10s" %
+          ('scenario', 'sim[cycle]', 'replay', 'error', 'sim[s]', 'replay[s]'))
+    for row in rows:
+        print("%-10s %12d %12d %7.2f%% %10.3f %10.4f" % row)
+
+if __name__ == '__main__':
+    main()
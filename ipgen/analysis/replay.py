@@ -0,0 +1,273 @@
+#-------------------------------------------------------------------------------
+# replay.py
+#
+# Trace-replay engine with DRAM and interconnect models
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import heapq
+import collections
+
+from ipgen.analysis.trace import (open_trace, DIRECTION_CHANNELS, DIRECTION_NAMES,
+                                  WRITE, READ, DEFAULT_CHUNKSIZE)
+
+#-------------------------------------------------------------------------------
+class Request(object):
+    def __init__(self, port, direction, issue, addr, size, completion=None):
+        self.port = port
+        self.direction = direction
+        self.issue = issue
+        self.addr = addr
+        self.size = size
+        self.completion = completion
+
+    def __repr__(self):
+        return ("(%s port:%d issue:%d addr:0x%x size:%d completion:%s)" %
+                (DIRECTION_NAMES[self.direction], self.port, self.issue,
+                 self.addr, self.size, str(self.completion)))
+
+def _div_ceil(a, b):
+    return -(-a // b)
+
+#-------------------------------------------------------------------------------
+def read_requests(filename, chunksize=DEFAULT_CHUNKSIZE):
+    """ request stream of a binary trace written by the testbench """
+    records = open_trace(filename)
+    requests = []
+    pending = {}
+    channels = {}
+    for d, (req_ch, comp_ch, data_ch) in enumerate(DIRECTION_CHANNELS):
+        channels[req_ch] = (d, True)
+        channels[comp_ch] = (d, False)
+
+    for start in range(0, len(records), chunksize):
+        chunk = records[start:start+chunksize]
+        for cycle, addr, size, wait, port, channel in zip(
+                chunk['cycle'].tolist(), chunk['addr'].tolist(), chunk['bytes'].tolist(),
+                chunk['wait'].tolist(), chunk['port'].tolist(), chunk['channel'].tolist()):
+            if channel not in channels:
+                continue
+            d, is_request = channels[channel]
+            if is_request:
+                r = Request(port, d, cycle - wait, addr, size)
+                requests.append(r)
+                pending.setdefault((d, port), collections.deque()).append(r)
+            elif pending.get((d, port)):
+                pending[(d, port)].popleft().completion = cycle
+
+    requests.sort(key=lambda r: r.issue)
+    return requests
+
+def read_requests_csv(filename):
+    """ hand-written request stream: 'cycle,port,read|write,addr,bytes' per line """
+    requests = []
+    for line in open(filename, 'r'):
+        line = line.split('#')[0].strip()
+        if len(line) == 0 or line.startswith('cycle'):
+            continue
+        cycle, port, direction, addr, size = [v.strip() for v in line.split(',')]
+        if direction not in DIRECTION_NAMES:
+            raise ValueError("No such direction: %s" % direction)
+        requests.append(Request(int(port), DIRECTION_NAMES.index(direction),
+                                int(cycle), int(addr, 0), int(size)))
+    requests.sort(key=lambda r: r.issue)
+    return requests
+
+#-------------------------------------------------------------------------------
+class DramModel(object):
+    def __init__(self, read_latency=8, write_latency=4, write_response=1,
+                 bandwidth=None):
+        self.read_latency = read_latency
+        self.write_latency = write_latency
+        self.write_response = write_response
+        self.bandwidth = bandwidth # bytes/cycle, None: limited by the ports only
+        self.reset()
+
+    def reset(self):
+        self.free = 0
+        self.busy = 0
+
+    def access(self, direction, start, size, beats):
+        latency = self.read_latency if direction == READ else self.write_latency
+        data_start = start + latency
+        occupancy = 0 if self.bandwidth is None else _div_ceil(size, self.bandwidth)
+        if self.bandwidth is not None:
+            data_start = max(data_start, self.free)
+            self.free = data_start + occupancy
+        self.busy += max(occupancy, beats)
+        end = data_start + max(occupancy, beats)
+        if direction == WRITE:
+            end += self.write_response
+        return end
+
+class InterconnectModel(object):
+    def __init__(self, num_ports, datawidth=32, outstanding=1,
+                 arbitration='roundrobin', weights=None):
+        if arbitration not in ('roundrobin', 'fixed', 'weighted'):
+            raise ValueError("Arbitration '%s' is not supported." % arbitration)
+        if outstanding < 0:
+            raise ValueError("Outstanding requests must be 0 (unlimited) or more: %d" % outstanding)
+        if not isinstance(datawidth, (tuple, list)):
+            datawidth = [datawidth] * num_ports
+        if len(datawidth) < num_ports:
+            raise ValueError("Data width is not defined for all ports")
+        self.num_ports = num_ports
+        self.datawidth = datawidth
+        self.outstanding = outstanding
+        self.arbitration = arbitration
+        self.weights = [1] * num_ports if weights is None else weights
+        self.reset()
+
+    def reset(self):
+        self.last = self.num_ports - 1
+        self.credit = list(self.weights)
+
+    def accepts(self, count):
+        """ whether a port with 'count' requests in flight issues another one """
+        return self.outstanding == 0 or count < self.outstanding
+
+    def getBeats(self, port, size):
+        return _div_ceil(size, self.datawidth[port] // 8)
+
+    def select(self, candidates):
+        if self.arbitration == 'fixed':
+            return min(candidates)
+        order = sorted(candidates, key=lambda p: (p - self.last - 1) % self.num_ports)
+        if self.arbitration == 'weighted':
+            if all(self.credit[p] <= 0 for p in candidates):
+                self.credit = list(self.weights)
+            order = [p for p in order if self.credit[p] > 0] or order
+            self.credit[order[0]] -= 1
+        self.last = order[0]
+        return order[0]
+
+#-------------------------------------------------------------------------------
+class ReplayResult(object):
+    def __init__(self, requests, issue, completion, cycles, busy, num_ports):
+        self.requests = requests
+        self.issue = issue
+        self.completion = completion
+        self.cycles = cycles
+        self.busy = busy
+        self.num_ports = num_ports
+
+    def getUtilization(self):
+        return self.busy / self.cycles if self.cycles > 0 else 0.0
+
+    def getSeconds(self, hperiod):
+        return self.cycles * hperiod * 2 * 1e-9
+
+    def getPortStats(self):
+        stats = []
+        for p in range(self.num_ports):
+            reqs = [(r, i, c) for r, i, c in zip(self.requests, self.issue, self.completion)
+                    if r.port == p]
+            size = sum([r.size for r, i, c in reqs])
+            latency = [c - i for r, i, c in reqs]
+            stats.append((len(reqs), size, max([c for r, i, c in reqs] or [0]),
+                          sum(latency) / len(latency) if latency else 0.0))
+        return stats
+
+    def report(self, hperiod=None):
+        ret = []
+        ret.append("----------------------------------------")
+        ret.append("Replay: %d requests, %d cycles" % (len(self.requests), self.cycles))
+        if hperiod is not None:
+            ret.append("  completion time: %.3f us" % (self.getSeconds(hperiod) * 1e6))
+        ret.append("  DRAM utilization: %.1f%%" % (self.getUtilization() * 100))
+        for p, (num, size, last, latency) in enumerate(self.getPortStats()):
+            ret.append("  port%d: %d requests, %d bytes, done at %d, mean latency %.2f" %
+                       (p, num, size, last, latency))
+        return '\n'.join(ret)
+
+#-------------------------------------------------------------------------------
+class ReplayEngine(object):
+    """
+    Requests of each port are re-issued in order. A request issued after
+    the completion of its predecessor in the recorded stream keeps its think
+    time from that completion, otherwise it keeps its distance from the
+    previous issue. Dependencies between ports are not modeled.
+    """
+    def __init__(self, dram=None, interconnect=None):
+        self.dram = DramModel() if dram is None else dram
+        self.interconnect = interconnect
+
+    def run(self, requests):
+        num_ports = max([r.port for r in requests] or [-1]) + 1
+        interconnect = (InterconnectModel(num_ports) if self.interconnect is None else
+                        self.interconnect)
+        if interconnect.num_ports < num_ports:
+            raise ValueError("Interconnect has %d ports, trace has %d" %
+                             (interconnect.num_ports, num_ports))
+        self.dram.reset()
+        interconnect.reset()
+
+        queues = [collections.deque() for p in range(num_ports)]
+        for i, r in enumerate(requests):
+            queues[r.port].append(i)
+
+        completion = [None] * len(requests)
+        issue = [None] * len(requests)
+        prev = [None] * num_ports
+        ready = [None] * num_ports
+        outstanding = [[0, 0] for p in range(num_ports)]
+        done = [] # heap of (cycle, port, direction)
+        first = min([r.issue for r in requests] or [0])
+
+        def updateReady(p):
+            if not queues[p]:
+                ready[p] = None
+                return
+            r = requests[queues[p][0]]
+            q = prev[p]
+            if q is None:
+                ready[p] = r.issue - first
+                return
+            pr = requests[q]
+            if pr.completion is not None and r.issue >= pr.completion:
+                ready[p] = completion[q] + (r.issue - pr.completion)
+            else:
+                ready[p] = issue[q] + (r.issue - pr.issue)
+
+        for p in range(num_ports):
+            updateReady(p)
+
+        t = 0
+        remaining = len(requests)
+        while remaining > 0:
+            while done and done[0][0] <= t:
+                c, p, d = heapq.heappop(done)
+                outstanding[p][d] -= 1
+
+            candidates = [p for p in range(num_ports)
+                          if ready[p] is not None and ready[p] <= t and
+                          interconnect.accepts(outstanding[p][requests[queues[p][0]].direction])]
+
+            if candidates:
+                p = interconnect.select(candidates)
+                i = queues[p].popleft()
+                r = requests[i]
+                issue[i] = t
+                completion[i] = self.dram.access(r.direction, t, r.size,
+                                                 interconnect.getBeats(p, r.size))
+                outstanding[p][r.direction] += 1
+                heapq.heappush(done, (completion[i], p, r.direction))
+                prev[p] = i
+                updateReady(p)
+                remaining -= 1
+                t += 1
+                continue
+
+            # advance to the next event
+            events = [ready[p] for p in range(num_ports)
+                      if ready[p] is not None and ready[p] > t]
+            if done:
+                events.append(done[0][0])
+            t = min(events) if events else t + 1
+
+        cycles = max(completion or [0])
+        return ReplayResult(requests, issue, completion, cycles, self.dram.busy, num_ports)
@@ -0,0 +1,75 @@
+#-------------------------------------------------------------------------------
+# run_analysis.py
+#
+# Bandwidth/latency analyzer for IPgen transaction traces
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import os
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import ipgen.utils.version
+from ipgen.analysis.trace import TraceAnalyzer, DIRECTION_NAMES, DEFAULT_CHUNKSIZE
+
+#-------------------------------------------------------------------------------
+def main():
+    INFO = "Bandwidth/latency analyzer for IPgen transaction traces"
+    VERSION = ipgen.utils.version.VERSION
+    USAGE = "Usage: python run_analysis.py [-w window] [--hperiod=ns] [--ports=name,...] tracefile"
+
+    def showVersion():
+        print(INFO)
+        print(VERSION)
+        print(USAGE)
+        sys.exit()
+
+    optparser = OptionParser()
+    optparser.add_option("-v","--version",action="store_true",dest="showversion",
+                         default=False,help="Show the version")
+    optparser.add_option("-w","--window",dest="window",type="int",
+                         default=1000,help="Window size of bandwidth in cycles, Default=1000")
+    optparser.add_option("--hperiod",dest="hperiod",type="float",
+                         default=None,help="Half period of bus clock in ns to report MB/s, Default=None")
+    optparser.add_option("--ports",dest="ports",
+                         default=None,help="Comma-separated master interface names in name order")
+    optparser.add_option("--chunksize",dest="chunksize",type="int",
+                         default=DEFAULT_CHUNKSIZE,help="Records per chunk, Default=%d" % DEFAULT_CHUNKSIZE)
+    optparser.add_option("--csv",dest="csv",
+                         default=None,help="Output file of bandwidth per window in CSV, Default=None")
+    (options, args) = optparser.parse_args()
+
+    filelist = args
+    if options.showversion:
+        showVersion()
+
+    for f in filelist:
+        if not os.path.exists(f): raise IOError("file not found: " + f)
+
+    if len(filelist) != 1:
+        showVersion()
+
+    portnames = None if options.ports is None else options.ports.split(',')
+
+    analyzer = TraceAnalyzer(filelist[0], options.window, options.chunksize)
+    print(analyzer.report(hperiod=options.hperiod, portnames=portnames))
+
+    if options.csv is not None:
+        f = open(options.csv, 'w')
+        cols = ['%s_%d' % (name, p)
+                for p in range(analyzer.getNumPorts()) for name in DIRECTION_NAMES]
+        f.write(','.join(['cycle'] + cols) + '\n')
+        bw = analyzer.bandwidth
+        for w in range(bw.shape[2]):
+            vals = [str(bw[d, p, w])
+                    for p in range(bw.shape[1]) for d in range(len(DIRECTION_NAMES))]
+            f.write(','.join([str(w * options.window)] + vals) + '\n')
+        f.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#-------------------------------------------------------------------------------
+# run_replay.py
+#
+# Trace-replay throughput estimator for IPgen
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import os
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import ipgen.utils.version
+from ipgen.analysis.replay import (ReplayEngine, DramModel, InterconnectModel,
+                                   read_requests, read_requests_csv)
+
+#-------------------------------------------------------------------------------
+def add_model_options(optparser):
+    optparser.add_option("--read_latency",dest="read_latency",type="int",
+                         default=8,help="DRAM read latency in cycles, Default=8")
+    optparser.add_option("--write_latency",dest="write_latency",type="int",
+                         default=4,help="DRAM write latency in cycles, Default=4")
+    optparser.add_option("--write_response",dest="write_response",type="int",
+                         default=1,help="Cycles from the last write beat to the response, Default=1 (-1 for Avalon)")
+    optparser.add_option("--bandwidth",dest="bandwidth",type="int",
+                         default=None,help="DRAM bandwidth in bytes/cycle, Default=None (unlimited)")
+    optparser.add_option("--datawidth",dest="datawidth",
+                         default="32",help="Data width of master ports in bits (comma-separated for each port), Default=32")
+    optparser.add_option("--outstanding",dest="outstanding",type="int",
+                         default=1,help="Outstanding requests per port and direction (0: unlimited), Default=1")
+    optparser.add_option("--arbitration",dest="arbitration",
+                         default="roundrobin",help="roundrobin, fixed or weighted, Default=roundrobin")
+    optparser.add_option("--weights",dest="weights",
+                         default=None,help="Comma-separated weights of ports for weighted arbitration")
+
+def make_engine(options, num_ports, read_latency=None, write_latency=None):
+    dram = DramModel(options.read_latency if read_latency is None else read_latency,
+                     options.write_latency if write_latency is None else write_latency,
+                     options.write_response, options.bandwidth)
+    datawidth = [int(v) for v in options.datawidth.split(',')]
+    if len(datawidth) == 1:
+        datawidth = datawidth[0]
+    weights = (None if options.weights is None else
+               [int(v) for v in options.weights.split(',')])
+    interconnect = InterconnectModel(num_ports, datawidth, options.outstanding,
+                                     options.arbitration, weights)
+    return ReplayEngine(dram, interconnect)
+
+def load_requests(filename):
+    if filename.endswith('.csv'):
+        return read_requests_csv(filename)
+    return read_requests(filename)
+
+#-------------------------------------------------------------------------------
+def main():
+    INFO = "Trace-replay throughput estimator for IPgen"
+    VERSION = ipgen.utils.version.VERSION
+    USAGE = "Usage: python run_replay.py [options] tracefile"
+
+    def showVersion():
+        print(INFO)
+        print(VERSION)
+        print(USAGE)
+        sys.exit()
+
+    optparser = OptionParser()
+    optparser.add_option("-v","--version",action="store_true",dest="showversion",
+                         default=False,help="Show the version")
+    optparser.add_option("--hperiod",dest="hperiod",type="float",
+                         default=None,help="Half period of bus clock in ns to report time, Default=None")
+    add_model_options(optparser)
+    (options, args) = optparser.parse_args()
+
+    filelist = args
+    if options.showversion:
+        showVersion()
+
+    for f in filelist:
+        if not os.path.exists(f): raise IOError("file not found: " + f)
+
+    if len(filelist) != 1:
+        showVersion()
+
+    requests = load_requests(filelist[0])
+    num_ports = max([r.port for r in requests] or [-1]) + 1
+    engine = make_engine(options, num_ports)
+    result = engine.run(requests)
+    print(result.report(options.hperiod))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+#-------------------------------------------------------------------------------
+# trace.py
+#
+# Binary transaction trace reader and analyzer
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import os
+import numpy as np
+
+#-------------------------------------------------------------------------------
+# Record format written by trace_record() in the generated testbench
+# (32 bytes, little-endian)
+TRACE_DTYPE = np.dtype([('cycle', '<u8'),
+                        ('addr', '<u8'),
+                        ('bytes', '<u4'),
+                        ('wait', '<u4'),
+                        ('port', '<u2'),
+                        ('channel', 'u1'),
+                        ('reserved0', 'u1'),
+                        ('reserved1', '<u4')])
+
+CH_AW = 0
+CH_W = 1
+CH_B = 2
+CH_AR = 3
+CH_R = 4
+CHANNEL_NAMES = ('AW', 'W', 'B', 'AR', 'R')
+
+WRITE = 0
+READ = 1
+DIRECTION_NAMES = ('write', 'read')
+
+# (request channel, completion channel, data channel) of each direction
+DIRECTION_CHANNELS = ((CH_AW, CH_B, CH_W), (CH_AR, CH_R, CH_R))
+
+DEFAULT_CHUNKSIZE = 1 << 22 # records
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+#-------------------------------------------------------------------------------
+def open_trace(filename):
+    """ memory-mapped record array of a trace file """
+    size = os.path.getsize(filename)
+    if size % TRACE_DTYPE.itemsize != 0:
+        raise ValueError("Trace file is truncated: %s" % filename)
+    if size == 0:
+        return np.zeros(0, dtype=TRACE_DTYPE)
+    return np.memmap(filename, dtype=TRACE_DTYPE, mode='r')
+
+def _grow(a, shape):
+    if all(n <= m for n, m in zip(shape, a.shape)):
+        return a
+    new_shape = tuple(max(n, m) for n, m in zip(shape, a.shape))
+    b = np.zeros(new_shape, dtype=a.dtype)
+    b[tuple(slice(0, m) for m in a.shape)] = a
+    return b
+
+def _percentile_from_histogram(hist, p):
+    total = hist.sum()
+    if total == 0:
+        return None
+    rank = max(int(np.ceil(p / 100.0 * total)), 1)
+    return int(np.searchsorted(np.cumsum(hist), rank))
+
+#-------------------------------------------------------------------------------
+class TraceAnalyzer(object):
+    def __init__(self, filename, window=1000, chunksize=DEFAULT_CHUNKSIZE):
+        if window <= 0:
+            raise ValueError("Window size should be positive: %d" % window)
+        self.filename = filename
+        self.window = window
+        self.chunksize = chunksize
+        self.records = open_trace(filename)
+
+        # [direction, port, window] -> bytes
+        self.bandwidth = np.zeros((2, 0, 0), dtype=np.int64)
+        # [direction, port, latency] -> count
+        self.latency = np.zeros((2, 0, 0), dtype=np.int64)
+        # [direction, port] -> (count, sum, max) of address-phase wait cycles
+        self.wait_count = np.zeros((2, 0), dtype=np.int64)
+        self.wait_sum = np.zeros((2, 0), dtype=np.int64)
+        self.wait_max = np.zeros((2, 0), dtype=np.int64)
+        # (direction, port) -> issue cycles of outstanding requests
+        self.pending = {}
+        self.unmatched = 0
+        self.num_records = 0
+        self.done = False
+
+    #---------------------------------------------------------------------------
+    def run(self):
+        if self.done:
+            return self
+        for start in range(0, len(self.records), self.chunksize):
+            self._update(np.asarray(self.records[start:start+self.chunksize]))
+        self.done = True
+        return self
+
+    def _update(self, chunk):
+        self.num_records += len(chunk)
+        cycle = chunk['cycle'].astype(np.int64)
+        port = chunk['port'].astype(np.int64)
+        channel = chunk['channel']
+        num_ports = int(port.max()) + 1
+        num_windows = int(cycle.max()) // self.window + 1
+
+        self.bandwidth = _grow(self.bandwidth, (2, num_ports, num_windows))
+        self.wait_count = _grow(self.wait_count, (2, num_ports))
+        self.wait_sum = _grow(self.wait_sum, (2, num_ports))
+        self.wait_max = _grow(self.wait_max, (2, num_ports))
+
+        for d, (req_ch, comp_ch, data_ch) in enumerate(DIRECTION_CHANNELS):
+            # bandwidth: a burst is accounted at its last data beat
+            sel = channel == data_ch
+            idx = port[sel] * self.bandwidth.shape[2] + cycle[sel] // self.window
+            self.bandwidth[d] += np.bincount(idx, weights=chunk['bytes'][sel],
+                                             minlength=self.bandwidth[d].size
+                                             ).astype(np.int64).reshape(self.bandwidth[d].shape)
+
+            req = channel == req_ch
+            comp = channel == comp_ch
+            wait = chunk['wait'][req].astype(np.int64)
+            req_port = port[req]
+            self.wait_count[d] += np.bincount(req_port, minlength=self.wait_count.shape[1])
+            self.wait_sum[d] += np.bincount(req_port, weights=wait,
+                                            minlength=self.wait_sum.shape[1]).astype(np.int64)
+            if len(wait) > 0:
+                np.maximum.at(self.wait_max[d], req_port, wait)
+
+            # latency: requests complete in order on each port
+            issue = cycle[req] - wait
+            comp_cycle = cycle[comp]
+            comp_port = port[comp]
+            for p in np.union1d(np.unique(req_port), np.unique(comp_port)):
+                reqs = np.concatenate((self.pending.get((d, p), np.zeros(0, dtype=np.int64)),
+                                       issue[req_port == p]))
+                comps = comp_cycle[comp_port == p]
+                n = min(len(reqs), len(comps))
+                self.unmatched += len(comps) - n
+                self.pending[(d, p)] = reqs[n:]
+                if n == 0:
+                    continue
+                hist = np.bincount(comps[:n] - reqs[:n])
+                self.latency = _grow(self.latency, (2, p + 1, len(hist)))
+                self.latency[d, p, :len(hist)] += hist
+
+    #---------------------------------------------------------------------------
+    def getNumPorts(self):
+        self.run()
+        return self.bandwidth.shape[1]
+
+    def getBandwidth(self, direction=None, port=None):
+        """ bytes transferred in each window """
+        self.run()
+        bw = self.bandwidth if direction is None else self.bandwidth[direction:direction+1]
+        bw = bw.sum(axis=0)
+        if port is None:
+            return bw.sum(axis=0)
+        return bw[port]
+
+    def getLatencyPercentiles(self, direction, port=None, percentiles=DEFAULT_PERCENTILES):
+        """ latency in cycles from the first request cycle to the completion """
+        self.run()
+        if port is not None and port >= self.latency.shape[1]:
+            return tuple(None for p in percentiles)
+        hist = (self.latency[direction].sum(axis=0) if port is None else
+                self.latency[direction, port])
+        return tuple(_percentile_from_histogram(hist, p) for p in percentiles)
+
+    def getContention(self):
+        """ per-port address-phase wait cycles and multi-port overlap ratio """
+        self.run()
+        waits = []
+        for p in range(self.getNumPorts()):
+            count = self.wait_count[:, p].sum()
+            total = self.wait_sum[:, p].sum()
+            waits.append((count, total, total / count if count else 0.0,
+                          self.wait_max[:, p].max()))
+        active = (self.bandwidth.sum(axis=0) > 0).sum(axis=0)
+        busy = np.count_nonzero(active)
+        overlap = np.count_nonzero(active > 1) / busy if busy else 0.0
+        return waits, overlap
+
+    #---------------------------------------------------------------------------
+    def report(self, hperiod=None, percentiles=DEFAULT_PERCENTILES, portnames=None):
+        self.run()
+        ret = []
+        def portname(p):
+            if portnames is not None and p < len(portnames):
+                return portnames[p]
+            return 'port%d' % p
+        def rate(b):
+            if hperiod is None:
+                return "%.3f bytes/cycle" % (b / self.window)
+            return "%.3f MB/s" % (b / (self.window * hperiod * 2) * 1000)
+
+        ret.append("----------------------------------------")
+        ret.append("Trace: %s (%d records, window %d cycles)" %
+                   (self.filename, self.num_records, self.window))
+        for p in range(self.getNumPorts()):
+            ret.append("----------------------------------------")
+            ret.append("%s" % portname(p))
+            for d, name in enumerate(DIRECTION_NAMES):
+                bw = self.getBandwidth(d, p)
+                nz = bw[bw > 0]
+                ret.append("  %s: %d bytes, mean %s, peak %s" %
+                           (name, bw.sum(), rate(nz.mean() if len(nz) else 0),
+                            rate(nz.max() if len(nz) else 0)))
+                lat = self.getLatencyPercentiles(d, p, percentiles)
+                ret.append("  %s latency: %s" %
+                           (name, ', '.join(['p%s=%s' % (q, '-' if l is None else l)
+                                             for q, l in zip(percentiles, lat)])))
+        waits, overlap = self.getContention()
+        ret.append("----------------------------------------")
+        ret.append("Contention")
+        for p, (count, total, mean, peak) in enumerate(waits):
+            ret.append("  %s: %d requests, wait mean %.2f max %d cycles" %
+                       (portname(p), count, mean, peak))
+        ret.append("  windows with multiple active ports: %.1f%%" % (overlap * 100))
+        if self.unmatched > 0:
+            ret.append("  unmatched completions: %d" % self.unmatched)
+        return '\n'.join(ret)
@@ -0,0 +1,123 @@
+#-------------------------------------------------------------------------------
+# alloc.py
+#
+# Page-granular buddy allocator of DMA regions (same as c_lib/buddy.h)
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+
+PAGE_SIZE = 4 * 1024
+CACHE_ORDERS = 4
+CACHE_SIZE = 8
+
+#-------------------------------------------------------------------------------
+class BuddyAllocator(object):
+    """ Allocator of offsets in a region. A block of order k is 2^k pages,
+    aligned to its size from the head of the region. Freed blocks of small
+    orders are cached for each order, and are reused without splitting and
+    coalescing. """
+    def __init__(self, size, page_size=PAGE_SIZE,
+                 cache_orders=CACHE_ORDERS, cache_size=CACHE_SIZE):
+        self.size = size
+        self.page_size = page_size
+        self.npages = size // page_size
+        self.max_order = max(self.npages.bit_length() - 1, 0)
+        self.cache_orders = cache_orders
+        self.cache_size = cache_size
+        # page -> order of the free blocks, for each order
+        self.free_lists = [ {} for k in range(self.max_order + 1) ]
+        self.used = {}
+        self.caches = [ [] for k in range(cache_orders) ]
+
+        page = 0
+        while page < self.npages:
+            order = self.max_order
+            while order > 0 and (page % (1 << order) != 0 or
+                                 page + (1 << order) > self.npages):
+                order -= 1
+            self.free_lists[order][page] = order
+            page += 1 << order
+
+    def order(self, nbytes, align=None):
+        numpages = max((nbytes + self.page_size - 1) // self.page_size, 1)
+        if align is not None:
+            if align & (align - 1) != 0:
+                raise ValueError("Alignment must be a power of 2: %d" % align)
+            numpages = max(numpages, (align + self.page_size - 1) // self.page_size)
+        return (numpages - 1).bit_length()
+
+    def alloc(self, nbytes, align=None):
+        """ offset of a block of 'nbytes' or more, aligned to 'align' bytes """
+        order = self.order(nbytes, align)
+        if order > self.max_order:
+            raise MemoryError("No block of %d bytes in %d bytes" % (nbytes, self.size))
+        if order < self.cache_orders and self.caches[order]:
+            page = self.caches[order].pop()
+        else:
+            page = self.take(order)
+            if page is None:
+                self.flush()
+                page = self.take(order)
+            if page is None:
+                raise MemoryError("No block of %d bytes in %d bytes" % (nbytes, self.size))
+        self.used[page] = order
+        return page * self.page_size
+
+    def free(self, offset):
+        page = offset // self.page_size
+        if offset % self.page_size != 0 or page not in self.used:
+            raise ValueError("Offset %d is not allocated" % offset)
+        order = self.used.pop(page)
+        if order < self.cache_orders and len(self.caches[order]) < self.cache_size:
+            self.caches[order].append(page)
+            return
+        self.release(page, order)
+
+    def take(self, order):
+        for k in range(order, self.max_order + 1):
+            if self.free_lists[k]:
+                break
+        else:
+            return None
+        page, k = self.free_lists[k].popitem()
+        while k > order:
+            k -= 1
+            self.free_lists[k][page + (1 << k)] = k
+        return page
+
+    def release(self, page, order):
+        while order < self.max_order:
+            buddy = page ^ (1 << order)
+            if buddy not in self.free_lists[order]:
+                break
+            del self.free_lists[order][buddy]
+            page = min(page, buddy)
+            order += 1
+        self.free_lists[order][page] = order
+
+    def flush(self):
+        """ returns the cached blocks to the free lists """
+        for order, cache in enumerate(self.caches):
+            while cache:
+                self.release(cache.pop(), order)
+
+    def free_bytes(self):
+        pages = sum([ len(l) << k for k, l in enumerate(self.free_lists) ])
+        pages += sum([ len(c) << k for k, c in enumerate(self.caches) ])
+        return pages * self.page_size
+
+    def largest_free(self):
+        for k in range(self.max_order, -1, -1):
+            if self.free_lists[k]:
+                return (1 << k) * self.page_size
+        return 0
+
+    def fragmentation(self):
+        """ 1 - (largest free block) / (free bytes), after flushing the caches """
+        self.flush()
+        free = self.free_bytes()
+        return 1.0 - self.largest_free() / free if free else 0.0
@@ -0,0 +1,175 @@
+#-------------------------------------------------------------------------------
+# bench_alloc.py
+#
+# Allocation throughput and fragmentation of DMA buffers
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import sys
+import os
+import time
+import random
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+import ipgen.utils.version
+from ipgen.host.alloc import BuddyAllocator, PAGE_SIZE
+from ipgen.host.device import DmaBuffer
+
+#-------------------------------------------------------------------------------
+class BumpAllocator(object):
+    """ Former allocator of cma_malloc() and umem_malloc(), which never frees """
+    def __init__(self, size, page_size=PAGE_SIZE):
+        self.size = size
+        self.page_size = page_size
+        self.used = 0
+
+    def alloc(self, nbytes, align=None):
+        align = self.page_size if align is None else max(align, self.page_size)
+        offset = (self.used + align - 1) // align * align
+        size = (nbytes + self.page_size - 1) // self.page_size * self.page_size
+        if offset + size > self.size:
+            raise MemoryError("No block of %d bytes in %d bytes" % (nbytes, self.size))
+        self.used = offset + size
+        return offset
+
+    def free(self, offset):
+        pass
+
+    def flush(self):
+        pass
+
+    def free_bytes(self):
+        return self.size - self.used
+
+    def largest_free(self):
+        return self.size - self.used
+
+#-------------------------------------------------------------------------------
+def workload(num, max_pages, max_live, seed):
+    """ random sequence of ('alloc', bytes, align) and ('free', index of the live blocks) """
+    rand = random.Random(seed)
+    ops = []
+    live = 0
+    for i in range(num):
+        if live == max_live or (live > 0 and rand.random() < 0.5):
+            ops.append(('free', rand.randrange(live), None))
+            live -= 1
+        else:
+            align = 8 * PAGE_SIZE if rand.random() < 0.125 else None
+            ops.append(('alloc', rand.randrange(1, max_pages * PAGE_SIZE), align))
+            live += 1
+    return ops
+
+def run(allocator, ops):
+    """ returns (elapsed time, failed allocations, live offsets) """
+    live = []
+    fail = 0
+    start = time.time()
+    for op, arg, align in ops:
+        if op == 'free':
+            if arg < len(live):
+                allocator.free(live[arg])
+                live[arg] = live[-1]
+                live.pop()
+        else:
+            try:
+                live.append(allocator.alloc(arg, align))
+            except MemoryError:
+                fail += 1
+    return time.time() - start, fail, live
+
+def check_buffers(size, ops):
+    """ errors of the arrays on anonymous memory, each filled with a serial number """
+    buf = DmaBuffer(None, size)
+    live = []
+    errors = 0
+    serial = 0
+    for op, arg, align in ops:
+        if op == 'free':
+            if arg < len(live):
+                a, v = live[arg]
+                if not (a == v).all():
+                    errors += 1
+                buf.free(a)
+                live[arg] = live[-1]
+                live.pop()
+        else:
+            try:
+                a = buf.alloc(max(arg // 4, 1), np.uint32, align)
+            except MemoryError:
+                continue
+            serial += 1
+            a[:] = serial
+            live.append((a, serial))
+    for a, v in live:
+        if not (a == v).all():
+            errors += 1
+        buf.free(a)
+    buf.allocator.flush()
+    if buf.allocator.free_bytes() != size // PAGE_SIZE * PAGE_SIZE:
+        errors += 1
+    live = None
+    buf.close()
+    return errors
+
+#-------------------------------------------------------------------------------
+def main():
+    INFO = "Benchmark of DMA buffer allocation"
+    VERSION = ipgen.utils.version.VERSION
+    USAGE = "Usage: python bench_alloc.py [options]"
+
+    def showVersion():
+        print(INFO)
+        print(VERSION)
+        print(USAGE)
+        sys.exit()
+
+    optparser = OptionParser()
+    optparser.add_option("-v","--version",action="store_true",dest="showversion",
+                         default=False,help="Show the version")
+    optparser.add_option("--size",dest="size",type='int',
+                         default=64,help="Size of the region in MB, Default=64")
+    optparser.add_option("--num",dest="num",type='int',
+                         default=100000,help="Number of operations, Default=100000")
+    optparser.add_option("--max_pages",dest="max_pages",type='int',
+                         default=64,help="Maximum pages of an allocation, Default=64")
+    optparser.add_option("--max_live",dest="max_live",type='int',
+                         default=1024,help="Maximum live buffers, Default=1024")
+    optparser.add_option("--seed",dest="seed",type='int',
+                         default=1,help="Random seed, Default=1")
+    (options, args) = optparser.parse_args()
+
+    if options.showversion:
+        showVersion()
+
+    size = options.size * 1024 * 1024
+    ops = workload(options.num, options.max_pages, options.max_live, options.seed)
+    num_alloc = len([ op for op in ops if op[0] == 'alloc' ])
+
+    print("----------------------------------------")
+    print("%d operations (%d allocations) in %d MB" % (len(ops), num_alloc, options.size))
+    print("%-8s %10s %10s %10s %10s %8s" %
+          ('alloc', 'Mops/s', 'failed', 'free[KB]', 'largest', 'frag'))
+    for name, cls in (('bump', BumpAllocator), ('buddy', BuddyAllocator)):
+        allocator = cls(size)
+        elapsed, fail, live = run(allocator, ops)
+        allocator.flush()
+        free = allocator.free_bytes()
+        largest = allocator.largest_free()
+        print("%-8s %10.3f %10d %10d %10d %8.3f" %
+              (name, len(ops) / elapsed / 1e6, fail, free // 1024, largest // 1024,
+               1.0 - largest / free if free else 0.0))
+
+    print("----------------------------------------")
+    print("errors of the buffers on anonymous memory: %d" % check_buffers(size, ops))
+
+if __name__ == '__main__':
+    main()
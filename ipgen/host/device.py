@@ -0,0 +1,200 @@
+#-------------------------------------------------------------------------------
+# device.py
+#
+# UIO registers and DMA buffers of IP-cores mapped as NumPy arrays
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import os
+import mmap
+import select
+import struct
+import numpy as np
+
+from ipgen.host.alloc import BuddyAllocator
+
+# same as c_lib/umem.h, c_lib/cma.h and c_lib/ipgen.h
+PAGE_SIZE = 4 * 1024
+
+UIO_MEM = '/dev/uio0'
+UMEM_SIZE = 0x10000000
+UMEM_OFFSET = 0x10000000
+
+UIO_IPGEN = '/dev/uio1'
+IPGEN_SIZE = 0x1000
+
+DEV_CMA = '/dev/udmabuf0'
+DEV_CMA_SYSFS = '/sys/class/udmabuf/udmabuf0/'
+
+CMA_SYNC_OFF = 0
+CMA_SYNC_ON = 1
+CMA_SYNC_ON_WC = 2
+CMA_SYNC_ON_DC = 3
+
+UIO_SYSFS = '/sys/class/uio/'
+
+#-------------------------------------------------------------------------------
+def read_attribute(filename, base=0):
+    with open(filename, 'r') as f:
+        return int(f.read().strip(), base)
+
+def write_attribute(filename, value):
+    with open(filename, 'w') as f:
+        f.write(str(value))
+
+#-------------------------------------------------------------------------------
+class MappedRegion(object):
+    """ A device file (or a regular file in place of it) mapped into the process.
+    Without a device, anonymous memory is mapped, for tests without hardware.
+    Arrays of the region are views of the mapped memory, without any copy. """
+    def __init__(self, device, size, physical_address=0, offset=0, sync=False):
+        self.device = device if device is not None else 'anonymous memory'
+        self.size = size
+        self.physical_address = physical_address
+        if device is None:
+            self.fd = -1
+            self.mem = mmap.mmap(-1, size)
+        else:
+            self.fd = os.open(device, os.O_RDWR | (os.O_SYNC if sync else 0))
+            try:
+                self.mem = mmap.mmap(self.fd, size, mmap.MAP_SHARED,
+                                     mmap.PROT_READ | mmap.PROT_WRITE, offset=offset)
+            except:
+                os.close(self.fd)
+                raise
+        self.bytes = np.frombuffer(self.mem, dtype=np.uint8)
+        self.address = self.bytes.ctypes.data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def array(self, offset, shape, dtype=np.uint32):
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        if offset < 0 or offset + count * dtype.itemsize > self.size:
+            raise ValueError("Out of the region of %s: offset %d, %d bytes" %
+                             (self.device, offset, count * dtype.itemsize))
+        return np.frombuffer(self.mem, dtype, count, offset).reshape(shape)
+
+    def offset(self, array):
+        pos = array.__array_interface__['data'][0] - self.address
+        if pos < 0 or pos + array.nbytes > self.size:
+            raise ValueError("Array is not in the region of %s" % self.device)
+        return pos
+
+    def physical(self, array):
+        """ physical address of an array (or a view of it) in the region """
+        return self.physical_address + self.offset(array)
+
+    def sync(self, array=None):
+        """ writes back the pages of the array (or of the region) """
+        if array is None:
+            self.mem.flush()
+            return
+        start = self.offset(array) // mmap.PAGESIZE * mmap.PAGESIZE
+        end = self.offset(array) + array.nbytes
+        self.mem.flush(start, end - start)
+
+    def close(self):
+        if self.mem is None:
+            return
+        self.bytes = None
+        try:
+            self.mem.close()
+        except BufferError:
+            # unmapped when the last array of the region is released
+            pass
+        self.mem = None
+        if self.fd >= 0:
+            os.close(self.fd)
+        self.fd = -1
+
+#-------------------------------------------------------------------------------
+class Uio(MappedRegion):
+    """ Registers of an IP-core on a UIO device.
+    The size and the physical address are read from sysfs, unless specified. """
+    def __init__(self, device=UIO_IPGEN, size=None, physical_address=None, index=0,
+                 sysfs=None):
+        if sysfs is None:
+            sysfs = UIO_SYSFS + os.path.basename(device) + '/maps/map%d/' % index
+        if size is None:
+            size = read_attribute(sysfs + 'size') if os.path.exists(sysfs) else IPGEN_SIZE
+        if physical_address is None:
+            physical_address = read_attribute(sysfs + 'addr') if os.path.exists(sysfs) else 0
+        MappedRegion.__init__(self, device, size, physical_address, index * mmap.PAGESIZE)
+        self.regs = self.array(0, size // 4, np.uint32)
+
+    def close(self):
+        self.regs = None
+        MappedRegion.close(self)
+
+    def read(self, offset):
+        return int(self.regs[offset // 4])
+
+    def write(self, offset, value):
+        self.regs[offset // 4] = value
+
+    def read_regs(self, offset, count):
+        """ copy of 'count' registers from the offset """
+        return self.regs[offset // 4:offset // 4 + count].copy()
+
+    def write_regs(self, offset, values):
+        """ writes the registers from the offset with a copy of the values """
+        values = np.asarray(values, dtype=np.uint32)
+        self.regs[offset // 4:offset // 4 + len(values)] = values
+
+    def wait_interrupt(self, timeout=None):
+        """ enables the interrupt of the UIO device and waits for it.
+        Returns the total number of the interrupts, or None at the timeout. """
+        os.write(self.fd, struct.pack('<I', 1))
+        if timeout is not None:
+            r, w, x = select.select([self.fd], [], [], timeout)
+            if not r:
+                return None
+        return struct.unpack('<I', os.read(self.fd, 4))[0]
+
+#-------------------------------------------------------------------------------
+class DmaBuffer(MappedRegion):
+    """ A physically contiguous region shared with IP-cores.
+    Buffers are allocated by the buddy allocator, as cma_malloc() and
+    umem_malloc(). The alignment is relative to the head of the region.
+    Without a device, the region is anonymous memory. """
+    def __init__(self, device=None, size=UMEM_SIZE, physical_address=0, sync=False):
+        MappedRegion.__init__(self, device, size, physical_address, 0, sync)
+        self.allocator = BuddyAllocator(size, PAGE_SIZE)
+
+    def alloc(self, shape, dtype=np.uint32, align=None):
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        try:
+            offset = self.allocator.alloc(nbytes, align)
+        except MemoryError:
+            raise MemoryError("No space of %d bytes in %s" % (nbytes, self.device))
+        return self.array(offset, shape, dtype)
+
+    def free(self, array):
+        """ releases the buffer; the array must not be used after that """
+        self.allocator.free(self.offset(array))
+
+class Umem(DmaBuffer):
+    """ DMA region on a UIO device, with the physical address of c_lib/umem.h """
+    def __init__(self, device=UIO_MEM, size=UMEM_SIZE, physical_address=UMEM_OFFSET):
+        DmaBuffer.__init__(self, device, size, physical_address)
+
+class Cma(DmaBuffer):
+    """ CMA region of udmabuf. The physical address and the size are read from
+    sysfs, and the sync mode is written to it, as cma_open() """
+    def __init__(self, device=DEV_CMA, sync_mode=CMA_SYNC_ON, sysfs=DEV_CMA_SYSFS):
+        sync_mode = min(sync_mode, CMA_SYNC_ON_DC)
+        physical_address = read_attribute(sysfs + 'phys_addr', 16)
+        size = read_attribute(sysfs + 'size', 10)
+        write_attribute(sysfs + 'sync_mode', sync_mode)
+        DmaBuffer.__init__(self, device, size, physical_address, sync_mode != CMA_SYNC_OFF)
+        self.sync_mode = sync_mode
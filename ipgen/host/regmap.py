@@ -0,0 +1,84 @@
+#-------------------------------------------------------------------------------
+# regmap.py
+#
+# Named registers of the slave interfaces of IP-cores
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import time
+import numpy as np
+
+# word of the registers for each DATA_WIDTH
+DTYPES = {8 : np.uint8, 16 : np.uint16, 32 : np.uint32, 64 : np.uint64}
+
+#-------------------------------------------------------------------------------
+def register(name):
+    """ property of a register, for the classes of the generated register maps """
+    return property(lambda self: self.read(name),
+                    lambda self, value: self.write(name, value))
+
+class RegisterMap(object):
+    """ Registers of a slave interface on a Uio (ipgen.host.device).
+    The generated module of an IP-core (sw/ipgen_<top>_regs.py) defines a
+    subclass for each slave interface. The registers are accessed by words of
+    DATA_WIDTH bits. """
+    NAME = None
+    ADDR_WIDTH = 0
+    DATA_WIDTH = 32
+    SIZE = 0
+    REGISTERS = ()
+
+    def __init__(self, uio, base=0):
+        if self.DATA_WIDTH not in DTYPES:
+            raise ValueError("DATA_WIDTH of %s must be 8, 16, 32 or 64: %d" %
+                             (self.NAME, self.DATA_WIDTH))
+        self.uio = uio
+        self.base = base
+        self.offsets = dict(self.REGISTERS)
+        self.wordsize = self.DATA_WIDTH // 8
+        self.regs = uio.array(0, uio.size // self.wordsize, DTYPES[self.DATA_WIDTH])
+
+    def offset(self, name):
+        if not isinstance(name, str):
+            return self.base + name
+        if name not in self.offsets:
+            raise ValueError("No register '%s' in %s" % (name, self.NAME))
+        return self.base + self.offsets[name]
+
+    def read(self, name):
+        return int(self.regs[self.offset(name) // self.wordsize])
+
+    def write(self, name, value):
+        self.regs[self.offset(name) // self.wordsize] = value
+
+    def read_burst(self, name, count):
+        """ 'count' words from the register in one call """
+        index = self.offset(name) // self.wordsize
+        return self.regs[index:index + count].copy()
+
+    def write_burst(self, name, values):
+        """ the words of the array from the register in one call """
+        values = np.asarray(values, dtype=self.regs.dtype)
+        index = self.offset(name) // self.wordsize
+        self.regs[index:index + len(values)] = values
+
+    def poll(self, name, mask, value, timeout=1.0, interval=1e-6, max_interval=1e-3):
+        """ waits until (register & mask) == value, with an exponential backoff of
+        the interval. Returns the register value, or raises IOError at the timeout. """
+        limit = time.time() + timeout
+        while True:
+            r = self.read(name)
+            if r & mask == value:
+                return r
+            if time.time() > limit:
+                raise IOError("Timeout of register '%s' of %s: 0x%x" % (name, self.NAME, r))
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+
+    def wait_interrupt(self, timeout=None):
+        """ waits for an interrupt of the UIO device, instead of polling """
+        return self.uio.wait_interrupt(timeout)
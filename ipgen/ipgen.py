@@ -9,14 +9,19 @@
 from __future__ import absolute_import
 from __future__ import print_function
 import os
+import re
 import sys
 import math
 import shutil
+import stat
 import copy
-from jinja2 import Environment, FileSystemLoader
+import hashlib
+import keyword
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 
 import ipgen.utils.componentgen
 from ipgen.rtl_converter.rtl_converter import RtlConverter
+from ipgen.rtl_converter.interfaces import MasterPort
 
 import pyverilog.vparser.ast as vast
 import pyverilog.utils.identifiervisitor as iv
@@ -29,14 +34,301 @@ TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__)) + '/template/'
 def log2(v):
     return int(math.ceil(math.log(v, 2)))
 
+DUMP_TYPES = ('none', 'vcd', 'fst')
+
+def dump_options(configs):
+    dump_type = configs.get('dump', 'none')
+    if dump_type is None: dump_type = 'none'
+    if dump_type not in DUMP_TYPES:
+        raise ValueError("Dump type '%s' is not supported." % dump_type)
+    scopes = [s.strip() for s in configs.get('dump_scope', 'uut').split(',') if s.strip()]
+    return { 'type' : dump_type,
+             'file' : configs.get('dump_file') or 'None',
+             'scopes' : scopes if scopes else ['uut'],
+             'depth' : configs.get('dump_depth', 0),
+             'start' : configs.get('dump_start', 0),
+             'cycles' : configs.get('dump_cycles', 0),
+             'trigger' : configs.get('dump_trigger') }
+
+# rates of the stream sources and sinks of the test bench, in percent of cycles
+def stream_options(configs):
+    options = {}
+    for key, default in (('stream_source_rate', 100), ('stream_sink_rate', 100),
+                         ('stream_packet_len', 16)):
+        options[key] = configs.get(key, default)
+    for key in ('stream_source_rate', 'stream_sink_rate'):
+        if options[key] < 1 or options[key] > 100:
+            raise ValueError("%s must be from 1 to 100." % key)
+    if options['stream_packet_len'] < 1:
+        raise ValueError("stream_packet_len must be 1 or more.")
+    return options
+
+REGISTER_SLICE_MODES = ('none', 'forward', 'reverse', 'full')
+REGISTER_SLICE_CHANNELS = ('aw', 'w', 'ar', 'r')
+
+# 'full' is applied to all of the channels, and 'aw:full,r:forward' to each.
+def register_slices(spec, name, channels=REGISTER_SLICE_CHANNELS):
+    modes = dict([ (ch, 0) for ch in channels ])
+    if not spec:
+        return modes
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        if ':' in item:
+            ch, mode = [ v.strip() for v in item.split(':', 1) ]
+            if ch not in channels:
+                raise ValueError("Register slice channel '%s' of '%s' is not supported." % (ch, name))
+            targets = (ch,)
+        else:
+            mode = item
+            targets = channels
+        if mode not in REGISTER_SLICE_MODES:
+            raise ValueError("Register slice '%s' of '%s' is not supported." % (mode, name))
+        for ch in targets:
+            modes[ch] = REGISTER_SLICE_MODES.index(mode)
+    return modes
+
+# C keywords, not usable as the fields of the struct of a register map
+C_KEYWORDS = ('auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do',
+              'double', 'else', 'enum', 'extern', 'float', 'for', 'goto', 'if', 'inline',
+              'int', 'long', 'register', 'restrict', 'return', 'short', 'signed', 'sizeof',
+              'static', 'struct', 'switch', 'typedef', 'union', 'unsigned', 'void',
+              'volatile', 'while')
+
+# '<slave> = name, name@offset, ...' in the [registers] section, where the slave is
+# the name of the interface or its suffix (NAME_ID). A register without an offset
+# is at the next word of the previous one.
+def register_maps(configs, slavelist):
+    specs = configs.get('registers') or {}
+    used = set()
+    for s in slavelist:
+        spec = None
+        for key, value in sorted(specs.items()):
+            if s.name.lower() == key.lower() or s.name.lower().endswith('_' + key.lower()):
+                spec = value
+                used.add(key)
+        wordsize = max(s.datawidth // 8, 1)
+        registers = []
+        names = set()
+        offset = 0
+        for item in (spec.split(',') if spec else ()):
+            item = item.strip()
+            if not item:
+                continue
+            if '@' in item:
+                name, value = [ v.strip() for v in item.split('@', 1) ]
+                offset = int(value, 0)
+            else:
+                name = item
+            if re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', name) is None:
+                raise ValueError("Register name '%s' of '%s' is invalid." % (name, s.name))
+            if (keyword.iskeyword(name.lower()) or name.lower() in C_KEYWORDS or
+                re.match(r'^reserved[0-9]+$', name.lower())):
+                raise ValueError("Register name '%s' of '%s' is reserved." % (name, s.name))
+            if name.lower() in names:
+                raise ValueError("Register '%s' of '%s' is defined twice." % (name, s.name))
+            if offset % wordsize != 0 or offset >= 2 ** s.addrwidth:
+                raise ValueError("Offset 0x%x of register '%s' of '%s' is out of the words." %
+                                 (offset, name, s.name))
+            names.add(name.lower())
+            registers.append((name.lower(), offset))
+            offset += wordsize
+        s.registers = registers
+        # the fields of the C struct: the registers alone at their offsets, and the
+        # unions of the others named by the names of their registers
+        fields = set()
+        for offset in sorted(set([o for n, o in registers])):
+            field = '_'.join([n for n, o in registers if o == offset])
+            if field in fields:
+                raise ValueError("Union '%s' of the registers of '%s' clashes with another field." %
+                                 (field, s.name))
+            fields.add(field)
+    for key in specs:
+        if key not in used:
+            raise ValueError("No slave interface for the registers of '%s'." % key)
+
+# Fields of the C struct of a register map: (names of the registers at an offset,
+# reserved words before them). None if the words are not of a C integer type.
+def register_fields(slave):
+    if slave.datawidth not in (8, 16, 32, 64) or not slave.registers:
+        return None
+    wordsize = slave.datawidth // 8
+    offsets = {}
+    for name, offset in slave.registers:
+        offsets.setdefault(offset, []).append(name)
+    fields = []
+    pos = 0
+    for offset in sorted(offsets):
+        fields.append((offsets[offset], (offset - pos) // wordsize))
+        pos = offset + wordsize
+    return fields
+
+# attributes of ipgen.host.regmap.RegisterMap, not overridden by the registers
+REGISTER_MAP_ATTRIBUTES = ('uio', 'base', 'offsets', 'wordsize', 'regs', 'offset', 'read', 'write',
+                           'read_burst', 'write_burst', 'poll', 'wait_interrupt')
+
+ARBITRATION_POLICIES = ('roundrobin', 'weighted', 'qos')
+
+# Non-lite masters are assigned to 'ext_ports' merged ports in turn, and each
+# merged port is driven by an arbiter. Otherwise, each master is its own port.
+def master_ports(configs, masterlist):
+    num_ports = configs.get('ext_ports', 0)
+    if num_ports < 0:
+        raise ValueError("ext_ports must be 0 or more.")
+    merged = sorted([m for m in masterlist if not m.lite], key=lambda x:x.name)
+    if num_ports == 0 or not merged:
+        for m in masterlist:
+            m.port = m
+        return list(masterlist)
+
+    if configs['if_type'] != 'axi':
+        raise ValueError("ext_ports is supported by AXI only.")
+    arbitration = configs.get('arbitration', 'roundrobin')
+    if arbitration not in ARBITRATION_POLICIES:
+        raise ValueError("Arbitration policy '%s' is not supported." % arbitration)
+
+    portlist = []
+    for m in masterlist:
+        if m.lite:
+            m.port = m
+            portlist.append(m)
+
+    num_ports = min(num_ports, len(merged))
+    for i in range(num_ports):
+        members = merged[i::num_ports]
+        name = 'ipgen_master_port_%d' % i
+        datawidth = members[0].ext_datawidth
+        for m in members:
+            if m.ext_datawidth != datawidth:
+                raise ValueError("Masters on '%s' must have the same EXT_DATA_WIDTH." % name)
+            if m.burstsplit:
+                raise ValueError("BURST_SPLIT of '%s' cannot be used with ext_ports." % m.name)
+            if m.regslice:
+                raise ValueError("REGISTER_SLICE of '%s' cannot be used with ext_ports." % m.name)
+        port = MasterPort(name, i, members[0].addrwidth, datawidth, members, arbitration)
+        port.ext_datawidth = datawidth
+        # response routing: the upper bits of the ID are the index of the master
+        port.indexwidth = max(log2(len(members)), 1)
+        port.memberidwidth = max([m.idwidth for m in members])
+        port.idwidth = port.indexwidth + port.memberidwidth
+        port.outoforder = True
+        # a cap of the port: the arbiter does not count the bursts of each master
+        port.outstanding = (0 if min([m.outstanding for m in members]) == 0 else
+                            sum([m.outstanding for m in members]))
+        port.burstlength = min([m.burstlength for m in members])
+        port.fifodepth = max([m.fifodepth for m in members])
+        port.thread_id_width = max(port.idwidth, configs.get('thread_id_width', 1))
+        for m in members:
+            m.port = port
+        portlist.append(port)
+
+    return portlist
+
+#-------------------------------------------------------------------------------
+# The environment is shared by the builders in a process, so that each template is
+# compiled once, and the compiled templates are kept in the bytecode cache
+# ($IPGEN_TEMPLATE_CACHE, or a directory for the user in the temporary directory
+# if it is unset or empty) across processes.
+_template_env = None
+
+def template_environment():
+    global _template_env
+    if _template_env is None:
+        env = Environment(loader=FileSystemLoader(TEMPLATE_DIR),
+                          bytecode_cache=FileSystemBytecodeCache(
+                              os.environ.get('IPGEN_TEMPLATE_CACHE') or None))
+        env.globals['int'] = int
+        env.globals['log'] = math.log
+        env.globals['log2'] = log2
+        env.globals['len'] = len
+        _template_env = env
+    return _template_env
+
+# same order as the sort filter of Jinja2, which ignores the case
+def sort_by_name(objs):
+    return sorted(objs, key=lambda x:x.name.lower())
+
+def sort_by_first(items):
+    return sorted(items, key=lambda x:x[0].lower() if isinstance(x[0], str) else x[0])
+
+def sort_ignore_case(items):
+    return sorted(items, key=lambda x:x.lower() if isinstance(x, str) else x)
+
+#-------------------------------------------------------------------------------
+# Static files in the template directory (interface HDLs, tcl and xdc) are read
+# once in a process, and the contents are shared by the builders.
+_static_files = {}
+
+def read_static(name):
+    code = _static_files.get(name)
+    if code is None:
+        with open(TEMPLATE_DIR+name, 'r') as f:
+            code = f.read()
+        _static_files[name] = code
+    return code
+
+# A file is copied in the kernel by copy_file_range, if available.
+# The destination is not hard-linked, since generated files may be edited by users.
+def copy_file(src, dst):
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remain = os.fstat(fsrc.fileno()).st_size
+                while remain > 0:
+                    size = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remain)
+                    if size == 0:
+                        break
+                    remain -= size
+            if remain == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+def copy_static(name, dst):
+    copy_file(TEMPLATE_DIR+name, dst)
+
+#-------------------------------------------------------------------------------
+# The common HDL is put in the shared store with the digest of the contents in
+# its name, so that the cores with the same interfaces refer to the same file.
+# The file is hard-linked into the core, or copied on a file system without links.
+# It is read-only, so that an edit in a core fails instead of changing the others.
+COMMON_HDL_PREFIX = 'ipgen_common_'
+COMMON_HDL_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+def share_common_hdl(store, common_code, path):
+    store = os.path.expanduser(store)
+    if not os.path.exists(store):
+        os.makedirs(store)
+    key = hashlib.sha1(common_code.encode('utf-8')).hexdigest()[:16]
+    common_hdlname = COMMON_HDL_PREFIX + key + '.v'
+    storename = os.path.join(store, common_hdlname)
+    if not os.path.exists(storename):
+        tmpname = '%s.%d.tmp' % (storename, os.getpid())
+        with open(tmpname, 'w') as f:
+            f.write(common_code)
+        os.chmod(tmpname, COMMON_HDL_MODE)
+        os.rename(tmpname, storename)
+
+    for name in os.listdir(path):
+        if name.startswith(COMMON_HDL_PREFIX) and name != common_hdlname:
+            os.remove(path+name)
+    if os.path.exists(path+common_hdlname):
+        if os.path.samefile(storename, path+common_hdlname):
+            return common_hdlname
+        os.remove(path+common_hdlname)
+    try:
+        os.link(storename, path+common_hdlname)
+    except OSError:
+        copy_file(storename, path+common_hdlname)
+        os.chmod(path+common_hdlname, COMMON_HDL_MODE)
+    return common_hdlname
+
 #-------------------------------------------------------------------------------
 class SystemBuilder(object):
     def __init__(self):
-        self.env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-        self.env.globals['int'] = int
-        self.env.globals['log'] = math.log
-        self.env.globals['log2'] = log2
-        self.env.globals['len'] = len
+        self.env = template_environment()
         
     #---------------------------------------------------------------------------
     def render(self, template_file, userlogic_name,
@@ -51,18 +343,27 @@ class SystemBuilder(object):
                tcl_parameters=None, tcl_ports=None,
                clock_hperiod_userlogic=None,
                clock_hperiod_bus=None,
-               ignore_protocol_error=False):
+               ignore_protocol_error=False,
+               tracefile=None, dump=None, mem_outstanding=1, fifo_depth=16,
+               cdc_depth=16,
+               portlist=None, masterstreamlist=None, slavestreamlist=None,
+               stream=None, interruptlist=None):
 
+        # the lists are sorted here instead of in the templates
         ext_burstlen_width = log2(ext_burstlength)
         template_dict = {
             'userlogic_name' : userlogic_name,
 
-            'masterlist' : masterlist,
-            'slavelist' : slavelist,
+            'masterlist' : sort_by_name(masterlist),
+            'slavelist' : sort_by_name(slavelist),
+            'portlist' : sort_by_name(masterlist if portlist is None else portlist),
+            'masterstreamlist' : () if masterstreamlist is None else masterstreamlist,
+            'slavestreamlist' : () if slavestreamlist is None else slavestreamlist,
+            'interruptlist' : () if interruptlist is None else sort_by_name(interruptlist),
 
             'def_top_parameters' : def_top_parameters,
             'def_top_localparams' : def_top_localparams,
-            'def_top_ioports' : def_top_ioports,
+            'def_top_ioports' : sort_ignore_case(def_top_ioports),
             'name_top_ioports' : name_top_ioports,
 
             'ext_addrwidth' : ext_addrwidth,
@@ -78,16 +379,23 @@ class SystemBuilder(object):
             'usertestcode' : '' if usertestcode is None else usertestcode,
             'simaddrwidth' : simaddrwidth,
             
-            'mpd_parameters' : () if mpd_parameters is None else mpd_parameters,
-            'mpd_ports' : () if mpd_ports is None else mpd_ports,
-            'tcl_parameters' : () if tcl_parameters is None else tcl_parameters,
-            'tcl_ports' : () if tcl_ports is None else tcl_ports,
+            'mpd_parameters' : () if mpd_parameters is None else sort_by_first(mpd_parameters),
+            'mpd_ports' : () if mpd_ports is None else sort_by_first(mpd_ports),
+            'tcl_parameters' : () if tcl_parameters is None else sort_by_first(tcl_parameters),
+            'tcl_ports' : () if tcl_ports is None else sort_by_first(tcl_ports),
 
             'clock_hperiod_userlogic' : clock_hperiod_userlogic,
             'clock_hperiod_bus' : clock_hperiod_bus,
             'single_clock' : single_clock,
 
             'ignore_protocol_error' : ignore_protocol_error,
+            'tracefile' : tracefile if tracefile is not None else 'None',
+            'dump' : dump if dump is not None else dump_options({}),
+            'mem_outstanding' : mem_outstanding,
+            'fifo_depth' : fifo_depth,
+            'fifo_addrwidth' : log2(fifo_depth),
+            'cdc_depth' : cdc_depth,
+            'stream' : stream if stream is not None else stream_options({}),
             }
         
         template = self.env.get_template(template_file)
@@ -99,11 +407,23 @@ class SystemBuilder(object):
               include=None, define=None, memimg=None, usertest=None,
               skip_not_found=False, ignore_protocol_error=False):
 
-        # default values
-        ext_burstlength = 256
+        ext_burstlength = configs.get('ext_burstlength', 256)
+        if ext_burstlength < 1 or ext_burstlength > 256:
+            raise ValueError("ext_burstlength must be from 1 to 256.")
+        fifo_depth = configs.get('fifo_depth', 16)
+        if fifo_depth < 2 or (fifo_depth & (fifo_depth - 1)) != 0:
+            raise ValueError("fifo_depth must be a power of 2 (2 or more).")
+        cdc_depth = configs.get('cdc_depth', 16)
+        if cdc_depth < 4 or (cdc_depth & (cdc_depth - 1)) != 0:
+            raise ValueError("cdc_depth must be a power of 2 (4 or more).")
+        ext_datawidth = configs.get('ext_datawidth', 0)
+        if ext_datawidth != 0 and (ext_datawidth < 8 or (ext_datawidth & (ext_datawidth - 1)) != 0):
+            raise ValueError("ext_datawidth must be 0 or a power of 2 (8 or more).")
         
         if configs['single_clock'] and (configs['hperiod_ulogic'] != configs['hperiod_bus']):
             raise ValueError("All clock periods should be same in single clock mode.")
+        if configs['hperiod_ulogic'] != configs['hperiod_bus'] and configs['if_type'] != 'axi':
+            raise ValueError("Different clock periods of User-logic and Bus are supported by AXI only.")
 
         # User RTL Conversion
         converter = RtlConverter(userlogic_filelist, userlogic_topmodule,
@@ -111,6 +431,59 @@ class SystemBuilder(object):
         userlogic_ast = converter.generate(skip_not_found)
         
         (masterlist, slavelist) = converter.getResourceDefinitions()
+        (masterstreamlist, slavestreamlist) = converter.getStreamDefinitions()
+        interruptlist = converter.getInterruptDefinitions()
+
+        # transaction IDs, outstanding requests, bursts and data widths of master interfaces
+        for m in masterlist:
+            if m.lite:
+                m.thread_id_width = 1
+                m.burstlength = 1
+                m.burstsplit = False
+                m.fifodepth = fifo_depth
+                m.ext_datawidth = m.datawidth
+                continue
+            if m.outoforder and configs['if_type'] != 'axi':
+                raise ValueError("OUT_OF_ORDER of '%s' is supported by AXI only." % m.name)
+            if m.outstanding == 0:
+                m.outstanding = configs.get('outstanding', 0)
+            if m.dma and m.burstlength == 0:
+                m.burstlength = 16
+            if m.burstlength == 0:
+                m.burstlength = ext_burstlength
+            if m.fifodepth == 0:
+                m.fifodepth = fifo_depth
+            if not m.burstsplit:
+                m.burstsplit = configs.get('burst_split', False)
+            if m.burstsplit and configs['if_type'] != 'axi':
+                raise ValueError("BURST_SPLIT of '%s' is supported by AXI only." % m.name)
+            if m.burstsplit and m.outoforder:
+                raise ValueError("BURST_SPLIT of '%s' cannot be used with OUT_OF_ORDER." % m.name)
+            if m.ext_datawidth == 0:
+                m.ext_datawidth = ext_datawidth if ext_datawidth != 0 else m.datawidth
+            if m.ext_datawidth > m.datawidth and configs['if_type'] != 'axi':
+                raise ValueError("EXT_DATA_WIDTH of '%s' wider than DATA_WIDTH is supported by AXI only." % m.name)
+            if m.ext_datawidth > m.datawidth and m.outoforder:
+                raise ValueError("EXT_DATA_WIDTH of '%s' wider than DATA_WIDTH cannot be used with OUT_OF_ORDER." % m.name)
+            if m.cache and m.cache[0] > m.burstlength and not m.burstsplit:
+                raise ValueError("LINE_SIZE of '%s' must be ext_burstlength or less." % m.name)
+            if m.wcombine and m.wcombine[0] > m.burstlength and not m.burstsplit:
+                raise ValueError("WC_SIZE of '%s' must be ext_burstlength or less." % m.name)
+            m.thread_id_width = max(m.idwidth if m.outoforder else 1,
+                                    configs.get('thread_id_width', 1))
+
+        portlist = master_ports(configs, masterlist)
+
+        # register slices on the user side of each bus interface
+        for m in list(portlist) + list(slavelist):
+            spec = m.regslice if m.regslice else configs.get('register_slice', 'none')
+            m.regslice = register_slices(spec, m.name)
+        for s in list(masterstreamlist) + list(slavestreamlist):
+            spec = s.regslice if s.regslice else configs.get('register_slice', 'none')
+            s.regslice = register_slices(spec, s.name, ('t',))['t']
+
+        register_maps(configs, slavelist)
+
         top_parameters = converter.getTopParameters()
         top_ioports = converter.getTopIOPorts()
 
@@ -158,7 +531,12 @@ class SystemBuilder(object):
                                 def_top_ioports, name_top_ioports, 
                                 ext_addrwidth=configs['ext_addrwidth'],
                                 ext_burstlength=ext_burstlength,
-                                single_clock=configs['single_clock'])
+                                single_clock=configs['single_clock'],
+                                cdc_depth=cdc_depth,
+                                portlist=portlist,
+                                masterstreamlist=masterstreamlist,
+                                slavestreamlist=slavestreamlist,
+                                interruptlist=interruptlist)
         
         # finalize of code generation
         synthesized_code_list = []
@@ -168,16 +546,34 @@ class SystemBuilder(object):
         common_code_list = []
         
         if configs['if_type'] == 'axi':
-            common_code_list.append( open(TEMPLATE_DIR+'axi_master_interface.v', 'r').read() )
-            common_code_list.append( open(TEMPLATE_DIR+'axi_lite_master_interface.v', 'r').read() )
-            common_code_list.append( open(TEMPLATE_DIR+'axi_slave_interface.v', 'r').read() )
-            common_code_list.append( open(TEMPLATE_DIR+'axi_lite_slave_interface.v', 'r').read() )
+            common_code_list.append( read_static('axi_master_interface.v') )
+            common_code_list.append( read_static('axi_lite_master_interface.v') )
+            common_code_list.append( read_static('axi_slave_interface.v') )
+            common_code_list.append( read_static('axi_lite_slave_interface.v') )
+            common_code_list.append( read_static('master_width_converter.v') )
+            common_code_list.append( read_static('master_arbiter.v') )
+            common_code_list.append( read_static('register_slice.v') )
+            common_code_list.append( read_static('stream_interface.v') )
+            if not configs['single_clock']:
+                common_code_list.append( read_static('clock_crossing.v') )
 
         if configs['if_type'] == 'avalon':
-            common_code_list.append( open(TEMPLATE_DIR+'avalon_master_interface.v', 'r').read() )
-            common_code_list.append( open(TEMPLATE_DIR+'avalon_lite_master_interface.v', 'r').read() )
-            common_code_list.append( open(TEMPLATE_DIR+'avalon_slave_interface.v', 'r').read() )
-            common_code_list.append( open(TEMPLATE_DIR+'avalon_lite_slave_interface.v', 'r').read() )
+            common_code_list.append( read_static('avalon_master_interface.v') )
+            common_code_list.append( read_static('avalon_lite_master_interface.v') )
+            common_code_list.append( read_static('avalon_slave_interface.v') )
+            common_code_list.append( read_static('avalon_lite_slave_interface.v') )
+            common_code_list.append( read_static('master_width_converter.v') )
+            common_code_list.append( read_static('register_slice.v') )
+            common_code_list.append( read_static('stream_interface.v') )
+
+        if [m for m in masterlist if m.dma]:
+            common_code_list.append( read_static('master_dma.v') )
+        if [m for m in masterlist if m.dma] and configs['if_type'] == 'avalon':
+            common_code_list.append( read_static('avalon_master_serializer.v') )
+        if [m for m in masterlist if m.cache]:
+            common_code_list.append( read_static('master_cache.v') )
+        if [m for m in masterlist if m.wcombine]:
+            common_code_list.append( read_static('master_wcombine.v') )
 
         synthesized_code = ''.join(synthesized_code_list)
         common_code = ''.join(common_code_list)
@@ -195,20 +591,35 @@ class SystemBuilder(object):
 
         if configs['if_type'] == 'axi':
             self.build_package_axi(configs, synthesized_code, common_code,
-                                   masterlist, slavelist,
+                                   portlist, slavelist,
                                    top_parameters, top_ioports, userlogic_topmodule,
-                                   memimg, usertest, ignore_protocol_error)
+                                   memimg, usertest, ignore_protocol_error,
+                                   masterstreamlist, slavestreamlist, interruptlist)
             return
             
         if configs['if_type'] == 'avalon':
             self.build_package_avalon(configs, synthesized_code, common_code,
                                       masterlist, slavelist,
                                       top_parameters, top_ioports, userlogic_topmodule,
-                                      memimg, usertest, ignore_protocol_error)
+                                      memimg, usertest, ignore_protocol_error,
+                                      masterstreamlist, slavestreamlist, interruptlist)
             return
 
         raise ValueError("Interface type '%s' is not supported." % configs['if_type'])
                 
+    #---------------------------------------------------------------------------
+    def build_register_maps(self, userlogic_topmodule, slavelist, swpath):
+        regmaps = [ (s, register_fields(s)) for s in sort_by_name(slavelist) ]
+        for ext, template_file in (('.h', 'regs_h.txt'), ('.py', 'regs_py.txt')):
+            regsname = 'ipgen_' + userlogic_topmodule + '_regs' + ext
+            template = self.env.get_template(template_file)
+            code = template.render({ 'userlogic_name' : userlogic_topmodule,
+                                     'regsname' : regsname,
+                                     'regmaps' : regmaps,
+                                     'reserved' : REGISTER_MAP_ATTRIBUTES })
+            with open(swpath+regsname, 'w') as f:
+                f.write(code)
+
     #---------------------------------------------------------------------------
     def build_package_general(self, configs, synthesized_code, common_code):
         code = synthesized_code + common_code
@@ -220,11 +631,9 @@ class SystemBuilder(object):
     def build_package_axi(self, configs, synthesized_code, common_code,
                           masterlist, slavelist,
                           top_parameters, top_ioports, userlogic_topmodule,
-                          memimg, usertest, ignore_protocol_error):
-        code = synthesized_code + common_code
-
-        # default values
-        ext_burstlength = 256
+                          memimg, usertest, ignore_protocol_error,
+                          masterstreamlist=(), slavestreamlist=(), interruptlist=()):
+        ext_burstlength = configs.get('ext_burstlength', 256)
 
         # write to files, with AXI interface
         def_top_parameters = []
@@ -308,6 +717,7 @@ class SystemBuilder(object):
         # source
         hdlname = 'ipgen_' + userlogic_topmodule + '.v'
         testname = 'test_ipgen_' + userlogic_topmodule + '.v'
+        verilatorname = 'sim_main.cpp'
         memname = 'mem.img'
         makefilename = 'Makefile'
         copied_memimg = memname if memimg is not None else None
@@ -329,6 +739,7 @@ class SystemBuilder(object):
         hdlpath = dirname + 'hdl/'
         verilogpath = dirname + 'hdl/verilog/'
         testpath = dirname + 'test/'
+        swpath = dirname + 'sw/'
         makefilepath = dirname + 'test/'
 
         if not os.path.exists(dirname):
@@ -347,6 +758,16 @@ class SystemBuilder(object):
             os.mkdir(dirname + '/' + 'hdl/verilog')
         if not os.path.exists(dirname + '/' + 'test'):
             os.mkdir(dirname + '/' + 'test')
+        if slavelist and not os.path.exists(dirname + '/' + 'sw'):
+            os.mkdir(dirname + '/' + 'sw')
+
+        # common hdl in the shared store, or in the hdl file
+        common_hdlname = None
+        code = synthesized_code + common_code
+        if configs.get('common_hdl_store'):
+            common_hdlname = share_common_hdl(configs['common_hdl_store'], common_code,
+                                              verilogpath)
+            code = synthesized_code
 
         # mpd file
         mpd_template_file = 'mpd.txt'
@@ -357,7 +778,8 @@ class SystemBuilder(object):
                                single_clock=configs['single_clock'],
                                hdlname=hdlname,
                                ipcore_version=ipcore_version, 
-                               mpd_ports=mpd_ports, mpd_parameters=mpd_parameters)
+                               mpd_ports=mpd_ports, mpd_parameters=mpd_parameters,
+                               interruptlist=interruptlist)
         f = open(mpdpath+mpdname, 'w')
         f.write(mpd_code)
         f.close()
@@ -383,7 +805,7 @@ class SystemBuilder(object):
                                def_top_parameters, def_top_localparams, def_top_ioports, name_top_ioports,
                                ext_addrwidth=configs['ext_addrwidth'], ext_burstlength=ext_burstlength,
                                single_clock=configs['single_clock'],
-                               hdlname=hdlname,
+                               hdlname=hdlname, common_hdlname=common_hdlname,
                                ipcore_version=ipcore_version, 
                                mpd_ports=mpd_ports, mpd_parameters=mpd_parameters)
         f = open(paopath+paoname, 'w')
@@ -391,47 +813,51 @@ class SystemBuilder(object):
         f.close()
 
         # tcl file
-        tcl_code = ''
         if not configs['single_clock']:
-            tcl_code = open(TEMPLATE_DIR+'pcore_tcl.tcl', 'r').read()
-        f = open(tclpath+tclname, 'w')
-        f.write(tcl_code)
-        f.close()
+            copy_static('pcore_tcl.tcl', tclpath+tclname)
+        else:
+            open(tclpath+tclname, 'w').close()
 
         memorylist = []
         for m in masterlist:
             memorylist.append(
-                ipgen.utils.componentgen.AxiDefinition(m.name + '_AXI', m.datawidth, True, m.lite))
+                ipgen.utils.componentgen.AxiDefinition(m.name + '_AXI', m.ext_datawidth, True, m.lite,
+                                                       m.thread_id_width, m.burstlength,
+                                                       m.outstanding))
         for s in slavelist:
             memorylist.append(
                 ipgen.utils.componentgen.AxiDefinition(s.name + '_AXI', s.datawidth, False, s.lite))
+        streamlist = []
+        for s in masterstreamlist:
+            streamlist.append(
+                ipgen.utils.componentgen.AxiStreamDefinition(s.name + '_AXIS', s.datawidth, True))
+        for s in slavestreamlist:
+            streamlist.append(
+                ipgen.utils.componentgen.AxiStreamDefinition(s.name + '_AXIS', s.datawidth, False))
+        irqlist = [ ipgen.utils.componentgen.InterruptDefinition(i.name + '_IRQ')
+                    for i in sort_by_name(interruptlist) ]
         
         # component.xml
         gen = ipgen.utils.componentgen.ComponentGen()
-        xml_code = gen.generate('ipgen_' + userlogic_topmodule,
-                                memorylist, 
-                                ext_addrwidth=configs['ext_addrwidth'],
-                                ext_burstlength=ext_burstlength,
-                                ext_ports=ext_ports,
-                                ext_params=ext_params)
-        f = open(xmlpath+xmlname, 'w')
-        f.write(xml_code)
-        f.close()
+        gen.update(xmlpath+xmlname, 'ipgen_' + userlogic_topmodule,
+                   memorylist, 
+                   ext_addrwidth=configs['ext_addrwidth'],
+                   ext_burstlength=ext_burstlength,
+                   ext_ports=ext_ports,
+                   ext_params=ext_params,
+                   streamlist=streamlist,
+                   interruptlist=irqlist,
+                   timestamp=configs.get('ipxact_timestamp', False),
+                   filelist=(common_hdlname,) if common_hdlname else ())
 
         # xdc
-        xdc_code = ''
         if not configs['single_clock']:
-            xdc_code = open(TEMPLATE_DIR+'ipxact.xdc', 'r').read()
-        f = open(xdcpath+xdcname, 'w')
-        f.write(xdc_code)
-        f.close()
+            copy_static('ipxact.xdc', xdcpath+xdcname)
+        else:
+            open(xdcpath+xdcname, 'w').close()
 
         # bd
-        bd_code = ''
-        bd_code = open(TEMPLATE_DIR+'bd.tcl', 'r').read()
-        f = open(bdpath+bdname, 'w')
-        f.write(bd_code)
-        f.close()
+        copy_static('bd.tcl', bdpath+bdname)
         
         # xgui file
         xgui_template_file = 'xgui_tcl.txt'
@@ -456,7 +882,8 @@ class SystemBuilder(object):
         # user test code
         usertestcode = None 
         if usertest is not None:
-            usertestcode = open(usertest, 'r').read()
+            with open(usertest, 'r') as f:
+                usertestcode = f.read()
 
         # test file
         test_template_file = 'test_ipgen_axi.txt'
@@ -465,21 +892,36 @@ class SystemBuilder(object):
                                 def_top_parameters, def_top_localparams, def_top_ioports, name_top_ioports,
                                 ext_addrwidth=configs['ext_addrwidth'], ext_burstlength=ext_burstlength,
                                 single_clock=configs['single_clock'],
-                                hdlname=hdlname,
+                                hdlname=hdlname, common_hdlname=common_hdlname,
                                 memimg=copied_memimg, binfile=binfile, 
                                 usertestcode=usertestcode,
                                 simaddrwidth=configs['sim_addrwidth'], 
                                 clock_hperiod_userlogic=configs['hperiod_ulogic'],
                                 clock_hperiod_bus=configs['hperiod_bus'],
-                                ignore_protocol_error=ignore_protocol_error)
+                                ignore_protocol_error=ignore_protocol_error,
+                                tracefile=configs['trace_file'],
+                                dump=dump_options(configs),
+                                mem_outstanding=configs.get('mem_outstanding', 1),
+                                fifo_depth=configs.get('fifo_depth', 16),
+                                masterstreamlist=masterstreamlist,
+                                slavestreamlist=slavestreamlist,
+                                interruptlist=interruptlist,
+                                stream=stream_options(configs))
         f = open(testpath+testname, 'w')
         f.write(test_code)
-        f.write( open(TEMPLATE_DIR+'axi_master_fifo.v', 'r').read() )
+        f.write( read_static('axi_master_fifo.v') )
         f.close()
 
+        # C++ harness for Verilator
+        copy_static('verilator_main.cpp', testpath+verilatorname)
+
         # memory image for test
         if memimg is not None:
-            shutil.copyfile(os.path.expanduser(memimg), testpath+memname)
+            copy_file(os.path.expanduser(memimg), testpath+memname)
+
+        # register maps for software
+        if slavelist:
+            self.build_register_maps(userlogic_topmodule, slavelist, swpath)
 
         # makefile file
         makefile_template_file = 'Makefile.txt'
@@ -488,7 +930,8 @@ class SystemBuilder(object):
                                     def_top_parameters, def_top_localparams, def_top_ioports, name_top_ioports,
                                     ext_addrwidth=configs['ext_addrwidth'], ext_burstlength=ext_burstlength,
                                     single_clock=configs['single_clock'],
-                                    testname=testname)
+                                    testname=testname,
+                                    dump=dump_options(configs))
         f = open(makefilepath+makefilename, 'w')
         f.write(makefile_code)
         f.close()
@@ -497,10 +940,10 @@ class SystemBuilder(object):
     def build_package_avalon(self, configs, synthesized_code, common_code, 
                              masterlist, slavelist,
                              top_parameters, top_ioports, userlogic_topmodule, 
-                             memimg, usertest, ignore_protocol_error):
+                             memimg, usertest, ignore_protocol_error,
+                             masterstreamlist=(), slavestreamlist=(), interruptlist=()):
 
-        # default values
-        ext_burstlength = 256
+        ext_burstlength = configs.get('ext_burstlength', 256)
 
         # write to files, with AXI interface
         def_top_parameters = [] 
@@ -543,6 +986,7 @@ class SystemBuilder(object):
         hdlname = 'ipgen_' + userlogic_topmodule + '.v'
         common_hdlname = 'ipgen_common.v'
         testname = 'test_ipgen_' + userlogic_topmodule + '.v'
+        verilatorname = 'sim_main.cpp'
         memname = 'mem.img'
         makefilename = 'Makefile'
         copied_memimg = memname if memimg is not None else None
@@ -551,6 +995,7 @@ class SystemBuilder(object):
         verilogpath = dirname + 'hdl/verilog/'
         tclpath = dirname + 'hdl/verilog/'
         testpath = dirname + 'test/'
+        swpath = dirname + 'sw/'
         makefilepath = dirname + 'test/'
 
         if not os.path.exists(dirname):
@@ -561,6 +1006,13 @@ class SystemBuilder(object):
             os.mkdir(dirname + '/' + 'hdl/verilog')
         if not os.path.exists(dirname + '/' + 'test'):
             os.mkdir(dirname + '/' + 'test')
+        if slavelist and not os.path.exists(dirname + '/' + 'sw'):
+            os.mkdir(dirname + '/' + 'sw')
+
+        # common hdl in the shared store
+        if configs.get('common_hdl_store'):
+            common_hdlname = share_common_hdl(configs['common_hdl_store'], common_code,
+                                              verilogpath)
 
         # tcl file
         tcl_template_file = 'qsys_tcl.txt'
@@ -570,7 +1022,10 @@ class SystemBuilder(object):
                                ext_addrwidth=configs['ext_addrwidth'], ext_burstlength=ext_burstlength,
                                single_clock=configs['single_clock'],
                                hdlname=hdlname, common_hdlname=common_hdlname,
-                               tcl_ports=tcl_ports, tcl_parameters=tcl_parameters)
+                               tcl_ports=tcl_ports, tcl_parameters=tcl_parameters,
+                               masterstreamlist=masterstreamlist,
+                               slavestreamlist=slavestreamlist,
+                               interruptlist=interruptlist)
         f = open(tclpath+tclname, 'w')
         f.write(tcl_code)
         f.close()
@@ -581,14 +1036,16 @@ class SystemBuilder(object):
         f.close()
 
         # common hdl file
-        f = open(verilogpath+common_hdlname, 'w')
-        f.write(common_code)
-        f.close()
+        if not configs.get('common_hdl_store'):
+            f = open(verilogpath+common_hdlname, 'w')
+            f.write(common_code)
+            f.close()
 
         # user test code
         usertestcode = None 
         if usertest is not None:
-            usertestcode = open(usertest, 'r').read()
+            with open(usertest, 'r') as f:
+                usertestcode = f.read()
 
         # test file
         test_template_file = 'test_ipgen_avalon.txt'
@@ -603,15 +1060,29 @@ class SystemBuilder(object):
                                 simaddrwidth=configs['sim_addrwidth'], 
                                 clock_hperiod_userlogic=configs['hperiod_ulogic'],
                                 clock_hperiod_bus=configs['hperiod_bus'],
-                                ignore_protocol_error=ignore_protocol_error)
+                                ignore_protocol_error=ignore_protocol_error,
+                                tracefile=configs['trace_file'],
+                                dump=dump_options(configs),
+                                fifo_depth=configs.get('fifo_depth', 16),
+                                masterstreamlist=masterstreamlist,
+                                slavestreamlist=slavestreamlist,
+                                interruptlist=interruptlist,
+                                stream=stream_options(configs))
         f = open(testpath+testname, 'w')
         f.write(test_code)
-        f.write( open(TEMPLATE_DIR+'avalon_master_fifo.v', 'r').read() )
+        f.write( read_static('avalon_master_fifo.v') )
         f.close()
 
+        # C++ harness for Verilator
+        copy_static('verilator_main.cpp', testpath+verilatorname)
+
         # memory image for test
         if memimg is not None:
-            shutil.copy(memimg, testpath+memname)
+            copy_file(memimg, testpath+memname)
+
+        # register maps for software
+        if slavelist:
+            self.build_register_maps(userlogic_topmodule, slavelist, swpath)
 
         # makefile file
         makefile_template_file = 'Makefile.txt'
@@ -620,7 +1091,8 @@ class SystemBuilder(object):
                                     def_top_parameters, def_top_localparams, def_top_ioports, name_top_ioports,
                                     ext_addrwidth=configs['ext_addrwidth'], ext_burstlength=ext_burstlength,
                                     single_clock=configs['single_clock'],
-                                    testname=testname)
+                                    testname=testname,
+                                    dump=dump_options(configs))
         f = open(makefilepath+makefilename, 'w')
         f.write(makefile_code)
         f.close()
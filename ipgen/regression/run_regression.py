@@ -0,0 +1,84 @@
+#-------------------------------------------------------------------------------
+# run_regression.py
+#
+# Parallel regression runner for IPgen sample projects
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import os
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import ipgen.utils.version
+from ipgen.regression.runner import (RegressionRunner, SIMULATORS, PASS,
+                                     discover, summarize, write_json, write_junit)
+
+#-------------------------------------------------------------------------------
+def main():
+    INFO = "Parallel regression runner for IPgen"
+    VERSION = ipgen.utils.version.VERSION
+    USAGE = "Usage: python run_regression.py [options] [directory]+"
+
+    def showVersion():
+        print(INFO)
+        print(VERSION)
+        print(USAGE)
+        sys.exit()
+
+    optparser = OptionParser()
+    optparser.add_option("-v","--version",action="store_true",dest="showversion",
+                         default=False,help="Show the version")
+    optparser.add_option("-j","--jobs",dest="jobs",type="int",
+                         default=None,help="Number of parallel workers, Default=number of CPUs")
+    optparser.add_option("--timeout",dest="timeout",type="int",
+                         default=600,help="Timeout of each test in seconds, Default=600")
+    optparser.add_option("--sim",dest="simulator",
+                         default="iverilog",help="%s, Default=iverilog" % ', '.join(sorted(SIMULATORS.keys())))
+    optparser.add_option("--rootdir",dest="rootdir",
+                         default=None,help="IPgen root directory, Default=ROOTDIR of each project")
+    optparser.add_option("--json",dest="json",
+                         default=None,help="JSON report file")
+    optparser.add_option("--junit",dest="junit",
+                         default=None,help="JUnit XML report file")
+    optparser.add_option("-m","--make_option",action="append",dest="make_options",
+                         default=[],help="Variable passed to make (e.g. VERILATOR=verilator)")
+    optparser.add_option("--keep",action="store_true",dest="keep",
+                         default=False,help="Keep the temporary directories")
+    (options, args) = optparser.parse_args()
+
+    if options.showversion:
+        showVersion()
+
+    projects = discover(args if args else ['.'])
+    if not projects:
+        raise IOError("No test project found")
+
+    def report(result):
+        print("%-8s %-24s build:%8.2fs sim:%8.2fs %s" %
+              (result.status.upper(), result.name, result.build_time,
+               result.sim_time, result.message))
+        sys.stdout.flush()
+
+    runner = RegressionRunner(options.simulator, options.jobs, options.timeout,
+                              options.rootdir, keep=options.keep,
+                              make_options=options.make_options)
+    results = runner.run(projects, callback=report)
+
+    if options.json is not None:
+        write_json(results, options.json, options.simulator)
+    if options.junit is not None:
+        write_junit(results, options.junit)
+
+    summary = summarize(results)
+    print("----------------------------------------")
+    print("%d tests: %s" % (len(results),
+                            ', '.join(['%d %s' % (v, k) for k, v in sorted(summary.items())])))
+    sys.exit(0 if summary[PASS] == len(results) else 1)
+
+if __name__ == '__main__':
+    main()
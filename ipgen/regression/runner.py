@@ -0,0 +1,232 @@
+#-------------------------------------------------------------------------------
+# runner.py
+#
+# Parallel regression runner for IPgen sample projects
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import signal
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import xml.etree.ElementTree as ET
+
+SIMULATORS = {
+    'iverilog' : 'sim',
+    'vcs' : 'vcs_sim',
+    'verilator' : 'verilator_sim',
+}
+
+PASS = 'pass'
+FAIL = 'fail'
+TIMEOUT = 'timeout'
+
+ERROR_PATTERN = re.compile(r'^\s*(%?Error|ERROR)|simulation time out')
+COUNTER_PATTERN = re.compile(r'^\s*\[([^\]]+)\]\s*([^:]+?)\s*:\s*(-?\d+)\s*$')
+
+#-------------------------------------------------------------------------------
+def is_project(path):
+    makefile = os.path.join(path, 'Makefile')
+    if not os.path.isfile(makefile):
+        return False
+    return get_make_variable(makefile, 'TOPMODULE') is not None
+
+def get_make_variable(makefile, name):
+    pattern = re.compile(r'^\s*%s\s*:?=\s*(.*?)\s*$' % name)
+    for line in open(makefile, 'r'):
+        m = pattern.match(line)
+        if m: return m.group(1)
+    return None
+
+def discover(paths):
+    """ sample projects (a directory with a Makefile defining TOPMODULE) """
+    projects = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if is_project(path):
+            projects.append(path)
+            continue
+        if not os.path.isdir(path):
+            raise IOError("No such directory: %s" % path)
+        for d in sorted(os.listdir(path)):
+            sub = os.path.join(path, d)
+            if os.path.isdir(sub) and is_project(sub):
+                projects.append(sub)
+    return projects
+
+def get_counters(log):
+    """ '[tag] name: value' lines of a simulation log """
+    counters = {}
+    for line in log.splitlines():
+        m = COUNTER_PATTERN.match(line)
+        if m is None or m.group(1) == 'IPgen':
+            continue
+        key = m.group(1) + '.' + m.group(2)
+        counters.setdefault(key, []).append(int(m.group(3)))
+    return counters
+
+def get_errors(log):
+    return [line.strip() for line in log.splitlines() if ERROR_PATTERN.search(line)]
+
+#-------------------------------------------------------------------------------
+class TestResult(object):
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.status = FAIL
+        self.message = ''
+        self.build_time = 0.0
+        self.sim_time = 0.0
+        self.log = ''
+        self.counters = {}
+
+    def getTime(self):
+        return self.build_time + self.sim_time
+
+    def toDict(self):
+        return { 'name' : self.name, 'path' : self.path, 'status' : self.status,
+                 'message' : self.message, 'build_time' : self.build_time,
+                 'sim_time' : self.sim_time, 'counters' : self.counters }
+
+class RegressionRunner(object):
+    def __init__(self, simulator='iverilog', jobs=None, timeout=600,
+                 rootdir=None, python=None, keep=False, make='make', make_options=None):
+        if simulator not in SIMULATORS:
+            raise ValueError("Simulator '%s' is not supported." % simulator)
+        self.simulator = simulator
+        self.jobs = multiprocessing.cpu_count() if jobs is None else jobs
+        self.timeout = timeout
+        self.rootdir = rootdir
+        self.python = sys.executable if python is None else python
+        self.keep = keep
+        self.make = make
+        self.make_options = [] if make_options is None else list(make_options)
+
+    def getRootDir(self, project):
+        if self.rootdir is not None:
+            return os.path.abspath(self.rootdir)
+        rootdir = get_make_variable(os.path.join(project, 'Makefile'), 'ROOTDIR')
+        if rootdir is None:
+            raise ValueError("ROOTDIR is not defined in %s" % project)
+        return os.path.abspath(os.path.join(project, rootdir))
+
+    def execute(self, args, cwd, deadline):
+        """ returns (returncode, output); returncode is None on timeout """
+        proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, preexec_fn=os.setsid)
+        expired = []
+
+        def kill():
+            expired.append(True)
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+        timer = threading.Timer(max(deadline - time.time(), 0), kill)
+        timer.start()
+        try:
+            output = proc.communicate()[0]
+        finally:
+            timer.cancel()
+        output = output.decode('utf-8', 'replace')
+        return (None if expired else proc.returncode), output
+
+    def runTest(self, project):
+        result = TestResult(os.path.basename(project), project)
+        workdir = tempfile.mkdtemp(prefix='ipgen_%s_' % result.name)
+        testdir = os.path.join(workdir, result.name)
+        variables = ['ROOTDIR=' + self.getRootDir(project) + '/',
+                     'PYTHON=' + self.python] + self.make_options
+        deadline = time.time() + self.timeout
+        try:
+            shutil.copytree(project, testdir, symlinks=True)
+            for step in ('lbuild', SIMULATORS[self.simulator]):
+                start = time.time()
+                returncode, output = self.execute([self.make, step] + variables,
+                                                  testdir, deadline)
+                elapsed = time.time() - start
+                result.log += output
+                if step == 'lbuild':
+                    result.build_time = elapsed
+                else:
+                    result.sim_time = elapsed
+                if returncode is None:
+                    result.status = TIMEOUT
+                    result.message = "'make %s' timed out in %d s" % (step, self.timeout)
+                    return result
+                if returncode != 0:
+                    result.message = "'make %s' exited with %d" % (step, returncode)
+                    return result
+            errors = get_errors(result.log)
+            if errors:
+                result.message = errors[0]
+                return result
+            result.status = PASS
+            result.counters = get_counters(result.log)
+        except Exception as e:
+            result.message = '%s: %s' % (e.__class__.__name__, str(e))
+        finally:
+            if self.keep:
+                result.message += ('; ' if result.message else '') + 'kept in ' + testdir
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+        return result
+
+    def run(self, projects, callback=None):
+        pool = ThreadPool(max(min(self.jobs, len(projects)), 1))
+        try:
+            asyncs = [pool.apply_async(self.runTest, (p,), callback=callback)
+                      for p in projects]
+            results = [a.get() for a in asyncs]
+        finally:
+            pool.close()
+            pool.join()
+        return results
+
+#-------------------------------------------------------------------------------
+def summarize(results):
+    summary = { PASS : 0, FAIL : 0, TIMEOUT : 0 }
+    for r in results:
+        summary[r.status] += 1
+    return summary
+
+def write_json(results, filename, simulator=None):
+    report = { 'simulator' : simulator, 'summary' : summarize(results),
+               'tests' : [r.toDict() for r in results] }
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+def write_junit(results, filename, name='ipgen'):
+    summary = summarize(results)
+    suite = ET.Element('testsuite', name=name, tests=str(len(results)),
+                       failures=str(summary[FAIL]), errors=str(summary[TIMEOUT]),
+                       time='%.3f' % sum([r.getTime() for r in results]))
+    for r in results:
+        case = ET.SubElement(suite, 'testcase', classname=name, name=r.name,
+                             time='%.3f' % r.getTime())
+        if r.status == FAIL:
+            ET.SubElement(case, 'failure', message=r.message).text = r.log
+        elif r.status == TIMEOUT:
+            ET.SubElement(case, 'error', message=r.message).text = r.log
+        props = ET.SubElement(case, 'properties')
+        ET.SubElement(props, 'property', name='build_time', value='%.3f' % r.build_time)
+        ET.SubElement(props, 'property', name='sim_time', value='%.3f' % r.sim_time)
+        for key in sorted(r.counters.keys()):
+            ET.SubElement(props, 'property', name=key,
+                          value=','.join([str(v) for v in r.counters[key]]))
+        if r.status == PASS:
+            ET.SubElement(case, 'system-out').text = r.log
+    ET.ElementTree(suite).write(filename, encoding='utf-8', xml_declaration=True)
@@ -27,12 +27,28 @@ TARGET_PARAMS = { # param_name : default_value
     'ID' : 0,
     'ADDR_WIDTH' : 32, 
     'DATA_WIDTH' : 32,
+    'ID_WIDTH' : 1,
+    'OUT_OF_ORDER' : 0,
+    'OUTSTANDING' : 0,
+    'MAX_BURST_LEN' : 0,
+    'BURST_SPLIT' : 0,
+    'FIFO_DEPTH' : 0,
+    'EXT_DATA_WIDTH' : 0,
+    'QOS' : 0,
+    'REGISTER_SLICE' : "",
+    'LINE_SIZE' : 8,
+    'LINES' : 64,
+    'WAYS' : 2,
+    'PREFETCH' : 1,
+    'WC_SIZE' : 16,
+    'WC_TIMEOUT' : 64,
 }
 
 TARGET_TABLE = { # module_type : (port_name, port_width)
     "ipgen_master_memory" : (('ext_awvalid', 'output', IntConst('1')),
                              ('ext_awaddr', 'output', Identifier('ADDR_WIDTH')),
                              ('ext_awlen', 'output', IntConst('8')),
+                             ('ext_awid', 'output', Identifier('ID_WIDTH')),
                              ('ext_awready', 'input', IntConst('1')),
                                
                              ('ext_wdata', 'output', Identifier('DATA_WIDTH')),
@@ -44,10 +60,12 @@ TARGET_TABLE = { # module_type : (port_name, port_width)
                              ('ext_arvalid', 'output', IntConst('1')),
                              ('ext_araddr', 'output', Identifier('ADDR_WIDTH')),
                              ('ext_arlen', 'output', IntConst('8')),
+                             ('ext_arid', 'output', Identifier('ID_WIDTH')),
                              ('ext_arready', 'input', IntConst('1')),
 
                              ('ext_rdata', 'input', Identifier('DATA_WIDTH')),
                              ('ext_rlast', 'input', IntConst('1')),
+                             ('ext_rid', 'input', Identifier('ID_WIDTH')),
                              ('ext_rvalid', 'input', IntConst('1')),
                              ('ext_rready', 'output', IntConst('1')),),
     
@@ -105,8 +123,30 @@ TARGET_TABLE = { # module_type : (port_name, port_width)
                                  ('ext_rdata', 'output', Identifier('DATA_WIDTH')),
                                  ('ext_rvalid', 'output', IntConst('1')),
                                  ('ext_rready', 'input', IntConst('1')),),
+
+    "ipgen_master_stream" : (('ext_tdata', 'output', Identifier('DATA_WIDTH')),
+                             ('ext_tkeep', 'output', Divide(Identifier('DATA_WIDTH'), IntConst('8'))),
+                             ('ext_tlast', 'output', IntConst('1')),
+                             ('ext_tvalid', 'output', IntConst('1')),
+                             ('ext_tready', 'input', IntConst('1')),),
+
+    "ipgen_slave_stream" : (('ext_tdata', 'input', Identifier('DATA_WIDTH')),
+                            ('ext_tkeep', 'input', Divide(Identifier('DATA_WIDTH'), IntConst('8'))),
+                            ('ext_tlast', 'input', IntConst('1')),
+                            ('ext_tvalid', 'input', IntConst('1')),
+                            ('ext_tready', 'output', IntConst('1')),),
+
+    "ipgen_interrupt" : (('ext_irq', 'output', IntConst('1')),),
 }
 
+# the DMA engine, the read caches and the write-combining buffer are in the
+# converted module, and their external ports are same as the ones of
+# ipgen_master_memory
+TARGET_TABLE["ipgen_master_dma"] = TARGET_TABLE["ipgen_master_memory"]
+TARGET_TABLE["ipgen_master_cached_memory"] = TARGET_TABLE["ipgen_master_memory"]
+TARGET_TABLE["ipgen_master_cached_lite_memory"] = TARGET_TABLE["ipgen_master_memory"]
+TARGET_TABLE["ipgen_master_combining_lite_memory"] = TARGET_TABLE["ipgen_master_memory"]
+
 #-------------------------------------------------------------------------------
 # TARGET SETTING END
 #-------------------------------------------------------------------------------
@@ -1,10 +1,26 @@
 class Interface(object):
-    def __init__(self, name, idx, addrwidth, datawidth, lite=False):
+    def __init__(self, name, idx, addrwidth, datawidth, lite=False,
+                 idwidth=1, outoforder=False, outstanding=0,
+                 burstlength=0, burstsplit=False, fifodepth=0, ext_datawidth=0,
+                 qos=0, regslice='', dma=False, cache=None,
+                 wcombine=None):
         self.name = name
         self.idx = idx
         self.datawidth = datawidth
         self.addrwidth = addrwidth
         self.lite = lite
+        self.idwidth = idwidth
+        self.outoforder = outoforder
+        self.outstanding = outstanding
+        self.burstlength = burstlength
+        self.burstsplit = burstsplit
+        self.fifodepth = fifodepth
+        self.ext_datawidth = ext_datawidth
+        self.qos = qos
+        self.regslice = regslice
+        self.dma = dma
+        self.cache = cache # (LINE_SIZE, LINES, WAYS, PREFETCH)
+        self.wcombine = wcombine # (WC_SIZE, WC_TIMEOUT)
 
     def __repr__(self):
         ret = []
@@ -25,8 +41,101 @@ class Interface(object):
         ret.append(' ')
         ret.append('LITE:')
         ret.append(str(self.lite))
+        if self.dma:
+            ret.append(' ')
+            ret.append('DMA:')
+            ret.append(str(self.dma))
+        if self.cache:
+            ret.append(' ')
+            ret.append('CACHE:')
+            ret.append(str(self.cache))
+        if self.wcombine:
+            ret.append(' ')
+            ret.append('WCOMBINE:')
+            ret.append(str(self.wcombine))
+        if not self.lite:
+            ret.append(' ')
+            ret.append('ID_WIDTH:')
+            ret.append(str(self.idwidth))
+            ret.append(' ')
+            ret.append('OUT_OF_ORDER:')
+            ret.append(str(self.outoforder))
+            ret.append(' ')
+            ret.append('OUTSTANDING:')
+            ret.append(str(self.outstanding))
+            ret.append(' ')
+            ret.append('MAX_BURST_LEN:')
+            ret.append(str(self.burstlength))
+            ret.append(' ')
+            ret.append('BURST_SPLIT:')
+            ret.append(str(self.burstsplit))
+            ret.append(' ')
+            ret.append('FIFO_DEPTH:')
+            ret.append(str(self.fifodepth))
+            ret.append(' ')
+            ret.append('EXT_DATA_WIDTH:')
+            ret.append(str(self.ext_datawidth))
+            ret.append(' ')
+            ret.append('QOS:')
+            ret.append(str(self.qos))
+        ret.append(' ')
+        ret.append('REGISTER_SLICE:')
+        ret.append(str(self.regslice))
         ret.append(')')
         return ''.join(ret)
 
 class MasterMemory(Interface): pass
 class SlaveMemory(Interface): pass
+
+class StreamInterface(object):
+    def __init__(self, name, idx, datawidth, regslice=''):
+        self.name = name
+        self.idx = idx
+        self.datawidth = datawidth
+        self.regslice = regslice
+
+    def __repr__(self):
+        ret = []
+        ret.append('(')
+        ret.append(self.__class__.__name__)
+        ret.append(' ')
+        ret.append('NAME:')
+        ret.append(str(self.name))
+        ret.append(' ')
+        ret.append('ID:')
+        ret.append(str(self.idx))
+        ret.append(' ')
+        ret.append('DATA_WIDTH:')
+        ret.append(str(self.datawidth))
+        ret.append(' ')
+        ret.append('REGISTER_SLICE:')
+        ret.append(str(self.regslice))
+        ret.append(')')
+        return ''.join(ret)
+
+class MasterStream(StreamInterface): pass
+class SlaveStream(StreamInterface): pass
+
+class Interrupt(object):
+    def __init__(self, name, idx):
+        self.name = name
+        self.idx = idx
+
+    def __repr__(self):
+        ret = []
+        ret.append('(')
+        ret.append(self.__class__.__name__)
+        ret.append(' ')
+        ret.append('NAME:')
+        ret.append(str(self.name))
+        ret.append(' ')
+        ret.append('ID:')
+        ret.append(str(self.idx))
+        ret.append(')')
+        return ''.join(ret)
+
+class MasterPort(Interface):
+    def __init__(self, name, idx, addrwidth, datawidth, members, arbitration='roundrobin'):
+        Interface.__init__(self, name, idx, addrwidth, datawidth)
+        self.members = members
+        self.arbitration = arbitration
@@ -68,17 +68,104 @@ class RtlConverter(object):
             if mode == 'ipgen_slave_lite_memory':
                 rslt = self.getSlaveMemory(target_items, lite=True)
                 slave_memory.extend(rslt)
+            if mode == 'ipgen_master_dma':
+                rslt = self.getMasterMemory(target_items, dma=True)
+                master_memory.extend(rslt)
+            if mode in ('ipgen_master_cached_memory', 'ipgen_master_cached_lite_memory'):
+                rslt = self.getMasterMemory(target_items, cache=True)
+                master_memory.extend(rslt)
+            if mode == 'ipgen_master_combining_lite_memory':
+                rslt = self.getMasterMemory(target_items, wcombine=True)
+                master_memory.extend(rslt)
 
         return tuple(master_memory), tuple(slave_memory)
 
-    def getMasterMemory(self, target_items, lite=False):
+    def getStreamDefinitions(self):
+        target_objects = self.getTargetObject()
+        master_stream = []
+        slave_stream = []
+
+        for mode, target_items in target_objects.items():
+            if mode == 'ipgen_master_stream':
+                rslt = self.getStream(target_items, MasterStream)
+                master_stream.extend(rslt)
+            if mode == 'ipgen_slave_stream':
+                rslt = self.getStream(target_items, SlaveStream)
+                slave_stream.extend(rslt)
+
+        return tuple(master_stream), tuple(slave_stream)
+
+    def getInterruptDefinitions(self):
+        target_objects = self.getTargetObject()
+        interrupt = []
+
+        for mode, target_items in target_objects.items():
+            if mode == 'ipgen_interrupt':
+                for name, values in target_items:
+                    interrupt.append( Interrupt(name, values['ID']) )
+
+        return tuple(interrupt)
+
+    def getMasterMemory(self, target_items, lite=False, dma=False, cache=False,
+                        wcombine=False):
         objs = []
 
         for name, values in target_items:
             idx = values['ID']
             addrwidth = values['ADDR_WIDTH']
             datawidth = values['DATA_WIDTH']
-            objs.append( MasterMemory(name, idx, addrwidth, datawidth, lite) )
+            idwidth = values['ID_WIDTH']
+            outoforder = values['OUT_OF_ORDER'] != 0
+            outstanding = values['OUTSTANDING']
+            burstlength = values['MAX_BURST_LEN']
+            burstsplit = values['BURST_SPLIT'] != 0
+            fifodepth = values['FIFO_DEPTH']
+            ext_datawidth = values['EXT_DATA_WIDTH']
+            qos = values['QOS']
+            regslice = values['REGISTER_SLICE']
+            if idwidth < 1:
+                raise ValueError("ID_WIDTH of '%s' must be 1 or more" % name)
+            if outstanding < 0:
+                raise ValueError("OUTSTANDING of '%s' must be 0 or more" % name)
+            if burstlength < 0 or burstlength > 256:
+                raise ValueError("MAX_BURST_LEN of '%s' must be from 0 to 256" % name)
+            if fifodepth < 0 or fifodepth == 1 or (fifodepth & (fifodepth - 1)) != 0:
+                raise ValueError("FIFO_DEPTH of '%s' must be 0 or a power of 2 (2 or more)" % name)
+            if ext_datawidth != 0 and (ext_datawidth < 8 or (ext_datawidth & (ext_datawidth - 1)) != 0):
+                raise ValueError("EXT_DATA_WIDTH of '%s' must be 0 or a power of 2 (8 or more)" % name)
+            if qos < 0 or qos > 15:
+                raise ValueError("QOS of '%s' must be from 0 to 15" % name)
+            cache_config = None
+            if cache:
+                linesize = values['LINE_SIZE']
+                lines = values['LINES']
+                ways = values['WAYS']
+                prefetch = values['PREFETCH']
+                if linesize < 1 or linesize > 256 or (linesize & (linesize - 1)) != 0:
+                    raise ValueError("LINE_SIZE of '%s' must be a power of 2 (up to 256)" % name)
+                if linesize * datawidth // 8 > 4096:
+                    raise ValueError("A line of '%s' must be 4KB or less" % name)
+                if ways < 1 or lines < ways or lines % ways != 0 or ((lines // ways) & (lines // ways - 1)) != 0:
+                    raise ValueError("LINES of '%s' must be WAYS times a power of 2" % name)
+                if prefetch < 0 or prefetch > 15:
+                    raise ValueError("PREFETCH of '%s' must be from 0 to 15" % name)
+                cache_config = (linesize, lines, ways, prefetch)
+            wcombine_config = None
+            if wcombine:
+                wcsize = values['WC_SIZE']
+                wctimeout = values['WC_TIMEOUT']
+                if wcsize < 1 or wcsize > 256 or (wcsize & (wcsize - 1)) != 0:
+                    raise ValueError("WC_SIZE of '%s' must be a power of 2 (up to 256)" % name)
+                if wcsize * datawidth // 8 > 4096:
+                    raise ValueError("A write-combining buffer of '%s' must be 4KB or less" % name)
+                if wctimeout < 0:
+                    raise ValueError("WC_TIMEOUT of '%s' must be 0 or more" % name)
+                wcombine_config = (wcsize, wctimeout)
+            objs.append( MasterMemory(name, idx, addrwidth, datawidth, lite,
+                                      idwidth, outoforder, outstanding,
+                                      burstlength, burstsplit, fifodepth, ext_datawidth,
+                                      qos, regslice, dma, cache_config,
+                                      wcombine_config) )
             
         return objs
 
@@ -89,7 +176,22 @@ class RtlConverter(object):
             idx = values['ID']
             addrwidth = values['ADDR_WIDTH']
             datawidth = values['DATA_WIDTH']
-            objs.append( SlaveMemory(name, idx, addrwidth, datawidth, lite) )
+            regslice = values['REGISTER_SLICE']
+            objs.append( SlaveMemory(name, idx, addrwidth, datawidth, lite,
+                                     regslice=regslice) )
+
+        return objs
+
+    def getStream(self, target_items, cls):
+        objs = []
+
+        for name, values in target_items:
+            idx = values['ID']
+            datawidth = values['DATA_WIDTH']
+            regslice = values['REGISTER_SLICE']
+            if datawidth < 8 or datawidth % 8 != 0:
+                raise ValueError("DATA_WIDTH of '%s' must be a multiple of 8" % name)
+            objs.append( cls(name, idx, datawidth, regslice) )
 
         return objs
             
@@ -130,6 +232,28 @@ class RtlConverter(object):
         for value in sorted(slave_list, key=lambda x:x.name):
             key = value.name
             print(" %s: %s" % (key, value))
+
+        master_stream_list, slave_stream_list = self.getStreamDefinitions()
+
+        if master_stream_list:
+            print("MasterStream")
+        for value in sorted(master_stream_list, key=lambda x:x.name):
+            key = value.name
+            print(" %s: %s" % (key, value))
+
+        if slave_stream_list:
+            print("SlaveStream")
+        for value in sorted(slave_stream_list, key=lambda x:x.name):
+            key = value.name
+            print(" %s: %s" % (key, value))
+
+        interrupt_list = self.getInterruptDefinitions()
+
+        if interrupt_list:
+            print("Interrupt")
+        for value in sorted(interrupt_list, key=lambda x:x.name):
+            key = value.name
+            print(" %s: %s" % (key, value))
         
     def generate(self, skip_not_found=False):
         code_parser = VerilogCodeParser(self.filelist,
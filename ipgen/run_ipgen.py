@@ -86,9 +86,34 @@ def main():
         'single_clock' : True,
         'if_type' : 'axi',
         'output' : 'out.v',
+        'outstanding' : 0,
+        'thread_id_width' : 1,
+        'ext_datawidth' : 0,
+        'ext_burstlength' : 256,
+        'burst_split' : False,
+        'fifo_depth' : 16,
+        'cdc_depth' : 16,
+        'ext_ports' : 0,
+        'arbitration' : 'roundrobin',
+        'register_slice' : 'none',
+        'ipxact_timestamp' : False,
+        'common_hdl_store' : None,
         'sim_addrwidth' : 27,
         'hperiod_ulogic' : 5,
         'hperiod_bus' : 5,
+        'mem_outstanding' : 1,
+        'stream_source_rate' : 100,
+        'stream_sink_rate' : 100,
+        'stream_packet_len' : 16,
+        'trace_file' : None,
+        'dump' : 'none',
+        'dump_file' : None,
+        'dump_scope' : 'uut',
+        'dump_depth' : 0,
+        'dump_start' : 0,
+        'dump_cycles' : 0,
+        'dump_trigger' : None,
+        'registers' : {},
     }
 
     confp = configparser.SafeConfigParser()
@@ -97,9 +122,12 @@ def main():
 
     if confp.has_section('synthesis'):
         for k, v in confp.items('synthesis'):
-            if k == 'single_clock':
+            if k == 'single_clock' or k == 'burst_split' or k == 'ipxact_timestamp':
                 configs[k] = False if 'n' in v or 'N' in v else True
-            elif k == 'signal_width' or k == 'ext_addrwidth' or k == 'ext_datawidth':
+            elif (k == 'signal_width' or k == 'ext_addrwidth' or k == 'ext_datawidth' or
+                  k == 'outstanding' or k == 'thread_id_width' or
+                  k == 'ext_burstlength' or k == 'fifo_depth' or k == 'cdc_depth' or
+                  k == 'ext_ports'):
                 configs[k] = int(v)
             elif k not in configs:
                 raise ValueError("No such configuration item: %s" % k)
@@ -108,16 +136,19 @@ def main():
 
     if confp.has_section('simulation'):
         for k, v in confp.items('simulation'):
-            if k == 'sim_addrwidth' or k == 'hperiod_ulogic' or k == 'hperiod_bus':
+            if (k == 'sim_addrwidth' or k == 'hperiod_ulogic' or k == 'hperiod_bus' or
+                k == 'mem_outstanding' or
+                k == 'stream_source_rate' or k == 'stream_sink_rate' or k == 'stream_packet_len' or
+                k == 'dump_depth' or k == 'dump_start' or k == 'dump_cycles'):
                 configs[k] = int(v)
             elif k not in configs:
                 raise ValueError("No such configuration item: %s" % k)
             else:
                 configs[k] = v
 
-    if configs['hperiod_ulogic'] != configs['hperiod_bus']:
-        raise ValueError(("Half period values of User-logic and Bus"
-                          " should be same in current implementation"))
+    if confp.has_section('registers'):
+        configs['registers'] = dict([ (k, v) for k, v in confp.items('registers')
+                                      if not confp.has_option('DEFAULT', k) ])
 
     builder = SystemBuilder()
     builder.build(configs,
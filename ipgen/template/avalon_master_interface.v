@@ -176,6 +176,8 @@ module avalon_master_interface #
           if(awlen == 0) write_busy <= 0;
           else write_busy <= 1;
         end else begin
+          write_addr <= awaddr;
+          write_len <= awlen + 1;
           write_count <= awlen + 1;
           write_busy <= 1;
           has_write_addr <= 1;
@@ -0,0 +1,92 @@
+//------------------------------------------------------------------------------
+// One burst at a time in front of avalon_master_interface
+// - avalon_master_interface handles a single transaction: a read must not be
+//   requested during a write burst, and a write during a read burst.
+//   ipgen_master_dma drives its read and write channels at the same time, so
+//   the channels are granted in turn.
+// - A write burst is complete when its address and its last data are
+//   accepted, and a read burst when its last data is received.
+//   The next burst is granted after that, writes first.
+//------------------------------------------------------------------------------
+module avalon_master_serializer
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   // User side
+   input  wire awvalid,
+   output wire awready,
+   input  wire wlast,
+   input  wire wvalid,
+   output wire wready,
+   input  wire arvalid,
+   output wire arready,
+
+   // Avalon interface side
+   output wire ext_awvalid,
+   input  wire ext_awready,
+   output wire ext_wvalid,
+   input  wire ext_wready,
+   output wire ext_arvalid,
+   input  wire ext_arready,
+   input  wire ext_rlast,
+   input  wire ext_rvalid,
+   input  wire ext_rready
+   );
+
+  localparam IDLE  = 0;
+  localparam WRITE = 1;
+  localparam READ  = 2;
+
+  reg [1:0] state;
+  reg addr_done; // the address of the burst is accepted
+  reg data_done; // the last write data of the burst is accepted
+
+  wire aw_beat;
+  wire w_last_beat;
+
+  assign ext_awvalid = awvalid && (state == WRITE) && !addr_done;
+  assign awready = ext_awready && (state == WRITE) && !addr_done;
+  assign ext_wvalid = wvalid && (state == WRITE) && !data_done;
+  assign wready = ext_wready && (state == WRITE) && !data_done;
+  assign ext_arvalid = arvalid && (state == READ) && !addr_done;
+  assign arready = ext_arready && (state == READ) && !addr_done;
+
+  assign aw_beat = ext_awvalid && ext_awready;
+  assign w_last_beat = ext_wvalid && ext_wready && wlast;
+
+  always @(posedge ACLK) begin
+    if(!ARESETN) begin
+      state <= IDLE;
+      addr_done <= 0;
+      data_done <= 0;
+    end else begin
+      case(state)
+        IDLE: begin
+          addr_done <= 0;
+          data_done <= 0;
+          if(awvalid || wvalid) begin
+            state <= WRITE;
+          end else if(arvalid) begin
+            state <= READ;
+          end
+        end
+        WRITE: begin
+          if(aw_beat) addr_done <= 1;
+          if(w_last_beat) data_done <= 1;
+          if((addr_done || aw_beat) && (data_done || w_last_beat)) begin
+            state <= IDLE;
+          end
+        end
+        READ: begin
+          if(ext_arvalid && ext_arready) addr_done <= 1;
+          if(addr_done && ext_rvalid && ext_rready && ext_rlast) begin
+            state <= IDLE;
+          end
+        end
+      endcase
+    end
+  end
+
+endmodule
+
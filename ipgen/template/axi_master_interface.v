@@ -32,7 +32,21 @@ module axi_master_interface #
    parameter integer C_M_AXI_BUSER_WIDTH           = 1,
    parameter integer C_M_AXI_SUPPORTS_WRITE        = 1,
    parameter integer C_M_AXI_SUPPORTS_READ         = 1,
-   parameter C_M_AXI_TARGET = 'h00000000
+   parameter C_M_AXI_TARGET = 'h00000000,
+
+   //----------------------------------------------------------------------------
+   // Transaction ID and Outstanding Request
+   //----------------------------------------------------------------------------
+   parameter integer C_M_AXI_ID_WIDTH              = 1, // width of awid/arid/rid
+   parameter integer C_M_AXI_OUT_OF_ORDER          = 0, // 0: IDs are fixed to 0
+   parameter integer C_M_AXI_OUTSTANDING           = 0, // 0: unlimited
+
+   //----------------------------------------------------------------------------
+   // Burst Splitting
+   //----------------------------------------------------------------------------
+   parameter integer C_M_AXI_MAX_BURST_LEN         = 256, // beats per external burst
+   parameter integer C_M_AXI_BURST_SPLIT           = 0, // 1: split at MAX_BURST_LEN and 4KB boundaries
+   parameter integer C_M_AXI_FIFO_DEPTH            = 16 // split bursts in flight, power of 2
    )
   (
    //----------------------------------------------------------------------------
@@ -47,6 +61,7 @@ module axi_master_interface #
    // Write Address
    input wire  [C_M_AXI_ADDR_WIDTH-1:0]   awaddr,
    input wire  [8-1:0]                    awlen,
+   input wire  [C_M_AXI_ID_WIDTH-1:0]     awid,
    input wire                             awvalid,
    output wire                            awready,
   
@@ -60,12 +75,14 @@ module axi_master_interface #
    // Read Address
    input wire  [C_M_AXI_ADDR_WIDTH-1:0]   araddr,
    input wire  [8-1:0]                    arlen,
+   input wire  [C_M_AXI_ID_WIDTH-1:0]     arid,
    input wire                             arvalid,
    output wire                            arready,
 
    // Read Data
    output wire [C_M_AXI_DATA_WIDTH-1:0]   rdata,
    output wire                            rlast,
+   output wire [C_M_AXI_ID_WIDTH-1:0]     rid,
    output wire                            rvalid,
    input wire                             rready,
 
@@ -147,13 +164,177 @@ module axi_master_interface #
     aresetn_rrr <= aresetn_rr;
   end
   
+  //----------------------------------------------------------------------------
+  // Outstanding Request Limit
+  //----------------------------------------------------------------------------
+  localparam integer OUTSTANDING_WIDTH = `AXII_C_LOG_2(C_M_AXI_OUTSTANDING + 1) + 1;
+
+  reg [OUTSTANDING_WIDTH-1:0] write_outstanding;
+  reg [OUTSTANDING_WIDTH-1:0] read_outstanding;
+  wire write_limited;
+  wire read_limited;
+
+  wire aw_fire;
+  wire b_fire;
+  wire ar_fire;
+  wire r_fire;
+
+  assign aw_fire = M_AXI_AWVALID && M_AXI_AWREADY;
+  assign b_fire = M_AXI_BVALID && M_AXI_BREADY;
+  assign ar_fire = M_AXI_ARVALID && M_AXI_ARREADY;
+  assign r_fire = M_AXI_RVALID && M_AXI_RREADY && M_AXI_RLAST;
+
+  assign write_limited = (C_M_AXI_OUTSTANDING > 0) && (write_outstanding >= C_M_AXI_OUTSTANDING);
+  assign read_limited = (C_M_AXI_OUTSTANDING > 0) && (read_outstanding >= C_M_AXI_OUTSTANDING);
+
+  always @(posedge ACLK) begin
+    if (aresetn_rrr == 0) begin
+      write_outstanding <= 0;
+      read_outstanding <= 0;
+    end else begin
+      if (aw_fire && !b_fire) write_outstanding <= write_outstanding + 1;
+      if (!aw_fire && b_fire) write_outstanding <= write_outstanding - 1;
+      if (ar_fire && !r_fire) read_outstanding <= read_outstanding + 1;
+      if (!ar_fire && r_fire) read_outstanding <= read_outstanding - 1;
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Burst Splitting
+  //----------------------------------------------------------------------------
+  // A user burst is accepted into the splitter, and issued as sub-bursts of up
+  // to C_M_AXI_MAX_BURST_LEN beats, none of which crosses a 4KB boundary.
+  // WLAST of each sub-burst is generated from the issued lengths, and RLAST is
+  // passed to the user at the end of the user burst only.
+  localparam integer BOUNDARY_BEATS = 4096 / (C_M_AXI_DATA_WIDTH / 8);
+  localparam integer FIFO_ADDR_WIDTH = `AXII_C_LOG_2(C_M_AXI_FIFO_DEPTH);
+  localparam integer FIFO_DEPTH = 2 ** FIFO_ADDR_WIDTH;
+
+  reg                          aw_split_busy;
+  reg [C_M_AXI_ADDR_WIDTH-1:0] aw_split_addr;
+  reg [13-1:0]                 aw_split_len;
+  reg [C_M_AXI_ID_WIDTH-1:0]   aw_split_id;
+  wire [13-1:0]                aw_boundary_len;
+  wire [13-1:0]                aw_max_len;
+  wire [13-1:0]                aw_sub_len;
+  wire                         aw_sub_last;
+
+  reg                          ar_split_busy;
+  reg [C_M_AXI_ADDR_WIDTH-1:0] ar_split_addr;
+  reg [13-1:0]                 ar_split_len;
+  reg [C_M_AXI_ID_WIDTH-1:0]   ar_split_id;
+  wire [13-1:0]                ar_boundary_len;
+  wire [13-1:0]                ar_max_len;
+  wire [13-1:0]                ar_sub_len;
+  wire                         ar_sub_last;
+
+  assign aw_boundary_len = BOUNDARY_BEATS - aw_split_addr[11:C_M_AXI_ADDRMASK_WIDTH];
+  assign aw_max_len = (aw_boundary_len < C_M_AXI_MAX_BURST_LEN)? aw_boundary_len : C_M_AXI_MAX_BURST_LEN;
+  assign aw_sub_len = (aw_split_len < aw_max_len)? aw_split_len : aw_max_len;
+  assign aw_sub_last = (aw_sub_len == aw_split_len);
+
+  assign ar_boundary_len = BOUNDARY_BEATS - ar_split_addr[11:C_M_AXI_ADDRMASK_WIDTH];
+  assign ar_max_len = (ar_boundary_len < C_M_AXI_MAX_BURST_LEN)? ar_boundary_len : C_M_AXI_MAX_BURST_LEN;
+  assign ar_sub_len = (ar_split_len < ar_max_len)? ar_split_len : ar_max_len;
+  assign ar_sub_last = (ar_sub_len == ar_split_len);
+
+  always @(posedge ACLK) begin
+    if (aresetn_rrr == 0) begin
+      aw_split_busy <= 0;
+      aw_split_addr <= 0;
+      aw_split_len <= 0;
+      aw_split_id <= 0;
+      ar_split_busy <= 0;
+      ar_split_addr <= 0;
+      ar_split_len <= 0;
+      ar_split_id <= 0;
+    end else if (C_M_AXI_BURST_SPLIT) begin
+      if (aw_fire) begin
+        aw_split_busy <= !aw_sub_last;
+        aw_split_addr <= aw_split_addr + (aw_sub_len << C_M_AXI_ADDRMASK_WIDTH);
+        aw_split_len <= aw_split_len - aw_sub_len;
+      end
+      if (awvalid && awready) begin
+        aw_split_busy <= 1;
+        aw_split_addr <= C_M_AXI_TARGET + awaddr;
+        aw_split_len <= awlen + 1;
+        aw_split_id <= awid;
+      end
+      if (ar_fire) begin
+        ar_split_busy <= !ar_sub_last;
+        ar_split_addr <= ar_split_addr + (ar_sub_len << C_M_AXI_ADDRMASK_WIDTH);
+        ar_split_len <= ar_split_len - ar_sub_len;
+      end
+      if (arvalid && arready) begin
+        ar_split_busy <= 1;
+        ar_split_addr <= C_M_AXI_TARGET + araddr;
+        ar_split_len <= arlen + 1;
+        ar_split_id <= arid;
+      end
+    end
+  end
+
+  // lengths of the issued write sub-bursts
+  reg [9-1:0] wlen_fifo [0:FIFO_DEPTH-1];
+  reg [FIFO_ADDR_WIDTH:0] wlen_head;
+  reg [FIFO_ADDR_WIDTH:0] wlen_tail;
+  reg [9-1:0] wlen_count;
+  wire wlen_full;
+  wire wlen_empty;
+  wire w_fire;
+
+  assign wlen_full = C_M_AXI_BURST_SPLIT && (wlen_tail - wlen_head == FIFO_DEPTH);
+  assign wlen_empty = C_M_AXI_BURST_SPLIT && (wlen_tail == wlen_head);
+  assign w_fire = M_AXI_WVALID && M_AXI_WREADY;
+
+  always @(posedge ACLK) begin
+    if (aresetn_rrr == 0) begin
+      wlen_head <= 0;
+      wlen_tail <= 0;
+      wlen_count <= 0;
+    end else begin
+      if (C_M_AXI_BURST_SPLIT && aw_fire) begin
+        wlen_fifo[wlen_tail[FIFO_ADDR_WIDTH-1:0]] <= aw_sub_len;
+        wlen_tail <= wlen_tail + 1;
+      end
+      if (C_M_AXI_BURST_SPLIT && w_fire) begin
+        wlen_count <= (M_AXI_WLAST)? 0 : wlen_count + 1;
+        if (M_AXI_WLAST) wlen_head <= wlen_head + 1;
+      end
+    end
+  end
+
+  // whether each issued read sub-burst ends the user burst
+  reg rlast_fifo [0:FIFO_DEPTH-1];
+  reg [FIFO_ADDR_WIDTH:0] rlast_head;
+  reg [FIFO_ADDR_WIDTH:0] rlast_tail;
+  wire rlast_full;
+
+  assign rlast_full = C_M_AXI_BURST_SPLIT && (rlast_tail - rlast_head == FIFO_DEPTH);
+
+  always @(posedge ACLK) begin
+    if (aresetn_rrr == 0) begin
+      rlast_head <= 0;
+      rlast_tail <= 0;
+    end else begin
+      if (C_M_AXI_BURST_SPLIT && ar_fire) begin
+        rlast_fifo[rlast_tail[FIFO_ADDR_WIDTH-1:0]] <= ar_sub_last;
+        rlast_tail <= rlast_tail + 1;
+      end
+      if (C_M_AXI_BURST_SPLIT && r_fire) begin
+        rlast_head <= rlast_head + 1;
+      end
+    end
+  end
+
   //----------------------------------------------------------------------------
   // Write Address (AW)
   //----------------------------------------------------------------------------
-  // Single threaded
-  assign M_AXI_AWID = 'b0;   
-  assign M_AXI_AWADDR = C_M_AXI_TARGET + awaddr;
-  assign M_AXI_AWLEN = awlen;
+  // IDs are used only for out-of-order completion
+  assign M_AXI_AWID = (!C_M_AXI_OUT_OF_ORDER)? 'b0 :
+                      (C_M_AXI_BURST_SPLIT)? aw_split_id : awid;
+  assign M_AXI_AWADDR = (C_M_AXI_BURST_SPLIT)? aw_split_addr : C_M_AXI_TARGET + awaddr;
+  assign M_AXI_AWLEN = (C_M_AXI_BURST_SPLIT)? aw_sub_len - 1 : awlen;
   assign M_AXI_AWSIZE = C_M_AXI_ADDRMASK_WIDTH;
   assign M_AXI_AWBURST = BURST_INCR;
   assign M_AXI_AWLOCK = 1'b0;
@@ -161,18 +342,19 @@ module axi_master_interface #
   assign M_AXI_AWPROT = 3'h0;
   assign M_AXI_AWQOS = 4'h0;
   assign M_AXI_AWUSER = 'b1;
-  assign M_AXI_AWVALID = awvalid;
-  assign awready = M_AXI_AWREADY;
+  assign M_AXI_AWVALID = ((C_M_AXI_BURST_SPLIT)? aw_split_busy && !wlen_full : awvalid) && !write_limited;
+  assign awready = (C_M_AXI_BURST_SPLIT)? !aw_split_busy || (aw_fire && aw_sub_last) :
+                   M_AXI_AWREADY && !write_limited;
   
   //----------------------------------------------------------------------------
   // Write Data(W)
   //----------------------------------------------------------------------------
   assign M_AXI_WDATA = wdata;
   assign M_AXI_WSTRB = wstrb;
-  assign M_AXI_WLAST = wlast;
+  assign M_AXI_WLAST = (C_M_AXI_BURST_SPLIT)? wlen_count == wlen_fifo[wlen_head[FIFO_ADDR_WIDTH-1:0]] - 1 : wlast;
   assign M_AXI_WUSER = 'b0;
-  assign M_AXI_WVALID = wvalid;
-  assign wready = M_AXI_WREADY;
+  assign M_AXI_WVALID = wvalid && !wlen_empty;
+  assign wready = M_AXI_WREADY && !wlen_empty;
   
   //----------------------------------------------------------------------------
   // Write Response (B)
@@ -182,10 +364,11 @@ module axi_master_interface #
   //----------------------------------------------------------------------------  
   // Read Address (AR)
   //----------------------------------------------------------------------------
-  // Single threaded   
-  assign M_AXI_ARID = 'b0;   
-  assign M_AXI_ARADDR = C_M_AXI_TARGET + araddr;
-  assign M_AXI_ARLEN = arlen;
+  // IDs are used only for out-of-order completion
+  assign M_AXI_ARID = (!C_M_AXI_OUT_OF_ORDER)? 'b0 :
+                      (C_M_AXI_BURST_SPLIT)? ar_split_id : arid;
+  assign M_AXI_ARADDR = (C_M_AXI_BURST_SPLIT)? ar_split_addr : C_M_AXI_TARGET + araddr;
+  assign M_AXI_ARLEN = (C_M_AXI_BURST_SPLIT)? ar_sub_len - 1 : arlen;
   assign M_AXI_ARSIZE = C_M_AXI_ADDRMASK_WIDTH;
   assign M_AXI_ARBURST = BURST_INCR;
   assign M_AXI_ARLOCK = 1'b0;
@@ -193,14 +376,16 @@ module axi_master_interface #
   assign M_AXI_ARPROT = 3'h0;
   assign M_AXI_ARQOS = 4'h0;
   assign M_AXI_ARUSER = 'b1;
-  assign M_AXI_ARVALID = arvalid;
-  assign arready = M_AXI_ARREADY;
+  assign M_AXI_ARVALID = ((C_M_AXI_BURST_SPLIT)? ar_split_busy && !rlast_full : arvalid) && !read_limited;
+  assign arready = (C_M_AXI_BURST_SPLIT)? !ar_split_busy || (ar_fire && ar_sub_last) :
+                   M_AXI_ARREADY && !read_limited;
 
   //----------------------------------------------------------------------------    
   // Read and Read Response (R)
   //----------------------------------------------------------------------------    
   assign rdata = M_AXI_RDATA;
-  assign rlast = M_AXI_RLAST;
+  assign rlast = (C_M_AXI_BURST_SPLIT)? M_AXI_RLAST && rlast_fifo[rlast_head[FIFO_ADDR_WIDTH-1:0]] : M_AXI_RLAST;
+  assign rid = (C_M_AXI_OUT_OF_ORDER)? M_AXI_RID : 'b0;
   assign rvalid = M_AXI_RVALID;
   assign M_AXI_RREADY = rready;
 
@@ -0,0 +1,520 @@
+
+`define CDC_C_LOG_2(n) (\
+(n) <= (1<<0) ? 0 : (n) <= (1<<1) ? 1 :\
+(n) <= (1<<2) ? 2 : (n) <= (1<<3) ? 3 :\
+(n) <= (1<<4) ? 4 : (n) <= (1<<5) ? 5 :\
+(n) <= (1<<6) ? 6 : (n) <= (1<<7) ? 7 :\
+(n) <= (1<<8) ? 8 : (n) <= (1<<9) ? 9 :\
+(n) <= (1<<10) ? 10 : (n) <= (1<<11) ? 11 :\
+(n) <= (1<<12) ? 12 : (n) <= (1<<13) ? 13 :\
+(n) <= (1<<14) ? 14 : (n) <= (1<<15) ? 15 :\
+(n) <= (1<<16) ? 16 : (n) <= (1<<17) ? 17 :\
+(n) <= (1<<18) ? 18 : (n) <= (1<<19) ? 19 :\
+(n) <= (1<<20) ? 20 : (n) <= (1<<21) ? 21 :\
+(n) <= (1<<22) ? 22 : (n) <= (1<<23) ? 23 :\
+(n) <= (1<<24) ? 24 : (n) <= (1<<25) ? 25 :\
+(n) <= (1<<26) ? 26 : (n) <= (1<<27) ? 27 :\
+(n) <= (1<<28) ? 28 : (n) <= (1<<29) ? 29 :\
+(n) <= (1<<30) ? 30 : (n) <= (1<<31) ? 31 : 32)
+
+//------------------------------------------------------------------------------
+// Asynchronous FIFO with Gray-code pointers
+// - The write pointer is synchronized into the read clock domain and the
+//   read pointer into the write clock domain by two flip-flops, so that
+//   s_ready and m_valid are computed from registers of their own domain.
+// - C_DEPTH is a power of 2 (4 or more).
+//------------------------------------------------------------------------------
+module async_fifo #
+  (
+   parameter integer C_WIDTH = 32,
+   parameter integer C_DEPTH = 16
+   )
+  (
+   input wire WCLK,
+   input wire WRST,
+
+   input  wire [C_WIDTH-1:0] s_data,
+   input  wire               s_valid,
+   output wire               s_ready,
+
+   input wire RCLK,
+   input wire RRST,
+
+   output wire [C_WIDTH-1:0] m_data,
+   output wire               m_valid,
+   input  wire               m_ready
+   );
+
+  localparam integer ADDR_WIDTH = `CDC_C_LOG_2(C_DEPTH);
+
+  reg [C_WIDTH-1:0] mem [0:C_DEPTH-1];
+
+  // pointers of both domains, declared before the synchronizers refer to them
+  reg  [ADDR_WIDTH:0] wbin;
+  reg  [ADDR_WIDTH:0] wgray;
+  reg  [ADDR_WIDTH:0] rgray_w1;
+  reg  [ADDR_WIDTH:0] rgray_w2;
+  wire [ADDR_WIDTH:0] wbin_next = wbin + 1;
+
+  reg  [ADDR_WIDTH:0] rbin;
+  reg  [ADDR_WIDTH:0] rgray;
+  reg  [ADDR_WIDTH:0] wgray_r1;
+  reg  [ADDR_WIDTH:0] wgray_r2;
+  wire [ADDR_WIDTH:0] rbin_next = rbin + 1;
+
+  //----------------------------------------------------------------------------
+  // Write clock domain
+  //----------------------------------------------------------------------------
+
+  // full when the pointers differ only in the two MSBs of the Gray code
+  assign s_ready = wgray != {~rgray_w2[ADDR_WIDTH:ADDR_WIDTH-1], rgray_w2[ADDR_WIDTH-2:0]};
+
+  always @(posedge WCLK) begin
+    if(WRST) begin
+      wbin <= 0;
+      wgray <= 0;
+      rgray_w1 <= 0;
+      rgray_w2 <= 0;
+    end else begin
+      rgray_w1 <= rgray;
+      rgray_w2 <= rgray_w1;
+      if(s_valid && s_ready) begin
+        wbin <= wbin_next;
+        wgray <= (wbin_next >> 1) ^ wbin_next;
+      end
+    end
+  end
+
+  always @(posedge WCLK) begin
+    if(s_valid && s_ready) begin
+      mem[wbin[ADDR_WIDTH-1:0]] <= s_data;
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Read clock domain
+  //----------------------------------------------------------------------------
+  assign m_valid = rgray != wgray_r2;
+  assign m_data = mem[rbin[ADDR_WIDTH-1:0]];
+
+  always @(posedge RCLK) begin
+    if(RRST) begin
+      rbin <= 0;
+      rgray <= 0;
+      wgray_r1 <= 0;
+      wgray_r2 <= 0;
+    end else begin
+      wgray_r1 <= wgray;
+      wgray_r2 <= wgray_r1;
+      if(m_valid && m_ready) begin
+        rbin <= rbin_next;
+        rgray <= (rbin_next >> 1) ^ rbin_next;
+      end
+    end
+  end
+
+endmodule
+
+
+module master_clock_crossing #
+  (
+   parameter integer C_ADDR_WIDTH = 32,
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_ID_WIDTH = 1,
+   parameter integer C_DEPTH = 16
+   )
+  (
+   input wire UCLK,
+   input wire URST,
+   input wire ACLK,
+   input wire ARESETN,
+
+   // User side
+   input  wire [C_ADDR_WIDTH-1:0]   awaddr,
+   input  wire [8-1:0]              awlen,
+   input  wire [C_ID_WIDTH-1:0]     awid,
+   input  wire                      awvalid,
+   output wire                      awready,
+
+   input  wire [C_DATA_WIDTH-1:0]   wdata,
+   input  wire [C_DATA_WIDTH/8-1:0] wstrb,
+   input  wire                      wlast,
+   input  wire                      wvalid,
+   output wire                      wready,
+
+   input  wire [C_ADDR_WIDTH-1:0]   araddr,
+   input  wire [8-1:0]              arlen,
+   input  wire [C_ID_WIDTH-1:0]     arid,
+   input  wire                      arvalid,
+   output wire                      arready,
+
+   output wire [C_DATA_WIDTH-1:0]   rdata,
+   output wire                      rlast,
+   output wire [C_ID_WIDTH-1:0]     rid,
+   output wire                      rvalid,
+   input  wire                      rready,
+
+   // Bus interface side
+   output wire [C_ADDR_WIDTH-1:0]   ext_awaddr,
+   output wire [8-1:0]              ext_awlen,
+   output wire [C_ID_WIDTH-1:0]     ext_awid,
+   output wire                      ext_awvalid,
+   input  wire                      ext_awready,
+
+   output wire [C_DATA_WIDTH-1:0]   ext_wdata,
+   output wire [C_DATA_WIDTH/8-1:0] ext_wstrb,
+   output wire                      ext_wlast,
+   output wire                      ext_wvalid,
+   input  wire                      ext_wready,
+
+   output wire [C_ADDR_WIDTH-1:0]   ext_araddr,
+   output wire [8-1:0]              ext_arlen,
+   output wire [C_ID_WIDTH-1:0]     ext_arid,
+   output wire                      ext_arvalid,
+   input  wire                      ext_arready,
+
+   input  wire [C_DATA_WIDTH-1:0]   ext_rdata,
+   input  wire                      ext_rlast,
+   input  wire [C_ID_WIDTH-1:0]     ext_rid,
+   input  wire                      ext_rvalid,
+   output wire                      ext_rready
+   );
+
+  localparam integer AW_WIDTH = C_ADDR_WIDTH + 8 + C_ID_WIDTH;
+  localparam integer W_WIDTH = C_DATA_WIDTH + C_DATA_WIDTH / 8 + 1;
+  localparam integer AR_WIDTH = C_ADDR_WIDTH + 8 + C_ID_WIDTH;
+  localparam integer R_WIDTH = C_DATA_WIDTH + 1 + C_ID_WIDTH;
+
+  //----------------------------------------------------------------------------
+  // Reset logic
+  //----------------------------------------------------------------------------
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  //----------------------------------------------------------------------------
+  // Channels
+  //----------------------------------------------------------------------------
+  async_fifo #
+   (
+    .C_WIDTH(AW_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_aw
+   (
+    .WCLK(UCLK),
+    .WRST(URST),
+    .s_data({awaddr, awlen, awid}),
+    .s_valid(awvalid),
+    .s_ready(awready),
+    .RCLK(ACLK),
+    .RRST(!aresetn_rrr),
+    .m_data({ext_awaddr, ext_awlen, ext_awid}),
+    .m_valid(ext_awvalid),
+    .m_ready(ext_awready)
+   );
+
+  async_fifo #
+   (
+    .C_WIDTH(W_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_w
+   (
+    .WCLK(UCLK),
+    .WRST(URST),
+    .s_data({wdata, wstrb, wlast}),
+    .s_valid(wvalid),
+    .s_ready(wready),
+    .RCLK(ACLK),
+    .RRST(!aresetn_rrr),
+    .m_data({ext_wdata, ext_wstrb, ext_wlast}),
+    .m_valid(ext_wvalid),
+    .m_ready(ext_wready)
+   );
+
+  async_fifo #
+   (
+    .C_WIDTH(AR_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_ar
+   (
+    .WCLK(UCLK),
+    .WRST(URST),
+    .s_data({araddr, arlen, arid}),
+    .s_valid(arvalid),
+    .s_ready(arready),
+    .RCLK(ACLK),
+    .RRST(!aresetn_rrr),
+    .m_data({ext_araddr, ext_arlen, ext_arid}),
+    .m_valid(ext_arvalid),
+    .m_ready(ext_arready)
+   );
+
+  async_fifo #
+   (
+    .C_WIDTH(R_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_r
+   (
+    .WCLK(ACLK),
+    .WRST(!aresetn_rrr),
+    .s_data({ext_rdata, ext_rlast, ext_rid}),
+    .s_valid(ext_rvalid),
+    .s_ready(ext_rready),
+    .RCLK(UCLK),
+    .RRST(URST),
+    .m_data({rdata, rlast, rid}),
+    .m_valid(rvalid),
+    .m_ready(rready)
+   );
+
+endmodule
+
+
+module slave_clock_crossing #
+  (
+   parameter integer C_ADDR_WIDTH = 32,
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_DEPTH = 16
+   )
+  (
+   input wire UCLK,
+   input wire URST,
+   input wire ACLK,
+   input wire ARESETN,
+
+   // User side
+   output wire [C_ADDR_WIDTH-1:0]   awaddr,
+   output wire [8-1:0]              awlen,
+   output wire                      awvalid,
+   input  wire                      awready,
+
+   output wire [C_DATA_WIDTH-1:0]   wdata,
+   output wire [C_DATA_WIDTH/8-1:0] wstrb,
+   output wire                      wlast,
+   output wire                      wvalid,
+   input  wire                      wready,
+
+   output wire [C_ADDR_WIDTH-1:0]   araddr,
+   output wire [8-1:0]              arlen,
+   output wire                      arvalid,
+   input  wire                      arready,
+
+   input  wire [C_DATA_WIDTH-1:0]   rdata,
+   input  wire                      rlast,
+   input  wire                      rvalid,
+   output wire                      rready,
+
+   // Bus interface side
+   input  wire [C_ADDR_WIDTH-1:0]   ext_awaddr,
+   input  wire [8-1:0]              ext_awlen,
+   input  wire                      ext_awvalid,
+   output wire                      ext_awready,
+
+   input  wire [C_DATA_WIDTH-1:0]   ext_wdata,
+   input  wire [C_DATA_WIDTH/8-1:0] ext_wstrb,
+   input  wire                      ext_wlast,
+   input  wire                      ext_wvalid,
+   output wire                      ext_wready,
+
+   input  wire [C_ADDR_WIDTH-1:0]   ext_araddr,
+   input  wire [8-1:0]              ext_arlen,
+   input  wire                      ext_arvalid,
+   output wire                      ext_arready,
+
+   output wire [C_DATA_WIDTH-1:0]   ext_rdata,
+   output wire                      ext_rlast,
+   output wire                      ext_rvalid,
+   input  wire                      ext_rready
+   );
+
+  localparam integer AW_WIDTH = C_ADDR_WIDTH + 8;
+  localparam integer W_WIDTH = C_DATA_WIDTH + C_DATA_WIDTH / 8 + 1;
+  localparam integer AR_WIDTH = C_ADDR_WIDTH + 8;
+  localparam integer R_WIDTH = C_DATA_WIDTH + 1;
+
+  //----------------------------------------------------------------------------
+  // Reset logic
+  //----------------------------------------------------------------------------
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  //----------------------------------------------------------------------------
+  // Channels
+  //----------------------------------------------------------------------------
+  async_fifo #
+   (
+    .C_WIDTH(AW_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_aw
+   (
+    .WCLK(ACLK),
+    .WRST(!aresetn_rrr),
+    .s_data({ext_awaddr, ext_awlen}),
+    .s_valid(ext_awvalid),
+    .s_ready(ext_awready),
+    .RCLK(UCLK),
+    .RRST(URST),
+    .m_data({awaddr, awlen}),
+    .m_valid(awvalid),
+    .m_ready(awready)
+   );
+
+  async_fifo #
+   (
+    .C_WIDTH(W_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_w
+   (
+    .WCLK(ACLK),
+    .WRST(!aresetn_rrr),
+    .s_data({ext_wdata, ext_wstrb, ext_wlast}),
+    .s_valid(ext_wvalid),
+    .s_ready(ext_wready),
+    .RCLK(UCLK),
+    .RRST(URST),
+    .m_data({wdata, wstrb, wlast}),
+    .m_valid(wvalid),
+    .m_ready(wready)
+   );
+
+  async_fifo #
+   (
+    .C_WIDTH(AR_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_ar
+   (
+    .WCLK(ACLK),
+    .WRST(!aresetn_rrr),
+    .s_data({ext_araddr, ext_arlen}),
+    .s_valid(ext_arvalid),
+    .s_ready(ext_arready),
+    .RCLK(UCLK),
+    .RRST(URST),
+    .m_data({araddr, arlen}),
+    .m_valid(arvalid),
+    .m_ready(arready)
+   );
+
+  async_fifo #
+   (
+    .C_WIDTH(R_WIDTH),
+    .C_DEPTH(C_DEPTH)
+   )
+  inst_r
+   (
+    .WCLK(UCLK),
+    .WRST(URST),
+    .s_data({rdata, rlast}),
+    .s_valid(rvalid),
+    .s_ready(rready),
+    .RCLK(ACLK),
+    .RRST(!aresetn_rrr),
+    .m_data({ext_rdata, ext_rlast}),
+    .m_valid(ext_rvalid),
+    .m_ready(ext_rready)
+   );
+
+endmodule
+
+
+module stream_clock_crossing #
+  (
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_DEPTH = 16,
+   parameter integer C_TO_BUS = 1 // 1: user logic to bus (master), 0: bus to user logic (slave)
+   )
+  (
+   input wire UCLK,
+   input wire URST,
+   input wire ACLK,
+   input wire ARESETN,
+
+   input  wire [C_DATA_WIDTH-1:0]   s_tdata,
+   input  wire [C_DATA_WIDTH/8-1:0] s_tkeep,
+   input  wire                      s_tlast,
+   input  wire                      s_tvalid,
+   output wire                      s_tready,
+
+   output wire [C_DATA_WIDTH-1:0]   m_tdata,
+   output wire [C_DATA_WIDTH/8-1:0] m_tkeep,
+   output wire                      m_tlast,
+   output wire                      m_tvalid,
+   input  wire                      m_tready
+   );
+
+  //----------------------------------------------------------------------------
+  // Reset logic
+  //----------------------------------------------------------------------------
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  generate if (C_TO_BUS) begin: to_bus
+    async_fifo #
+     (
+      .C_WIDTH(C_DATA_WIDTH + C_DATA_WIDTH / 8 + 1),
+      .C_DEPTH(C_DEPTH)
+     )
+    inst_t
+     (
+      .WCLK(UCLK),
+      .WRST(URST),
+      .s_data({s_tdata, s_tkeep, s_tlast}),
+      .s_valid(s_tvalid),
+      .s_ready(s_tready),
+      .RCLK(ACLK),
+      .RRST(!aresetn_rrr),
+      .m_data({m_tdata, m_tkeep, m_tlast}),
+      .m_valid(m_tvalid),
+      .m_ready(m_tready)
+     );
+
+  end else begin: to_user
+    async_fifo #
+     (
+      .C_WIDTH(C_DATA_WIDTH + C_DATA_WIDTH / 8 + 1),
+      .C_DEPTH(C_DEPTH)
+     )
+    inst_t
+     (
+      .WCLK(ACLK),
+      .WRST(!aresetn_rrr),
+      .s_data({s_tdata, s_tkeep, s_tlast}),
+      .s_valid(s_tvalid),
+      .s_ready(s_tready),
+      .RCLK(UCLK),
+      .RRST(URST),
+      .m_data({m_tdata, m_tkeep, m_tlast}),
+      .m_valid(m_tvalid),
+      .m_ready(m_tready)
+     );
+
+  end endgenerate
+
+endmodule
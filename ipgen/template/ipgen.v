@@ -4,6 +4,13 @@
 // - ipgen_slave_memory:   memory-mapped access interface (slave)
 // - ipgen_master_lite_memory:  memory-mapped access lite interface (master)
 // - ipgen_slave_lite_memory:   memory-mapped access lite interface (slave)
+// - ipgen_master_cached_memory:  memory-mapped access interface with read cache (master)
+// - ipgen_master_cached_lite_memory:  lite interface with read cache (master)
+// - ipgen_master_combining_lite_memory:  lite interface with write combining (master)
+// - ipgen_master_dma:     descriptor-based DMA engine (master)
+// - ipgen_master_stream:  stream interface (master)
+// - ipgen_slave_stream:   stream interface (slave)
+// - ipgen_interrupt:      level-sensitive interrupt request (output)
 //------------------------------------------------------------------------------
 
 //------------------------------------------------------------------------------
@@ -12,7 +19,16 @@ module ipgen_master_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter ID_WIDTH = 1, // 2 ** ID_WIDTH transaction IDs
+   parameter OUT_OF_ORDER = 0, // 0: in-order completion, 1: tagged by awid/arid/rid
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter MAX_BURST_LEN = 0, // max beats per external burst (up to 256), 0: configuration default
+   parameter BURST_SPLIT = 0, // 1: split bursts at MAX_BURST_LEN and 4KB boundaries, 0: configuration default
+   parameter FIFO_DEPTH = 0, // split bursts in flight (power of 2), 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -22,6 +38,7 @@ module ipgen_master_memory #
    input wire                     awvalid,
    input wire  [ADDR_WIDTH-1:0]   awaddr,
    input wire  [8-1:0]            awlen,
+   input wire  [ID_WIDTH-1:0]     awid,
    output wire                    awready,
   
    // Write Data
@@ -35,11 +52,13 @@ module ipgen_master_memory #
    input wire                     arvalid,
    input wire  [ADDR_WIDTH-1:0]   araddr,
    input wire  [8-1:0]            arlen,
+   input wire  [ID_WIDTH-1:0]     arid,
    output wire                    arready,
 
    // Read Data
    output wire [DATA_WIDTH-1:0]   rdata,
    output wire                    rlast,
+   output wire [ID_WIDTH-1:0]     rid,
    output wire                    rvalid,
    input wire                     rready,
 
@@ -48,6 +67,7 @@ module ipgen_master_memory #
    output wire                    ext_awvalid,
    output wire [ADDR_WIDTH-1:0]   ext_awaddr,
    output wire [8-1:0]            ext_awlen,
+   output wire [ID_WIDTH-1:0]     ext_awid,
    input wire                     ext_awready,
   
    // Write Data
@@ -61,11 +81,13 @@ module ipgen_master_memory #
    output wire                    ext_arvalid,
    output wire [ADDR_WIDTH-1:0]   ext_araddr,
    output wire [8-1:0]            ext_arlen,
+   output wire [ID_WIDTH-1:0]     ext_arid,
    input wire                     ext_arready,
 
    // Read Data
    input wire  [DATA_WIDTH-1:0]   ext_rdata,
    input wire                     ext_rlast,
+   input wire  [ID_WIDTH-1:0]     ext_rid,
    input wire                     ext_rvalid,
    output wire                    ext_rready
    );
@@ -73,6 +95,7 @@ module ipgen_master_memory #
   assign ext_awvalid = awvalid;
   assign ext_awaddr = awaddr;
   assign ext_awlen = awlen;
+  assign ext_awid = awid;
   assign awready = ext_awready;
 
   assign ext_wdata = wdata;
@@ -84,10 +107,12 @@ module ipgen_master_memory #
   assign ext_arvalid = arvalid;
   assign ext_araddr = araddr;
   assign ext_arlen = arlen;
+  assign ext_arid = arid;
   assign arready = ext_arready;
 
   assign rdata = ext_rdata;
   assign rlast = ext_rlast;
+  assign rid = ext_rid;
   assign rvalid = ext_rvalid;
   assign ext_rready = rready;
 endmodule
@@ -98,7 +123,8 @@ module ipgen_slave_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -184,7 +210,8 @@ module ipgen_master_lite_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -258,7 +285,8 @@ module ipgen_slave_lite_memory #
    parameter NAME = "undefined",
    parameter ID = 0,
    parameter ADDR_WIDTH = 32, // up to 32
-   parameter DATA_WIDTH = 32  // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
    )
   (
    input CLK,
@@ -326,3 +354,610 @@ module ipgen_slave_lite_memory #
   assign rready = ext_rready;
 endmodule
 
+//------------------------------------------------------------------------------
+module ipgen_master_cached_memory #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter ID_WIDTH = 1, // 2 ** ID_WIDTH transaction IDs, completed in-order
+   parameter LINE_SIZE = 8, // words per line (power of 2), a line is filled by a burst
+   parameter LINES = 64, // lines of the cache (WAYS * power of 2)
+   parameter WAYS = 2, // associativity
+   parameter PREFETCH = 1, // next lines prefetched on a miss (0 to 15), 0: no prefetch
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Write Address
+   input wire                     awvalid,
+   input wire  [ADDR_WIDTH-1:0]   awaddr,
+   input wire  [8-1:0]            awlen,
+   input wire  [ID_WIDTH-1:0]     awid,
+   output wire                    awready,
+  
+   // Write Data
+   input wire  [DATA_WIDTH-1:0]   wdata,
+   input wire  [DATA_WIDTH/8-1:0] wstrb,
+   input wire                     wlast,
+   input wire                     wvalid,
+   output wire                    wready,
+
+   // Read Address
+   input wire                     arvalid,
+   input wire  [ADDR_WIDTH-1:0]   araddr,
+   input wire  [8-1:0]            arlen,
+   input wire  [ID_WIDTH-1:0]     arid,
+   output wire                    arready,
+
+   // Read Data
+   output wire [DATA_WIDTH-1:0]   rdata,
+   output wire                    rlast,
+   output wire [ID_WIDTH-1:0]     rid,
+   output wire                    rvalid,
+   input wire                     rready,
+
+   // Cache Statistics
+   output wire [32-1:0]           hits,
+   output wire [32-1:0]           misses,
+
+   
+   // Write Address
+   output wire                    ext_awvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_awaddr,
+   output wire [8-1:0]            ext_awlen,
+   output wire [ID_WIDTH-1:0]     ext_awid,
+   input wire                     ext_awready,
+  
+   // Write Data
+   output wire [DATA_WIDTH-1:0]   ext_wdata,
+   output wire [DATA_WIDTH/8-1:0] ext_wstrb,
+   output wire                    ext_wlast,
+   output wire                    ext_wvalid,
+   input wire                     ext_wready,
+   
+   // Read Address
+   output wire                    ext_arvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_araddr,
+   output wire [8-1:0]            ext_arlen,
+   output wire [ID_WIDTH-1:0]     ext_arid,
+   input wire                     ext_arready,
+
+   // Read Data
+   input wire  [DATA_WIDTH-1:0]   ext_rdata,
+   input wire                     ext_rlast,
+   input wire  [ID_WIDTH-1:0]     ext_rid,
+   input wire                     ext_rvalid,
+   output wire                    ext_rready
+   );
+
+  master_cache #
+   (
+    .C_ADDR_WIDTH(ADDR_WIDTH),
+    .C_DATA_WIDTH(DATA_WIDTH),
+    .C_ID_WIDTH(ID_WIDTH),
+    .C_LINE_SIZE(LINE_SIZE),
+    .C_LINES(LINES),
+    .C_WAYS(WAYS),
+    .C_PREFETCH(PREFETCH)
+   )
+  inst_master_cache
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .awvalid(awvalid),
+    .awaddr(awaddr),
+    .awlen(awlen),
+    .awid(awid),
+    .awready(awready),
+    .wdata(wdata),
+    .wstrb(wstrb),
+    .wlast(wlast),
+    .wvalid(wvalid),
+    .wready(wready),
+    .arvalid(arvalid),
+    .araddr(araddr),
+    .arlen(arlen),
+    .arid(arid),
+    .arready(arready),
+    .rdata(rdata),
+    .rlast(rlast),
+    .rid(rid),
+    .rvalid(rvalid),
+    .rready(rready),
+    .hits(hits),
+    .misses(misses),
+    .m_awvalid(ext_awvalid),
+    .m_awaddr(ext_awaddr),
+    .m_awlen(ext_awlen),
+    .m_awid(ext_awid),
+    .m_awready(ext_awready),
+    .m_wdata(ext_wdata),
+    .m_wstrb(ext_wstrb),
+    .m_wlast(ext_wlast),
+    .m_wvalid(ext_wvalid),
+    .m_wready(ext_wready),
+    .m_arvalid(ext_arvalid),
+    .m_araddr(ext_araddr),
+    .m_arlen(ext_arlen),
+    .m_arid(ext_arid),
+    .m_arready(ext_arready),
+    .m_rdata(ext_rdata),
+    .m_rvalid(ext_rvalid),
+    .m_rready(ext_rready)
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_cached_lite_memory #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter LINE_SIZE = 8, // words per line (power of 2), a line is filled by a burst
+   parameter LINES = 64, // lines of the cache (WAYS * power of 2)
+   parameter WAYS = 2, // associativity
+   parameter PREFETCH = 1, // next lines prefetched on a miss (0 to 15), 0: no prefetch
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Write Address
+   input wire                     awvalid,
+   input wire  [ADDR_WIDTH-1:0]   awaddr,
+   output wire                    awready,
+  
+   // Write Data
+   input wire  [DATA_WIDTH-1:0]   wdata,
+   input wire  [DATA_WIDTH/8-1:0] wstrb,
+   input wire                     wvalid,
+   output wire                    wready,
+
+   // Read Address
+   input wire                     arvalid,
+   input wire  [ADDR_WIDTH-1:0]   araddr,
+   output wire                    arready,
+
+   // Read Data
+   output wire [DATA_WIDTH-1:0]   rdata,
+   output wire                    rvalid,
+   input wire                     rready,
+
+   // Cache Statistics
+   output wire [32-1:0]           hits,
+   output wire [32-1:0]           misses,
+
+   
+   // Write Address
+   output wire                    ext_awvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_awaddr,
+   output wire [8-1:0]            ext_awlen,
+   output wire [1-1:0]            ext_awid,
+   input wire                     ext_awready,
+  
+   // Write Data
+   output wire [DATA_WIDTH-1:0]   ext_wdata,
+   output wire [DATA_WIDTH/8-1:0] ext_wstrb,
+   output wire                    ext_wlast,
+   output wire                    ext_wvalid,
+   input wire                     ext_wready,
+   
+   // Read Address
+   output wire                    ext_arvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_araddr,
+   output wire [8-1:0]            ext_arlen,
+   output wire [1-1:0]            ext_arid,
+   input wire                     ext_arready,
+
+   // Read Data
+   input wire  [DATA_WIDTH-1:0]   ext_rdata,
+   input wire                     ext_rlast,
+   input wire  [1-1:0]            ext_rid,
+   input wire                     ext_rvalid,
+   output wire                    ext_rready
+   );
+
+  master_cache #
+   (
+    .C_ADDR_WIDTH(ADDR_WIDTH),
+    .C_DATA_WIDTH(DATA_WIDTH),
+    .C_ID_WIDTH(1),
+    .C_LINE_SIZE(LINE_SIZE),
+    .C_LINES(LINES),
+    .C_WAYS(WAYS),
+    .C_PREFETCH(PREFETCH)
+   )
+  inst_master_cache
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .awvalid(awvalid),
+    .awaddr(awaddr),
+    .awlen(0),
+    .awid(0),
+    .awready(awready),
+    .wdata(wdata),
+    .wstrb(wstrb),
+    .wlast(1'b1),
+    .wvalid(wvalid),
+    .wready(wready),
+    .arvalid(arvalid),
+    .araddr(araddr),
+    .arlen(0),
+    .arid(0),
+    .arready(arready),
+    .rdata(rdata),
+    .rlast(),
+    .rid(),
+    .rvalid(rvalid),
+    .rready(rready),
+    .hits(hits),
+    .misses(misses),
+    .m_awvalid(ext_awvalid),
+    .m_awaddr(ext_awaddr),
+    .m_awlen(ext_awlen),
+    .m_awid(ext_awid),
+    .m_awready(ext_awready),
+    .m_wdata(ext_wdata),
+    .m_wstrb(ext_wstrb),
+    .m_wlast(ext_wlast),
+    .m_wvalid(ext_wvalid),
+    .m_wready(ext_wready),
+    .m_arvalid(ext_arvalid),
+    .m_araddr(ext_araddr),
+    .m_arlen(ext_arlen),
+    .m_arid(ext_arid),
+    .m_arready(ext_arready),
+    .m_rdata(ext_rdata),
+    .m_rvalid(ext_rvalid),
+    .m_rready(ext_rready)
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_combining_lite_memory #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter WC_SIZE = 16, // words of the buffer (power of 2), written by a burst
+   parameter WC_TIMEOUT = 64, // cycles without stores before a flush, 0: no timeout
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Write Address
+   input wire                     awvalid,
+   input wire  [ADDR_WIDTH-1:0]   awaddr,
+   output wire                    awready,
+  
+   // Write Data
+   input wire  [DATA_WIDTH-1:0]   wdata,
+   input wire  [DATA_WIDTH/8-1:0] wstrb,
+   input wire                     wvalid,
+   output wire                    wready,
+
+   // Read Address
+   input wire                     arvalid,
+   input wire  [ADDR_WIDTH-1:0]   araddr,
+   output wire                    arready,
+
+   // Read Data
+   output wire [DATA_WIDTH-1:0]   rdata,
+   output wire                    rvalid,
+   input wire                     rready,
+
+   // Write Combining
+   input wire                     flush, // writes the buffered stores
+   output wire                    idle, // no store is buffered or being written
+
+   
+   // Write Address
+   output wire                    ext_awvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_awaddr,
+   output wire [8-1:0]            ext_awlen,
+   output wire [1-1:0]            ext_awid,
+   input wire                     ext_awready,
+  
+   // Write Data
+   output wire [DATA_WIDTH-1:0]   ext_wdata,
+   output wire [DATA_WIDTH/8-1:0] ext_wstrb,
+   output wire                    ext_wlast,
+   output wire                    ext_wvalid,
+   input wire                     ext_wready,
+   
+   // Read Address
+   output wire                    ext_arvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_araddr,
+   output wire [8-1:0]            ext_arlen,
+   output wire [1-1:0]            ext_arid,
+   input wire                     ext_arready,
+
+   // Read Data
+   input wire  [DATA_WIDTH-1:0]   ext_rdata,
+   input wire                     ext_rlast,
+   input wire  [1-1:0]            ext_rid,
+   input wire                     ext_rvalid,
+   output wire                    ext_rready
+   );
+
+  master_wcombine #
+   (
+    .C_ADDR_WIDTH(ADDR_WIDTH),
+    .C_DATA_WIDTH(DATA_WIDTH),
+    .C_SIZE(WC_SIZE),
+    .C_TIMEOUT(WC_TIMEOUT)
+   )
+  inst_master_wcombine
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .awvalid(awvalid),
+    .awaddr(awaddr),
+    .awready(awready),
+    .wdata(wdata),
+    .wstrb(wstrb),
+    .wvalid(wvalid),
+    .wready(wready),
+    .arvalid(arvalid),
+    .araddr(araddr),
+    .arready(arready),
+    .rdata(rdata),
+    .rvalid(rvalid),
+    .rready(rready),
+    .flush(flush),
+    .idle(idle),
+    .m_awvalid(ext_awvalid),
+    .m_awaddr(ext_awaddr),
+    .m_awlen(ext_awlen),
+    .m_awid(ext_awid),
+    .m_awready(ext_awready),
+    .m_wdata(ext_wdata),
+    .m_wstrb(ext_wstrb),
+    .m_wlast(ext_wlast),
+    .m_wvalid(ext_wvalid),
+    .m_wready(ext_wready),
+    .m_arvalid(ext_arvalid),
+    .m_araddr(ext_araddr),
+    .m_arlen(ext_arlen),
+    .m_arid(ext_arid),
+    .m_arready(ext_arready),
+    .m_rdata(ext_rdata),
+    .m_rvalid(ext_rvalid),
+    .m_rready(ext_rready)
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_dma #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter ADDR_WIDTH = 32, // up to 32
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter OUTSTANDING = 0, // max outstanding bursts per direction, 0: configuration default
+   parameter MAX_BURST_LEN = 0, // max beats per burst (up to 256), 0: 16
+   parameter BUFFER_DEPTH = 0, // words of each data FIFO (power of 2, MAX_BURST_LEN or more), 0: 4 bursts
+   parameter QUEUE_DEPTH = 4, // descriptors queued per direction (power of 2)
+   parameter EXT_DATA_WIDTH = 0, // data width of the external port, 0: configuration default
+   parameter QOS = 0, // arbitration priority (0 to 15) on a merged port
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, per channel as "aw:full,r:forward", "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   // Descriptor: op[0] reads src, op[1] writes dst, chain: src points a descriptor chain
+   input wire                     desc_valid,
+   output wire                    desc_ready,
+   input wire  [ADDR_WIDTH-1:0]   desc_src,
+   input wire  [ADDR_WIDTH-1:0]   desc_dst,
+   input wire  [32-1:0]           desc_len, // in words
+   input wire  [ADDR_WIDTH-1:0]   desc_stride, // in bytes, 0: contiguous
+   input wire  [2-1:0]            desc_op,
+   input wire                     desc_chain,
+
+   // Read Data Stream: rd_last at the last word of each descriptor
+   output wire [DATA_WIDTH-1:0]   rd_data,
+   output wire                    rd_last,
+   output wire                    rd_valid,
+   input wire                     rd_ready,
+
+   // Write Data Stream: wr_done when the last word of a descriptor is sent
+   input wire  [DATA_WIDTH-1:0]   wr_data,
+   input wire                     wr_valid,
+   output wire                    wr_ready,
+   output wire                    wr_done,
+
+   output wire                    busy,
+
+   
+   // Write Address
+   output wire                    ext_awvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_awaddr,
+   output wire [8-1:0]            ext_awlen,
+   output wire [1-1:0]            ext_awid,
+   input wire                     ext_awready,
+  
+   // Write Data
+   output wire [DATA_WIDTH-1:0]   ext_wdata,
+   output wire [DATA_WIDTH/8-1:0] ext_wstrb,
+   output wire                    ext_wlast,
+   output wire                    ext_wvalid,
+   input wire                     ext_wready,
+   
+   // Read Address
+   output wire                    ext_arvalid,
+   output wire [ADDR_WIDTH-1:0]   ext_araddr,
+   output wire [8-1:0]            ext_arlen,
+   output wire [1-1:0]            ext_arid,
+   input wire                     ext_arready,
+
+   // Read Data
+   input wire  [DATA_WIDTH-1:0]   ext_rdata,
+   input wire                     ext_rlast,
+   input wire  [1-1:0]            ext_rid,
+   input wire                     ext_rvalid,
+   output wire                    ext_rready
+   );
+
+  assign ext_awid = 0;
+  assign ext_arid = 0;
+
+  master_dma #
+   (
+    .C_ADDR_WIDTH(ADDR_WIDTH),
+    .C_DATA_WIDTH(DATA_WIDTH),
+    .C_BURST_LEN((MAX_BURST_LEN == 0)? 16 : MAX_BURST_LEN),
+    .C_BUFFER_DEPTH(BUFFER_DEPTH),
+    .C_QUEUE_DEPTH(QUEUE_DEPTH)
+   )
+  inst_master_dma
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .desc_valid(desc_valid),
+    .desc_ready(desc_ready),
+    .desc_src(desc_src),
+    .desc_dst(desc_dst),
+    .desc_len(desc_len),
+    .desc_stride(desc_stride),
+    .desc_op(desc_op),
+    .desc_chain(desc_chain),
+    .rd_data(rd_data),
+    .rd_last(rd_last),
+    .rd_valid(rd_valid),
+    .rd_ready(rd_ready),
+    .wr_data(wr_data),
+    .wr_valid(wr_valid),
+    .wr_ready(wr_ready),
+    .wr_done(wr_done),
+    .busy(busy),
+    .awvalid(ext_awvalid),
+    .awaddr(ext_awaddr),
+    .awlen(ext_awlen),
+    .awready(ext_awready),
+    .wdata(ext_wdata),
+    .wstrb(ext_wstrb),
+    .wlast(ext_wlast),
+    .wvalid(ext_wvalid),
+    .wready(ext_wready),
+    .arvalid(ext_arvalid),
+    .araddr(ext_araddr),
+    .arlen(ext_arlen),
+    .arready(ext_arready),
+    .rdata(ext_rdata),
+    .rvalid(ext_rvalid),
+    .rready(ext_rready)
+   );
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_master_stream #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   input wire  [DATA_WIDTH-1:0]   tdata,
+   input wire  [DATA_WIDTH/8-1:0] tkeep,
+   input wire                     tlast,
+   input wire                     tvalid,
+   output wire                    tready,
+
+   
+   output wire [DATA_WIDTH-1:0]   ext_tdata,
+   output wire [DATA_WIDTH/8-1:0] ext_tkeep,
+   output wire                    ext_tlast,
+   output wire                    ext_tvalid,
+   input wire                     ext_tready
+   );
+
+  assign ext_tdata = tdata;
+  assign ext_tkeep = tkeep;
+  assign ext_tlast = tlast;
+  assign ext_tvalid = tvalid;
+  assign tready = ext_tready;
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_slave_stream #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0,
+   parameter DATA_WIDTH = 32, // 8, 16, 32, 64, 128, 256, and 512 are supported
+   parameter REGISTER_SLICE = "" // none, forward, reverse or full, "": configuration default
+   )
+  (
+   input CLK,
+   input RST,
+   
+   output wire [DATA_WIDTH-1:0]   tdata,
+   output wire [DATA_WIDTH/8-1:0] tkeep,
+   output wire                    tlast,
+   output wire                    tvalid,
+   input wire                     tready,
+
+   
+   input wire  [DATA_WIDTH-1:0]   ext_tdata,
+   input wire  [DATA_WIDTH/8-1:0] ext_tkeep,
+   input wire                     ext_tlast,
+   input wire                     ext_tvalid,
+   output wire                    ext_tready
+   );
+
+  assign tdata = ext_tdata;
+  assign tkeep = ext_tkeep;
+  assign tlast = ext_tlast;
+  assign tvalid = ext_tvalid;
+  assign ext_tready = tready;
+endmodule
+
+//------------------------------------------------------------------------------
+module ipgen_interrupt #
+  (
+   parameter NAME = "undefined",
+   parameter ID = 0
+   )
+  (
+   input CLK,
+   input RST,
+   
+   input wire                     irq, // held high until cleared by the host
+
+   
+   output reg                     ext_irq
+   );
+
+  // registered, so that the interrupt line has no glitch of the user logic
+  always @(posedge CLK) begin
+    if(RST) begin
+      ext_irq <= 0;
+    end else begin
+      ext_irq <= irq;
+    end
+  end
+endmodule
@@ -0,0 +1,307 @@
+
+`define MARB_C_LOG_2(n) (\
+(n) <= (1<<0) ? 0 : (n) <= (1<<1) ? 1 :\
+(n) <= (1<<2) ? 2 : (n) <= (1<<3) ? 3 :\
+(n) <= (1<<4) ? 4 : (n) <= (1<<5) ? 5 :\
+(n) <= (1<<6) ? 6 : (n) <= (1<<7) ? 7 :\
+(n) <= (1<<8) ? 8 : (n) <= (1<<9) ? 9 :\
+(n) <= (1<<10) ? 10 : (n) <= (1<<11) ? 11 :\
+(n) <= (1<<12) ? 12 : (n) <= (1<<13) ? 13 :\
+(n) <= (1<<14) ? 14 : (n) <= (1<<15) ? 15 :\
+(n) <= (1<<16) ? 16 : (n) <= (1<<17) ? 17 :\
+(n) <= (1<<18) ? 18 : (n) <= (1<<19) ? 19 :\
+(n) <= (1<<20) ? 20 : (n) <= (1<<21) ? 21 :\
+(n) <= (1<<22) ? 22 : (n) <= (1<<23) ? 23 :\
+(n) <= (1<<24) ? 24 : (n) <= (1<<25) ? 25 :\
+(n) <= (1<<26) ? 26 : (n) <= (1<<27) ? 27 :\
+(n) <= (1<<28) ? 28 : (n) <= (1<<29) ? 29 :\
+(n) <= (1<<30) ? 30 : (n) <= (1<<31) ? 31 : 32)
+
+//------------------------------------------------------------------------------
+// Arbiter merging several user master interfaces onto one external port
+// - The upper C_INDEX_WIDTH bits of the external ID are the index of the
+//   master, by which the read data is routed back.
+// - Write data follows the order of the granted write addresses.
+// - C_POLICY 0: round-robin
+//            1: weighted round-robin, up to QOS + 1 consecutive bursts
+//            2: highest QOS first, round-robin among the same QOS
+// - Masters are flattened into vectors, master 0 at the LSB.
+//------------------------------------------------------------------------------
+module master_arbiter #
+  (
+   parameter integer C_NUM_MASTERS  = 2,
+   parameter integer C_ADDR_WIDTH   = 32,
+   parameter integer C_DATA_WIDTH   = 32,
+   parameter integer C_ID_WIDTH     = 1, // ID width of each master
+   parameter integer C_INDEX_WIDTH  = 1, // log2(C_NUM_MASTERS), 1 or more
+   parameter integer C_POLICY       = 0,
+   parameter [C_NUM_MASTERS*4-1:0] C_QOS = 0, // 4 bits per master
+   parameter integer C_FIFO_DEPTH   = 16 // write bursts in flight, power of 2
+   )
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   //----------------------------------------------------------------------------
+   // Master Side
+   //----------------------------------------------------------------------------
+   // Write Address
+   input wire  [C_NUM_MASTERS*C_ADDR_WIDTH-1:0]   awaddr,
+   input wire  [C_NUM_MASTERS*8-1:0]              awlen,
+   input wire  [C_NUM_MASTERS*C_ID_WIDTH-1:0]     awid,
+   input wire  [C_NUM_MASTERS-1:0]                awvalid,
+   output wire [C_NUM_MASTERS-1:0]                awready,
+
+   // Write Data
+   input wire  [C_NUM_MASTERS*C_DATA_WIDTH-1:0]   wdata,
+   input wire  [C_NUM_MASTERS*C_DATA_WIDTH/8-1:0] wstrb,
+   input wire  [C_NUM_MASTERS-1:0]                wlast,
+   input wire  [C_NUM_MASTERS-1:0]                wvalid,
+   output wire [C_NUM_MASTERS-1:0]                wready,
+
+   // Read Address
+   input wire  [C_NUM_MASTERS*C_ADDR_WIDTH-1:0]   araddr,
+   input wire  [C_NUM_MASTERS*8-1:0]              arlen,
+   input wire  [C_NUM_MASTERS*C_ID_WIDTH-1:0]     arid,
+   input wire  [C_NUM_MASTERS-1:0]                arvalid,
+   output wire [C_NUM_MASTERS-1:0]                arready,
+
+   // Read Data
+   output wire [C_NUM_MASTERS*C_DATA_WIDTH-1:0]   rdata,
+   output wire [C_NUM_MASTERS-1:0]                rlast,
+   output wire [C_NUM_MASTERS*C_ID_WIDTH-1:0]     rid,
+   output wire [C_NUM_MASTERS-1:0]                rvalid,
+   input wire  [C_NUM_MASTERS-1:0]                rready,
+
+   //----------------------------------------------------------------------------
+   // External Side
+   //----------------------------------------------------------------------------
+   // Write Address
+   output wire [C_ADDR_WIDTH-1:0]                 ext_awaddr,
+   output wire [8-1:0]                            ext_awlen,
+   output wire [C_INDEX_WIDTH+C_ID_WIDTH-1:0]     ext_awid,
+   output wire                                    ext_awvalid,
+   input wire                                     ext_awready,
+
+   // Write Data
+   output wire [C_DATA_WIDTH-1:0]                 ext_wdata,
+   output wire [C_DATA_WIDTH/8-1:0]               ext_wstrb,
+   output wire                                    ext_wlast,
+   output wire                                    ext_wvalid,
+   input wire                                     ext_wready,
+
+   // Read Address
+   output wire [C_ADDR_WIDTH-1:0]                 ext_araddr,
+   output wire [8-1:0]                            ext_arlen,
+   output wire [C_INDEX_WIDTH+C_ID_WIDTH-1:0]     ext_arid,
+   output wire                                    ext_arvalid,
+   input wire                                     ext_arready,
+
+   // Read Data
+   input wire  [C_DATA_WIDTH-1:0]                 ext_rdata,
+   input wire                                     ext_rlast,
+   input wire  [C_INDEX_WIDTH+C_ID_WIDTH-1:0]     ext_rid,
+   input wire                                     ext_rvalid,
+   output wire                                    ext_rready
+   );
+
+  localparam integer FIFO_ADDR_WIDTH = `MARB_C_LOG_2(C_FIFO_DEPTH);
+  localparam integer FIFO_DEPTH = 2 ** FIFO_ADDR_WIDTH;
+
+  //----------------------------------------------------------------------------
+  // Reset logic
+  //----------------------------------------------------------------------------
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  //----------------------------------------------------------------------------
+  // Write Address
+  //----------------------------------------------------------------------------
+  reg [C_INDEX_WIDTH-1:0] wq_index [0:FIFO_DEPTH-1];
+  reg [FIFO_ADDR_WIDTH:0] wq_head;
+  reg [FIFO_ADDR_WIDTH:0] wq_tail;
+  wire wq_full;
+  wire wq_empty;
+
+  wire [C_INDEX_WIDTH-1:0] aw_grant;
+  wire aw_request;
+  wire aw_fire;
+
+  assign wq_full = (wq_tail - wq_head == FIFO_DEPTH);
+  assign wq_empty = (wq_tail == wq_head);
+
+  master_arbiter_grant #
+    (
+     .C_NUM_MASTERS(C_NUM_MASTERS),
+     .C_INDEX_WIDTH(C_INDEX_WIDTH),
+     .C_POLICY(C_POLICY),
+     .C_QOS(C_QOS)
+     )
+  inst_aw_grant
+    (
+     .ACLK(ACLK),
+     .RST(!aresetn_rrr),
+     .request(awvalid & {C_NUM_MASTERS{!wq_full}}),
+     .accept(aw_fire),
+     .grant(aw_grant),
+     .valid(aw_request)
+     );
+
+  assign ext_awaddr = awaddr[aw_grant*C_ADDR_WIDTH +: C_ADDR_WIDTH];
+  assign ext_awlen = awlen[aw_grant*8 +: 8];
+  assign ext_awid = {aw_grant, awid[aw_grant*C_ID_WIDTH +: C_ID_WIDTH]};
+  assign ext_awvalid = aw_request;
+  assign aw_fire = ext_awvalid && ext_awready;
+
+  //----------------------------------------------------------------------------
+  // Write Data: in the order of the write addresses
+  //----------------------------------------------------------------------------
+  wire [C_INDEX_WIDTH-1:0] w_index;
+
+  assign w_index = wq_index[wq_head[FIFO_ADDR_WIDTH-1:0]];
+  assign ext_wdata = wdata[w_index*C_DATA_WIDTH +: C_DATA_WIDTH];
+  assign ext_wstrb = wstrb[w_index*C_DATA_WIDTH/8 +: C_DATA_WIDTH/8];
+  assign ext_wlast = wlast[w_index];
+  assign ext_wvalid = !wq_empty && wvalid[w_index];
+
+  always @(posedge ACLK) begin
+    if (aresetn_rrr == 0) begin
+      wq_head <= 0;
+      wq_tail <= 0;
+    end else begin
+      if (aw_fire) begin
+        wq_index[wq_tail[FIFO_ADDR_WIDTH-1:0]] <= aw_grant;
+        wq_tail <= wq_tail + 1;
+      end
+      if (ext_wvalid && ext_wready && ext_wlast) begin
+        wq_head <= wq_head + 1;
+      end
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Read Address
+  //----------------------------------------------------------------------------
+  wire [C_INDEX_WIDTH-1:0] ar_grant;
+  wire ar_request;
+
+  master_arbiter_grant #
+    (
+     .C_NUM_MASTERS(C_NUM_MASTERS),
+     .C_INDEX_WIDTH(C_INDEX_WIDTH),
+     .C_POLICY(C_POLICY),
+     .C_QOS(C_QOS)
+     )
+  inst_ar_grant
+    (
+     .ACLK(ACLK),
+     .RST(!aresetn_rrr),
+     .request(arvalid),
+     .accept(ext_arvalid && ext_arready),
+     .grant(ar_grant),
+     .valid(ar_request)
+     );
+
+  assign ext_araddr = araddr[ar_grant*C_ADDR_WIDTH +: C_ADDR_WIDTH];
+  assign ext_arlen = arlen[ar_grant*8 +: 8];
+  assign ext_arid = {ar_grant, arid[ar_grant*C_ID_WIDTH +: C_ID_WIDTH]};
+  assign ext_arvalid = ar_request;
+
+  //----------------------------------------------------------------------------
+  // Read Data: routed by the upper bits of the ID
+  //----------------------------------------------------------------------------
+  wire [C_INDEX_WIDTH-1:0] r_index;
+
+  assign r_index = ext_rid[C_INDEX_WIDTH+C_ID_WIDTH-1:C_ID_WIDTH];
+  assign ext_rready = rready[r_index];
+
+  genvar i;
+  generate for (i = 0; i < C_NUM_MASTERS; i = i + 1) begin : route
+    assign awready[i] = ext_awready && !wq_full && (aw_grant == i);
+    assign wready[i] = ext_wready && !wq_empty && (w_index == i);
+    assign arready[i] = ext_arready && (ar_grant == i);
+    assign rdata[i*C_DATA_WIDTH +: C_DATA_WIDTH] = ext_rdata;
+    assign rlast[i] = ext_rlast;
+    assign rid[i*C_ID_WIDTH +: C_ID_WIDTH] = ext_rid[C_ID_WIDTH-1:0];
+    assign rvalid[i] = ext_rvalid && (r_index == i);
+  end endgenerate
+
+endmodule
+
+//------------------------------------------------------------------------------
+// Grant of one address channel. The grant is held until it is accepted.
+//------------------------------------------------------------------------------
+module master_arbiter_grant #
+  (
+   parameter integer C_NUM_MASTERS  = 2,
+   parameter integer C_INDEX_WIDTH  = 1,
+   parameter integer C_POLICY       = 0,
+   parameter [C_NUM_MASTERS*4-1:0] C_QOS = 0
+   )
+  (
+   input wire                      ACLK,
+   input wire                      RST,
+   input wire  [C_NUM_MASTERS-1:0] request,
+   input wire                      accept,
+   output wire [C_INDEX_WIDTH-1:0] grant,
+   output wire                     valid
+   );
+
+  reg [C_INDEX_WIDTH-1:0] last;
+  reg [5-1:0] count;
+  reg locked;
+  reg [C_INDEX_WIDTH-1:0] locked_index;
+
+  reg [C_INDEX_WIDTH-1:0] candidate;
+  reg found;
+  reg [4-1:0] best_qos;
+  integer i;
+  integer j;
+
+  // rotating priority from the master next to the last granted one
+  always @(*) begin
+    candidate = last;
+    found = 0;
+    best_qos = 0;
+    for (i = 1; i <= C_NUM_MASTERS; i = i + 1) begin
+      j = last + i;
+      if (j >= C_NUM_MASTERS) j = j - C_NUM_MASTERS;
+      if (request[j] && (!found || (C_POLICY == 2 && C_QOS[j*4 +: 4] > best_qos))) begin
+        candidate = j;
+        found = 1;
+        best_qos = C_QOS[j*4 +: 4];
+      end
+    end
+    if (C_POLICY == 1 && request[last] && count < C_QOS[last*4 +: 4]) begin
+      candidate = last;
+    end
+  end
+
+  assign grant = (locked)? locked_index : candidate;
+  assign valid = |request;
+
+  always @(posedge ACLK) begin
+    if (RST) begin
+      last <= C_NUM_MASTERS - 1;
+      count <= 0;
+      locked <= 0;
+      locked_index <= 0;
+    end else if (accept) begin
+      last <= grant;
+      if (grant != last) count <= 0;
+      else if (count < 16) count <= count + 1;
+      locked <= 0;
+    end else if (valid) begin
+      locked <= 1;
+      locked_index <= grant;
+    end
+  end
+
+endmodule
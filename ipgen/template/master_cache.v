@@ -0,0 +1,457 @@
+
+`define MCACHE_C_LOG_2(n) (\
+(n) <= (1<<0) ? 0 : (n) <= (1<<1) ? 1 :\
+(n) <= (1<<2) ? 2 : (n) <= (1<<3) ? 3 :\
+(n) <= (1<<4) ? 4 : (n) <= (1<<5) ? 5 :\
+(n) <= (1<<6) ? 6 : (n) <= (1<<7) ? 7 :\
+(n) <= (1<<8) ? 8 : (n) <= (1<<9) ? 9 :\
+(n) <= (1<<10) ? 10 : (n) <= (1<<11) ? 11 :\
+(n) <= (1<<12) ? 12 : (n) <= (1<<13) ? 13 :\
+(n) <= (1<<14) ? 14 : (n) <= (1<<15) ? 15 :\
+(n) <= (1<<16) ? 16 : (n) <= (1<<17) ? 17 :\
+(n) <= (1<<18) ? 18 : (n) <= (1<<19) ? 19 :\
+(n) <= (1<<20) ? 20 : (n) <= (1<<21) ? 21 :\
+(n) <= (1<<22) ? 22 : (n) <= (1<<23) ? 23 :\
+(n) <= (1<<24) ? 24 : (n) <= (1<<25) ? 25 :\
+(n) <= (1<<26) ? 26 : (n) <= (1<<27) ? 27 :\
+(n) <= (1<<28) ? 28 : (n) <= (1<<29) ? 29 :\
+(n) <= (1<<30) ? 30 : (n) <= (1<<31) ? 31 : 32)
+
+//------------------------------------------------------------------------------
+// Read cache with a next-line prefetcher of ipgen_master_cached_memory
+// - Set associative, C_LINES lines of C_LINE_SIZE words in C_WAYS ways.
+//   A missed line is filled by a burst of C_LINE_SIZE beats, and the victim
+//   is selected by round-robin in the set.
+// - A miss prefetches the next C_PREFETCH lines, and the first hit on a
+//   prefetched line prefetches the line C_PREFETCH lines ahead of it.
+// - Writes go through to the external port. The lines written are
+//   invalidated, and a line in filling is not validated at the end of the
+//   fill (write-through, no write allocation).
+// - Read requests are served in order, one beat per cycle on hits.
+//------------------------------------------------------------------------------
+module master_cache #
+  (
+   parameter integer C_ADDR_WIDTH = 32,
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_ID_WIDTH   = 1,
+   parameter integer C_LINE_SIZE  = 8, // words per line, power of 2
+   parameter integer C_LINES      = 64, // C_WAYS * power of 2
+   parameter integer C_WAYS       = 2,
+   parameter integer C_PREFETCH   = 1 // lines, 0: no prefetch
+   )
+  (
+   input wire CLK,
+   input wire RST,
+
+   // Write Address
+   input  wire                      awvalid,
+   input  wire [C_ADDR_WIDTH-1:0]   awaddr,
+   input  wire [8-1:0]              awlen,
+   input  wire [C_ID_WIDTH-1:0]     awid,
+   output wire                      awready,
+
+   // Write Data
+   input  wire [C_DATA_WIDTH-1:0]   wdata,
+   input  wire [C_DATA_WIDTH/8-1:0] wstrb,
+   input  wire                      wlast,
+   input  wire                      wvalid,
+   output wire                      wready,
+
+   // Read Address
+   input  wire                      arvalid,
+   input  wire [C_ADDR_WIDTH-1:0]   araddr,
+   input  wire [8-1:0]              arlen,
+   input  wire [C_ID_WIDTH-1:0]     arid,
+   output wire                      arready,
+
+   // Read Data
+   output wire [C_DATA_WIDTH-1:0]   rdata,
+   output reg                       rlast,
+   output reg  [C_ID_WIDTH-1:0]     rid,
+   output reg                       rvalid,
+   input  wire                      rready,
+
+   output reg  [32-1:0]             hits,
+   output reg  [32-1:0]             misses,
+
+   // External Write Address
+   output wire                      m_awvalid,
+   output wire [C_ADDR_WIDTH-1:0]   m_awaddr,
+   output wire [8-1:0]              m_awlen,
+   output wire [C_ID_WIDTH-1:0]     m_awid,
+   input  wire                      m_awready,
+
+   // External Write Data
+   output wire [C_DATA_WIDTH-1:0]   m_wdata,
+   output wire [C_DATA_WIDTH/8-1:0] m_wstrb,
+   output wire                      m_wlast,
+   output wire                      m_wvalid,
+   input  wire                      m_wready,
+
+   // External Read Address
+   output reg                       m_arvalid,
+   output reg  [C_ADDR_WIDTH-1:0]   m_araddr,
+   output wire [8-1:0]              m_arlen,
+   output wire [C_ID_WIDTH-1:0]     m_arid,
+   input  wire                      m_arready,
+
+   // External Read Data
+   input  wire [C_DATA_WIDTH-1:0]   m_rdata,
+   input  wire                      m_rvalid,
+   output wire                      m_rready
+   );
+
+  localparam integer BYTES = C_DATA_WIDTH / 8;
+  localparam integer WORD_BITS = `MCACHE_C_LOG_2(BYTES);
+  localparam integer LINE_BITS = `MCACHE_C_LOG_2(C_LINE_SIZE);
+  localparam integer LINE_ADDR_WIDTH = C_ADDR_WIDTH - WORD_BITS - LINE_BITS;
+  localparam integer SETS = C_LINES / C_WAYS;
+  localparam integer WAY_WIDTH = (C_WAYS < 2)? 1 : `MCACHE_C_LOG_2(C_WAYS);
+  localparam integer SET_WIDTH = (SETS < 2)? 1 : `MCACHE_C_LOG_2(SETS);
+  localparam integer ENTRY_WIDTH = (C_LINES < 2)? 1 : `MCACHE_C_LOG_2(C_LINES);
+  localparam integer FILL_DEPTH = C_PREFETCH + 1; // fills in flight
+  localparam integer FQ_ADDR_WIDTH = `MCACHE_C_LOG_2(FILL_DEPTH) + 1;
+  localparam integer AWQ_ADDR_WIDTH = 2;
+
+  integer di, dk, pi, pk, wi, ri;
+
+  //----------------------------------------------------------------------------
+  // Lines
+  //----------------------------------------------------------------------------
+  reg [LINE_ADDR_WIDTH-1:0] line_addr [0:C_LINES-1];
+  reg [C_LINES-1:0] valid;
+  reg [C_LINES-1:0] pending; // in filling
+  reg [C_LINES-1:0] poison; // written in filling
+  reg [C_LINES-1:0] prefetched; // filled by the prefetcher and not used yet
+  reg [WAY_WIDTH-1:0] victim_ptr [0:SETS-1];
+
+  reg [C_DATA_WIDTH-1:0] mem [0:C_LINES*C_LINE_SIZE-1];
+  reg [C_DATA_WIDTH-1:0] mem_q;
+
+  //----------------------------------------------------------------------------
+  // Demand reads
+  //----------------------------------------------------------------------------
+  reg                    req_active;
+  reg [C_ADDR_WIDTH-1:0] req_addr;
+  reg [8-1:0]            req_left;
+  reg [C_ID_WIDTH-1:0]   req_id;
+  reg                    req_missed; // the current beat has been counted as a miss
+
+  wire [LINE_ADDR_WIDTH-1:0] d_line = req_addr >> (WORD_BITS + LINE_BITS);
+  wire [SET_WIDTH-1:0]       d_set = d_line % SETS;
+  wire [LINE_BITS:0]         d_word = (req_addr >> WORD_BITS) % C_LINE_SIZE;
+  reg                        d_hit;
+  reg                        d_pending;
+  reg [WAY_WIDTH-1:0]        d_way;
+  reg                        d_victim_ok;
+  reg [WAY_WIDTH-1:0]        d_victim;
+  wire [ENTRY_WIDTH-1:0]     d_entry = d_set * C_WAYS + d_way;
+  wire [ENTRY_WIDTH-1:0]     d_victim_entry = d_set * C_WAYS + d_victim;
+
+  always @* begin
+    d_hit = 0;
+    d_pending = 0;
+    d_way = 0;
+    for(di=0; di<C_WAYS; di=di+1) begin
+      if(line_addr[d_set * C_WAYS + di] == d_line) begin
+        if(valid[d_set * C_WAYS + di]) begin
+          d_hit = 1;
+          d_way = di;
+        end
+        if(pending[d_set * C_WAYS + di]) d_pending = 1;
+      end
+    end
+  end
+
+  // the output register is free at the next cycle
+  wire can_issue = !rvalid || rready;
+  wire d_issue = req_active && d_hit && can_issue;
+
+  // the first way not in filling from the round-robin pointer
+  always @* begin
+    d_victim_ok = 0;
+    d_victim = 0;
+    for(dk=C_WAYS-1; dk>=0; dk=dk-1) begin
+      if(!pending[d_set * C_WAYS + (victim_ptr[d_set] + dk) % C_WAYS]) begin
+        d_victim_ok = 1;
+        d_victim = (victim_ptr[d_set] + dk) % C_WAYS;
+      end
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Prefetch
+  //----------------------------------------------------------------------------
+  reg [LINE_ADDR_WIDTH-1:0] pf_line;
+  reg [8-1:0]               pf_remain;
+
+  wire [SET_WIDTH-1:0]      p_set = pf_line % SETS;
+  reg                       p_present;
+  reg                       p_victim_ok;
+  reg [WAY_WIDTH-1:0]       p_victim;
+  wire [ENTRY_WIDTH-1:0]    p_victim_entry = p_set * C_WAYS + p_victim;
+
+  always @* begin
+    p_present = 0;
+    for(pi=0; pi<C_WAYS; pi=pi+1) begin
+      if(line_addr[p_set * C_WAYS + pi] == pf_line &&
+         (valid[p_set * C_WAYS + pi] || pending[p_set * C_WAYS + pi])) begin
+        p_present = 1;
+      end
+    end
+  end
+
+  always @* begin
+    p_victim_ok = 0;
+    p_victim = 0;
+    for(pk=C_WAYS-1; pk>=0; pk=pk-1) begin
+      if(!pending[p_set * C_WAYS + (victim_ptr[p_set] + pk) % C_WAYS]) begin
+        p_victim_ok = 1;
+        p_victim = (victim_ptr[p_set] + pk) % C_WAYS;
+      end
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Fill
+  //----------------------------------------------------------------------------
+  reg [ENTRY_WIDTH-1:0]   fq [0:(2**FQ_ADDR_WIDTH)-1];
+  reg [FQ_ADDR_WIDTH-1:0] fq_head;
+  reg [FQ_ADDR_WIDTH-1:0] fq_tail;
+  reg [FQ_ADDR_WIDTH:0]   fq_count;
+  reg [LINE_BITS:0]       fill_beat;
+  wire [ENTRY_WIDTH-1:0]  fill_entry = fq[fq_head];
+  wire                    fill_done = m_rvalid && (fill_beat == C_LINE_SIZE - 1);
+
+  wire ar_free = !m_arvalid || m_arready;
+  wire fill_room = (fq_count < FILL_DEPTH);
+  wire d_fill = req_active && !d_hit && !d_pending && d_victim_ok && ar_free && fill_room;
+  wire p_busy = (pf_remain != 0) && !d_fill;
+  wire p_fill = p_busy && !p_present && p_victim_ok && ar_free && fill_room;
+  wire p_skip = p_busy && p_present;
+  wire p_drop = p_busy && !p_present && !p_victim_ok;
+  wire alloc = d_fill || p_fill;
+  wire [ENTRY_WIDTH-1:0] alloc_entry = (d_fill)? d_victim_entry : p_victim_entry;
+  wire [LINE_ADDR_WIDTH-1:0] alloc_line = (d_fill)? d_line : pf_line;
+  wire [SET_WIDTH-1:0] alloc_set = (d_fill)? d_set : p_set;
+  wire [WAY_WIDTH-1:0] alloc_way = (d_fill)? d_victim : p_victim;
+
+  assign m_arlen = C_LINE_SIZE - 1;
+  assign m_arid = 0;
+  // the lines are allocated at the request, so the read data are always accepted
+  assign m_rready = 1'b1;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      m_arvalid <= 0;
+      m_araddr <= 0;
+    end else begin
+      if(m_arvalid && m_arready) begin
+        m_arvalid <= 0;
+      end
+      if(alloc) begin
+        m_arvalid <= 1;
+        m_araddr <= alloc_line << (WORD_BITS + LINE_BITS);
+      end
+    end
+  end
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      fq_head <= 0;
+      fq_tail <= 0;
+      fq_count <= 0;
+      fill_beat <= 0;
+    end else begin
+      if(alloc) begin
+        fq[fq_tail] <= alloc_entry;
+        fq_tail <= fq_tail + 1;
+      end
+      if(m_rvalid) begin
+        fill_beat <= (fill_done)? 0 : fill_beat + 1;
+      end
+      if(fill_done) begin
+        fq_head <= fq_head + 1;
+      end
+      if(alloc && !fill_done) fq_count <= fq_count + 1;
+      if(!alloc && fill_done) fq_count <= fq_count - 1;
+    end
+  end
+
+  always @(posedge CLK) begin
+    if(m_rvalid) begin
+      mem[fill_entry * C_LINE_SIZE + fill_beat] <= m_rdata;
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Write through
+  //----------------------------------------------------------------------------
+  reg [C_ADDR_WIDTH-1:0]   awq [0:(2**AWQ_ADDR_WIDTH)-1];
+  reg [AWQ_ADDR_WIDTH-1:0] awq_head;
+  reg [AWQ_ADDR_WIDTH-1:0] awq_tail;
+  reg [AWQ_ADDR_WIDTH:0]   awq_count;
+  reg [8-1:0]              w_beat;
+
+  wire awq_full = (awq_count == 2 ** AWQ_ADDR_WIDTH);
+  wire awq_empty = (awq_count == 0);
+  wire aw_fire = awvalid && awready;
+  wire w_fire = wvalid && wready;
+
+  // the write data wait for their address, which is needed for invalidation
+  assign m_awvalid = awvalid && !awq_full;
+  assign awready = m_awready && !awq_full;
+  assign m_awaddr = awaddr;
+  assign m_awlen = awlen;
+  assign m_awid = awid;
+
+  assign m_wvalid = wvalid && !awq_empty;
+  assign wready = m_wready && !awq_empty;
+  assign m_wdata = wdata;
+  assign m_wstrb = wstrb;
+  assign m_wlast = wlast;
+
+  wire [C_ADDR_WIDTH-1:0]    w_addr = awq[awq_head] + w_beat * BYTES;
+  wire [LINE_ADDR_WIDTH-1:0] w_line = w_addr >> (WORD_BITS + LINE_BITS);
+  wire [SET_WIDTH-1:0]       w_set = w_line % SETS;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      awq_head <= 0;
+      awq_tail <= 0;
+      awq_count <= 0;
+      w_beat <= 0;
+    end else begin
+      if(aw_fire) begin
+        awq[awq_tail] <= awaddr;
+        awq_tail <= awq_tail + 1;
+      end
+      if(w_fire) begin
+        w_beat <= (wlast)? 0 : w_beat + 1;
+      end
+      if(w_fire && wlast) begin
+        awq_head <= awq_head + 1;
+      end
+      if(aw_fire && !(w_fire && wlast)) awq_count <= awq_count + 1;
+      if(!aw_fire && (w_fire && wlast)) awq_count <= awq_count - 1;
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Line states
+  //----------------------------------------------------------------------------
+  always @(posedge CLK) begin
+    if(RST) begin
+      valid <= 0;
+      pending <= 0;
+      poison <= 0;
+      prefetched <= 0;
+      for(ri=0; ri<SETS; ri=ri+1) begin
+        victim_ptr[ri] <= 0;
+      end
+    end else begin
+      if(fill_done) begin
+        pending[fill_entry] <= 0;
+        valid[fill_entry] <= !poison[fill_entry];
+      end
+      if(w_fire) begin
+        for(wi=0; wi<C_WAYS; wi=wi+1) begin
+          if(line_addr[w_set * C_WAYS + wi] == w_line) begin
+            valid[w_set * C_WAYS + wi] <= 0;
+            if(pending[w_set * C_WAYS + wi]) poison[w_set * C_WAYS + wi] <= 1;
+          end
+        end
+      end
+      if(d_issue) begin
+        prefetched[d_entry] <= 0;
+      end
+      if(alloc) begin
+        line_addr[alloc_entry] <= alloc_line;
+        valid[alloc_entry] <= 0;
+        pending[alloc_entry] <= 1;
+        poison[alloc_entry] <= w_fire && (w_line == alloc_line);
+        prefetched[alloc_entry] <= !d_fill;
+        victim_ptr[alloc_set] <= (alloc_way + 1) % C_WAYS;
+      end
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Read response
+  //----------------------------------------------------------------------------
+  assign arready = !req_active;
+  assign rdata = mem_q;
+
+  always @(posedge CLK) begin
+    if(d_issue) begin
+      mem_q <= mem[d_entry * C_LINE_SIZE + d_word];
+    end
+  end
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      req_active <= 0;
+      req_addr <= 0;
+      req_left <= 0;
+      req_id <= 0;
+      req_missed <= 0;
+      rvalid <= 0;
+      rlast <= 0;
+      rid <= 0;
+      hits <= 0;
+      misses <= 0;
+      pf_line <= 0;
+      pf_remain <= 0;
+    end else begin
+      if(arvalid && arready) begin
+        req_active <= 1;
+        req_addr <= araddr;
+        req_left <= arlen;
+        req_id <= arid;
+      end
+
+      if(d_issue) begin
+        rvalid <= 1;
+        rlast <= (req_left == 0);
+        rid <= req_id;
+        req_addr <= req_addr + BYTES;
+        req_left <= req_left - 1;
+        if(req_left == 0) begin
+          req_active <= 0;
+        end
+        if(!req_missed) begin
+          hits <= hits + 1;
+        end
+        req_missed <= 0;
+      end else if(rready) begin
+        rvalid <= 0;
+      end
+
+      if(req_active && !d_hit && !req_missed) begin
+        misses <= misses + 1;
+        req_missed <= 1;
+      end
+
+      if(p_skip) begin
+        pf_line <= pf_line + 1;
+        pf_remain <= pf_remain - 1;
+      end
+      if(p_fill) begin
+        pf_line <= pf_line + 1;
+        pf_remain <= pf_remain - 1;
+      end
+      if(p_drop) begin
+        pf_remain <= 0;
+      end
+      if(d_fill) begin
+        pf_line <= d_line + 1;
+        pf_remain <= C_PREFETCH;
+      end
+      if(d_issue && prefetched[d_entry] && C_PREFETCH > 0) begin
+        pf_line <= d_line + C_PREFETCH;
+        pf_remain <= 1;
+      end
+    end
+  end
+
+endmodule
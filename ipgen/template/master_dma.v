@@ -0,0 +1,598 @@
+
+`define MDMA_C_LOG_2(n) (\
+(n) <= (1<<0) ? 0 : (n) <= (1<<1) ? 1 :\
+(n) <= (1<<2) ? 2 : (n) <= (1<<3) ? 3 :\
+(n) <= (1<<4) ? 4 : (n) <= (1<<5) ? 5 :\
+(n) <= (1<<6) ? 6 : (n) <= (1<<7) ? 7 :\
+(n) <= (1<<8) ? 8 : (n) <= (1<<9) ? 9 :\
+(n) <= (1<<10) ? 10 : (n) <= (1<<11) ? 11 :\
+(n) <= (1<<12) ? 12 : (n) <= (1<<13) ? 13 :\
+(n) <= (1<<14) ? 14 : (n) <= (1<<15) ? 15 :\
+(n) <= (1<<16) ? 16 : (n) <= (1<<17) ? 17 :\
+(n) <= (1<<18) ? 18 : (n) <= (1<<19) ? 19 :\
+(n) <= (1<<20) ? 20 : (n) <= (1<<21) ? 21 :\
+(n) <= (1<<22) ? 22 : (n) <= (1<<23) ? 23 :\
+(n) <= (1<<24) ? 24 : (n) <= (1<<25) ? 25 :\
+(n) <= (1<<26) ? 26 : (n) <= (1<<27) ? 27 :\
+(n) <= (1<<28) ? 28 : (n) <= (1<<29) ? 29 :\
+(n) <= (1<<30) ? 30 : (n) <= (1<<31) ? 31 : 32)
+
+//------------------------------------------------------------------------------
+// Descriptor-based DMA engine of ipgen_master_dma
+// - A descriptor (src, dst, len, stride, op) reads 'len' words from 'src' to
+//   the read data FIFO (op[0]) and writes 'len' words of the write data FIFO
+//   to 'dst' (op[1]). 'stride' is the distance of the words in bytes.
+//   0 or the word size is contiguous, and the transfer is split into bursts of
+//   up to C_BURST_LEN beats at 4KB boundaries. Otherwise one beat per word.
+// - With desc_chain, desc_src is the address of a descriptor chain in memory.
+//   A descriptor in memory is eight 32-bit words aligned to 32 bytes:
+//   src, dst, len, stride, op, next (0: end of the chain), reserved, reserved
+//   The next descriptor is fetched while the current one is transferred.
+// - A read burst is issued only when the read data FIFO has room for it, and
+//   a write burst only when the write data FIFO has all of its data, so that
+//   the data channels never stall in the middle of a burst.
+// - Reads and writes are not ordered with each other.
+//------------------------------------------------------------------------------
+module master_dma #
+  (
+   parameter integer C_ADDR_WIDTH   = 32,
+   parameter integer C_DATA_WIDTH   = 32,
+   parameter integer C_BURST_LEN    = 16, // 1 to 256
+   parameter integer C_BUFFER_DEPTH = 0, // words of each data FIFO (power of 2), 0: 4 bursts
+   parameter integer C_QUEUE_DEPTH  = 4 // descriptors per direction (power of 2)
+   )
+  (
+   input wire CLK,
+   input wire RST,
+
+   // Descriptor
+   input  wire                      desc_valid,
+   output wire                      desc_ready,
+   input  wire [C_ADDR_WIDTH-1:0]   desc_src,
+   input  wire [C_ADDR_WIDTH-1:0]   desc_dst,
+   input  wire [32-1:0]             desc_len,
+   input  wire [C_ADDR_WIDTH-1:0]   desc_stride,
+   input  wire [2-1:0]              desc_op,
+   input  wire                      desc_chain,
+
+   // Read Data Stream
+   output wire [C_DATA_WIDTH-1:0]   rd_data,
+   output wire                      rd_last,
+   output wire                      rd_valid,
+   input  wire                      rd_ready,
+
+   // Write Data Stream
+   input  wire [C_DATA_WIDTH-1:0]   wr_data,
+   input  wire                      wr_valid,
+   output wire                      wr_ready,
+   output wire                      wr_done,
+
+   output wire                      busy,
+
+   // Write Address
+   output reg                       awvalid,
+   output reg  [C_ADDR_WIDTH-1:0]   awaddr,
+   output reg  [8-1:0]              awlen,
+   input  wire                      awready,
+
+   // Write Data
+   output wire [C_DATA_WIDTH-1:0]   wdata,
+   output wire [C_DATA_WIDTH/8-1:0] wstrb,
+   output wire                      wlast,
+   output wire                      wvalid,
+   input  wire                      wready,
+
+   // Read Address
+   output reg                       arvalid,
+   output reg  [C_ADDR_WIDTH-1:0]   araddr,
+   output reg  [8-1:0]              arlen,
+   input  wire                      arready,
+
+   // Read Data
+   input  wire [C_DATA_WIDTH-1:0]   rdata,
+   input  wire                      rvalid,
+   output wire                      rready
+   );
+
+  localparam integer BYTES = C_DATA_WIDTH / 8;
+  localparam integer MASK_WIDTH = `MDMA_C_LOG_2(BYTES);
+  localparam integer BUF_ADDR_WIDTH = (C_BUFFER_DEPTH == 0)? `MDMA_C_LOG_2(C_BURST_LEN) + 2 :
+                                      `MDMA_C_LOG_2(C_BUFFER_DEPTH);
+  localparam integer BUF_DEPTH = 2 ** BUF_ADDR_WIDTH;
+  localparam integer QUEUE_ADDR_WIDTH = (C_QUEUE_DEPTH < 2)? 1 : `MDMA_C_LOG_2(C_QUEUE_DEPTH);
+  localparam integer WLEN_ADDR_WIDTH = 4;
+  localparam integer FETCH_BEATS = (C_DATA_WIDTH >= 256)? 1 : 256 / C_DATA_WIDTH;
+  localparam integer FETCH_WIDTH = FETCH_BEATS * C_DATA_WIDTH;
+  localparam integer CMD_WIDTH = C_ADDR_WIDTH * 2 + 32;
+
+  localparam FETCH_IDLE  = 0;
+  localparam FETCH_ISSUE = 1;
+  localparam FETCH_WAIT  = 2;
+  localparam FETCH_PARSE = 3;
+
+  //----------------------------------------------------------------------------
+  // Descriptor chain
+  //----------------------------------------------------------------------------
+  reg [1:0] fetch_state;
+  reg [C_ADDR_WIDTH-1:0] fetch_addr;
+  reg [BUF_ADDR_WIDTH:0] fetch_skip; // data beats ahead of the descriptor
+  reg [8:0] fetch_count;
+  reg [FETCH_WIDTH-1:0] fetch_buf;
+  wire [FETCH_WIDTH-1:0] fetch_desc;
+
+  reg chain_valid;
+  reg [C_ADDR_WIDTH-1:0] chain_src;
+  reg [C_ADDR_WIDTH-1:0] chain_dst;
+  reg [32-1:0] chain_len;
+  reg [C_ADDR_WIDTH-1:0] chain_stride;
+  reg [2-1:0] chain_op;
+
+  wire fetch_idle;
+  wire fetch_beat;
+  wire data_beat;
+
+  // a descriptor wider than the bus is at an offset in the beat
+  assign fetch_desc = fetch_buf >> ((fetch_addr % BYTES) * 8);
+
+  //----------------------------------------------------------------------------
+  // Descriptor acceptance
+  //----------------------------------------------------------------------------
+  wire                    in_valid;
+  wire [C_ADDR_WIDTH-1:0] in_src;
+  wire [C_ADDR_WIDTH-1:0] in_dst;
+  wire [32-1:0]           in_len;
+  wire [C_ADDR_WIDTH-1:0] in_stride;
+  wire [2-1:0]            in_op;
+  wire                    in_read;
+  wire                    in_write;
+  wire                    in_room;
+  wire                    in_accept;
+  wire                    chain_start;
+
+  wire rcmd_full, rcmd_empty;
+  wire rlen_full, rlen_empty;
+  wire wcmd_full, wcmd_empty;
+  wire [CMD_WIDTH-1:0] rcmd_data;
+  wire [CMD_WIDTH-1:0] wcmd_data;
+  wire [32-1:0] rlen_data;
+  wire rgen_load;
+  wire wgen_load;
+
+  assign fetch_idle = (fetch_state == FETCH_IDLE) && !chain_valid;
+
+  // a descriptor of the chain has priority over the next one of the user
+  assign in_valid = chain_valid || (fetch_idle && desc_valid && !desc_chain);
+  assign in_src = (chain_valid)? chain_src : desc_src;
+  assign in_dst = (chain_valid)? chain_dst : desc_dst;
+  assign in_len = (chain_valid)? chain_len : desc_len;
+  assign in_stride = (chain_valid)? chain_stride : desc_stride;
+  assign in_op = (chain_valid)? chain_op : desc_op;
+
+  assign in_read = in_op[0] && (in_len != 0);
+  assign in_write = in_op[1] && (in_len != 0);
+  assign in_room = (!in_read || (!rcmd_full && !rlen_full)) && (!in_write || !wcmd_full);
+  assign in_accept = in_valid && in_room;
+  assign chain_start = fetch_idle && desc_valid && desc_chain;
+
+  assign desc_ready = fetch_idle && (desc_chain || in_room);
+
+  master_dma_fifo #
+   (
+    .C_WIDTH(CMD_WIDTH),
+    .C_ADDR_WIDTH(QUEUE_ADDR_WIDTH)
+   )
+  inst_rcmd
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .enq_data({in_src, in_stride, in_len}),
+    .enq(in_accept && in_read),
+    .full(rcmd_full),
+    .deq_data(rcmd_data),
+    .deq(rgen_load),
+    .empty(rcmd_empty),
+    .count()
+   );
+
+  // lengths of the read descriptors for rd_last
+  master_dma_fifo #
+   (
+    .C_WIDTH(32),
+    .C_ADDR_WIDTH(QUEUE_ADDR_WIDTH)
+   )
+  inst_rlen
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .enq_data(in_len),
+    .enq(in_accept && in_read),
+    .full(rlen_full),
+    .deq_data(rlen_data),
+    .deq(rd_valid && rd_ready && rd_last),
+    .empty(rlen_empty),
+    .count()
+   );
+
+  master_dma_fifo #
+   (
+    .C_WIDTH(CMD_WIDTH),
+    .C_ADDR_WIDTH(QUEUE_ADDR_WIDTH)
+   )
+  inst_wcmd
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .enq_data({in_dst, in_stride, in_len}),
+    .enq(in_accept && in_write),
+    .full(wcmd_full),
+    .deq_data(wcmd_data),
+    .deq(wgen_load),
+    .empty(wcmd_empty),
+    .count()
+   );
+
+  //----------------------------------------------------------------------------
+  // Read
+  //----------------------------------------------------------------------------
+  reg                    rgen_active;
+  reg [C_ADDR_WIDTH-1:0] rgen_addr;
+  reg [C_ADDR_WIDTH-1:0] rgen_stride;
+  reg [32-1:0]           rgen_remain;
+  wire                   rgen_contig;
+  wire [13-1:0]          rgen_to_4k;
+  wire [32-1:0]          rgen_max;
+  wire [32-1:0]          rgen_len;
+  wire                   rgen_go;
+
+  reg  [BUF_ADDR_WIDTH:0] r_inflight;
+  wire [BUF_ADDR_WIDTH:0] rbuf_count;
+  wire                    rbuf_full;
+  wire                    rbuf_empty;
+  reg  [32-1:0]           rout_count;
+
+  wire ar_free;
+  wire ar_fetch;
+  wire ar_data;
+
+  assign rgen_load = !rgen_active && !rcmd_empty;
+  assign rgen_contig = (rgen_stride == 0) || (rgen_stride == BYTES);
+  assign rgen_to_4k = (13'h1000 - {1'b0, rgen_addr[11:0]}) >> MASK_WIDTH;
+  assign rgen_max = (!rgen_contig)? 1 :
+                    (rgen_to_4k < C_BURST_LEN)? rgen_to_4k : C_BURST_LEN;
+  assign rgen_len = (rgen_remain < rgen_max)? rgen_remain : rgen_max;
+  assign rgen_go = rgen_active && (rbuf_count + r_inflight + rgen_len <= BUF_DEPTH);
+
+  assign ar_free = !arvalid || arready;
+  assign ar_fetch = ar_free && (fetch_state == FETCH_ISSUE);
+  assign ar_data = ar_free && !ar_fetch && rgen_go;
+
+  // the read data are always accepted, since the bursts are reserved
+  assign rready = 1'b1;
+  assign fetch_beat = rvalid && (fetch_state == FETCH_WAIT) && (fetch_skip == 0);
+  assign data_beat = rvalid && !fetch_beat;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      arvalid <= 0;
+      araddr <= 0;
+      arlen <= 0;
+      rgen_active <= 0;
+      rgen_addr <= 0;
+      rgen_stride <= 0;
+      rgen_remain <= 0;
+    end else begin
+      if(arvalid && arready) begin
+        arvalid <= 0;
+      end
+      if(ar_fetch) begin
+        arvalid <= 1;
+        araddr <= fetch_addr & ~(BYTES - 1);
+        arlen <= FETCH_BEATS - 1;
+      end else if(ar_data) begin
+        arvalid <= 1;
+        araddr <= rgen_addr;
+        arlen <= rgen_len - 1;
+        rgen_addr <= rgen_addr + ((rgen_contig)? rgen_len * BYTES : rgen_stride);
+        rgen_remain <= rgen_remain - rgen_len;
+        if(rgen_remain == rgen_len) begin
+          rgen_active <= 0;
+        end
+      end
+      if(rgen_load) begin
+        {rgen_addr, rgen_stride, rgen_remain} <= rcmd_data;
+        rgen_active <= 1;
+      end
+    end
+  end
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      r_inflight <= 0;
+    end else begin
+      r_inflight <= r_inflight + ((ar_data)? rgen_len : 0) - ((data_beat)? 1 : 0);
+    end
+  end
+
+  master_dma_fifo #
+   (
+    .C_WIDTH(C_DATA_WIDTH),
+    .C_ADDR_WIDTH(BUF_ADDR_WIDTH)
+   )
+  inst_rbuf
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .enq_data(rdata),
+    .enq(data_beat),
+    .full(rbuf_full),
+    .deq_data(rd_data),
+    .deq(rd_valid && rd_ready),
+    .empty(rbuf_empty),
+    .count(rbuf_count)
+   );
+
+  assign rd_valid = !rbuf_empty;
+  assign rd_last = (rout_count == rlen_data - 1);
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      rout_count <= 0;
+    end else if(rd_valid && rd_ready) begin
+      rout_count <= (rd_last)? 0 : rout_count + 1;
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Descriptor chain fetch state machine
+  //----------------------------------------------------------------------------
+  always @(posedge CLK) begin
+    if(RST) begin
+      fetch_state <= FETCH_IDLE;
+      fetch_addr <= 0;
+      fetch_skip <= 0;
+      fetch_count <= 0;
+      chain_valid <= 0;
+    end else begin
+      if(chain_valid && in_accept) begin
+        chain_valid <= 0;
+      end
+      case(fetch_state)
+        FETCH_IDLE: begin
+          if(chain_start) begin
+            fetch_addr <= desc_src;
+            fetch_state <= FETCH_ISSUE;
+          end
+        end
+        FETCH_ISSUE: begin
+          if(ar_fetch) begin
+            fetch_skip <= r_inflight - ((data_beat)? 1 : 0);
+            fetch_count <= 0;
+            fetch_state <= FETCH_WAIT;
+          end
+        end
+        FETCH_WAIT: begin
+          if(data_beat && fetch_skip > 0) begin
+            fetch_skip <= fetch_skip - 1;
+          end
+          if(fetch_beat) begin
+            fetch_count <= fetch_count + 1;
+            if(fetch_count == FETCH_BEATS - 1) begin
+              fetch_state <= FETCH_PARSE;
+            end
+          end
+        end
+        FETCH_PARSE: begin
+          if(!chain_valid) begin
+            chain_valid <= 1;
+            chain_src <= fetch_desc[32*0 +: C_ADDR_WIDTH];
+            chain_dst <= fetch_desc[32*1 +: C_ADDR_WIDTH];
+            chain_len <= fetch_desc[32*2 +: 32];
+            chain_stride <= fetch_desc[32*3 +: C_ADDR_WIDTH];
+            chain_op <= fetch_desc[32*4 +: 2];
+            fetch_addr <= fetch_desc[32*5 +: C_ADDR_WIDTH];
+            fetch_state <= (fetch_desc[32*5 +: C_ADDR_WIDTH] != 0)? FETCH_ISSUE : FETCH_IDLE;
+          end
+        end
+      endcase
+    end
+  end
+
+  always @(posedge CLK) begin
+    if(fetch_beat) begin
+      fetch_buf <= fetch_buf >> C_DATA_WIDTH;
+      fetch_buf[FETCH_WIDTH-1 -: C_DATA_WIDTH] <= rdata;
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Write
+  //----------------------------------------------------------------------------
+  reg                    wgen_active;
+  reg [C_ADDR_WIDTH-1:0] wgen_addr;
+  reg [C_ADDR_WIDTH-1:0] wgen_stride;
+  reg [32-1:0]           wgen_remain;
+  wire                   wgen_contig;
+  wire [13-1:0]          wgen_to_4k;
+  wire [32-1:0]          wgen_max;
+  wire [32-1:0]          wgen_len;
+  wire                   wgen_go;
+
+  reg  [BUF_ADDR_WIDTH:0] w_reserved; // words of the issued bursts in the FIFO
+  wire [BUF_ADDR_WIDTH:0] wbuf_count;
+  wire                    wbuf_full;
+  wire                    wbuf_empty;
+  reg                     aw_done; // the burst is the last one of the descriptor
+
+  wire [8:0]                 wlen_data;
+  wire                       wlen_full;
+  wire                       wlen_empty;
+  wire [WLEN_ADDR_WIDTH:0]   wlen_count;
+  reg  [8-1:0]               w_count;
+
+  wire aw_free;
+  wire aw_data;
+  wire w_beat;
+
+  assign wgen_load = !wgen_active && !wcmd_empty;
+  assign wgen_contig = (wgen_stride == 0) || (wgen_stride == BYTES);
+  assign wgen_to_4k = (13'h1000 - {1'b0, wgen_addr[11:0]}) >> MASK_WIDTH;
+  assign wgen_max = (!wgen_contig)? 1 :
+                    (wgen_to_4k < C_BURST_LEN)? wgen_to_4k : C_BURST_LEN;
+  assign wgen_len = (wgen_remain < wgen_max)? wgen_remain : wgen_max;
+  // a burst is queued to the data channel when its address is accepted
+  assign wgen_go = wgen_active && (wbuf_count - w_reserved >= wgen_len) &&
+                   (wlen_count < (2 ** WLEN_ADDR_WIDTH) - 1);
+
+  assign aw_free = !awvalid || awready;
+  assign aw_data = aw_free && wgen_go;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      awvalid <= 0;
+      awaddr <= 0;
+      awlen <= 0;
+      aw_done <= 0;
+      wgen_active <= 0;
+      wgen_addr <= 0;
+      wgen_stride <= 0;
+      wgen_remain <= 0;
+    end else begin
+      if(awvalid && awready) begin
+        awvalid <= 0;
+      end
+      if(aw_data) begin
+        awvalid <= 1;
+        awaddr <= wgen_addr;
+        awlen <= wgen_len - 1;
+        aw_done <= (wgen_remain == wgen_len);
+        wgen_addr <= wgen_addr + ((wgen_contig)? wgen_len * BYTES : wgen_stride);
+        wgen_remain <= wgen_remain - wgen_len;
+        if(wgen_remain == wgen_len) begin
+          wgen_active <= 0;
+        end
+      end
+      if(wgen_load) begin
+        {wgen_addr, wgen_stride, wgen_remain} <= wcmd_data;
+        wgen_active <= 1;
+      end
+    end
+  end
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      w_reserved <= 0;
+    end else begin
+      w_reserved <= w_reserved + ((aw_data)? wgen_len : 0) - ((w_beat)? 1 : 0);
+    end
+  end
+
+  assign wr_ready = !wbuf_full;
+
+  master_dma_fifo #
+   (
+    .C_WIDTH(C_DATA_WIDTH),
+    .C_ADDR_WIDTH(BUF_ADDR_WIDTH)
+   )
+  inst_wbuf
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .enq_data(wr_data),
+    .enq(wr_valid),
+    .full(wbuf_full),
+    .deq_data(wdata),
+    .deq(w_beat),
+    .empty(wbuf_empty),
+    .count(wbuf_count)
+   );
+
+  master_dma_fifo #
+   (
+    .C_WIDTH(9),
+    .C_ADDR_WIDTH(WLEN_ADDR_WIDTH)
+   )
+  inst_wlen
+   (
+    .CLK(CLK),
+    .RST(RST),
+    .enq_data({aw_done, awlen}),
+    .enq(awvalid && awready),
+    .full(wlen_full),
+    .deq_data(wlen_data),
+    .deq(w_beat && wlast),
+    .empty(wlen_empty),
+    .count(wlen_count)
+   );
+
+  assign wstrb = {(C_DATA_WIDTH/8){1'b1}};
+  assign wvalid = !wlen_empty && !wbuf_empty;
+  assign wlast = (w_count == wlen_data[7:0]);
+  assign w_beat = wvalid && wready;
+  assign wr_done = w_beat && wlast && wlen_data[8];
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      w_count <= 0;
+    end else if(w_beat) begin
+      w_count <= (wlast)? 0 : w_count + 1;
+    end
+  end
+
+  assign busy = !fetch_idle || !rcmd_empty || !wcmd_empty || !rlen_empty ||
+                rgen_active || wgen_active || arvalid || awvalid ||
+                (r_inflight != 0) || !wlen_empty;
+
+endmodule
+
+//------------------------------------------------------------------------------
+module master_dma_fifo #
+  (
+   parameter integer C_WIDTH = 32,
+   parameter integer C_ADDR_WIDTH = 4
+   )
+  (
+   input wire CLK,
+   input wire RST,
+
+   input  wire [C_WIDTH-1:0]    enq_data,
+   input  wire                  enq,
+   output wire                  full,
+
+   output wire [C_WIDTH-1:0]    deq_data,
+   input  wire                  deq,
+   output wire                  empty,
+
+   output reg  [C_ADDR_WIDTH:0] count
+   );
+
+  reg [C_WIDTH-1:0] mem [0:(2**C_ADDR_WIDTH)-1];
+  reg [C_ADDR_WIDTH-1:0] head;
+  reg [C_ADDR_WIDTH-1:0] tail;
+
+  wire do_enq = enq && !full;
+  wire do_deq = deq && !empty;
+
+  assign full = (count == 2 ** C_ADDR_WIDTH);
+  assign empty = (count == 0);
+  assign deq_data = mem[head];
+
+  always @(posedge CLK) begin
+    if(do_enq) begin
+      mem[tail] <= enq_data;
+    end
+  end
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      head <= 0;
+      tail <= 0;
+      count <= 0;
+    end else begin
+      if(do_enq) tail <= tail + 1;
+      if(do_deq) head <= head + 1;
+      if(do_enq && !do_deq) count <= count + 1;
+      if(!do_enq && do_deq) count <= count - 1;
+    end
+  end
+
+endmodule
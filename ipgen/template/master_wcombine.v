@@ -0,0 +1,278 @@
+
+`define MWCB_C_LOG_2(n) (\
+(n) <= (1<<0) ? 0 : (n) <= (1<<1) ? 1 :\
+(n) <= (1<<2) ? 2 : (n) <= (1<<3) ? 3 :\
+(n) <= (1<<4) ? 4 : (n) <= (1<<5) ? 5 :\
+(n) <= (1<<6) ? 6 : (n) <= (1<<7) ? 7 :\
+(n) <= (1<<8) ? 8 : (n) <= (1<<9) ? 9 :\
+(n) <= (1<<10) ? 10 : (n) <= (1<<11) ? 11 :\
+(n) <= (1<<12) ? 12 : (n) <= (1<<13) ? 13 :\
+(n) <= (1<<14) ? 14 : (n) <= (1<<15) ? 15 :\
+(n) <= (1<<16) ? 16 : (n) <= (1<<17) ? 17 :\
+(n) <= (1<<18) ? 18 : (n) <= (1<<19) ? 19 :\
+(n) <= (1<<20) ? 20 : (n) <= (1<<21) ? 21 :\
+(n) <= (1<<22) ? 22 : (n) <= (1<<23) ? 23 :\
+(n) <= (1<<24) ? 24 : (n) <= (1<<25) ? 25 :\
+(n) <= (1<<26) ? 26 : (n) <= (1<<27) ? 27 :\
+(n) <= (1<<28) ? 28 : (n) <= (1<<29) ? 29 :\
+(n) <= (1<<30) ? 30 : (n) <= (1<<31) ? 31 : 32)
+
+//------------------------------------------------------------------------------
+// Write-combining buffer of ipgen_master_combining_lite_memory
+// - Stores to an aligned window of C_SIZE words are merged by the byte
+//   strobes into the active buffer, and the buffer is written by a burst
+//   from its first to its last written word. Unwritten bytes in between
+//   have no strobes.
+// - The active buffer is flushed when it is full, when a store or a read
+//   goes to another window or to the same window respectively, after
+//   C_TIMEOUT cycles without stores, and on 'flush'. A flushed buffer is
+//   moved to the drain buffer, so that the next stores are merged during
+//   the burst.
+// - Reads are passed through after the buffered stores to their window.
+//   'idle' is 1 when no store is buffered or being written (a fence).
+//------------------------------------------------------------------------------
+module master_wcombine #
+  (
+   parameter integer C_ADDR_WIDTH = 32,
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_SIZE       = 16, // words of a buffer, power of 2
+   parameter integer C_TIMEOUT    = 64 // cycles, 0: no timeout
+   )
+  (
+   input wire CLK,
+   input wire RST,
+
+   // Write Address
+   input  wire                      awvalid,
+   input  wire [C_ADDR_WIDTH-1:0]   awaddr,
+   output wire                      awready,
+
+   // Write Data
+   input  wire [C_DATA_WIDTH-1:0]   wdata,
+   input  wire [C_DATA_WIDTH/8-1:0] wstrb,
+   input  wire                      wvalid,
+   output wire                      wready,
+
+   // Read Address
+   input  wire                      arvalid,
+   input  wire [C_ADDR_WIDTH-1:0]   araddr,
+   output wire                      arready,
+
+   // Read Data
+   output wire [C_DATA_WIDTH-1:0]   rdata,
+   output wire                      rvalid,
+   input  wire                      rready,
+
+   input  wire                      flush,
+   output wire                      idle,
+
+   // External Write Address
+   output reg                       m_awvalid,
+   output wire [C_ADDR_WIDTH-1:0]   m_awaddr,
+   output wire [8-1:0]              m_awlen,
+   output wire [1-1:0]              m_awid,
+   input  wire                      m_awready,
+
+   // External Write Data
+   output wire [C_DATA_WIDTH-1:0]   m_wdata,
+   output wire [C_DATA_WIDTH/8-1:0] m_wstrb,
+   output wire                      m_wlast,
+   output wire                      m_wvalid,
+   input  wire                      m_wready,
+
+   // External Read Address
+   output reg                       m_arvalid,
+   output reg  [C_ADDR_WIDTH-1:0]   m_araddr,
+   output wire [8-1:0]              m_arlen,
+   output wire [1-1:0]              m_arid,
+   input  wire                      m_arready,
+
+   // External Read Data
+   input  wire [C_DATA_WIDTH-1:0]   m_rdata,
+   input  wire                      m_rvalid,
+   output wire                      m_rready
+   );
+
+  localparam integer BYTES = C_DATA_WIDTH / 8;
+  localparam integer WORD_BITS = `MWCB_C_LOG_2(BYTES);
+  localparam integer WIN_BITS = WORD_BITS + `MWCB_C_LOG_2(C_SIZE);
+  localparam integer BASE_WIDTH = C_ADDR_WIDTH - WIN_BITS;
+  localparam integer INDEX_WIDTH = (C_SIZE < 2)? 1 : `MWCB_C_LOG_2(C_SIZE);
+
+  integer fi, si, sb, mi;
+
+  //----------------------------------------------------------------------------
+  // Active buffer
+  //----------------------------------------------------------------------------
+  reg                     a_valid;
+  reg [BASE_WIDTH-1:0]    a_base;
+  reg [C_DATA_WIDTH-1:0]  a_data [0:C_SIZE-1];
+  reg [BYTES-1:0]         a_strb [0:C_SIZE-1];
+  reg [32-1:0]            a_timer; // cycles since the last store
+  reg                     flush_req;
+
+  reg                     a_full;
+  reg [INDEX_WIDTH-1:0]   a_first;
+  reg [INDEX_WIDTH-1:0]   a_last;
+
+  always @* begin
+    a_full = 1;
+    a_first = 0;
+    a_last = 0;
+    for(fi=C_SIZE-1; fi>=0; fi=fi-1) begin
+      if(a_strb[fi] != 0) a_first = fi;
+    end
+    for(fi=0; fi<C_SIZE; fi=fi+1) begin
+      if(a_strb[fi] != 0) a_last = fi;
+      if(a_strb[fi] != {BYTES{1'b1}}) a_full = 0;
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Drain buffer
+  //----------------------------------------------------------------------------
+  reg                     d_busy;
+  reg [BASE_WIDTH-1:0]    d_base;
+  reg [C_DATA_WIDTH-1:0]  d_data [0:C_SIZE-1];
+  reg [BYTES-1:0]         d_strb [0:C_SIZE-1];
+  reg [INDEX_WIDTH-1:0]   d_first;
+  reg [INDEX_WIDTH-1:0]   d_last;
+  reg [INDEX_WIDTH-1:0]   d_index;
+  reg                     d_aw_done;
+
+  //----------------------------------------------------------------------------
+  // Stores
+  //----------------------------------------------------------------------------
+  wire [BASE_WIDTH-1:0]   s_base = awaddr >> WIN_BITS;
+  wire [INDEX_WIDTH-1:0]  s_index = (awaddr >> WORD_BITS) % C_SIZE;
+  wire                    s_req = awvalid && wvalid;
+  reg  [C_DATA_WIDTH-1:0] s_mask;
+
+  always @* begin
+    for(sb=0; sb<BYTES; sb=sb+1) begin
+      s_mask[sb*8 +: 8] = {8{wstrb[sb]}};
+    end
+  end
+
+  wire [BASE_WIDTH-1:0]   r_base = araddr >> WIN_BITS;
+  wire                    r_hazard_a = a_valid && (r_base == a_base);
+  wire                    r_hazard_d = d_busy && (r_base == d_base);
+
+  wire flush_now = a_valid &&
+                   (a_full || flush || flush_req ||
+                    (s_req && (s_base != a_base)) ||
+                    (arvalid && r_hazard_a) ||
+                    (C_TIMEOUT > 0 && a_timer >= C_TIMEOUT));
+  wire move = flush_now && !d_busy;
+  wire store = s_req && !flush_now;
+
+  assign awready = store;
+  assign wready = store;
+  assign idle = !a_valid && !d_busy;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      a_valid <= 0;
+      a_base <= 0;
+      a_timer <= 0;
+      flush_req <= 0;
+      for(si=0; si<C_SIZE; si=si+1) begin
+        a_strb[si] <= 0;
+      end
+    end else begin
+      if(move) begin
+        a_valid <= 0;
+        for(si=0; si<C_SIZE; si=si+1) begin
+          a_strb[si] <= 0;
+        end
+      end
+      if(store) begin
+        a_valid <= 1;
+        a_base <= s_base;
+        a_timer <= 0;
+        a_data[s_index] <= (a_data[s_index] & ~s_mask) | (wdata & s_mask);
+        a_strb[s_index] <= a_strb[s_index] | wstrb;
+      end else if(a_valid && a_timer != {32{1'b1}}) begin
+        a_timer <= a_timer + 1;
+      end
+      if(move) begin
+        flush_req <= 0;
+      end else if(flush && a_valid) begin
+        flush_req <= 1;
+      end
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Bursts from the drain buffer
+  //----------------------------------------------------------------------------
+  assign m_awaddr = (d_base << WIN_BITS) | (d_first << WORD_BITS);
+  assign m_awlen = d_last - d_first;
+  assign m_awid = 0;
+  assign m_wdata = d_data[d_index];
+  assign m_wstrb = d_strb[d_index];
+  assign m_wlast = d_index == d_last;
+  assign m_wvalid = d_busy && d_aw_done;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      d_busy <= 0;
+      d_base <= 0;
+      d_first <= 0;
+      d_last <= 0;
+      d_index <= 0;
+      d_aw_done <= 0;
+      m_awvalid <= 0;
+    end else begin
+      if(move) begin
+        d_busy <= 1;
+        d_base <= a_base;
+        d_first <= a_first;
+        d_last <= a_last;
+        d_index <= a_first;
+        for(mi=0; mi<C_SIZE; mi=mi+1) begin
+          d_data[mi] <= a_data[mi];
+          d_strb[mi] <= a_strb[mi];
+        end
+        m_awvalid <= 1;
+      end
+      if(m_awvalid && m_awready) begin
+        m_awvalid <= 0;
+        d_aw_done <= 1;
+      end
+      if(m_wvalid && m_wready) begin
+        d_index <= d_index + 1;
+        if(m_wlast) begin
+          d_busy <= 0;
+          d_aw_done <= 0;
+        end
+      end
+    end
+  end
+
+  //----------------------------------------------------------------------------
+  // Reads
+  //----------------------------------------------------------------------------
+  assign arready = (!m_arvalid || m_arready) && !r_hazard_a && !r_hazard_d;
+  assign m_arlen = 0;
+  assign m_arid = 0;
+  assign rdata = m_rdata;
+  assign rvalid = m_rvalid;
+  assign m_rready = rready;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      m_arvalid <= 0;
+      m_araddr <= 0;
+    end else begin
+      if(m_arvalid && m_arready) begin
+        m_arvalid <= 0;
+      end
+      if(arvalid && arready) begin
+        m_arvalid <= 1;
+        m_araddr <= araddr;
+      end
+    end
+  end
+
+endmodule
@@ -0,0 +1,380 @@
+
+`define MWC_C_LOG_2(n) (\
+(n) <= (1<<0) ? 0 : (n) <= (1<<1) ? 1 :\
+(n) <= (1<<2) ? 2 : (n) <= (1<<3) ? 3 :\
+(n) <= (1<<4) ? 4 : (n) <= (1<<5) ? 5 :\
+(n) <= (1<<6) ? 6 : (n) <= (1<<7) ? 7 :\
+(n) <= (1<<8) ? 8 : (n) <= (1<<9) ? 9 :\
+(n) <= (1<<10) ? 10 : (n) <= (1<<11) ? 11 :\
+(n) <= (1<<12) ? 12 : (n) <= (1<<13) ? 13 :\
+(n) <= (1<<14) ? 14 : (n) <= (1<<15) ? 15 :\
+(n) <= (1<<16) ? 16 : (n) <= (1<<17) ? 17 :\
+(n) <= (1<<18) ? 18 : (n) <= (1<<19) ? 19 :\
+(n) <= (1<<20) ? 20 : (n) <= (1<<21) ? 21 :\
+(n) <= (1<<22) ? 22 : (n) <= (1<<23) ? 23 :\
+(n) <= (1<<24) ? 24 : (n) <= (1<<25) ? 25 :\
+(n) <= (1<<26) ? 26 : (n) <= (1<<27) ? 27 :\
+(n) <= (1<<28) ? 28 : (n) <= (1<<29) ? 29 :\
+(n) <= (1<<30) ? 30 : (n) <= (1<<31) ? 31 : 32)
+
+//------------------------------------------------------------------------------
+// Data width converter between a user master interface and an external port
+// - Upsizing: user beats are packed into wide beats with merged strobes.
+//   Bursts may start from any user-width aligned address. Completion is
+//   in order.
+// - Downsizing: a user beat is issued as several narrow beats.
+//   (awlen + 1) * C_DATA_WIDTH / C_EXT_DATA_WIDTH must not exceed 256.
+//------------------------------------------------------------------------------
+module master_width_converter #
+  (
+   parameter integer C_ADDR_WIDTH     = 32,
+   parameter integer C_DATA_WIDTH     = 32, // user side
+   parameter integer C_EXT_DATA_WIDTH = 64, // external side
+   parameter integer C_ID_WIDTH       = 1,
+   parameter integer C_FIFO_DEPTH     = 16 // bursts in flight (upsizing), power of 2
+   )
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   //----------------------------------------------------------------------------
+   // User Side
+   //----------------------------------------------------------------------------
+   // Write Address
+   input wire  [C_ADDR_WIDTH-1:0]       awaddr,
+   input wire  [8-1:0]                  awlen,
+   input wire  [C_ID_WIDTH-1:0]         awid,
+   input wire                           awvalid,
+   output wire                          awready,
+
+   // Write Data
+   input wire  [C_DATA_WIDTH-1:0]       wdata,
+   input wire  [C_DATA_WIDTH/8-1:0]     wstrb,
+   input wire                           wlast,
+   input wire                           wvalid,
+   output wire                          wready,
+
+   // Read Address
+   input wire  [C_ADDR_WIDTH-1:0]       araddr,
+   input wire  [8-1:0]                  arlen,
+   input wire  [C_ID_WIDTH-1:0]         arid,
+   input wire                           arvalid,
+   output wire                          arready,
+
+   // Read Data
+   output wire [C_DATA_WIDTH-1:0]       rdata,
+   output wire                          rlast,
+   output wire [C_ID_WIDTH-1:0]         rid,
+   output wire                          rvalid,
+   input wire                           rready,
+
+   //----------------------------------------------------------------------------
+   // External Side
+   //----------------------------------------------------------------------------
+   // Write Address
+   output wire [C_ADDR_WIDTH-1:0]       ext_awaddr,
+   output wire [8-1:0]                  ext_awlen,
+   output wire [C_ID_WIDTH-1:0]         ext_awid,
+   output wire                          ext_awvalid,
+   input wire                           ext_awready,
+
+   // Write Data
+   output wire [C_EXT_DATA_WIDTH-1:0]   ext_wdata,
+   output wire [C_EXT_DATA_WIDTH/8-1:0] ext_wstrb,
+   output wire                          ext_wlast,
+   output wire                          ext_wvalid,
+   input wire                           ext_wready,
+
+   // Read Address
+   output wire [C_ADDR_WIDTH-1:0]       ext_araddr,
+   output wire [8-1:0]                  ext_arlen,
+   output wire [C_ID_WIDTH-1:0]         ext_arid,
+   output wire                          ext_arvalid,
+   input wire                           ext_arready,
+
+   // Read Data
+   input wire  [C_EXT_DATA_WIDTH-1:0]   ext_rdata,
+   input wire                           ext_rlast,
+   input wire  [C_ID_WIDTH-1:0]         ext_rid,
+   input wire                           ext_rvalid,
+   output wire                          ext_rready
+   );
+
+  localparam integer USER_MASK_WIDTH = `MWC_C_LOG_2(C_DATA_WIDTH / 8);
+  localparam integer EXT_MASK_WIDTH = `MWC_C_LOG_2(C_EXT_DATA_WIDTH / 8);
+
+  //----------------------------------------------------------------------------
+  // Reset logic
+  //----------------------------------------------------------------------------
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  assign ext_awid = awid;
+  assign ext_arid = arid;
+
+  generate if (C_EXT_DATA_WIDTH > C_DATA_WIDTH) begin : upsize
+    localparam integer RATIO = C_EXT_DATA_WIDTH / C_DATA_WIDTH;
+    localparam integer LANE_WIDTH = `MWC_C_LOG_2(RATIO);
+    localparam integer FIFO_ADDR_WIDTH = `MWC_C_LOG_2(C_FIFO_DEPTH);
+    localparam integer FIFO_DEPTH = 2 ** FIFO_ADDR_WIDTH;
+
+    //--------------------------------------------------------------------------
+    // Address: aligned to the external width, with the first lane queued
+    //--------------------------------------------------------------------------
+    wire [LANE_WIDTH-1:0] aw_lane;
+    wire [LANE_WIDTH-1:0] ar_lane;
+    wire aw_fire;
+    wire ar_fire;
+
+    reg [LANE_WIDTH-1:0] wq_lane [0:FIFO_DEPTH-1];
+    reg [FIFO_ADDR_WIDTH:0] wq_head;
+    reg [FIFO_ADDR_WIDTH:0] wq_tail;
+    wire wq_full;
+    wire wq_empty;
+
+    reg [LANE_WIDTH-1:0] rq_lane [0:FIFO_DEPTH-1];
+    reg [8-1:0] rq_len [0:FIFO_DEPTH-1];
+    reg [FIFO_ADDR_WIDTH:0] rq_head;
+    reg [FIFO_ADDR_WIDTH:0] rq_tail;
+    wire rq_full;
+
+    assign aw_lane = awaddr[EXT_MASK_WIDTH-1:USER_MASK_WIDTH];
+    assign ar_lane = araddr[EXT_MASK_WIDTH-1:USER_MASK_WIDTH];
+    assign wq_full = (wq_tail - wq_head == FIFO_DEPTH);
+    assign wq_empty = (wq_tail == wq_head);
+    assign rq_full = (rq_tail - rq_head == FIFO_DEPTH);
+
+    assign ext_awaddr = (awaddr >> EXT_MASK_WIDTH) << EXT_MASK_WIDTH;
+    assign ext_awlen = ({1'b0, awlen} + aw_lane) >> LANE_WIDTH;
+    assign ext_awvalid = awvalid && !wq_full;
+    assign awready = ext_awready && !wq_full;
+    assign aw_fire = ext_awvalid && ext_awready;
+
+    assign ext_araddr = (araddr >> EXT_MASK_WIDTH) << EXT_MASK_WIDTH;
+    assign ext_arlen = ({1'b0, arlen} + ar_lane) >> LANE_WIDTH;
+    assign ext_arvalid = arvalid && !rq_full;
+    assign arready = ext_arready && !rq_full;
+    assign ar_fire = ext_arvalid && ext_arready;
+
+    //--------------------------------------------------------------------------
+    // Write Data: packed into the external width
+    //--------------------------------------------------------------------------
+    reg [C_EXT_DATA_WIDTH-1:0] w_acc_data;
+    reg [C_EXT_DATA_WIDTH/8-1:0] w_acc_strb;
+    reg [LANE_WIDTH-1:0] w_lane;
+    reg w_first;
+    reg [C_EXT_DATA_WIDTH-1:0] w_out_data;
+    reg [C_EXT_DATA_WIDTH/8-1:0] w_out_strb;
+    reg w_out_last;
+    reg w_out_valid;
+
+    wire [LANE_WIDTH-1:0] w_cur_lane;
+    wire [C_EXT_DATA_WIDTH-1:0] w_merged_data;
+    wire [C_EXT_DATA_WIDTH/8-1:0] w_merged_strb;
+    wire w_fire;
+    wire w_complete;
+
+    assign w_cur_lane = (w_first)? wq_lane[wq_head[FIFO_ADDR_WIDTH-1:0]] : w_lane;
+    assign w_merged_data = w_acc_data | ({{(C_EXT_DATA_WIDTH-C_DATA_WIDTH){1'b0}}, wdata} << (w_cur_lane * C_DATA_WIDTH));
+    assign w_merged_strb = w_acc_strb | ({{(C_EXT_DATA_WIDTH/8-C_DATA_WIDTH/8){1'b0}}, wstrb} << (w_cur_lane * C_DATA_WIDTH / 8));
+    assign wready = !wq_empty && (!w_out_valid || ext_wready);
+    assign w_fire = wvalid && wready;
+    assign w_complete = (w_cur_lane == RATIO - 1) || wlast;
+
+    assign ext_wdata = w_out_data;
+    assign ext_wstrb = w_out_strb;
+    assign ext_wlast = w_out_last;
+    assign ext_wvalid = w_out_valid;
+
+    always @(posedge ACLK) begin
+      if (aresetn_rrr == 0) begin
+        wq_head <= 0;
+        wq_tail <= 0;
+        w_acc_data <= 0;
+        w_acc_strb <= 0;
+        w_lane <= 0;
+        w_first <= 1;
+        w_out_data <= 0;
+        w_out_strb <= 0;
+        w_out_last <= 0;
+        w_out_valid <= 0;
+      end else begin
+        if (aw_fire) begin
+          wq_lane[wq_tail[FIFO_ADDR_WIDTH-1:0]] <= aw_lane;
+          wq_tail <= wq_tail + 1;
+        end
+        if (ext_wvalid && ext_wready) begin
+          w_out_valid <= 0;
+        end
+        if (w_fire) begin
+          w_lane <= w_cur_lane + 1;
+          w_first <= wlast;
+          if (wlast) wq_head <= wq_head + 1;
+          if (w_complete) begin
+            w_out_data <= w_merged_data;
+            w_out_strb <= w_merged_strb;
+            w_out_last <= wlast;
+            w_out_valid <= 1;
+            w_acc_data <= 0;
+            w_acc_strb <= 0;
+          end else begin
+            w_acc_data <= w_merged_data;
+            w_acc_strb <= w_merged_strb;
+          end
+        end
+      end
+    end
+
+    //--------------------------------------------------------------------------
+    // Read Data: unpacked from the external width
+    //--------------------------------------------------------------------------
+    reg [LANE_WIDTH-1:0] r_lane;
+    reg [8-1:0] r_remain;
+    reg r_first;
+
+    wire [LANE_WIDTH-1:0] r_cur_lane;
+    wire [8-1:0] r_cur_remain;
+    wire r_fire;
+
+    assign r_cur_lane = (r_first)? rq_lane[rq_head[FIFO_ADDR_WIDTH-1:0]] : r_lane;
+    assign r_cur_remain = (r_first)? rq_len[rq_head[FIFO_ADDR_WIDTH-1:0]] : r_remain;
+    assign rdata = ext_rdata >> (r_cur_lane * C_DATA_WIDTH);
+    assign rlast = (r_cur_remain == 0);
+    assign rid = ext_rid;
+    assign rvalid = ext_rvalid;
+    assign ext_rready = rready && ((r_cur_lane == RATIO - 1) || (r_cur_remain == 0));
+    assign r_fire = rvalid && rready;
+
+    always @(posedge ACLK) begin
+      if (aresetn_rrr == 0) begin
+        rq_head <= 0;
+        rq_tail <= 0;
+        r_lane <= 0;
+        r_remain <= 0;
+        r_first <= 1;
+      end else begin
+        if (ar_fire) begin
+          rq_lane[rq_tail[FIFO_ADDR_WIDTH-1:0]] <= ar_lane;
+          rq_len[rq_tail[FIFO_ADDR_WIDTH-1:0]] <= arlen;
+          rq_tail <= rq_tail + 1;
+        end
+        if (r_fire) begin
+          r_lane <= r_cur_lane + 1;
+          r_remain <= r_cur_remain - 1;
+          r_first <= (r_cur_remain == 0);
+          if (r_cur_remain == 0) rq_head <= rq_head + 1;
+        end
+      end
+    end
+
+  end else if (C_EXT_DATA_WIDTH < C_DATA_WIDTH) begin : downsize
+    localparam integer RATIO = C_DATA_WIDTH / C_EXT_DATA_WIDTH;
+    localparam integer LANE_WIDTH = `MWC_C_LOG_2(RATIO);
+
+    //--------------------------------------------------------------------------
+    // Address: RATIO beats per user beat
+    //--------------------------------------------------------------------------
+    assign ext_awaddr = awaddr;
+    assign ext_awlen = (awlen << LANE_WIDTH) | (RATIO - 1);
+    assign ext_awvalid = awvalid;
+    assign awready = ext_awready;
+
+    assign ext_araddr = araddr;
+    assign ext_arlen = (arlen << LANE_WIDTH) | (RATIO - 1);
+    assign ext_arvalid = arvalid;
+    assign arready = ext_arready;
+
+    //--------------------------------------------------------------------------
+    // Write Data: sliced into the external width
+    //--------------------------------------------------------------------------
+    reg [LANE_WIDTH-1:0] w_lane;
+
+    assign ext_wdata = wdata >> (w_lane * C_EXT_DATA_WIDTH);
+    assign ext_wstrb = wstrb >> (w_lane * C_EXT_DATA_WIDTH / 8);
+    assign ext_wlast = wlast && (w_lane == RATIO - 1);
+    assign ext_wvalid = wvalid;
+    assign wready = ext_wready && (w_lane == RATIO - 1);
+
+    always @(posedge ACLK) begin
+      if (aresetn_rrr == 0) begin
+        w_lane <= 0;
+      end else if (ext_wvalid && ext_wready) begin
+        w_lane <= w_lane + 1;
+      end
+    end
+
+    //--------------------------------------------------------------------------
+    // Read Data: packed into the user width
+    //--------------------------------------------------------------------------
+    reg [C_DATA_WIDTH-1:0] r_acc_data;
+    reg [LANE_WIDTH-1:0] r_lane;
+    reg [C_DATA_WIDTH-1:0] r_out_data;
+    reg r_out_last;
+    reg [C_ID_WIDTH-1:0] r_out_id;
+    reg r_out_valid;
+
+    wire [C_DATA_WIDTH-1:0] r_merged_data;
+
+    assign r_merged_data = r_acc_data | ({{(C_DATA_WIDTH-C_EXT_DATA_WIDTH){1'b0}}, ext_rdata} << (r_lane * C_EXT_DATA_WIDTH));
+    assign rdata = r_out_data;
+    assign rlast = r_out_last;
+    assign rid = r_out_id;
+    assign rvalid = r_out_valid;
+    assign ext_rready = !r_out_valid || rready;
+
+    always @(posedge ACLK) begin
+      if (aresetn_rrr == 0) begin
+        r_acc_data <= 0;
+        r_lane <= 0;
+        r_out_data <= 0;
+        r_out_last <= 0;
+        r_out_id <= 0;
+        r_out_valid <= 0;
+      end else begin
+        if (rvalid && rready) begin
+          r_out_valid <= 0;
+        end
+        if (ext_rvalid && ext_rready) begin
+          r_lane <= r_lane + 1;
+          if (r_lane == RATIO - 1) begin
+            r_out_data <= r_merged_data;
+            r_out_last <= ext_rlast;
+            r_out_id <= ext_rid;
+            r_out_valid <= 1;
+            r_acc_data <= 0;
+          end else begin
+            r_acc_data <= r_merged_data;
+          end
+        end
+      end
+    end
+
+  end else begin : through
+    assign ext_awaddr = awaddr;
+    assign ext_awlen = awlen;
+    assign ext_awvalid = awvalid;
+    assign awready = ext_awready;
+    assign ext_wdata = wdata;
+    assign ext_wstrb = wstrb;
+    assign ext_wlast = wlast;
+    assign ext_wvalid = wvalid;
+    assign wready = ext_wready;
+    assign ext_araddr = araddr;
+    assign ext_arlen = arlen;
+    assign ext_arvalid = arvalid;
+    assign arready = ext_arready;
+    assign rdata = ext_rdata;
+    assign rlast = ext_rlast;
+    assign rid = ext_rid;
+    assign rvalid = ext_rvalid;
+    assign ext_rready = rready;
+  end endgenerate
+
+endmodule
@@ -0,0 +1,422 @@
+
+module register_slice #
+  (
+   parameter integer C_WIDTH = 32,
+   parameter integer C_MODE = 3 // 0: through, 1: forward, 2: reverse, 3: full
+   )
+  (
+   input wire ACLK,
+   input wire RST,
+
+   input  wire [C_WIDTH-1:0] s_data,
+   input  wire               s_valid,
+   output wire               s_ready,
+
+   output wire [C_WIDTH-1:0] m_data,
+   output wire               m_valid,
+   input  wire               m_ready
+   );
+
+  generate if (C_MODE == 1) begin: forward
+    // m_data and m_valid are registered
+    reg [C_WIDTH-1:0] data;
+    reg valid;
+
+    assign s_ready = !valid || m_ready;
+    assign m_data = data;
+    assign m_valid = valid;
+
+    always @(posedge ACLK) begin
+      if (RST) begin
+        valid <= 0;
+      end else if (s_ready) begin
+        valid <= s_valid;
+      end
+    end
+
+    always @(posedge ACLK) begin
+      if (s_ready && s_valid) begin
+        data <= s_data;
+      end
+    end
+
+  end else if (C_MODE == 2) begin: reverse
+    // s_ready is registered, and a skid register holds the data
+    // accepted while m_ready is low
+    reg [C_WIDTH-1:0] skid_data;
+    reg skid_valid;
+
+    assign s_ready = !skid_valid;
+    assign m_data = (skid_valid)? skid_data : s_data;
+    assign m_valid = skid_valid || s_valid;
+
+    always @(posedge ACLK) begin
+      if (RST) begin
+        skid_valid <= 0;
+      end else if (m_ready) begin
+        skid_valid <= 0;
+      end else if (s_valid && !skid_valid) begin
+        skid_valid <= 1;
+      end
+    end
+
+    always @(posedge ACLK) begin
+      if (!skid_valid) begin
+        skid_data <= s_data;
+      end
+    end
+
+  end else if (C_MODE == 3) begin: full
+    // reverse followed by forward: all of the outputs are registered
+    wire [C_WIDTH-1:0] mid_data;
+    wire mid_valid;
+    wire mid_ready;
+
+    register_slice #
+     (
+      .C_WIDTH(C_WIDTH),
+      .C_MODE(2)
+     )
+    inst_reverse
+     (
+      .ACLK(ACLK),
+      .RST(RST),
+      .s_data(s_data),
+      .s_valid(s_valid),
+      .s_ready(s_ready),
+      .m_data(mid_data),
+      .m_valid(mid_valid),
+      .m_ready(mid_ready)
+     );
+
+    register_slice #
+     (
+      .C_WIDTH(C_WIDTH),
+      .C_MODE(1)
+     )
+    inst_forward
+     (
+      .ACLK(ACLK),
+      .RST(RST),
+      .s_data(mid_data),
+      .s_valid(mid_valid),
+      .s_ready(mid_ready),
+      .m_data(m_data),
+      .m_valid(m_valid),
+      .m_ready(m_ready)
+     );
+
+  end else begin: through
+    assign s_ready = m_ready;
+    assign m_data = s_data;
+    assign m_valid = s_valid;
+  end endgenerate
+
+endmodule
+
+
+module master_register_slice #
+  (
+   parameter integer C_ADDR_WIDTH = 32,
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_ID_WIDTH = 1,
+   parameter integer C_AW_SLICE = 0, // 0: through, 1: forward, 2: reverse, 3: full
+   parameter integer C_W_SLICE = 0,
+   parameter integer C_AR_SLICE = 0,
+   parameter integer C_R_SLICE = 0
+   )
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   // User side
+   input  wire [C_ADDR_WIDTH-1:0]   awaddr,
+   input  wire [8-1:0]              awlen,
+   input  wire [C_ID_WIDTH-1:0]     awid,
+   input  wire                      awvalid,
+   output wire                      awready,
+
+   input  wire [C_DATA_WIDTH-1:0]   wdata,
+   input  wire [C_DATA_WIDTH/8-1:0] wstrb,
+   input  wire                      wlast,
+   input  wire                      wvalid,
+   output wire                      wready,
+
+   input  wire [C_ADDR_WIDTH-1:0]   araddr,
+   input  wire [8-1:0]              arlen,
+   input  wire [C_ID_WIDTH-1:0]     arid,
+   input  wire                      arvalid,
+   output wire                      arready,
+
+   output wire [C_DATA_WIDTH-1:0]   rdata,
+   output wire                      rlast,
+   output wire [C_ID_WIDTH-1:0]     rid,
+   output wire                      rvalid,
+   input  wire                      rready,
+
+   // Bus interface side
+   output wire [C_ADDR_WIDTH-1:0]   ext_awaddr,
+   output wire [8-1:0]              ext_awlen,
+   output wire [C_ID_WIDTH-1:0]     ext_awid,
+   output wire                      ext_awvalid,
+   input  wire                      ext_awready,
+
+   output wire [C_DATA_WIDTH-1:0]   ext_wdata,
+   output wire [C_DATA_WIDTH/8-1:0] ext_wstrb,
+   output wire                      ext_wlast,
+   output wire                      ext_wvalid,
+   input  wire                      ext_wready,
+
+   output wire [C_ADDR_WIDTH-1:0]   ext_araddr,
+   output wire [8-1:0]              ext_arlen,
+   output wire [C_ID_WIDTH-1:0]     ext_arid,
+   output wire                      ext_arvalid,
+   input  wire                      ext_arready,
+
+   input  wire [C_DATA_WIDTH-1:0]   ext_rdata,
+   input  wire                      ext_rlast,
+   input  wire [C_ID_WIDTH-1:0]     ext_rid,
+   input  wire                      ext_rvalid,
+   output wire                      ext_rready
+   );
+
+  localparam integer AW_WIDTH = C_ADDR_WIDTH + 8 + C_ID_WIDTH;
+  localparam integer W_WIDTH = C_DATA_WIDTH + C_DATA_WIDTH / 8 + 1;
+  localparam integer AR_WIDTH = C_ADDR_WIDTH + 8 + C_ID_WIDTH;
+  localparam integer R_WIDTH = C_DATA_WIDTH + 1 + C_ID_WIDTH;
+
+  //----------------------------------------------------------------------------
+  // Reset logic
+  //----------------------------------------------------------------------------
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  //----------------------------------------------------------------------------
+  // Channels
+  //----------------------------------------------------------------------------
+  register_slice #
+   (
+    .C_WIDTH(AW_WIDTH),
+    .C_MODE(C_AW_SLICE)
+   )
+  inst_aw
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({awaddr, awlen, awid}),
+    .s_valid(awvalid),
+    .s_ready(awready),
+    .m_data({ext_awaddr, ext_awlen, ext_awid}),
+    .m_valid(ext_awvalid),
+    .m_ready(ext_awready)
+   );
+
+  register_slice #
+   (
+    .C_WIDTH(W_WIDTH),
+    .C_MODE(C_W_SLICE)
+   )
+  inst_w
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({wdata, wstrb, wlast}),
+    .s_valid(wvalid),
+    .s_ready(wready),
+    .m_data({ext_wdata, ext_wstrb, ext_wlast}),
+    .m_valid(ext_wvalid),
+    .m_ready(ext_wready)
+   );
+
+  register_slice #
+   (
+    .C_WIDTH(AR_WIDTH),
+    .C_MODE(C_AR_SLICE)
+   )
+  inst_ar
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({araddr, arlen, arid}),
+    .s_valid(arvalid),
+    .s_ready(arready),
+    .m_data({ext_araddr, ext_arlen, ext_arid}),
+    .m_valid(ext_arvalid),
+    .m_ready(ext_arready)
+   );
+
+  register_slice #
+   (
+    .C_WIDTH(R_WIDTH),
+    .C_MODE(C_R_SLICE)
+   )
+  inst_r
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({ext_rdata, ext_rlast, ext_rid}),
+    .s_valid(ext_rvalid),
+    .s_ready(ext_rready),
+    .m_data({rdata, rlast, rid}),
+    .m_valid(rvalid),
+    .m_ready(rready)
+   );
+
+endmodule
+
+
+module slave_register_slice #
+  (
+   parameter integer C_ADDR_WIDTH = 32,
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_AW_SLICE = 0, // 0: through, 1: forward, 2: reverse, 3: full
+   parameter integer C_W_SLICE = 0,
+   parameter integer C_AR_SLICE = 0,
+   parameter integer C_R_SLICE = 0
+   )
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   // User side
+   output wire [C_ADDR_WIDTH-1:0]   awaddr,
+   output wire [8-1:0]              awlen,
+   output wire                      awvalid,
+   input  wire                      awready,
+
+   output wire [C_DATA_WIDTH-1:0]   wdata,
+   output wire [C_DATA_WIDTH/8-1:0] wstrb,
+   output wire                      wlast,
+   output wire                      wvalid,
+   input  wire                      wready,
+
+   output wire [C_ADDR_WIDTH-1:0]   araddr,
+   output wire [8-1:0]              arlen,
+   output wire                      arvalid,
+   input  wire                      arready,
+
+   input  wire [C_DATA_WIDTH-1:0]   rdata,
+   input  wire                      rlast,
+   input  wire                      rvalid,
+   output wire                      rready,
+
+   // Bus interface side
+   input  wire [C_ADDR_WIDTH-1:0]   ext_awaddr,
+   input  wire [8-1:0]              ext_awlen,
+   input  wire                      ext_awvalid,
+   output wire                      ext_awready,
+
+   input  wire [C_DATA_WIDTH-1:0]   ext_wdata,
+   input  wire [C_DATA_WIDTH/8-1:0] ext_wstrb,
+   input  wire                      ext_wlast,
+   input  wire                      ext_wvalid,
+   output wire                      ext_wready,
+
+   input  wire [C_ADDR_WIDTH-1:0]   ext_araddr,
+   input  wire [8-1:0]              ext_arlen,
+   input  wire                      ext_arvalid,
+   output wire                      ext_arready,
+
+   output wire [C_DATA_WIDTH-1:0]   ext_rdata,
+   output wire                      ext_rlast,
+   output wire                      ext_rvalid,
+   input  wire                      ext_rready
+   );
+
+  localparam integer AW_WIDTH = C_ADDR_WIDTH + 8;
+  localparam integer W_WIDTH = C_DATA_WIDTH + C_DATA_WIDTH / 8 + 1;
+  localparam integer AR_WIDTH = C_ADDR_WIDTH + 8;
+  localparam integer R_WIDTH = C_DATA_WIDTH + 1;
+
+  //----------------------------------------------------------------------------
+  // Reset logic
+  //----------------------------------------------------------------------------
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  //----------------------------------------------------------------------------
+  // Channels
+  //----------------------------------------------------------------------------
+  register_slice #
+   (
+    .C_WIDTH(AW_WIDTH),
+    .C_MODE(C_AW_SLICE)
+   )
+  inst_aw
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({ext_awaddr, ext_awlen}),
+    .s_valid(ext_awvalid),
+    .s_ready(ext_awready),
+    .m_data({awaddr, awlen}),
+    .m_valid(awvalid),
+    .m_ready(awready)
+   );
+
+  register_slice #
+   (
+    .C_WIDTH(W_WIDTH),
+    .C_MODE(C_W_SLICE)
+   )
+  inst_w
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({ext_wdata, ext_wstrb, ext_wlast}),
+    .s_valid(ext_wvalid),
+    .s_ready(ext_wready),
+    .m_data({wdata, wstrb, wlast}),
+    .m_valid(wvalid),
+    .m_ready(wready)
+   );
+
+  register_slice #
+   (
+    .C_WIDTH(AR_WIDTH),
+    .C_MODE(C_AR_SLICE)
+   )
+  inst_ar
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({ext_araddr, ext_arlen}),
+    .s_valid(ext_arvalid),
+    .s_ready(ext_arready),
+    .m_data({araddr, arlen}),
+    .m_valid(arvalid),
+    .m_ready(arready)
+   );
+
+  register_slice #
+   (
+    .C_WIDTH(R_WIDTH),
+    .C_MODE(C_R_SLICE)
+   )
+  inst_r
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({rdata, rlast}),
+    .s_valid(rvalid),
+    .s_ready(rready),
+    .m_data({ext_rdata, ext_rlast}),
+    .m_valid(ext_rvalid),
+    .m_ready(ext_rready)
+   );
+
+endmodule
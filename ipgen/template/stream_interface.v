@@ -0,0 +1,196 @@
+
+module axi_stream_interface #
+  (
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_SLICE = 0 // 0: through, 1: forward, 2: reverse, 3: full
+   )
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   input  wire [C_DATA_WIDTH-1:0]   s_tdata,
+   input  wire [C_DATA_WIDTH/8-1:0] s_tkeep,
+   input  wire                      s_tlast,
+   input  wire                      s_tvalid,
+   output wire                      s_tready,
+
+   output wire [C_DATA_WIDTH-1:0]   m_tdata,
+   output wire [C_DATA_WIDTH/8-1:0] m_tkeep,
+   output wire                      m_tlast,
+   output wire                      m_tvalid,
+   input  wire                      m_tready
+   );
+
+  localparam W = C_DATA_WIDTH + C_DATA_WIDTH / 8 + 1;
+
+  wire slice_s_ready;
+
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  // no beat is accepted until the synchronized reset is released
+  assign s_tready = aresetn_rrr && slice_s_ready;
+
+  register_slice #
+   (
+    .C_WIDTH(W),
+    .C_MODE(C_SLICE)
+   )
+  inst_register_slice
+   (
+    .ACLK(ACLK),
+    .RST(!aresetn_rrr),
+    .s_data({s_tdata, s_tkeep, s_tlast}),
+    .s_valid(aresetn_rrr && s_tvalid),
+    .s_ready(slice_s_ready),
+    .m_data({m_tdata, m_tkeep, m_tlast}),
+    .m_valid(m_tvalid),
+    .m_ready(m_tready)
+   );
+
+endmodule
+
+// tkeep of the last beat is converted into empty, the number of the unused
+// bytes in the upper bits. startofpacket is asserted at the first beat.
+module avalon_st_source_interface #
+  (
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_EMPTY_WIDTH = 2,
+   parameter integer C_SLICE = 0 // 0: through, 1: forward, 2: reverse, 3: full
+   )
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   input  wire [C_DATA_WIDTH-1:0]   tdata,
+   input  wire [C_DATA_WIDTH/8-1:0] tkeep,
+   input  wire                      tlast,
+   input  wire                      tvalid,
+   output wire                      tready,
+
+   output wire [C_DATA_WIDTH-1:0]   aso_data,
+   output wire                      aso_valid,
+   input  wire                      aso_ready,
+   output wire                      aso_startofpacket,
+   output wire                      aso_endofpacket,
+   output wire [C_EMPTY_WIDTH-1:0]  aso_empty
+   );
+
+  wire [C_DATA_WIDTH/8-1:0] m_tkeep;
+  reg in_packet;
+
+  reg aresetn_r;
+  reg aresetn_rr;
+  reg aresetn_rrr;
+
+  always @(posedge ACLK) begin
+    aresetn_r <= ARESETN;
+    aresetn_rr <= aresetn_r;
+    aresetn_rrr <= aresetn_rr;
+  end
+
+  function [C_EMPTY_WIDTH-1:0] empty_bytes;
+    input [C_DATA_WIDTH/8-1:0] keep;
+    integer i;
+    begin
+      empty_bytes = 0;
+      for(i=0; i<C_DATA_WIDTH/8; i=i+1) begin
+        if(!keep[i]) empty_bytes = empty_bytes + 1;
+      end
+    end
+  endfunction
+
+  assign aso_startofpacket = !in_packet;
+  assign aso_empty = (aso_endofpacket)? empty_bytes(m_tkeep) : 0;
+
+  always @(posedge ACLK) begin
+    if(aresetn_rrr == 0) begin
+      in_packet <= 0;
+    end else if(aso_valid && aso_ready) begin
+      in_packet <= !aso_endofpacket;
+    end
+  end
+
+  axi_stream_interface #
+   (
+    .C_DATA_WIDTH(C_DATA_WIDTH),
+    .C_SLICE(C_SLICE)
+   )
+  inst_axi_stream_interface
+   (
+    .ACLK(ACLK),
+    .ARESETN(ARESETN),
+    .s_tdata(tdata),
+    .s_tkeep(tkeep),
+    .s_tlast(tlast),
+    .s_tvalid(tvalid),
+    .s_tready(tready),
+    .m_tdata(aso_data),
+    .m_tkeep(m_tkeep),
+    .m_tlast(aso_endofpacket),
+    .m_tvalid(aso_valid),
+    .m_tready(aso_ready)
+   );
+
+endmodule
+
+// empty of the last beat is converted into tkeep. startofpacket is not used,
+// since a packet begins at the beat after endofpacket.
+module avalon_st_sink_interface #
+  (
+   parameter integer C_DATA_WIDTH = 32,
+   parameter integer C_EMPTY_WIDTH = 2,
+   parameter integer C_SLICE = 0 // 0: through, 1: forward, 2: reverse, 3: full
+   )
+  (
+   input wire ACLK,
+   input wire ARESETN,
+
+   output wire [C_DATA_WIDTH-1:0]   tdata,
+   output wire [C_DATA_WIDTH/8-1:0] tkeep,
+   output wire                      tlast,
+   output wire                      tvalid,
+   input  wire                      tready,
+
+   input  wire [C_DATA_WIDTH-1:0]   asi_data,
+   input  wire                      asi_valid,
+   output wire                      asi_ready,
+   input  wire                      asi_startofpacket,
+   input  wire                      asi_endofpacket,
+   input  wire [C_EMPTY_WIDTH-1:0]  asi_empty
+   );
+
+  wire [C_DATA_WIDTH/8-1:0] s_tkeep;
+
+  assign s_tkeep = (asi_endofpacket)? {(C_DATA_WIDTH/8){1'b1}} >> asi_empty :
+                   {(C_DATA_WIDTH/8){1'b1}};
+
+  axi_stream_interface #
+   (
+    .C_DATA_WIDTH(C_DATA_WIDTH),
+    .C_SLICE(C_SLICE)
+   )
+  inst_axi_stream_interface
+   (
+    .ACLK(ACLK),
+    .ARESETN(ARESETN),
+    .s_tdata(asi_data),
+    .s_tkeep(s_tkeep),
+    .s_tlast(asi_endofpacket),
+    .s_tvalid(asi_valid),
+    .s_tready(asi_ready),
+    .m_tdata(tdata),
+    .m_tkeep(tkeep),
+    .m_tlast(tlast),
+    .m_tvalid(tvalid),
+    .m_tready(tready)
+   );
+
+endmodule
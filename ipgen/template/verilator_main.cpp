@@ -0,0 +1,195 @@
+//------------------------------------------------------------------------------
+// C++ harness and DRAM model for Verilator
+//------------------------------------------------------------------------------
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <cctype>
+#include <memory>
+#include <string>
+#include <vector>
+#include <utility>
+
+#include "verilated.h"
+#include "Vtest_top.h"
+
+#if VM_TRACE_FST
+#include "verilated_fst_c.h"
+typedef VerilatedFstC ipgen_trace_t;
+#elif VM_TRACE
+#include "verilated_vcd_c.h"
+typedef VerilatedVcdC ipgen_trace_t;
+#endif
+
+//------------------------------------------------------------------------------
+// DRAM Model (accessed by dram_stub via DPI-C)
+//------------------------------------------------------------------------------
+static unsigned char* dram_memory = NULL;
+static unsigned long long dram_length = 0;
+
+static void dram_readmemh(const char* filename)
+{
+  FILE* fp = fopen(filename, "r");
+  if(fp == NULL) {
+    fprintf(stderr, "WARNING: %s: $readmem file not found\n", filename);
+    return;
+  }
+  unsigned long long addr = 0;
+  int c = fgetc(fp);
+  while(c != EOF) {
+    if(isspace(c)) {
+      c = fgetc(fp);
+      continue;
+    }
+    if(c == '/') {
+      // comments
+      int n = fgetc(fp);
+      if(n == '/') {
+        while(c != EOF && c != '\n') c = fgetc(fp);
+      } else if(n == '*') {
+        int p = 0;
+        c = fgetc(fp);
+        while(c != EOF && !(p == '*' && c == '/')) {
+          p = c;
+          c = fgetc(fp);
+        }
+        if(c != EOF) c = fgetc(fp);
+      } else {
+        c = n;
+      }
+      continue;
+    }
+    bool is_addr = (c == '@');
+    if(is_addr) c = fgetc(fp);
+    unsigned long long val = 0;
+    while(c != EOF && (isxdigit(c) || c == '_' || c == 'x' || c == 'X' || c == 'z' || c == 'Z')) {
+      if(isxdigit(c)) {
+        val = (val << 4) | (isdigit(c) ? c - '0' : (tolower(c) - 'a' + 10));
+      } else if(c != '_') {
+        val = val << 4;
+      }
+      c = fgetc(fp);
+    }
+    if(is_addr) {
+      addr = val;
+    } else {
+      if(addr < dram_length) dram_memory[addr] = (unsigned char)val;
+      addr++;
+    }
+  }
+  fclose(fp);
+}
+
+static void dram_fread(const char* filename)
+{
+  FILE* fp = fopen(filename, "rb");
+  if(fp == NULL) {
+    fprintf(stderr, "WARNING: %s: $fread file not found\n", filename);
+    return;
+  }
+  size_t size = fread(dram_memory, 1, dram_length, fp);
+  (void)size;
+  fclose(fp);
+}
+
+extern "C" void ipgen_dram_init(const char* memimg, int binfile, int addrwidth)
+{
+  dram_length = 1ULL << addrwidth;
+  free(dram_memory);
+  dram_memory = (unsigned char*)calloc(dram_length, 1);
+  if(dram_memory == NULL) {
+    fprintf(stderr, "ERROR: DRAM model of %llu bytes cannot be allocated\n", dram_length);
+    exit(1);
+  }
+  if(strcmp(memimg, "None") == 0) {
+    // incremental values as 32-bit little-endian words
+    for(unsigned long long i=0; i<dram_length; i++) {
+      dram_memory[i] = (unsigned char)(((unsigned int)(i / 4)) >> (8 * (i % 4)));
+    }
+  } else if(binfile) {
+    dram_fread(memimg);
+  } else {
+    dram_readmemh(memimg);
+  }
+}
+
+extern "C" unsigned char ipgen_dram_read(unsigned long long addr)
+{
+  return (addr < dram_length)? dram_memory[addr] : 0;
+}
+
+extern "C" void ipgen_dram_write(unsigned long long addr, unsigned char data)
+{
+  if(addr < dram_length) dram_memory[addr] = data;
+}
+
+//------------------------------------------------------------------------------
+// Waveform Dump (controlled by test_top via DPI-C)
+//------------------------------------------------------------------------------
+static std::string dump_filename;
+static std::vector<std::pair<int, std::string> > dump_scopes;
+static bool dump_requested = false;
+static bool dump_enabled = true;
+
+extern "C" void ipgen_dump_vars(int depth, const char* scope)
+{
+  dump_scopes.push_back(std::make_pair(depth, std::string("TOP.test_top.") + scope));
+}
+
+extern "C" void ipgen_dump_open(const char* filename)
+{
+#if VM_TRACE
+  dump_filename = filename;
+  dump_requested = true;
+#else
+  fprintf(stderr, "WARNING: %s: waveform dump requires Verilator --trace or --trace-fst\n", filename);
+#endif
+}
+
+extern "C" void ipgen_dump_enable(int enable)
+{
+  dump_enabled = enable;
+}
+
+//------------------------------------------------------------------------------
+// Main
+//------------------------------------------------------------------------------
+int main(int argc, char** argv)
+{
+  const std::unique_ptr<VerilatedContext> contextp(new VerilatedContext);
+  contextp->commandArgs(argc, argv);
+  const std::unique_ptr<Vtest_top> topp(new Vtest_top(contextp.get(), "TOP"));
+
+#if VM_TRACE
+  contextp->traceEverOn(true);
+  std::unique_ptr<ipgen_trace_t> tfp;
+#endif
+
+  while(!contextp->gotFinish()) {
+    topp->eval();
+#if VM_TRACE
+    if(dump_requested && !tfp) {
+      tfp.reset(new ipgen_trace_t);
+      for(size_t i=0; i<dump_scopes.size(); i++) {
+        tfp->dumpvars(dump_scopes[i].first, dump_scopes[i].second);
+      }
+      topp->trace(tfp.get(), 99);
+      tfp->open(dump_filename.c_str());
+    }
+    if(tfp && dump_enabled) tfp->dump(contextp->time());
+#endif
+    if(!topp->eventsPending()) break;
+    contextp->time(topp->nextTimeSlot());
+  }
+
+  if(!contextp->gotFinish()) {
+    fprintf(stderr, "[IPgen] simulation stopped without $finish\n");
+  }
+
+  topp->final();
+#if VM_TRACE
+  if(tfp) tfp->close();
+#endif
+  free(dram_memory);
+  return 0;
+}
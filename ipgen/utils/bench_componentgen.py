@@ -0,0 +1,150 @@
+#-------------------------------------------------------------------------------
+# bench_componentgen.py
+#
+# Generation time and memory of component.xml against the number of interfaces
+#
+# Copyright (C) 2013, Shinya Takamaeda-Yamazaki
+# License: Apache 2.0
+#-------------------------------------------------------------------------------
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import division
+import sys
+import os
+import io
+import time
+import tracemalloc
+import xml.dom.minidom
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import ipgen.utils.version
+from ipgen.utils.componentgen import ComponentGen, AxiDefinition
+
+#-------------------------------------------------------------------------------
+class DomWriter(object):
+    """ Former backend: the whole document is built as a minidom tree """
+    def __init__(self, stream):
+        self.stream = stream
+        impl = xml.dom.minidom.getDOMImplementation()
+        self.dom = impl.createDocument('spirit', 'spirit:component', None)
+
+    def createElement(self, tagName):
+        return self.dom.createElement(tagName)
+
+    def createTextNode(self, data):
+        return self.dom.createTextNode(data)
+
+    def start(self, top):
+        for name, value in top.attributes:
+            self.dom.documentElement.setAttribute(name, value)
+        return ''
+
+    def write(self, element):
+        self.dom.documentElement.appendChild(element)
+        return ''
+
+    def end(self):
+        self.stream.write(self.dom.toprettyxml(indent='  '))
+
+class StreamComponentGen(ComponentGen):
+    """ Streaming without the fragment templates: all interfaces are built """
+    def appendFragment(self, parent, method, obj, order=None):
+        if order is None:
+            r = method(obj)
+        else:
+            order, r = method(obj, order)
+        for e in (r if isinstance(r, list) else [r]):
+            parent.appendChild(e)
+        return order
+
+class DomComponentGen(StreamComponentGen):
+    def init(self, stream):
+        StreamComponentGen.init(self, stream)
+        self.doc = DomWriter(stream)
+
+class NullStream(object):
+    def __init__(self):
+        self.size = 0
+
+    def write(self, s):
+        self.size += len(s)
+
+#-------------------------------------------------------------------------------
+def mkMemoryList(num):
+    return [ AxiDefinition('if%d_AXI' % i, 32 << (i % 3), i % 2 == 0, i % 4 >= 2)
+             for i in range(num) ]
+
+def measure(gen_class, memorylist, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        gen_class().write(NullStream(), 'userlogic', memorylist)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    stream = NullStream()
+    gen_class().write(stream, 'userlogic', memorylist)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, stream.size
+
+#-------------------------------------------------------------------------------
+def main():
+    INFO = "Benchmark of component.xml generation"
+    VERSION = ipgen.utils.version.VERSION
+    USAGE = "Usage: python bench_componentgen.py [options]"
+
+    def showVersion():
+        print(INFO)
+        print(VERSION)
+        print(USAGE)
+        sys.exit()
+
+    optparser = OptionParser()
+    optparser.add_option("-v","--version",action="store_true",dest="showversion",
+                         default=False,help="Show the version")
+    optparser.add_option("--num",dest="num",
+                         default="1,4,16,64,256",help="Comma-separated numbers of interfaces, Default=1,4,16,64,256")
+    optparser.add_option("--repeat",dest="repeat",type='int',
+                         default=3,help="Repeat count of each measurement (best is reported), Default=3")
+    (options, args) = optparser.parse_args()
+
+    if options.showversion:
+        showVersion()
+
+    backends = (('dom', DomComponentGen), ('stream', StreamComponentGen),
+                ('fragment', ComponentGen))
+
+    rows = []
+    for num in [int(v) for v in options.num.split(',')]:
+        memorylist = mkMemoryList(num)
+        outputs = []
+        for name, gen_class in backends:
+            out = io.StringIO()
+            gen_class().write(out, 'userlogic', memorylist)
+            outputs.append(out.getvalue())
+        if outputs.count(outputs[0]) != len(outputs):
+            raise ValueError("Different outputs with %d interfaces" % num)
+        times = []
+        peaks = []
+        for name, gen_class in backends:
+            elapsed, peak, size = measure(gen_class, memorylist, options.repeat)
+            times.append(elapsed)
+            peaks.append(peak / 1024)
+        rows.append([num, size / 1024] + times + [times[0] / times[-1]] + peaks)
+
+    print("----------------------------------------")
+    print("time[s] and peak memory[KB] of each backend")
+    print("%-6s %10s" % ('num', 'size[KB]') +
+          ''.join([' %10s' % name for name, gen_class in backends]) + ' %8s' % 'speedup' +
+          ''.join([' %10s' % name for name, gen_class in backends]))
+    for row in rows:
+        print("%-6d %10.1f" % tuple(row[:2]) +
+              ''.join([' %10.4f' % v for v in row[2:2 + len(backends)]]) +
+              ' %7.2fx' % row[2 + len(backends)] +
+              ''.join([' %10.1f' % v for v in row[3 + len(backends):]]))
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,15 @@
-import xml.dom.minidom
+import os
+import io
+import re
+import copy
+import json
+import time
+import hashlib
 import codecs
 import datetime
 
+import ipgen.utils.version
+
 PORTLIST = ('AWID', 'AWADDR', 'AWLEN', 'AWSIZE', 'AWBURST', 'AWLOCK',
             'AWCACHE', 'AWPROT', 'AWQOS', 'AWUSER', 'AWVALID', 'AWREADY',
             'WDATA', 'WSTRB', 'WLAST', 'WUSER', 'WVALID', 'WREADY', 
@@ -16,73 +24,318 @@ PORTLITELIST = ('AWADDR', 'AWPROT', 'AWVALID', 'AWREADY',
                 'ARADDR', 'ARPROT', 'ARVALID', 'ARREADY', 
                 'RDATA', 'RRESP', 'RVALID', 'RREADY' )
 
+PORTSTREAMLIST = ('TDATA', 'TKEEP', 'TLAST', 'TVALID', 'TREADY')
+
+# interface name in the fragment templates
+FRAGMENT_NAME = '\x00'
+FRAGMENT_ORDER = re.compile(r'spirit:order="(\d+)"')
+
+# changed when the format of the sections is changed, to invalidate the previous output
+SECTION_VERSION = 1
+
+#-------------------------------------------------------------------------------
+def model(obj, exclude=()):
+    """ Normalized attributes of an interface definition """
+    return ((obj.__class__.__name__,) +
+            tuple(sorted([ (k, v) for k, v in vars(obj).items() if k not in exclude ])))
+
+def generator_digest():
+    """ The version of ipgen and the source of this module, so that the sections
+    generated by another version are not reused """
+    h = hashlib.sha1(ipgen.utils.version.VERSION.encode('utf-8'))
+    source = os.path.splitext(os.path.abspath(__file__))[0] + '.py'
+    if os.path.exists(source):
+        with open(source, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+GENERATOR_DIGEST = generator_digest()
+
+def digest(inputs):
+    return hashlib.sha1(repr((SECTION_VERSION, GENERATOR_DIGEST, inputs)).encode('utf-8')).hexdigest()
+
+#-------------------------------------------------------------------------------
+def escape(text):
+    return (text.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('"', '&quot;').replace('>', '&gt;'))
+
+#-------------------------------------------------------------------------------
+class Element(object):
+    __slots__ = ('tagName', 'attributes', 'childNodes')
+    def __init__(self, tagName):
+        self.tagName = tagName
+        self.attributes = []
+        self.childNodes = []
+
+    def appendChild(self, node):
+        self.childNodes.append(node)
+        return node
+
+    def setAttribute(self, name, value):
+        self.attributes.append((name, value))
+
+#-------------------------------------------------------------------------------
+class FragmentTemplate(object):
+    """ Elements of an interface built once for each kind of interface """
+    __slots__ = ('elements', 'count', 'texts')
+    def __init__(self, elements, count=0):
+        self.elements = elements
+        self.count = count
+        self.texts = {}
+
+class Fragment(object):
+    __slots__ = ('template', 'name', 'order')
+    def __init__(self, template, name, order=0):
+        self.template = template
+        self.name = name
+        self.order = order
+
+#-------------------------------------------------------------------------------
+class XmlWriter(object):
+    """ Writes each element to the stream when it is complete, in the format of
+    xml.dom.minidom toprettyxml(), so that the whole document is not kept """
+    def __init__(self, stream, indent='  '):
+        self.stream = stream
+        self.indent = indent
+        self.top = None
+
+    def createElement(self, tagName):
+        return Element(tagName)
+
+    def createTextNode(self, data):
+        return data
+
+    def start(self, top):
+        self.top = top
+        text = '<?xml version="1.0" ?>\n' + self.startTag(top) + '>\n'
+        self.stream.write(text)
+        return text
+
+    def write(self, element):
+        buf = []
+        self.format(buf, element, self.indent)
+        text = ''.join(buf)
+        self.stream.write(text)
+        return text
+
+    def end(self):
+        self.stream.write('</' + self.top.tagName + '>\n')
+
+    def startTag(self, element):
+        return '<' + element.tagName + ''.join([' %s="%s"' % (name, escape(value))
+                                                for name, value in element.attributes])
+
+    def format(self, buf, element, indent):
+        children = element.childNodes
+        buf.append(indent + self.startTag(element))
+        if not children:
+            buf.append('/>\n')
+        elif len(children) == 1 and not isinstance(children[0], (Element, Fragment)):
+            buf.append('>' + escape(children[0]) + '</' + element.tagName + '>\n')
+        else:
+            buf.append('>\n')
+            for child in children:
+                if isinstance(child, Element):
+                    self.format(buf, child, indent + self.indent)
+                elif isinstance(child, Fragment):
+                    self.formatFragment(buf, child, indent + self.indent)
+                else:
+                    buf.append(escape(indent + self.indent + child + '\n'))
+            buf.append(indent + '</' + element.tagName + '>\n')
+
+    def formatFragment(self, buf, fragment, indent):
+        template = fragment.template
+        text = template.texts.get(indent)
+        if text is None:
+            tbuf = []
+            for element in template.elements:
+                self.format(tbuf, element, indent)
+            text = ''.join(tbuf)
+            template.texts[indent] = text
+        if fragment.order:
+            order = fragment.order
+            text = FRAGMENT_ORDER.sub(lambda m: 'spirit:order="%d"' % (int(m.group(1)) + order),
+                                      text)
+        buf.append(text.replace(FRAGMENT_NAME, escape(fragment.name)))
+
 #-------------------------------------------------------------------------------
 class AxiDefinition(object):
-    def __init__(self, name, ext_datawidth=32, master=True, lite=False):
+    def __init__(self, name, ext_datawidth=32, master=True, lite=False, thread_id_width=1,
+                 max_burst_length=None, outstanding=0):
         self.name = name
         self.ext_datawidth = ext_datawidth
         self.master = master
         self.lite = lite
+        self.thread_id_width = thread_id_width
+        self.max_burst_length = max_burst_length
+        self.outstanding = outstanding
+
+#-------------------------------------------------------------------------------
+class AxiStreamDefinition(object):
+    def __init__(self, name, ext_datawidth=32, master=True):
+        self.name = name
+        self.ext_datawidth = ext_datawidth
+        self.master = master
+
+#-------------------------------------------------------------------------------
+class InterruptDefinition(object):
+    def __init__(self, name, sensitivity='LEVEL_HIGH'):
+        self.name = name
+        self.sensitivity = sensitivity
 
 #-------------------------------------------------------------------------------
 class ComponentGen(object):
     def __init__(self):
-        self.impl = None
         self.doc = None
         self.top = None
         self.userlogic_name = None
         self.memorylist = None
+        self.streamlist = ()
+        self.interruptlist = ()
         self.ext_addrwidth = 32
         self.ext_burstlength = 256
         self.ext_ports = ()
         self.ext_params = ()
+        self.timestamp = None
+        self.filelist = ()
+        self.fragments = {}
 
     #---------------------------------------------------------------------------
     def generate(self, userlogic_name, memorylist, 
-                 ext_addrwidth=32, ext_burstlength=256, ext_ports=(), ext_params=()):
+                 ext_addrwidth=32, ext_burstlength=256, ext_ports=(), ext_params=(),
+                 streamlist=(), timestamp=False, filelist=(), interruptlist=()):
+        stream = io.StringIO()
+        self.write(stream, userlogic_name, memorylist,
+                   ext_addrwidth, ext_burstlength, ext_ports, ext_params, streamlist,
+                   timestamp, filelist, interruptlist)
+        return stream.getvalue()
+
+    def write(self, stream, userlogic_name, memorylist, 
+              ext_addrwidth=32, ext_burstlength=256, ext_ports=(), ext_params=(),
+              streamlist=(), timestamp=False, filelist=(), interruptlist=(), previous=None):
+        """ filelist: HDL files in the core (such as the shared common HDL),
+        which are added to the file sets with the top module.
+        interruptlist: interrupt outputs of the core (InterruptDefinition).
+        previous: section name -> (digest of the inputs, text) of the previous
+        output, reused for the sections whose inputs are not changed.
+        Returns the header and (name, digest, length) of the sections. """
         self.userlogic_name = userlogic_name
-        self.memorylist = memorylist
+        # the same order as sort_by_name() of the templates
+        self.memorylist = sorted(memorylist, key=lambda x:x.name.lower())
+        self.streamlist = sorted(streamlist, key=lambda x:x.name.lower())
+        self.interruptlist = sorted(interruptlist, key=lambda x:x.name.lower())
         
         self.ext_addrwidth = ext_addrwidth
         self.ext_burstlength = ext_burstlength
-        self.ext_ports = ext_ports
-        self.ext_params = ext_params
+        self.ext_ports = tuple([ tuple(p) for p in ext_ports ])
+        self.ext_params = tuple([ tuple(p) for p in ext_params ])
+        self.timestamp = (time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                          if timestamp else None)
+        self.filelist = tuple(filelist)
 
-        self.init()
+        self.init(stream)
         
-        self.top.appendChild(self.mkVendor())
-        self.top.appendChild(self.mkLibrary())
-        self.top.appendChild(self.mkName(self.userlogic_name.lower()))
-        self.top.appendChild(self.mkVersion())
-        self.top.appendChild(self.mkBusInterfaces())
-        r = self.mkAddressSpaces()
-        if r: self.top.appendChild(r)
-        r = self.mkMemoryMaps()
-        if r: self.top.appendChild(r)
-        self.top.appendChild(self.mkModel())
-        self.top.appendChild(self.mkChoices())
-        self.top.appendChild(self.mkFileSets())
-        self.top.appendChild(self.mkDescription())
-        self.top.appendChild(self.mkParameters())
-        self.top.appendChild(self.mkVendorExtensions())
-
-        return self.doc.toprettyxml(indent='  ')
+        header = self.doc.start(self.top)
+        sections = []
+        for name, inputs, method in self.mkSections():
+            key = digest(inputs)
+            if previous is not None and name in previous and previous[name][0] == key:
+                text = previous[name][1]
+                stream.write(text)
+            else:
+                r = method()
+                text = self.doc.write(r) if r is not None else ''
+            sections.append((name, key, len(text)))
+        self.doc.end()
+        return header, sections
+
+    def update(self, filename, userlogic_name, memorylist, 
+               ext_addrwidth=32, ext_burstlength=256, ext_ports=(), ext_params=(),
+               streamlist=(), timestamp=False, filelist=(), interruptlist=()):
+        """ Regenerates the file from the sections of the previous output whose
+        inputs are not changed. The file is not written if the output is the same.
+        Returns True if the file is written. """
+        indexname = os.path.join(os.path.dirname(filename),
+                                 '.' + os.path.basename(filename) + '.json')
+        prevtext, previous = self.readPrevious(filename, indexname)
+        stream = io.StringIO()
+        header, sections = self.write(stream, userlogic_name, memorylist,
+                                      ext_addrwidth, ext_burstlength, ext_ports, ext_params,
+                                      streamlist, timestamp, filelist, interruptlist,
+                                      previous)
+        text = stream.getvalue()
+        index = {'digest' : hashlib.sha1(text.encode('utf-8')).hexdigest(),
+                 'header' : len(header),
+                 'sections' : sections}
+        if text != prevtext:
+            f = open(filename, 'w')
+            f.write(text)
+            f.close()
+        if text != prevtext or previous is None:
+            f = open(indexname, 'w')
+            json.dump(index, f)
+            f.close()
+        return text != prevtext
+
+    def readPrevious(self, filename, indexname):
+        if not os.path.exists(filename):
+            return None, None
+        f = open(filename, 'r')
+        text = f.read()
+        f.close()
+        if not os.path.exists(indexname):
+            return text, None
+        try:
+            f = open(indexname, 'r')
+            index = json.load(f)
+            f.close()
+        except ValueError:
+            return text, None
+        # the file might be edited after the generation
+        if index.get('digest') != hashlib.sha1(text.encode('utf-8')).hexdigest():
+            return text, None
+        previous = {}
+        pos = index['header']
+        for name, key, length in index['sections']:
+            previous[name] = (key, text[pos:pos+length])
+            pos += length
+        return text, previous
+
+    #---------------------------------------------------------------------------
+    def mkSections(self):
+        """ Top-level sections with the normalized inputs they depend on """
+        name = self.userlogic_name
+        memories = tuple([ model(m) for m in self.memorylist ])
+        streams = tuple([ model(s) for s in self.streamlist ])
+        interrupts = tuple([ model(i) for i in self.interruptlist ])
+        return (('vendor', (), self.mkVendor),
+                ('library', (), self.mkLibrary),
+                ('name', (name,), lambda: self.mkName(self.userlogic_name.lower())),
+                ('version', (), self.mkVersion),
+                ('busInterfaces', (memories, streams + interrupts, self.ext_burstlength),
+                 self.mkBusInterfaces),
+                ('addressSpaces', (memories, self.ext_addrwidth), self.mkAddressSpaces),
+                ('memoryMaps', (memories,), self.mkMemoryMaps),
+                ('model', (name, memories, streams + interrupts, self.ext_addrwidth,
+                           self.ext_ports, self.ext_params), self.mkModel),
+                ('choices', (), self.mkChoices),
+                ('fileSets', (name,) + self.filelist, self.mkFileSets),
+                ('description', (), self.mkDescription),
+                ('parameters', (name, memories, streams, self.ext_addrwidth,
+                                self.ext_params), self.mkParameters),
+                ('vendorExtensions', (name, self.timestamp), self.mkVendorExtensions))
 
     #---------------------------------------------------------------------------
     def setAttribute(self, obj, name, text):
-        attrobj = self.doc.createAttribute(name)
-        attrobj.value = str(text)
-        obj.setAttributeNode(attrobj)
+        obj.setAttribute(name, str(text))
     
     def setText(self, obj, text):
-        textobj = self.doc.createTextNode(str(text))
-        obj.appendChild(textobj)
+        obj.appendChild(self.doc.createTextNode(str(text)))
 
     #---------------------------------------------------------------------------
-    def init(self):
-        self.impl = xml.dom.minidom.getDOMImplementation()
-        self.doc = self.impl.createDocument('spirit', 'spirit:component', None)
-        self.top = self.doc.documentElement
+    def init(self, stream):
+        self.doc = XmlWriter(stream)
+        self.top = self.doc.createElement('spirit:component')
         
         self.setAttribute(self.top, 'xmlns:xilinx', "http://www.xilinx.com")
         self.setAttribute(self.top, 'xmlns:spirit',
@@ -116,14 +369,43 @@ class ComponentGen(object):
         self.setText(name, v)
         return name
 
+    #---------------------------------------------------------------------------
+    def appendFragment(self, parent, method, obj, order=None):
+        """ The elements by method are built and formatted once for each kind of
+        interface, and then the name and the order are substituted """
+        key = (method.__name__, self.ext_addrwidth, self.ext_burstlength,
+               model(obj, exclude=('name',)))
+        template = self.fragments.get(key)
+        if template is None:
+            tobj = copy.copy(obj)
+            tobj.name = FRAGMENT_NAME
+            if order is None:
+                r = method(tobj)
+                count = 0
+            else:
+                count, r = method(tobj, 0)
+            template = FragmentTemplate(r if isinstance(r, list) else [r], count)
+            self.fragments[key] = template
+        parent.appendChild(Fragment(template, obj.name, 0 if order is None else order))
+        if order is None:
+            return None
+        return order + template.count
+
     #---------------------------------------------------------------------------
     def mkBusInterfaces(self):
         bus = self.doc.createElement('spirit:busInterfaces')
         for memory in self.memorylist:
-            bus.appendChild(self.mkBusInterface(memory))
+            self.appendFragment(bus, self.mkBusInterface, memory)
+        for stream in self.streamlist:
+            self.appendFragment(bus, self.mkBusInterfaceStream, stream)
+        for interrupt in self.interruptlist:
+            self.appendFragment(bus, self.mkBusInterfaceInterrupt, interrupt)
         for memory in self.memorylist:
-            bus.appendChild(self.mkBusInterfaceReset(memory))
-            bus.appendChild(self.mkBusInterfaceClock(memory))
+            self.appendFragment(bus, self.mkBusInterfaceReset, memory)
+            self.appendFragment(bus, self.mkBusInterfaceClock, memory)
+        for stream in self.streamlist:
+            self.appendFragment(bus, self.mkBusInterfaceReset, stream)
+            self.appendFragment(bus, self.mkBusInterfaceClock, stream)
         return bus
 
     #---------------------------------------------------------------------------
@@ -141,7 +423,11 @@ class ComponentGen(object):
         else:
             interface.appendChild(self.mkSlave(name))
         interface.appendChild(self.mkPortMaps(name, lite))
-        interface.appendChild(self.mkBusParameters(name, datawidth, master))
+        max_burst_length = (1 if lite else
+                            self.ext_burstlength if obj.max_burst_length is None else
+                            obj.max_burst_length)
+        interface.appendChild(self.mkBusParameters(name, datawidth, master,
+                                                   max_burst_length, obj.outstanding))
         return interface
 
     def mkBusType(self):
@@ -200,12 +486,21 @@ class ComponentGen(object):
         physicalport.appendChild(self.mkName(name + '_' + attr))
         return physicalport
     
-    def mkBusParameters(self, name, datawidth, master=True):
+    def mkBusParameters(self, name, datawidth, master=True,
+                        max_burst_length=256, outstanding=0):
         parameters = self.doc.createElement('spirit:parameters')
         parameters.appendChild(self.mkBusParameterDatawidth(name, datawidth))
         if master:
             parameters.appendChild(self.mkBusParameterNumReg(name, 4))
         parameters.appendChild(self.mkBusParameterBurst(name, 0))
+        if master:
+            parameters.appendChild(self.mkBusParameterLong(name, 'MAX_BURST_LENGTH',
+                                                           max_burst_length))
+        if master and outstanding > 0:
+            parameters.appendChild(self.mkBusParameterLong(name, 'NUM_READ_OUTSTANDING',
+                                                           outstanding))
+            parameters.appendChild(self.mkBusParameterLong(name, 'NUM_WRITE_OUTSTANDING',
+                                                           outstanding))
         return parameters
 
     def mkBusParameterDatawidth(self, name, datawidth):
@@ -246,6 +541,102 @@ class ComponentGen(object):
         parameter.appendChild(value)
         return parameter
 
+    def mkBusParameterLong(self, name, paramname, num):
+        parameter = self.doc.createElement('spirit:parameter')
+        parameter.appendChild(self.mkName(paramname))
+        value = self.doc.createElement('spirit:value')
+        self.setAttribute(value, 'spirit:format', "long")
+        self.setAttribute(value, 'spirit:id', "BUSIFPARAM_VALUE." +
+                          name + "." + paramname)
+        self.setText(value, num)
+        parameter.appendChild(value)
+        return parameter
+
+    #---------------------------------------------------------------------------
+    def mkBusInterfaceStream(self, obj):
+        name = obj.name
+        interface = self.doc.createElement('spirit:busInterface')
+        interface.appendChild(self.mkName(name))
+        interface.appendChild(self.mkBusTypeStream())
+        interface.appendChild(self.mkAbstractionTypeStream())
+        if obj.master:
+            interface.appendChild(self.doc.createElement('spirit:master'))
+        else:
+            interface.appendChild(self.doc.createElement('spirit:slave'))
+        portmaps = self.doc.createElement('spirit:portMaps')
+        for port in PORTSTREAMLIST:
+            portmaps.appendChild(self.mkPortMap(name, port))
+        interface.appendChild(portmaps)
+        parameters = self.doc.createElement('spirit:parameters')
+        parameters.appendChild(self.mkBusParameterLong(name, 'TDATA_NUM_BYTES',
+                                                       obj.ext_datawidth // 8))
+        parameters.appendChild(self.mkBusParameterLong(name, 'HAS_TKEEP', 1))
+        parameters.appendChild(self.mkBusParameterLong(name, 'HAS_TLAST', 1))
+        parameters.appendChild(self.mkBusParameterLong(name, 'HAS_TREADY', 1))
+        parameters.appendChild(self.mkBusParameterLong(name, 'HAS_TSTRB', 0))
+        interface.appendChild(parameters)
+        return interface
+
+    def mkBusTypeStream(self):
+        bustype = self.doc.createElement('spirit:busType')
+        self.setAttribute(bustype, 'spirit:vendor', "xilinx.com")
+        self.setAttribute(bustype, 'spirit:library', "interface")
+        self.setAttribute(bustype, 'spirit:name', "axis")
+        self.setAttribute(bustype, 'spirit:version', "1.0")
+        return bustype
+
+    def mkAbstractionTypeStream(self):
+        abstractiontype = self.doc.createElement('spirit:abstractionType')
+        self.setAttribute(abstractiontype, 'spirit:vendor', "xilinx.com")
+        self.setAttribute(abstractiontype, 'spirit:library', "interface")
+        self.setAttribute(abstractiontype, 'spirit:name', "axis_rtl")
+        self.setAttribute(abstractiontype, 'spirit:version', "1.0")
+        return abstractiontype
+
+    #---------------------------------------------------------------------------
+    def mkBusInterfaceInterrupt(self, obj):
+        name = obj.name
+        interface = self.doc.createElement('spirit:busInterface')
+        interface.appendChild(self.mkName(name))
+        interface.appendChild(self.mkBusTypeInterrupt())
+        interface.appendChild(self.mkAbstractionTypeInterrupt())
+        interface.appendChild(self.doc.createElement('spirit:master'))
+        portmaps = self.doc.createElement('spirit:portMaps')
+        portmap = self.doc.createElement('spirit:portMap')
+        portmap.appendChild(self.mkLogicalPort('INTERRUPT'))
+        physicalport = self.doc.createElement('spirit:physicalPort')
+        physicalport.appendChild(self.mkName(name))
+        portmap.appendChild(physicalport)
+        portmaps.appendChild(portmap)
+        interface.appendChild(portmaps)
+        parameters = self.doc.createElement('spirit:parameters')
+        parameter = self.doc.createElement('spirit:parameter')
+        parameter.appendChild(self.mkName('SENSITIVITY'))
+        value = self.doc.createElement('spirit:value')
+        self.setAttribute(value, 'spirit:id', "BUSIFPARAM_VALUE." +
+                          name + ".SENSITIVITY")
+        self.setText(value, obj.sensitivity)
+        parameter.appendChild(value)
+        parameters.appendChild(parameter)
+        interface.appendChild(parameters)
+        return interface
+
+    def mkBusTypeInterrupt(self):
+        bustype = self.doc.createElement('spirit:busType')
+        self.setAttribute(bustype, 'spirit:vendor', "xilinx.com")
+        self.setAttribute(bustype, 'spirit:library', "signal")
+        self.setAttribute(bustype, 'spirit:name', "interrupt")
+        self.setAttribute(bustype, 'spirit:version', "1.0")
+        return bustype
+
+    def mkAbstractionTypeInterrupt(self):
+        abstractiontype = self.doc.createElement('spirit:abstractionType')
+        self.setAttribute(abstractiontype, 'spirit:vendor', "xilinx.com")
+        self.setAttribute(abstractiontype, 'spirit:library', "signal")
+        self.setAttribute(abstractiontype, 'spirit:name', "interrupt_rtl")
+        self.setAttribute(abstractiontype, 'spirit:version', "1.0")
+        return abstractiontype
+
     #---------------------------------------------------------------------------
     def mkBusInterfaceReset(self, obj):
         name = obj.name
@@ -391,7 +782,7 @@ class ComponentGen(object):
         spaces = self.doc.createElement('spirit:addressSpaces')
         for memory in self.memorylist:
             if memory.master:
-                spaces.appendChild(self.mkAddressSpace(memory))
+                self.appendFragment(spaces, self.mkAddressSpace, memory)
                 isempty = False
         if isempty: return None
         return spaces
@@ -426,7 +817,7 @@ class ComponentGen(object):
         maps = self.doc.createElement('spirit:memoryMaps')
         for memory in self.memorylist:
             if not memory.master:
-                maps.appendChild(self.mkMemoryMap(memory))
+                self.appendFragment(maps, self.mkMemoryMap, memory)
                 isempty = False
         if isempty: return None
         return maps
@@ -564,11 +955,15 @@ class ComponentGen(object):
                                            None, None, None, None))
         for memory in self.memorylist:
             if memory.master:
-                for p in self.mkPortMaster(memory):
-                    ports.appendChild(p)
+                self.appendFragment(ports, self.mkPortMaster, memory)
             else:
-                for p in self.mkPortSlave(memory):
-                    ports.appendChild(p)
+                self.appendFragment(ports, self.mkPortSlave, memory)
+
+        for stream in self.streamlist:
+            self.appendFragment(ports, self.mkPortStream, stream)
+
+        for interrupt in self.interruptlist:
+            self.appendFragment(ports, self.mkPortInterrupt, interrupt)
                 
         for portname, portdir, portlvalue, portvar in self.ext_ports:
             lvalue = portlvalue if portlvalue is not None else None
@@ -583,6 +978,7 @@ class ComponentGen(object):
         base = obj.name
         datawidth = obj.ext_datawidth
         addrwidth = self.ext_addrwidth
+        idwidth = obj.thread_id_width
         ret = []
         
         def mkStr(b, s):
@@ -590,7 +986,7 @@ class ComponentGen(object):
         
         if not lite:
             ret.append(self.mkPortEntry(base+'_AWID', 'out',
-                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', 0, None, 0,
+                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', idwidth-1, None, 0,
                                         True, True, mkStr(base,'THREAD_ID_WIDTH')+' >0', 'true'))
             
         ret.append(self.mkPortEntry(base+'_AWADDR', 'out',
@@ -641,7 +1037,7 @@ class ComponentGen(object):
         
         if not lite:
             ret.append(self.mkPortEntry(base+'_BID', 'in',
-                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', 0, None, 0,
+                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', idwidth-1, None, 0,
                                         True, True, mkStr(base,'THREAD_ID_WIDTH')+' >0', 'true'))
             
         ret.append(self.mkPortEntry(base+'_BRESP', 'in',
@@ -659,7 +1055,7 @@ class ComponentGen(object):
         
         if not lite:
             ret.append(self.mkPortEntry(base+'_ARID', 'out',
-                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', 0, None, 0,
+                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', idwidth-1, None, 0,
                                         True, True, mkStr(base,'THREAD_ID_WIDTH')+' >0', 'true'))
             
         ret.append(self.mkPortEntry(base+'_ARADDR', 'out',
@@ -694,7 +1090,7 @@ class ComponentGen(object):
         
         if not lite:
             ret.append(self.mkPortEntry(base+'_RID', 'in',
-                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', 0, None, 0,
+                                        '('+mkStr(base,'THREAD_ID_WIDTH')+'-1)', idwidth-1, None, 0,
                                         True, True, mkStr(base,'THREAD_ID_WIDTH')+' >0', 'true'))
             
         ret.append(self.mkPortEntry(base+'_RDATA', 'in',
@@ -863,6 +1259,35 @@ class ComponentGen(object):
 
         return ret
         
+    def mkPortStream(self, obj):
+        base = obj.name
+        datawidth = obj.ext_datawidth
+        out = 'out' if obj.master else 'in'
+        inp = 'in' if obj.master else 'out'
+        ret = []
+
+        def mkStr(b, s):
+            return "spirit:decode(id('MODELPARAM_VALUE.C_" + b + '_' + s + "'))"
+
+        ret.append(self.mkPortEntry(base+'_TDATA', out,
+                                    '('+mkStr(base,'DATA_WIDTH')+'-1)', datawidth-1, None, 0))
+        ret.append(self.mkPortEntry(base+'_TKEEP', out,
+                                    '('+mkStr(base,'DATA_WIDTH')+'/8-1)', int(datawidth/8)-1, None, 0))
+        ret.append(self.mkPortEntry(base+'_TLAST', out,
+                                    None, None, None, None))
+        ret.append(self.mkPortEntry(base+'_TVALID', out,
+                                    None, None, None, None))
+        ret.append(self.mkPortEntry(base+'_TREADY', inp,
+                                    None, None, None, None))
+        ret.append(self.mkPortEntry(base+'_ACLK', 'in',
+                                    None, None, None, None))
+        ret.append(self.mkPortEntry(base+'_ARESETN', 'in',
+                                    None, None, None, None))
+        return ret
+
+    def mkPortInterrupt(self, obj):
+        return self.mkPortEntry(obj.name, 'out', None, None, None, None)
+
     def mkPortEntry(self, name, direction, lvar, lvalue, rvar, rvalue,
                     withdriver=False,
                     withextension=False, extensionvar=None, extensionvalue='true'):
@@ -945,8 +1370,24 @@ class ComponentGen(object):
         order = 2
         
         for memory in self.memorylist:
-            order, rslt = self.mkModelParameter(memory, order)
-            for p in rslt: modelparameters.appendChild(p)
+            order = self.appendFragment(modelparameters, self.mkModelParameter, memory, order)
+
+        for stream in self.streamlist:
+            datawidth = self.doc.createElement('spirit:modelParameter')
+            self.setAttribute(datawidth, 'spirit:dataType', "integer")
+            datawidth.appendChild(self.mkName("C_" + stream.name + "_DATA_WIDTH"))
+            datawidth.appendChild(self.mkTextNode('spirit:displayName', "C_" + stream.name + "_DATA_WIDTH"))
+            datawidth.appendChild(self.mkTextNode('spirit:description', "C_" + stream.name + "_DATA_WIDTH"))
+            value = self.doc.createElement('spirit:value')
+            self.setAttribute(value, 'spirit:format', 'long')
+            self.setAttribute(value, 'spirit:resolve', 'generated')
+            self.setAttribute(value, 'spirit:id', "MODELPARAM_VALUE.C_" + stream.name + "_DATA_WIDTH")
+            self.setAttribute(value, 'spirit:order', order)
+            self.setAttribute(value, 'spirit:rangeType', "long")
+            self.setText(value, stream.ext_datawidth)
+            datawidth.appendChild(value)
+            modelparameters.appendChild(datawidth)
+            order += 1
 
         for paramname, paramlvalue, paramtype in self.ext_params:
             p = self.doc.createElement('spirit:modelParameter')
@@ -987,7 +1428,7 @@ class ComponentGen(object):
             self.setAttribute(value, 'spirit:minimum', "0")
             self.setAttribute(value, 'spirit:maximum', "32")
             self.setAttribute(value, 'spirit:rangeType', "long")
-            self.setText(value, 1)
+            self.setText(value, obj.thread_id_width)
             idwidth.appendChild(value)
             ret.append(idwidth)
             order += 1
@@ -1191,12 +1632,16 @@ class ComponentGen(object):
         source.appendChild(self.mkName("xilinx_verilogsynthesis_view_fileset"))
         source.appendChild(self.mkFileSet('hdl/verilog/'+self.userlogic_name.lower()+'.v',
                                           'verilogSource'))
+        for f in self.filelist:
+            source.appendChild(self.mkFileSet('hdl/verilog/'+f, 'verilogSource'))
         filesets.appendChild(source)
         
         sim = self.doc.createElement('spirit:fileSet')
         sim.appendChild(self.mkName("xilinx_verilogbehavioralsimulation_view_fileset"))
         sim.appendChild(self.mkFileSet('hdl/verilog/'+self.userlogic_name.lower()+'.v',
                                        'verilogSource'))
+        for f in self.filelist:
+            sim.appendChild(self.mkFileSet('hdl/verilog/'+f, 'verilogSource'))
         sim.appendChild(self.mkFileSet('test/test_'+self.userlogic_name.lower()+'.v',
                                        'verilogSource'))
         filesets.appendChild(sim)
@@ -1249,8 +1694,22 @@ class ComponentGen(object):
         
         order = 2
         for memory in self.memorylist:
-            order, rslt = self.mkParameter(memory, order)
-            for p in rslt: parameters.appendChild(p)
+            order = self.appendFragment(parameters, self.mkParameter, memory, order)
+
+        for stream in self.streamlist:
+            datawidth = self.doc.createElement('spirit:parameter')
+            datawidth.appendChild(self.mkName("C_" + stream.name + "_DATA_WIDTH"))
+            datawidth.appendChild(self.mkTextNode('spirit:displayName', "C_" + stream.name + "_DATA_WIDTH"))
+            datawidth.appendChild(self.mkTextNode('spirit:description', "C_" + stream.name + "_DATA_WIDTH"))
+            value = self.doc.createElement('spirit:value')
+            self.setAttribute(value, 'spirit:format', 'long')
+            self.setAttribute(value, 'spirit:resolve', 'user')
+            self.setAttribute(value, 'spirit:id', "PARAM_VALUE.C_" + stream.name + "_DATA_WIDTH")
+            self.setAttribute(value, 'spirit:order', order)
+            self.setText(value, stream.ext_datawidth)
+            datawidth.appendChild(value)
+            parameters.appendChild(datawidth)
+            order += 1
                 
         for paramname, paramlvalue, paramtype in self.ext_params:
             p = self.doc.createElement('spirit:parameter')
@@ -1290,7 +1749,7 @@ class ComponentGen(object):
             self.setAttribute(value, 'spirit:minimum', "0")
             self.setAttribute(value, 'spirit:maximum', "32")
             self.setAttribute(value, 'spirit:rangeType', "long")
-            self.setText(value, 1)
+            self.setText(value, obj.thread_id_width)
             idwidth.appendChild(value)
             ret.append(idwidth)
             order += 1
@@ -1473,10 +1932,10 @@ class ComponentGen(object):
         coreextensions.appendChild(taxonomies)
         coreextensions.appendChild(self.mkTextNode('xilinx:displayName',
                                                    (self.userlogic_name.lower() + '_v1_0')))
-        #coreextensions.appendChild(self.mkTextNode('xilinx:coreRevison', 1))
-        #now = datetime.datetime.now()
-        #dt = now.strftime("%Y-%m-%d") # '2015-03-08T02:16:15Z'
-        #coreextensions.appendChild(self.mkTextNode('xilinx:coreCreationDateTime', dt))
+        if self.timestamp is not None:
+            coreextensions.appendChild(self.mkTextNode('xilinx:coreRevision', 1))
+            coreextensions.appendChild(self.mkTextNode('xilinx:coreCreationDateTime',
+                                                       self.timestamp))
         return coreextensions
 
 #-------------------------------------------------------------------------------
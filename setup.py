@@ -27,9 +27,14 @@ setup(name='ipgen',
       install_requires=[ 'pyverilog>=1.0.7', 'Jinja2>=2.8' ],
       extras_require={
           'test' : [ 'pytest>=2.8.2', 'pytest-pythonpath>=0.7' ],
+          'analysis' : [ 'numpy>=1.9' ],
+          'host' : [ 'numpy>=1.9' ],
       },
       entry_points="""
       [console_scripts]
       %s = ipgen.run_ipgen:main
-      """ % script_name,
+      %s_analysis = ipgen.analysis.run_analysis:main
+      %s_replay = ipgen.analysis.run_replay:main
+      %s_regression = ipgen.regression.run_regression:main
+      """ % (script_name, script_name, script_name, script_name),
 )
@@ -0,0 +1,461 @@
+`include "ipgen.v"
+
+module arbiter #
+  (
+   parameter DATA_WIDTH = 32,
+   parameter ADDR_WIDTH = 32,
+   parameter S_ADDR_WIDTH = 12,
+   parameter NUM_WORKERS = 4
+   )
+  (
+   input CLK,
+   input RST,
+   output reg [7:0] LED
+   );
+
+  // Write Address
+  wire                    s_awvalid;
+  wire [S_ADDR_WIDTH-1:0] s_awaddr;
+  reg                     s_awready;
+
+  // Write Data
+  wire [DATA_WIDTH-1:0]   s_wdata;
+  wire [DATA_WIDTH/8-1:0] s_wstrb;
+  wire                    s_wvalid;
+  reg                     s_wready;
+
+  // Read Address
+  wire                    s_arvalid;
+  wire [S_ADDR_WIDTH-1:0] s_araddr;
+  reg                     s_arready;
+
+  // Read Data
+  reg  [DATA_WIDTH-1:0]   s_rdata;
+  reg                     s_rvalid;
+  wire                    s_rready;
+
+  reg [7:0] state;
+
+  reg [ADDR_WIDTH-1:0] size;
+  reg [ADDR_WIDTH-1:0] dst;
+  reg start;
+
+  wire [NUM_WORKERS-1:0] done;
+  wire [NUM_WORKERS-1:0] error;
+  wire [DATA_WIDTH-1:0] sum_0, sum_1, sum_2, sum_3;
+
+  // Each worker writes 'size' words into its own region with 16-beat bursts
+  // and reads them back, all of which share one external port.
+  always @(posedge CLK) begin
+    if(RST) begin
+      LED <= 0;
+      state <= 0;
+      s_awready <= 0;
+      s_arready <= 0;
+      s_wready <= 0;
+      s_rdata <= 0;
+      s_rvalid <= 0;
+      size <= 0;
+      dst <= 0;
+      start <= 0;
+    end else begin
+      case(state)
+        'h00: begin
+          s_awready <= 1;
+          s_arready <= 0;
+          s_wready <= 0;
+          s_rdata <= 0;
+          s_rvalid <= 0;
+          if(s_awvalid) begin
+            s_wready <= 1;
+            s_awready <= 0;
+            state <= 'h01;
+          end
+        end
+        'h01: begin
+          if(s_wvalid) begin
+            size <= s_wdata;
+            s_wready <= 0;
+            s_awready <= 1;
+            state <= 'h02;
+          end
+        end
+        'h02: begin
+          if(s_awvalid) begin
+            s_wready <= 1;
+            s_awready <= 0;
+            state <= 'h03;
+          end
+        end
+        'h03: begin
+          if(s_wvalid) begin
+            dst <= s_wdata & 'hffff_fffc;
+            s_wready <= 0;
+            start <= 1;
+            state <= 'h04;
+          end
+        end
+        'h04: begin
+          start <= 0;
+          if(!start && done == {NUM_WORKERS{1'b1}}) begin
+            s_arready <= 1;
+            state <= 'h05;
+          end
+        end
+        'h05: begin
+          LED <= sum_0;
+          if(s_arvalid) begin
+            s_arready <= 0;
+            s_rvalid <= 1;
+            s_rdata <= sum_0 + sum_1 + sum_2 + sum_3;
+            state <= 'h06;
+          end
+        end
+        'h06: begin
+          if(s_rready) begin
+            s_rvalid <= 0;
+            s_arready <= 1;
+            state <= 'h07;
+          end
+        end
+        'h07: begin
+          if(s_arvalid) begin
+            s_arready <= 0;
+            s_rvalid <= 1;
+            s_rdata <= error;
+            state <= 'h08;
+          end
+        end
+        'h08: begin
+          if(s_rready) begin
+            s_rvalid <= 0;
+            state <= 'h00;
+          end
+        end
+      endcase
+    end
+  end
+
+  worker #
+    (
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(1),
+     .OUT_OF_ORDER(0),
+     .QOS(0)
+     )
+  inst_worker_0
+    (
+     .CLK(CLK),
+     .RST(RST),
+     .start(start),
+     .size(size),
+     .dst(dst),
+     .base(0),
+     .done(done[0]),
+     .error(error[0]),
+     .sum(sum_0)
+     );
+
+  worker #
+    (
+     .ID(1),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(2),
+     .OUT_OF_ORDER(1),
+     .QOS(3)
+     )
+  inst_worker_1
+    (
+     .CLK(CLK),
+     .RST(RST),
+     .start(start),
+     .size(size),
+     .dst(dst + size * 4),
+     .base(size),
+     .done(done[1]),
+     .error(error[1]),
+     .sum(sum_1)
+     );
+
+  worker #
+    (
+     .ID(2),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(1),
+     .OUT_OF_ORDER(0),
+     .QOS(1)
+     )
+  inst_worker_2
+    (
+     .CLK(CLK),
+     .RST(RST),
+     .start(start),
+     .size(size),
+     .dst(dst + size * 8),
+     .base(size * 2),
+     .done(done[2]),
+     .error(error[2]),
+     .sum(sum_2)
+     );
+
+  worker #
+    (
+     .ID(3),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(3),
+     .OUT_OF_ORDER(1),
+     .QOS(0)
+     )
+  inst_worker_3
+    (
+     .CLK(CLK),
+     .RST(RST),
+     .start(start),
+     .size(size),
+     .dst(dst + size * 12),
+     .base(size * 3),
+     .done(done[3]),
+     .error(error[3]),
+     .sum(sum_3)
+     );
+
+  ipgen_slave_lite_memory #
+    (
+     .NAME("s"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(S_ADDR_WIDTH)
+     )
+  inst_slave
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(s_awvalid),
+     .awaddr(s_awaddr),
+     .awready(s_awready),
+
+     .wdata(s_wdata),
+     .wstrb(s_wstrb),
+     .wvalid(s_wvalid),
+     .wready(s_wready),
+
+     .arvalid(s_arvalid),
+     .araddr(s_araddr),
+     .arready(s_arready),
+
+     .rdata(s_rdata),
+     .rvalid(s_rvalid),
+     .rready(s_rready)
+     );
+
+endmodule
+
+// Writes base+1, base+2, ... base+size into 'size' words from dst, and reads
+// them back. 'size' must be a multiple of BURST_LEN.
+module worker #
+  (
+   parameter ID = 0,
+   parameter DATA_WIDTH = 32,
+   parameter ADDR_WIDTH = 32,
+   parameter ID_WIDTH = 1,
+   parameter OUT_OF_ORDER = 0,
+   parameter QOS = 0
+   )
+  (
+   input CLK,
+   input RST,
+   input start,
+   input [ADDR_WIDTH-1:0] size,
+   input [ADDR_WIDTH-1:0] dst,
+   input [DATA_WIDTH-1:0] base,
+   output reg done,
+   output reg error,
+   output reg [DATA_WIDTH-1:0] sum
+   );
+
+  localparam BURST_LEN = 16;
+
+  // Write Address
+  reg                     m_awvalid;
+  reg  [ADDR_WIDTH-1:0]   m_awaddr;
+  reg  [8-1:0]            m_awlen;
+  reg  [ID_WIDTH-1:0]     m_awid;
+  wire                    m_awready;
+
+  // Write Data
+  reg  [DATA_WIDTH-1:0]   m_wdata;
+  reg  [DATA_WIDTH/8-1:0] m_wstrb;
+  reg                     m_wlast;
+  reg                     m_wvalid;
+  wire                    m_wready;
+
+  // Read Address
+  reg                     m_arvalid;
+  reg  [ADDR_WIDTH-1:0]   m_araddr;
+  reg  [8-1:0]            m_arlen;
+  reg  [ID_WIDTH-1:0]     m_arid;
+  wire                    m_arready;
+
+  // Read Data
+  wire [DATA_WIDTH-1:0]   m_rdata;
+  wire                    m_rlast;
+  wire [ID_WIDTH-1:0]     m_rid;
+  wire                    m_rvalid;
+  reg                     m_rready;
+
+  reg [7:0] state;
+  reg [ADDR_WIDTH-1:0] remain;
+  reg [7:0] count;
+  reg aw_done;
+  reg w_done;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      state <= 0;
+      done <= 0;
+      error <= 0;
+      sum <= 0;
+      m_awvalid <= 0;
+      m_awaddr <= 0;
+      m_awlen <= 0;
+      m_awid <= 0;
+      m_wdata <= 0;
+      m_wstrb <= 0;
+      m_wlast <= 0;
+      m_wvalid <= 0;
+      m_arvalid <= 0;
+      m_araddr <= 0;
+      m_arlen <= 0;
+      m_arid <= 0;
+      m_rready <= 0;
+      remain <= 0;
+      count <= 0;
+      aw_done <= 0;
+      w_done <= 0;
+    end else begin
+      case(state)
+        'h00: begin
+          if(start) begin
+            done <= 0;
+            error <= 0;
+            sum <= 0;
+            m_awaddr <= dst;
+            m_araddr <= dst;
+            m_wdata <= base + 1;
+            remain <= size;
+            state <= 'h01;
+          end
+        end
+        'h01: begin
+          m_awvalid <= 1;
+          m_awlen <= BURST_LEN - 1;
+          m_wstrb <= {(DATA_WIDTH/8){1'b1}};
+          m_wlast <= 0;
+          m_wvalid <= 1;
+          count <= 0;
+          aw_done <= 0;
+          w_done <= 0;
+          state <= 'h02;
+        end
+        'h02: begin
+          if(m_awvalid && m_awready) begin
+            m_awvalid <= 0;
+            aw_done <= 1;
+          end
+          if(m_wvalid && m_wready) begin
+            m_wdata <= m_wdata + 1;
+            m_wlast <= (count + 2 == BURST_LEN);
+            count <= count + 1;
+            if(m_wlast) begin
+              m_wvalid <= 0;
+              w_done <= 1;
+            end
+          end
+          if(aw_done && w_done) begin
+            m_awaddr <= m_awaddr + BURST_LEN * (DATA_WIDTH/8);
+            m_awid <= m_awid + 1;
+            remain <= (remain == BURST_LEN)? size : remain - BURST_LEN;
+            state <= (remain == BURST_LEN)? 'h03 : 'h01;
+          end
+        end
+        'h03: begin
+          m_arvalid <= 1;
+          m_arlen <= BURST_LEN - 1;
+          m_rready <= 1;
+          count <= 0;
+          state <= 'h04;
+        end
+        'h04: begin
+          if(m_arvalid && m_arready) begin
+            m_arvalid <= 0;
+          end
+          if(m_rvalid && m_rready) begin
+            sum <= sum + m_rdata;
+            count <= count + 1;
+            if(OUT_OF_ORDER && m_rid != m_arid) error <= 1;
+            if(m_rlast != (count == BURST_LEN - 1)) error <= 1;
+            if(m_rlast) begin
+              m_rready <= 0;
+              m_araddr <= m_araddr + BURST_LEN * (DATA_WIDTH/8);
+              m_arid <= m_arid + 1;
+              remain <= remain - BURST_LEN;
+              state <= (remain == BURST_LEN)? 'h05 : 'h03;
+            end
+          end
+        end
+        'h05: begin
+          if(sum != size * base + size * (size + 1) / 2) error <= 1;
+          done <= 1;
+          state <= 'h00;
+        end
+      endcase
+    end
+  end
+
+  ipgen_master_memory #
+    (
+     .NAME("m"),
+     .ID(ID),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(ID_WIDTH),
+     .OUT_OF_ORDER(OUT_OF_ORDER),
+     .QOS(QOS)
+     )
+  inst_master
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(m_awvalid),
+     .awaddr(m_awaddr),
+     .awlen(m_awlen),
+     .awid(m_awid),
+     .awready(m_awready),
+
+     .wdata(m_wdata),
+     .wstrb(m_wstrb),
+     .wlast(m_wlast),
+     .wvalid(m_wvalid),
+     .wready(m_wready),
+
+     .arvalid(m_arvalid),
+     .araddr(m_araddr),
+     .arlen(m_arlen),
+     .arid(m_arid),
+     .arready(m_arready),
+
+     .rdata(m_rdata),
+     .rlast(m_rlast),
+     .rid(m_rid),
+     .rvalid(m_rvalid),
+     .rready(m_rready)
+     );
+
+endmodule
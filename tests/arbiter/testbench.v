@@ -0,0 +1,47 @@
+reg [31:0] readval;
+reg [31:0] size, dst;
+integer aw_count, ar_count;
+
+initial begin
+  aw_count = 0;
+  ar_count = 0;
+end
+
+always @(posedge ipgen_master_port_0_AXI_ACLK) begin
+  if(ipgen_master_port_0_AXI_AWVALID && ipgen_master_port_0_AXI_AWREADY) aw_count <= aw_count + 1;
+  if(ipgen_master_port_0_AXI_ARVALID && ipgen_master_port_0_AXI_ARREADY) ar_count <= ar_count + 1;
+end
+
+initial begin
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  size = 64;
+  dst = 1024;
+
+  $display("[testbench] size: %d", size);
+  slave_write_ipgen_slave_lite_memory_s_0(size, 0);
+  nclk();
+
+  $display("[testbench] dst: %d", dst);
+  slave_write_ipgen_slave_lite_memory_s_0(dst, 0);
+  nclk();
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+  nclk();
+  $display("[testbench] sum: %d", readval);
+  if(readval != 4 * size * (4 * size + 1) / 2) $display("ERROR: sum should be %d", 4 * size * (4 * size + 1) / 2);
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+  nclk();
+  $display("[testbench] failed_workers: %b", readval[3:0]);
+  if(readval != 0) $display("ERROR: every worker should read back its own data");
+
+  $display("[testbench] port_aw: %d", aw_count);
+  $display("[testbench] port_ar: %d", ar_count);
+  if(aw_count != 4 * size / 16 || ar_count != 4 * size / 16) $display("ERROR: all bursts should go through the merged port");
+
+  #1000;
+  $finish;
+end
@@ -0,0 +1,54 @@
+reg [31:0] readval;
+reg [31:0] size, dst;
+reg [31:0] num_awbursts, num_arbursts, num_crossings;
+
+always @(posedge ipgen_master_memory_m_0_AXI_ACLK) begin
+  if(ipgen_master_memory_m_0_AXI_AWVALID && ipgen_master_memory_m_0_AXI_AWREADY) begin
+    num_awbursts = num_awbursts + 1;
+    if(ipgen_master_memory_m_0_AXI_AWADDR[11:0] + (ipgen_master_memory_m_0_AXI_AWLEN + 1) * 4 > 4096)
+      num_crossings = num_crossings + 1;
+  end
+  if(ipgen_master_memory_m_0_AXI_ARVALID && ipgen_master_memory_m_0_AXI_ARREADY) begin
+    num_arbursts = num_arbursts + 1;
+    if(ipgen_master_memory_m_0_AXI_ARADDR[11:0] + (ipgen_master_memory_m_0_AXI_ARLEN + 1) * 4 > 4096)
+      num_crossings = num_crossings + 1;
+  end
+end
+
+initial begin
+  num_awbursts = 0;
+  num_arbursts = 0;
+  num_crossings = 0;
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  size = 256;
+  dst = 4096 - 64;
+
+  $display("[testbench] size: %d", size);
+  slave_write_ipgen_slave_lite_memory_s_0(size, 0);
+  nclk();
+
+  $display("[testbench] dst: %d", dst);
+  slave_write_ipgen_slave_lite_memory_s_0(dst, 0);
+  nclk();
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+  nclk();
+  $display("[testbench] sum: %d", readval);
+  if(readval != size * (size + 1) / 2) $display("ERROR: sum should be %d", size * (size + 1) / 2);
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+  nclk();
+  $display("[testbench] rlast: %d", readval);
+  if(readval != 1) $display("ERROR: rlast should be asserted once");
+
+  $display("[testbench] awbursts: %d", num_awbursts);
+  $display("[testbench] arbursts: %d", num_arbursts);
+  $display("[testbench] crossings: %d", num_crossings);
+  if(num_crossings != 0) $display("ERROR: bursts should not cross a 4KB boundary");
+
+  #1000;
+  $finish;
+end
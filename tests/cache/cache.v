@@ -0,0 +1,288 @@
+`include "ipgen.v"
+
+module cache #
+  (
+   parameter DATA_WIDTH = 32,
+   parameter ADDR_WIDTH = 32,
+   parameter S_ADDR_WIDTH = 12
+   )
+  (
+   input CLK,
+   input RST,
+   output reg [7:0] LED
+   );
+
+  // Write Address
+  reg                     awvalid;
+  reg  [ADDR_WIDTH-1:0]   awaddr;
+  wire                    awready;
+
+  // Write Data
+  reg  [DATA_WIDTH-1:0]   wdata;
+  wire [DATA_WIDTH/8-1:0] wstrb;
+  reg                     wvalid;
+  wire                    wready;
+
+  // Read Address
+  reg                     arvalid;
+  reg  [ADDR_WIDTH-1:0]   araddr;
+  wire                    arready;
+
+  // Read Data
+  wire [DATA_WIDTH-1:0]   rdata;
+  wire                    rvalid;
+  reg                     rready;
+
+  // Cache Statistics
+  wire [32-1:0]           hits;
+  wire [32-1:0]           misses;
+
+  // Slave Write Address
+  wire                    s_awvalid;
+  wire [S_ADDR_WIDTH-1:0] s_awaddr;
+  reg                     s_awready;
+
+  // Slave Write Data
+  wire [DATA_WIDTH-1:0]   s_wdata;
+  wire [DATA_WIDTH/8-1:0] s_wstrb;
+  wire                    s_wvalid;
+  reg                     s_wready;
+
+  // Slave Read Address
+  wire                    s_arvalid;
+  wire [S_ADDR_WIDTH-1:0] s_araddr;
+  reg                     s_arready;
+
+  // Slave Read Data
+  reg  [DATA_WIDTH-1:0]   s_rdata;
+  reg                     s_rvalid;
+  wire                    s_rready;
+
+  reg [7:0] s_state;
+  reg [S_ADDR_WIDTH-1:0] s_addr;
+
+  reg [ADDR_WIDTH-1:0] base;
+  reg [31:0] count;
+  reg [ADDR_WIDTH-1:0] stride;
+  reg [1:0] command;
+
+  reg [7:0] state;
+  reg [31:0] index;
+  reg [DATA_WIDTH-1:0] sum;
+  reg [31:0] cycles;
+
+  assign wstrb = {(DATA_WIDTH/8){1'b1}};
+
+  // A read pass sums 'count' words at 'base' + 'stride' * i by single reads,
+  // and a write pass writes the address to each of them.
+  always @(posedge CLK) begin
+    if(RST) begin
+      state <= 0;
+      index <= 0;
+      sum <= 0;
+      cycles <= 0;
+      awvalid <= 0;
+      awaddr <= 0;
+      wvalid <= 0;
+      wdata <= 0;
+      arvalid <= 0;
+      araddr <= 0;
+      rready <= 0;
+      LED <= 0;
+    end else begin
+      case(state)
+        'h00: begin
+          index <= 0;
+          if(command == 1) begin
+            sum <= 0;
+            cycles <= 0;
+            state <= 'h01;
+          end
+          if(command == 2) begin
+            cycles <= 0;
+            state <= 'h10;
+          end
+        end
+        'h01: begin
+          cycles <= cycles + 1;
+          if(index == count) begin
+            LED <= LED + 1;
+            state <= 'h00;
+          end else begin
+            arvalid <= 1;
+            araddr <= base + stride * index;
+            state <= 'h02;
+          end
+        end
+        'h02: begin
+          cycles <= cycles + 1;
+          if(arvalid && arready) begin
+            arvalid <= 0;
+            rready <= 1;
+            state <= 'h03;
+          end
+        end
+        'h03: begin
+          cycles <= cycles + 1;
+          if(rvalid && rready) begin
+            rready <= 0;
+            sum <= sum + rdata;
+            index <= index + 1;
+            state <= 'h01;
+          end
+        end
+        'h10: begin
+          cycles <= cycles + 1;
+          if(index == count) begin
+            LED <= LED + 1;
+            state <= 'h00;
+          end else begin
+            awvalid <= 1;
+            awaddr <= base + stride * index;
+            wvalid <= 1;
+            wdata <= base + stride * index;
+            state <= 'h11;
+          end
+        end
+        'h11: begin
+          cycles <= cycles + 1;
+          if(awvalid && awready) awvalid <= 0;
+          if(wvalid && wready) wvalid <= 0;
+          if((!awvalid || awready) && (!wvalid || wready)) begin
+            index <= index + 1;
+            state <= 'h10;
+          end
+        end
+      endcase
+    end
+  end
+
+  // Registers of the slave
+  // write 'h00: base, 'h04: count, 'h08: stride, 'h0c: 1 starts a read pass, 2 a write pass
+  // read  'h00: sum, 'h04: hits, 'h08: misses, 'h0c: cycles of the pass, 'h10: busy
+  always @(posedge CLK) begin
+    if(RST) begin
+      s_state <= 0;
+      s_addr <= 0;
+      s_awready <= 0;
+      s_wready <= 0;
+      s_arready <= 0;
+      s_rdata <= 0;
+      s_rvalid <= 0;
+      base <= 0;
+      count <= 0;
+      stride <= 0;
+      command <= 0;
+    end else begin
+      command <= 0;
+      case(s_state)
+        'h00: begin
+          s_awready <= 1;
+          s_arready <= 1;
+          if(s_awvalid && s_awready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_wready <= 1;
+            s_addr <= s_awaddr;
+            s_state <= 'h01;
+          end else if(s_arvalid && s_arready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_rdata <= (s_araddr[4:2] == 0)? sum :
+                       (s_araddr[4:2] == 1)? hits :
+                       (s_araddr[4:2] == 2)? misses :
+                       (s_araddr[4:2] == 3)? cycles : (state != 0);
+            s_rvalid <= 1;
+            s_state <= 'h02;
+          end
+        end
+        'h01: begin
+          if(s_wvalid && s_wready) begin
+            s_wready <= 0;
+            s_state <= 'h00;
+            case(s_addr[4:2])
+              0: base <= s_wdata;
+              1: count <= s_wdata;
+              2: stride <= s_wdata;
+              3: command <= s_wdata;
+            endcase
+          end
+        end
+        'h02: begin
+          if(s_rvalid && s_rready) begin
+            s_rvalid <= 0;
+            s_state <= 'h00;
+          end
+        end
+      endcase
+    end
+  end
+
+  ipgen_master_cached_lite_memory #
+    (
+     .NAME("c"),
+     .ID(0),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .DATA_WIDTH(DATA_WIDTH),
+     .LINE_SIZE(8),
+     .LINES(64),
+     .WAYS(2),
+     .PREFETCH(2)
+     )
+  inst_cache
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(awvalid),
+     .awaddr(awaddr),
+     .awready(awready),
+
+     .wdata(wdata),
+     .wstrb(wstrb),
+     .wvalid(wvalid),
+     .wready(wready),
+
+     .arvalid(arvalid),
+     .araddr(araddr),
+     .arready(arready),
+
+     .rdata(rdata),
+     .rvalid(rvalid),
+     .rready(rready),
+
+     .hits(hits),
+     .misses(misses)
+     );
+
+  ipgen_slave_lite_memory #
+    (
+     .NAME("s"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(S_ADDR_WIDTH)
+     )
+  inst_slave
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(s_awvalid),
+     .awaddr(s_awaddr),
+     .awready(s_awready),
+
+     .wdata(s_wdata),
+     .wstrb(s_wstrb),
+     .wvalid(s_wvalid),
+     .wready(s_wready),
+
+     .arvalid(s_arvalid),
+     .araddr(s_araddr),
+     .arready(s_arready),
+
+     .rdata(s_rdata),
+     .rvalid(s_rvalid),
+     .rready(s_rready)
+     );
+
+endmodule
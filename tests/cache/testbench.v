@@ -0,0 +1,82 @@
+reg [31:0] readval;
+reg [31:0] sumval, hitval, missval, cycleval;
+reg [31:0] expected;
+reg [31:0] errors;
+reg [255:0] memval;
+integer j;
+
+task run_pass;
+  input [31:0] base;
+  input [31:0] count;
+  input [31:0] stride;
+  input [31:0] command;
+  begin
+    slave_write_ipgen_slave_lite_memory_s_0(base, 'h00);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(count, 'h04);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(stride, 'h08);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(command, 'h0c);
+    nclk();
+    readval = 1;
+    while(readval != 0) begin
+      slave_read_ipgen_slave_lite_memory_s_0(readval, 'h10);
+      nclk();
+    end
+    slave_read_ipgen_slave_lite_memory_s_0(sumval, 'h00);
+    nclk();
+    slave_read_ipgen_slave_lite_memory_s_0(hitval, 'h04);
+    nclk();
+    slave_read_ipgen_slave_lite_memory_s_0(missval, 'h08);
+    nclk();
+    slave_read_ipgen_slave_lite_memory_s_0(cycleval, 'h0c);
+    nclk();
+    $display("[testbench] cycles: %d, hits: %d, misses: %d", cycleval, hitval, missval);
+  end
+endtask
+
+task read_pass;
+  input [31:0] base;
+  input [31:0] count;
+  input [31:0] stride;
+  begin
+    run_pass(base, count, stride, 1);
+    expected = 0;
+    for(j=0; j<count; j=j+1) begin
+      mem_read(base + stride * j, 4, memval);
+      expected = expected + memval[31:0];
+    end
+    if(sumval != expected) begin
+      $display("ERROR: sum is %x, should be %x", sumval, expected);
+      errors = errors + 1;
+    end
+  end
+endtask
+
+initial begin
+  errors = 0;
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  $display("[testbench] sequential reads: 256 words from 'h1000");
+  read_pass('h1000, 256, 4);
+  $display("[testbench] sequential reads again");
+  read_pass('h1000, 256, 4);
+  $display("[testbench] repeated reads: 64 words from 'h1000 with stride 32");
+  read_pass('h1000, 64, 32);
+  $display("[testbench] irregular reads: 64 words from 'h8000 with stride 68");
+  read_pass('h8000, 64, 68);
+
+  // the written lines are invalidated, so the reads return the new data
+  $display("[testbench] write 64 words from 'h1000, then read them");
+  run_pass('h1000, 64, 4, 2);
+  repeat(200) nclk();
+  read_pass('h1000, 64, 4);
+
+  $display("[testbench] errors: %d", errors);
+
+  #1000;
+  $finish;
+end
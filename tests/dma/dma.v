@@ -0,0 +1,244 @@
+`include "ipgen.v"
+
+module dma #
+  (
+   parameter DATA_WIDTH = 32,
+   parameter ADDR_WIDTH = 32,
+   parameter S_ADDR_WIDTH = 12
+   )
+  (
+   input CLK,
+   input RST,
+   output reg [7:0] LED
+   );
+
+  // Descriptor
+  reg                     desc_valid;
+  wire                    desc_ready;
+  reg  [ADDR_WIDTH-1:0]   desc_src;
+  reg  [ADDR_WIDTH-1:0]   desc_dst;
+  reg  [32-1:0]           desc_len;
+  reg  [ADDR_WIDTH-1:0]   desc_stride;
+  reg  [2-1:0]            desc_op;
+  reg                     desc_chain;
+
+  // Read Data Stream
+  wire [DATA_WIDTH-1:0]   rd_data;
+  wire                    rd_last;
+  wire                    rd_valid;
+  wire                    rd_ready;
+
+  // Write Data Stream
+  wire [DATA_WIDTH-1:0]   wr_data;
+  wire                    wr_valid;
+  wire                    wr_ready;
+  wire                    wr_done;
+
+  wire                    busy;
+
+  // Write Address
+  wire                    s_awvalid;
+  wire [S_ADDR_WIDTH-1:0] s_awaddr;
+  reg                     s_awready;
+
+  // Write Data
+  wire [DATA_WIDTH-1:0]   s_wdata;
+  wire [DATA_WIDTH/8-1:0] s_wstrb;
+  wire                    s_wvalid;
+  reg                     s_wready;
+
+  // Read Address
+  wire                    s_arvalid;
+  wire [S_ADDR_WIDTH-1:0] s_araddr;
+  reg                     s_arready;
+
+  // Read Data
+  reg  [DATA_WIDTH-1:0]   s_rdata;
+  reg                     s_rvalid;
+  wire                    s_rready;
+
+  reg [7:0] state;
+  reg [S_ADDR_WIDTH-1:0] addr;
+  reg [31:0] done_count;
+  reg [31:0] irq_ack;
+  reg [DATA_WIDTH-1:0] sum;
+
+  // Every word read from the source is incremented by one and written to the destination.
+  assign wr_data = rd_data + 1;
+  assign wr_valid = rd_valid;
+  assign rd_ready = wr_ready;
+
+  // Interrupt while any descriptor is done and not acknowledged
+  wire irq;
+  assign irq = done_count != irq_ack;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      done_count <= 0;
+      sum <= 0;
+      LED <= 0;
+    end else begin
+      if(wr_done) begin
+        done_count <= done_count + 1;
+        LED <= LED + 1;
+      end
+      if(rd_valid && rd_ready) begin
+        sum <= sum + rd_data;
+      end
+    end
+  end
+
+  // Registers of the slave
+  // write 'h00: src, 'h04: dst, 'h08: len, 'h0c: stride,
+  //       'h10: start a descriptor, op in [1:0] and chain in [2]
+  //       'h14: acknowledge the interrupt, with the number of the done descriptors
+  // read  'h00: the number of the done descriptors, 'h04: sum of the read words, 'h08: busy
+  always @(posedge CLK) begin
+    if(RST) begin
+      state <= 0;
+      addr <= 0;
+      s_awready <= 0;
+      s_wready <= 0;
+      s_arready <= 0;
+      s_rdata <= 0;
+      s_rvalid <= 0;
+      desc_valid <= 0;
+      desc_src <= 0;
+      desc_dst <= 0;
+      desc_len <= 0;
+      desc_stride <= 0;
+      desc_op <= 0;
+      desc_chain <= 0;
+      irq_ack <= 0;
+    end else begin
+      case(state)
+        'h00: begin
+          s_awready <= 1;
+          s_arready <= 1;
+          if(s_awvalid && s_awready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_wready <= 1;
+            addr <= s_awaddr;
+            state <= 'h01;
+          end else if(s_arvalid && s_arready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_rdata <= (s_araddr[4:2] == 0)? done_count :
+                       (s_araddr[4:2] == 1)? sum : busy;
+            s_rvalid <= 1;
+            state <= 'h02;
+          end
+        end
+        'h01: begin
+          if(s_wvalid && s_wready) begin
+            s_wready <= 0;
+            state <= 'h00;
+            case(addr[4:2])
+              0: desc_src <= s_wdata;
+              1: desc_dst <= s_wdata;
+              2: desc_len <= s_wdata;
+              3: desc_stride <= s_wdata;
+              4: begin
+                desc_op <= s_wdata[1:0];
+                desc_chain <= s_wdata[2];
+                desc_valid <= 1;
+                state <= 'h03;
+              end
+              5: irq_ack <= s_wdata;
+            endcase
+          end
+        end
+        'h02: begin
+          if(s_rvalid && s_rready) begin
+            s_rvalid <= 0;
+            state <= 'h00;
+          end
+        end
+        'h03: begin
+          if(desc_valid && desc_ready) begin
+            desc_valid <= 0;
+            state <= 'h00;
+          end
+        end
+      endcase
+    end
+  end
+
+  ipgen_master_dma #
+    (
+     .NAME("d"),
+     .ID(0),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .DATA_WIDTH(DATA_WIDTH)
+     )
+  inst_dma
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .desc_valid(desc_valid),
+     .desc_ready(desc_ready),
+     .desc_src(desc_src),
+     .desc_dst(desc_dst),
+     .desc_len(desc_len),
+     .desc_stride(desc_stride),
+     .desc_op(desc_op),
+     .desc_chain(desc_chain),
+
+     .rd_data(rd_data),
+     .rd_last(rd_last),
+     .rd_valid(rd_valid),
+     .rd_ready(rd_ready),
+
+     .wr_data(wr_data),
+     .wr_valid(wr_valid),
+     .wr_ready(wr_ready),
+     .wr_done(wr_done),
+
+     .busy(busy)
+     );
+
+  ipgen_slave_lite_memory #
+    (
+     .NAME("s"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(S_ADDR_WIDTH)
+     )
+  inst_slave
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(s_awvalid),
+     .awaddr(s_awaddr),
+     .awready(s_awready),
+
+     .wdata(s_wdata),
+     .wstrb(s_wstrb),
+     .wvalid(s_wvalid),
+     .wready(s_wready),
+
+     .arvalid(s_arvalid),
+     .araddr(s_araddr),
+     .arready(s_arready),
+
+     .rdata(s_rdata),
+     .rvalid(s_rvalid),
+     .rready(s_rready)
+     );
+
+  ipgen_interrupt #
+    (
+     .NAME("irq"),
+     .ID(0)
+     )
+  inst_irq
+    (
+     .CLK(CLK),
+     .RST(RST),
+     .irq(irq)
+     );
+
+endmodule
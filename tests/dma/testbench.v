@@ -0,0 +1,110 @@
+reg [31:0] readval;
+reg [31:0] num_cycles, start_cycle;
+reg [31:0] errors;
+reg [255:0] srcval, dstval;
+integer j;
+
+always @(posedge sim_clk) begin
+  num_cycles = num_cycles + 1;
+end
+
+task start_descriptor;
+  input [31:0] src;
+  input [31:0] dst;
+  input [31:0] len;
+  input [31:0] stride;
+  input [31:0] command;
+  begin
+    slave_write_ipgen_slave_lite_memory_s_0(src, ipgen_slave_lite_memory_s_0_SRC);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(dst, ipgen_slave_lite_memory_s_0_DST);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(len, ipgen_slave_lite_memory_s_0_LEN);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(stride, ipgen_slave_lite_memory_s_0_STRIDE);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(command, ipgen_slave_lite_memory_s_0_COMMAND);
+    nclk();
+  end
+endtask
+
+task wait_done;
+  input [31:0] count;
+  begin
+    readval = 0;
+    while(readval < count) begin
+      wait_interrupt_ipgen_interrupt_irq_0();
+      slave_read_ipgen_slave_lite_memory_s_0(readval, ipgen_slave_lite_memory_s_0_DONE);
+      nclk();
+      slave_write_ipgen_slave_lite_memory_s_0(readval, ipgen_slave_lite_memory_s_0_ACK);
+      nclk();
+    end
+    // wait for the last writes to reach the memory
+    repeat(200) nclk();
+  end
+endtask
+
+// Each word at dst + stride * i is the word at src + stride * i plus one.
+task check;
+  input [31:0] src;
+  input [31:0] dst;
+  input [31:0] len;
+  input [31:0] stride;
+  begin
+    for(j=0; j<len; j=j+1) begin
+      mem_read(src + ((stride == 0)? 4 : stride) * j, 4, srcval);
+      mem_read(dst + ((stride == 0)? 4 : stride) * j, 4, dstval);
+      if(dstval[31:0] != srcval[31:0] + 1) begin
+        if(errors < 8)
+          $display("ERROR: word %d of %x is %x, should be %x", j, dst, dstval[31:0], srcval[31:0] + 1);
+        errors = errors + 1;
+      end
+    end
+  end
+endtask
+
+initial begin
+  num_cycles = 0;
+  errors = 0;
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  // a descriptor from the user logic
+  $display("[testbench] descriptor: 4096 words from 'h0 to 'h100000");
+  start_cycle = num_cycles;
+  start_descriptor('h0, 'h100000, 4096, 0, 3);
+  wait_done(1);
+  $display("[testbench] cycles: %d", num_cycles - start_cycle);
+  check('h0, 'h100000, 4096, 0);
+
+  // a descriptor chain in the memory: src, dst, len, stride, op, next
+  mem_write('h20000, 32, {32'h0, 32'h0, 32'h20020, 32'h3, 32'h0, 32'd100, 32'h30000, 32'h1fc0});
+  mem_write('h20020, 32, {32'h0, 32'h0, 32'h20040, 32'h3, 32'd12, 32'd50, 32'h31000, 32'h4000});
+  mem_write('h20040, 32, {32'h0, 32'h0, 32'h0, 32'h3, 32'd4, 32'd64, 32'h32000, 32'h5000});
+
+  $display("[testbench] descriptor chain at 'h20000");
+  start_descriptor('h20000, 0, 0, 0, 4);
+  wait_done(4);
+  check('h1fc0, 'h30000, 100, 0);
+  check('h4000, 'h31000, 50, 12);
+  check('h5000, 'h32000, 64, 4);
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, ipgen_slave_lite_memory_s_0_BUSY);
+  nclk();
+  if(readval != 0) begin
+    $display("ERROR: DMA is still busy");
+    errors = errors + 1;
+  end
+
+  // a completion of the single descriptor and three of the chain
+  $display("[testbench] interrupts: %d", ipgen_interrupt_irq_0_irq_count);
+  if(ipgen_interrupt_irq_0_irq_count != 4) begin
+    $display("ERROR: interrupts: expected 4");
+    errors = errors + 1;
+  end
+  $display("[testbench] errors: %d", errors);
+
+  #1000;
+  $finish;
+end
@@ -0,0 +1,51 @@
+reg [31:0] readval;
+reg [31:0] size, src, dst;
+reg [31:0] errors;
+reg [255:0] srcval, dstval;
+integer j;
+
+// The user logic runs at HPERIOD_CLK_ULOGIC and the bus at HPERIOD_CLK_BUS.
+task copy;
+  input [31:0] size;
+  input [31:0] src;
+  input [31:0] dst;
+  begin
+    $display("[testbench] copy: %d words from %x to %x", size, src, dst);
+    slave_write_ipgen_slave_lite_memory_s_0(size, 0);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(src, 0);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(dst, 0);
+    nclk();
+    slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+    nclk();
+    $display("[testbench] sum: %d", readval);
+    // wait for the last writes to reach the memory
+    repeat(200) nclk();
+    for(j=0; j<size; j=j+1) begin
+      mem_read(src + j * 4, 4, srcval);
+      mem_read(dst + j * 4, 4, dstval);
+      if(dstval[31:0] != srcval[31:0]) begin
+        if(errors < 8)
+          $display("ERROR: word %d of %x is %x, should be %x", j, dst, dstval[31:0], srcval[31:0]);
+        errors = errors + 1;
+      end
+    end
+  end
+endtask
+
+initial begin
+  errors = 0;
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  copy(16, 0, 4096);
+  copy(1024, 0, 'h10000);
+  copy(300, 'h200, 'h20000);
+
+  $display("[testbench] errors: %d", errors);
+
+  #1000;
+  $finish;
+end
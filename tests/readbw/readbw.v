@@ -0,0 +1,274 @@
+`include "ipgen.v"
+
+module readbw #
+  (
+   parameter DATA_WIDTH = 32,
+   parameter ADDR_WIDTH = 32,
+   parameter S_ADDR_WIDTH = 12,
+   parameter ID_WIDTH = 2,
+   parameter OUTSTANDING = 4
+   )
+  (
+   input CLK,
+   input RST,
+   output reg [7:0] LED
+   );
+
+  localparam BURST_LEN = 16;
+
+  // Write Address
+  reg                     m_awvalid;
+  reg  [ADDR_WIDTH-1:0]   m_awaddr;
+  reg  [8-1:0]            m_awlen;
+  reg  [ID_WIDTH-1:0]     m_awid;
+  wire                    m_awready;
+
+  // Write Data
+  reg  [DATA_WIDTH-1:0]   m_wdata;
+  reg  [DATA_WIDTH/8-1:0] m_wstrb;
+  reg                     m_wlast;
+  reg                     m_wvalid;
+  wire                    m_wready;
+
+  // Read Address
+  reg                     m_arvalid;
+  reg  [ADDR_WIDTH-1:0]   m_araddr;
+  reg  [8-1:0]            m_arlen;
+  reg  [ID_WIDTH-1:0]     m_arid;
+  wire                    m_arready;
+
+  // Read Data
+  wire [DATA_WIDTH-1:0]   m_rdata;
+  wire                    m_rlast;
+  wire [ID_WIDTH-1:0]     m_rid;
+  wire                    m_rvalid;
+  reg                     m_rready;
+
+  // Write Address
+  wire                    s_awvalid;
+  wire [S_ADDR_WIDTH-1:0] s_awaddr;
+  reg                     s_awready;
+
+  // Write Data
+  wire [DATA_WIDTH-1:0]   s_wdata;
+  wire [DATA_WIDTH/8-1:0] s_wstrb;
+  wire                    s_wvalid;
+  reg                     s_wready;
+
+  // Read Address
+  wire                    s_arvalid;
+  wire [S_ADDR_WIDTH-1:0] s_araddr;
+  reg                     s_arready;
+
+  // Read Data
+  reg  [DATA_WIDTH-1:0]   s_rdata;
+  reg                     s_rvalid;
+  wire                    s_rready;
+
+  reg [7:0] state;
+
+  reg [ADDR_WIDTH-1:0] size;
+  reg [ADDR_WIDTH-1:0] issue_size;
+  reg [ADDR_WIDTH-1:0] recv_size;
+  reg [DATA_WIDTH-1:0] sum;
+  reg [DATA_WIDTH-1:0] cycles;
+
+  // Read bursts are issued back-to-back with rotating IDs, independently of
+  // the read data. The sum does not depend on the order of the completion.
+  always @(posedge CLK) begin
+    if(RST) begin
+      LED <= 0;
+      state <= 0;
+      m_awvalid <= 0;
+      m_awaddr <= 0;
+      m_awlen <= 0;
+      m_awid <= 0;
+      m_wdata <= 0;
+      m_wstrb <= 0;
+      m_wlast <= 0;
+      m_wvalid <= 0;
+      m_arvalid <= 0;
+      m_araddr <= 0;
+      m_arlen <= 0;
+      m_arid <= 0;
+      m_rready <= 0;
+      s_awready <= 0;
+      s_arready <= 0;
+      s_wready <= 0;
+      s_rdata <= 0;
+      s_rvalid <= 0;
+      size <= 0;
+      issue_size <= 0;
+      recv_size <= 0;
+      sum <= 0;
+      cycles <= 0;
+    end else begin
+      case(state)
+        'h00: begin
+          m_arvalid <= 0;
+          m_rready <= 0;
+          s_awready <= 1;
+          s_arready <= 0;
+          s_wready <= 0;
+          s_rdata <= 0;
+          s_rvalid <= 0;
+          if(s_awvalid) begin
+            s_wready <= 1;
+            s_awready <= 0;
+            state <= 'h01;
+          end
+        end
+        'h01: begin
+          if(s_wvalid) begin
+            size <= s_wdata;
+            s_wready <= 0;
+            s_awready <= 1;
+            state <= 'h02;
+          end
+        end
+        'h02: begin
+          if(s_awvalid) begin
+            s_wready <= 1;
+            s_awready <= 0;
+            state <= 'h03;
+          end
+        end
+        'h03: begin
+          if(s_wvalid) begin
+            m_araddr <= s_wdata & 'hffff_fffc;
+            m_arlen <= (size <= BURST_LEN)? size - 1 : BURST_LEN - 1;
+            m_arid <= 0;
+            m_arvalid <= (size > 0);
+            m_rready <= 1;
+            issue_size <= size;
+            recv_size <= size;
+            sum <= 0;
+            cycles <= 0;
+            s_wready <= 0;
+            state <= 'h04;
+          end
+        end
+        'h04: begin
+          cycles <= cycles + 1;
+          if(m_arvalid && m_arready) begin
+            m_araddr <= m_araddr + (m_arlen + 1) * (DATA_WIDTH/8);
+            m_arlen <= (issue_size - m_arlen - 1 <= BURST_LEN)? issue_size - m_arlen - 2 : BURST_LEN - 1;
+            m_arid <= m_arid + 1;
+            m_arvalid <= (issue_size - m_arlen - 1 > 0);
+            issue_size <= issue_size - m_arlen - 1;
+          end
+          if(m_rvalid && m_rready) begin
+            sum <= sum + m_rdata;
+            recv_size <= recv_size - 1;
+          end
+          if(recv_size == 0 || (recv_size == 1 && m_rvalid && m_rready)) begin
+            m_rready <= 0;
+            s_arready <= 1;
+            state <= 'h05;
+          end
+        end
+        'h05: begin
+          LED <= sum;
+          if(s_arvalid) begin
+            s_arready <= 0;
+            s_rvalid <= 1;
+            s_rdata <= sum;
+            state <= 'h06;
+          end
+        end
+        'h06: begin
+          if(s_rready) begin
+            s_rvalid <= 0;
+            s_arready <= 1;
+            state <= 'h07;
+          end
+        end
+        'h07: begin
+          if(s_arvalid) begin
+            s_arready <= 0;
+            s_rvalid <= 1;
+            s_rdata <= cycles;
+            state <= 'h08;
+          end
+        end
+        'h08: begin
+          if(s_rready) begin
+            s_rvalid <= 0;
+            state <= 'h00;
+          end
+        end
+      endcase
+    end
+  end
+
+  ipgen_master_memory #
+    (
+     .NAME("m"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(ID_WIDTH),
+     .OUT_OF_ORDER(1),
+     .OUTSTANDING(OUTSTANDING)
+     )
+  inst_master
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(m_awvalid),
+     .awaddr(m_awaddr),
+     .awlen(m_awlen),
+     .awid(m_awid),
+     .awready(m_awready),
+
+     .wdata(m_wdata),
+     .wstrb(m_wstrb),
+     .wlast(m_wlast),
+     .wvalid(m_wvalid),
+     .wready(m_wready),
+
+     .arvalid(m_arvalid),
+     .araddr(m_araddr),
+     .arlen(m_arlen),
+     .arid(m_arid),
+     .arready(m_arready),
+
+     .rdata(m_rdata),
+     .rlast(m_rlast),
+     .rid(m_rid),
+     .rvalid(m_rvalid),
+     .rready(m_rready)
+     );
+
+  ipgen_slave_lite_memory #
+    (
+     .NAME("s"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(S_ADDR_WIDTH)
+     )
+  inst_slave
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(s_awvalid),
+     .awaddr(s_awaddr),
+     .awready(s_awready),
+
+     .wdata(s_wdata),
+     .wstrb(s_wstrb),
+     .wvalid(s_wvalid),
+     .wready(s_wready),
+
+     .arvalid(s_arvalid),
+     .araddr(s_araddr),
+     .arready(s_arready),
+
+     .rdata(s_rdata),
+     .rvalid(s_rvalid),
+     .rready(s_rready)
+     );
+
+endmodule
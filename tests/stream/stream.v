@@ -0,0 +1,181 @@
+`include "ipgen.v"
+
+module stream #
+  (
+   parameter DATA_WIDTH = 32,
+   parameter S_ADDR_WIDTH = 12
+   )
+  (
+   input CLK,
+   input RST,
+   output reg [7:0] LED
+   );
+
+  // Slave Stream
+  wire [DATA_WIDTH-1:0]   in_tdata;
+  wire [DATA_WIDTH/8-1:0] in_tkeep;
+  wire                    in_tlast;
+  wire                    in_tvalid;
+  wire                    in_tready;
+
+  // Master Stream
+  wire [DATA_WIDTH-1:0]   out_tdata;
+  wire [DATA_WIDTH/8-1:0] out_tkeep;
+  wire                    out_tlast;
+  wire                    out_tvalid;
+  wire                    out_tready;
+
+  // Write Address
+  wire                    s_awvalid;
+  wire [S_ADDR_WIDTH-1:0] s_awaddr;
+  reg                     s_awready;
+
+  // Write Data
+  wire [DATA_WIDTH-1:0]   s_wdata;
+  wire [DATA_WIDTH/8-1:0] s_wstrb;
+  wire                    s_wvalid;
+  reg                     s_wready;
+
+  // Read Address
+  wire                    s_arvalid;
+  wire [S_ADDR_WIDTH-1:0] s_araddr;
+  reg                     s_arready;
+
+  // Read Data
+  reg  [DATA_WIDTH-1:0]   s_rdata;
+  reg                     s_rvalid;
+  wire                    s_rready;
+
+  reg [7:0] state;
+  reg       enable;
+  reg [DATA_WIDTH-1:0] count;
+
+  // Every beat is incremented by one and forwarded while enabled.
+  assign out_tdata = in_tdata + 1;
+  assign out_tkeep = in_tkeep;
+  assign out_tlast = in_tlast;
+  assign out_tvalid = enable && in_tvalid;
+  assign in_tready = enable && out_tready;
+
+  always @(posedge CLK) begin
+    if(RST) begin
+      count <= 0;
+      LED <= 0;
+    end else if(out_tvalid && out_tready) begin
+      count <= count + 1;
+      if(out_tlast) LED <= LED + 1;
+    end
+  end
+
+  // A write sets 'enable', and a read returns the number of the forwarded beats.
+  always @(posedge CLK) begin
+    if(RST) begin
+      state <= 0;
+      enable <= 0;
+      s_awready <= 0;
+      s_wready <= 0;
+      s_arready <= 0;
+      s_rdata <= 0;
+      s_rvalid <= 0;
+    end else begin
+      case(state)
+        'h00: begin
+          s_awready <= 1;
+          s_arready <= 1;
+          if(s_awvalid && s_awready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_wready <= 1;
+            state <= 'h01;
+          end else if(s_arvalid && s_arready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_rdata <= count;
+            s_rvalid <= 1;
+            state <= 'h02;
+          end
+        end
+        'h01: begin
+          if(s_wvalid && s_wready) begin
+            enable <= s_wdata[0];
+            s_wready <= 0;
+            state <= 'h00;
+          end
+        end
+        'h02: begin
+          if(s_rvalid && s_rready) begin
+            s_rvalid <= 0;
+            state <= 'h00;
+          end
+        end
+      endcase
+    end
+  end
+
+  ipgen_slave_stream #
+    (
+     .NAME("in"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH)
+     )
+  inst_in
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .tdata(in_tdata),
+     .tkeep(in_tkeep),
+     .tlast(in_tlast),
+     .tvalid(in_tvalid),
+     .tready(in_tready)
+     );
+
+  ipgen_master_stream #
+    (
+     .NAME("out"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH)
+     )
+  inst_out
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .tdata(out_tdata),
+     .tkeep(out_tkeep),
+     .tlast(out_tlast),
+     .tvalid(out_tvalid),
+     .tready(out_tready)
+     );
+
+  ipgen_slave_lite_memory #
+    (
+     .NAME("s"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(S_ADDR_WIDTH)
+     )
+  inst_slave
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(s_awvalid),
+     .awaddr(s_awaddr),
+     .awready(s_awready),
+
+     .wdata(s_wdata),
+     .wstrb(s_wstrb),
+     .wvalid(s_wvalid),
+     .wready(s_wready),
+
+     .arvalid(s_arvalid),
+     .araddr(s_araddr),
+     .arready(s_arready),
+
+     .rdata(s_rdata),
+     .rvalid(s_rvalid),
+     .rready(s_rready)
+     );
+
+endmodule
@@ -0,0 +1,52 @@
+reg [31:0] readval;
+reg [31:0] num_beats, expected_sum, start_cycle, cycles;
+reg [31:0] num_cycles;
+
+always @(posedge sim_clk) begin
+  num_cycles = num_cycles + 1;
+end
+
+initial begin
+  num_cycles = 0;
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  num_beats = 1024;
+
+  $display("[testbench] enable");
+  slave_write_ipgen_slave_lite_memory_s_0(1, 0);
+  nclk();
+  start_cycle = num_cycles;
+
+  wait(ipgen_master_stream_out_0_sink_count >= num_beats);
+  cycles = num_cycles - start_cycle;
+
+  $display("[testbench] disable");
+  slave_write_ipgen_slave_lite_memory_s_0(0, 0);
+  nclk();
+
+  // drain the register slices
+  repeat(100) nclk();
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+  nclk();
+
+  $display("[testbench] forwarded: %d", readval);
+  $display("[testbench] sink count: %d", ipgen_master_stream_out_0_sink_count);
+  $display("[testbench] sink sum: %d", ipgen_master_stream_out_0_sink_sum);
+  $display("[testbench] sink packets: %d", ipgen_master_stream_out_0_sink_packets);
+  $display("[testbench] cycles for %d beats: %d", num_beats, cycles);
+
+  // The source sends 1, 2, 3, ... and the IP-core adds one to each beat.
+  expected_sum = readval * (readval + 1) / 2 + readval;
+  if(ipgen_master_stream_out_0_sink_count != readval)
+    $display("ERROR: sink count should be %d", readval);
+  if(ipgen_master_stream_out_0_sink_sum != expected_sum)
+    $display("ERROR: sink sum should be %d", expected_sum);
+  if(ipgen_master_stream_out_0_sink_packets != readval / STREAM_PACKET_LEN)
+    $display("ERROR: sink packets should be %d", readval / STREAM_PACKET_LEN);
+
+  #1000;
+  $finish;
+end
@@ -0,0 +1,119 @@
+reg [31:0] readval;
+reg [31:0] cycleval;
+reg [31:0] expected;
+reg [31:0] errors;
+reg [255:0] memval;
+reg [31:0] initval [0:63];
+integer j;
+
+task run_command;
+  input [31:0] base;
+  input [31:0] count;
+  input [31:0] stride;
+  input [31:0] command;
+  begin
+    slave_write_ipgen_slave_lite_memory_s_0(base, 'h00);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(count, 'h04);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(stride, 'h08);
+    nclk();
+    slave_write_ipgen_slave_lite_memory_s_0(command, 'h0c);
+    nclk();
+    readval = 1;
+    while(readval != 0) begin
+      slave_read_ipgen_slave_lite_memory_s_0(readval, 'h08);
+      nclk();
+    end
+    slave_read_ipgen_slave_lite_memory_s_0(cycleval, 'h00);
+    nclk();
+  end
+endtask
+
+task store_and_flush;
+  input [31:0] base;
+  input [31:0] count;
+  input [31:0] stride;
+  input [31:0] command;
+  begin
+    run_command(base, count, stride, command);
+    $display("[testbench] store cycles: %d", cycleval);
+    run_command(0, 0, 0, 4);
+    $display("[testbench] flush cycles: %d", cycleval);
+    // wait for the last writes to reach the memory
+    repeat(200) nclk();
+  end
+endtask
+
+task check_word;
+  input [31:0] addr;
+  input [31:0] value;
+  begin
+    mem_read(addr, 4, memval);
+    if(memval[31:0] != value) begin
+      if(errors < 8)
+        $display("ERROR: word at %x is %x, should be %x", addr, memval[31:0], value);
+      errors = errors + 1;
+    end
+  end
+endtask
+
+initial begin
+  errors = 0;
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  $display("[testbench] word stores: 256 words from 'h1000");
+  store_and_flush('h1000, 256, 4, 1);
+  for(j=0; j<256; j=j+1) check_word('h1000 + j * 4, 'h1000 + j * 4);
+
+  $display("[testbench] byte stores: 64 words from 'h2000");
+  store_and_flush('h2000, 64, 4, 2);
+  for(j=0; j<64; j=j+1) begin
+    expected = j * 4;
+    check_word('h2000 + j * 4, {expected[7:0] + 8'd3, expected[7:0] + 8'd2, expected[7:0] + 8'd1, expected[7:0]});
+  end
+
+  // the words between the stored ones keep the values
+  $display("[testbench] overlapping stores: 32 words from 'h3000 with stride 8");
+  for(j=0; j<64; j=j+1) begin
+    mem_read('h3000 + j * 4, 4, memval);
+    initval[j] = memval[31:0];
+  end
+  store_and_flush('h3000, 32, 8, 3);
+  for(j=0; j<64; j=j+1) begin
+    expected = 'h3000 + j * 4;
+    check_word('h3000 + j * 4, (j % 2 == 0)? {16'hdead, expected[15:0]} : initval[j]);
+  end
+
+  // the reads flush the buffered stores to their window
+  $display("[testbench] word stores and reads without flush: 32 words from 'h4000");
+  run_command('h4000, 32, 4, 1);
+  run_command('h4000, 32, 4, 5);
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 'h04);
+  nclk();
+  expected = 0;
+  for(j=0; j<32; j=j+1) expected = expected + 'h4000 + j * 4;
+  if(readval != expected) begin
+    $display("ERROR: sum is %x, should be %x", readval, expected);
+    errors = errors + 1;
+  end
+
+  // the timeout flushes the buffer
+  $display("[testbench] 3 word stores from 'h5000 without flush");
+  run_command('h5000, 3, 4, 1);
+  repeat(300) nclk();
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 'h0c);
+  nclk();
+  if(readval != 1) begin
+    $display("ERROR: the buffer is not idle");
+    errors = errors + 1;
+  end
+  for(j=0; j<3; j=j+1) check_word('h5000 + j * 4, 'h5000 + j * 4);
+
+  $display("[testbench] errors: %d", errors);
+
+  #1000;
+  $finish;
+end
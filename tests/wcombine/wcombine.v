@@ -0,0 +1,325 @@
+`include "ipgen.v"
+
+module wcombine #
+  (
+   parameter DATA_WIDTH = 32,
+   parameter ADDR_WIDTH = 32,
+   parameter S_ADDR_WIDTH = 12
+   )
+  (
+   input CLK,
+   input RST,
+   output reg [7:0] LED
+   );
+
+  // Write Address
+  reg                     awvalid;
+  reg  [ADDR_WIDTH-1:0]   awaddr;
+  wire                    awready;
+
+  // Write Data
+  reg  [DATA_WIDTH-1:0]   wdata;
+  reg  [DATA_WIDTH/8-1:0] wstrb;
+  reg                     wvalid;
+  wire                    wready;
+
+  // Read Address
+  reg                     arvalid;
+  reg  [ADDR_WIDTH-1:0]   araddr;
+  wire                    arready;
+
+  // Read Data
+  wire [DATA_WIDTH-1:0]   rdata;
+  wire                    rvalid;
+  reg                     rready;
+
+  // Write Combining
+  reg                     flush;
+  wire                    idle;
+
+  // Slave Write Address
+  wire                    s_awvalid;
+  wire [S_ADDR_WIDTH-1:0] s_awaddr;
+  reg                     s_awready;
+
+  // Slave Write Data
+  wire [DATA_WIDTH-1:0]   s_wdata;
+  wire [DATA_WIDTH/8-1:0] s_wstrb;
+  wire                    s_wvalid;
+  reg                     s_wready;
+
+  // Slave Read Address
+  wire                    s_arvalid;
+  wire [S_ADDR_WIDTH-1:0] s_araddr;
+  reg                     s_arready;
+
+  // Slave Read Data
+  reg  [DATA_WIDTH-1:0]   s_rdata;
+  reg                     s_rvalid;
+  wire                    s_rready;
+
+  reg [7:0] s_state;
+  reg [S_ADDR_WIDTH-1:0] s_addr;
+
+  reg [ADDR_WIDTH-1:0] base;
+  reg [31:0] count;
+  reg [ADDR_WIDTH-1:0] stride;
+  reg [2:0] command;
+
+  reg [7:0] state;
+  reg [2:0] mode;
+  reg [31:0] index;
+  reg [1:0] part;
+  reg [DATA_WIDTH-1:0] sum;
+  reg [31:0] cycles;
+
+  wire [ADDR_WIDTH-1:0] addr = base + stride * index;
+
+  // command 1: a word store of the address to each of 'count' words at 'base' + 'stride' * i
+  //         2: four byte stores from the upper byte, byte k is the address + k
+  //         3: a word store of 'hdeadbeef and a store of the address to the lower half
+  //         4: flush and wait until the buffer is idle
+  //         5: sum of the words by reads
+  always @(posedge CLK) begin
+    if(RST) begin
+      state <= 0;
+      mode <= 0;
+      index <= 0;
+      part <= 0;
+      sum <= 0;
+      cycles <= 0;
+      awvalid <= 0;
+      awaddr <= 0;
+      wvalid <= 0;
+      wdata <= 0;
+      wstrb <= 0;
+      arvalid <= 0;
+      araddr <= 0;
+      rready <= 0;
+      flush <= 0;
+      LED <= 0;
+    end else begin
+      flush <= 0;
+      case(state)
+        'h00: begin
+          index <= 0;
+          part <= 0;
+          mode <= command;
+          if(command >= 1 && command <= 3) begin
+            cycles <= 0;
+            state <= 'h01;
+          end
+          if(command == 4) begin
+            cycles <= 0;
+            flush <= 1;
+            state <= 'h10;
+          end
+          if(command == 5) begin
+            cycles <= 0;
+            sum <= 0;
+            state <= 'h20;
+          end
+        end
+        'h01: begin
+          cycles <= cycles + 1;
+          if(index == count) begin
+            LED <= LED + 1;
+            state <= 'h00;
+          end else begin
+            awvalid <= 1;
+            awaddr <= addr;
+            wvalid <= 1;
+            if(mode == 1) begin
+              wdata <= addr;
+              wstrb <= 4'b1111;
+            end else if(mode == 2) begin
+              wdata <= (addr + 3 - part) << ((3 - part) * 8);
+              wstrb <= 4'b1000 >> part;
+            end else if(part == 0) begin
+              wdata <= 'hdeadbeef;
+              wstrb <= 4'b1111;
+            end else begin
+              wdata <= addr;
+              wstrb <= 4'b0011;
+            end
+            state <= 'h02;
+          end
+        end
+        'h02: begin
+          cycles <= cycles + 1;
+          if(awvalid && awready) begin
+            awvalid <= 0;
+            wvalid <= 0;
+            part <= part + 1;
+            if((mode == 1) || (mode == 2 && part == 3) || (mode == 3 && part == 1)) begin
+              part <= 0;
+              index <= index + 1;
+            end
+            state <= 'h01;
+          end
+        end
+        'h10: begin
+          cycles <= cycles + 1;
+          if(!flush && idle) begin
+            LED <= LED + 1;
+            state <= 'h00;
+          end
+        end
+        'h20: begin
+          cycles <= cycles + 1;
+          if(index == count) begin
+            LED <= LED + 1;
+            state <= 'h00;
+          end else begin
+            arvalid <= 1;
+            araddr <= addr;
+            state <= 'h21;
+          end
+        end
+        'h21: begin
+          cycles <= cycles + 1;
+          if(arvalid && arready) begin
+            arvalid <= 0;
+            rready <= 1;
+            state <= 'h22;
+          end
+        end
+        'h22: begin
+          cycles <= cycles + 1;
+          if(rvalid && rready) begin
+            rready <= 0;
+            sum <= sum + rdata;
+            index <= index + 1;
+            state <= 'h20;
+          end
+        end
+      endcase
+    end
+  end
+
+  // Registers of the slave
+  // write 'h00: base, 'h04: count, 'h08: stride, 'h0c: command
+  // read  'h00: cycles of the command, 'h04: sum, 'h08: busy, 'h0c: idle
+  always @(posedge CLK) begin
+    if(RST) begin
+      s_state <= 0;
+      s_addr <= 0;
+      s_awready <= 0;
+      s_wready <= 0;
+      s_arready <= 0;
+      s_rdata <= 0;
+      s_rvalid <= 0;
+      base <= 0;
+      count <= 0;
+      stride <= 0;
+      command <= 0;
+    end else begin
+      command <= 0;
+      case(s_state)
+        'h00: begin
+          s_awready <= 1;
+          s_arready <= 1;
+          if(s_awvalid && s_awready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_wready <= 1;
+            s_addr <= s_awaddr;
+            s_state <= 'h01;
+          end else if(s_arvalid && s_arready) begin
+            s_awready <= 0;
+            s_arready <= 0;
+            s_rdata <= (s_araddr[3:2] == 0)? cycles :
+                       (s_araddr[3:2] == 1)? sum :
+                       (s_araddr[3:2] == 2)? (state != 0) : idle;
+            s_rvalid <= 1;
+            s_state <= 'h02;
+          end
+        end
+        'h01: begin
+          if(s_wvalid && s_wready) begin
+            s_wready <= 0;
+            s_state <= 'h00;
+            case(s_addr[3:2])
+              0: base <= s_wdata;
+              1: count <= s_wdata;
+              2: stride <= s_wdata;
+              3: command <= s_wdata;
+            endcase
+          end
+        end
+        'h02: begin
+          if(s_rvalid && s_rready) begin
+            s_rvalid <= 0;
+            s_state <= 'h00;
+          end
+        end
+      endcase
+    end
+  end
+
+  ipgen_master_combining_lite_memory #
+    (
+     .NAME("w"),
+     .ID(0),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .DATA_WIDTH(DATA_WIDTH),
+     .WC_SIZE(16),
+     .WC_TIMEOUT(64)
+     )
+  inst_wcombine
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(awvalid),
+     .awaddr(awaddr),
+     .awready(awready),
+
+     .wdata(wdata),
+     .wstrb(wstrb),
+     .wvalid(wvalid),
+     .wready(wready),
+
+     .arvalid(arvalid),
+     .araddr(araddr),
+     .arready(arready),
+
+     .rdata(rdata),
+     .rvalid(rvalid),
+     .rready(rready),
+
+     .flush(flush),
+     .idle(idle)
+     );
+
+  ipgen_slave_lite_memory #
+    (
+     .NAME("s"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(S_ADDR_WIDTH)
+     )
+  inst_slave
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(s_awvalid),
+     .awaddr(s_awaddr),
+     .awready(s_awready),
+
+     .wdata(s_wdata),
+     .wstrb(s_wstrb),
+     .wvalid(s_wvalid),
+     .wready(s_wready),
+
+     .arvalid(s_arvalid),
+     .araddr(s_araddr),
+     .arready(s_arready),
+
+     .rdata(s_rdata),
+     .rvalid(s_rvalid),
+     .rready(s_rready)
+     );
+
+endmodule
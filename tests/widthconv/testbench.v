@@ -0,0 +1,41 @@
+reg [31:0] readval;
+reg [31:0] size, dst;
+reg [255:0] before_head, before_tail, after_head, after_tail;
+
+initial begin
+  #1000;
+  wait(sim_resetn == 1);
+  nclk();
+
+  size = 28;
+  dst = 4096 + 8;
+
+  mem_read(dst - 8, 8, before_head);
+  mem_read(dst + size * 4, 8, before_tail);
+
+  $display("[testbench] size: %d", size);
+  slave_write_ipgen_slave_lite_memory_s_0(size, 0);
+  nclk();
+
+  $display("[testbench] dst: %d", dst);
+  slave_write_ipgen_slave_lite_memory_s_0(dst, 0);
+  nclk();
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+  nclk();
+  $display("[testbench] sum: %d", readval);
+  if(readval != size * (size + 1) / 2) $display("ERROR: sum should be %d", size * (size + 1) / 2);
+
+  slave_read_ipgen_slave_lite_memory_s_0(readval, 0);
+  nclk();
+  $display("[testbench] wide_sum: %d", readval);
+  if(readval != size * (size + 1) / 2) $display("ERROR: wide_sum should be %d", size * (size + 1) / 2);
+
+  mem_read(dst - 8, 8, after_head);
+  mem_read(dst + size * 4, 8, after_tail);
+  if(before_head != after_head || before_tail != after_tail)
+    $display("ERROR: bytes outside of the burst should not be written");
+
+  #1000;
+  $finish;
+end
@@ -0,0 +1,369 @@
+`include "ipgen.v"
+
+module widthconv #
+  (
+   parameter DATA_WIDTH = 32,
+   parameter WIDE_DATA_WIDTH = 64,
+   parameter ADDR_WIDTH = 32,
+   parameter S_ADDR_WIDTH = 12,
+   parameter ID_WIDTH = 1
+   )
+  (
+   input CLK,
+   input RST,
+   output reg [7:0] LED
+   );
+
+  // Write Address
+  reg                     m_awvalid;
+  reg  [ADDR_WIDTH-1:0]   m_awaddr;
+  reg  [8-1:0]            m_awlen;
+  reg  [ID_WIDTH-1:0]     m_awid;
+  wire                    m_awready;
+
+  // Write Data
+  reg  [DATA_WIDTH-1:0]   m_wdata;
+  reg  [DATA_WIDTH/8-1:0] m_wstrb;
+  reg                     m_wlast;
+  reg                     m_wvalid;
+  wire                    m_wready;
+
+  // Read Address
+  reg                     m_arvalid;
+  reg  [ADDR_WIDTH-1:0]   m_araddr;
+  reg  [8-1:0]            m_arlen;
+  reg  [ID_WIDTH-1:0]     m_arid;
+  wire                    m_arready;
+
+  // Read Data
+  wire [DATA_WIDTH-1:0]   m_rdata;
+  wire                    m_rlast;
+  wire [ID_WIDTH-1:0]     m_rid;
+  wire                    m_rvalid;
+  reg                     m_rready;
+
+  // Read Address (wide master)
+  reg                          d_arvalid;
+  reg  [ADDR_WIDTH-1:0]        d_araddr;
+  reg  [8-1:0]                 d_arlen;
+  wire                         d_arready;
+
+  // Read Data (wide master)
+  wire [WIDE_DATA_WIDTH-1:0]   d_rdata;
+  wire                         d_rlast;
+  wire [ID_WIDTH-1:0]          d_rid;
+  wire                         d_rvalid;
+  reg                          d_rready;
+
+  // Write Address
+  wire                    s_awvalid;
+  wire [S_ADDR_WIDTH-1:0] s_awaddr;
+  reg                     s_awready;
+
+  // Write Data
+  wire [DATA_WIDTH-1:0]   s_wdata;
+  wire [DATA_WIDTH/8-1:0] s_wstrb;
+  wire                    s_wvalid;
+  reg                     s_wready;
+
+  // Read Address
+  wire                    s_arvalid;
+  wire [S_ADDR_WIDTH-1:0] s_araddr;
+  reg                     s_arready;
+
+  // Read Data
+  reg  [DATA_WIDTH-1:0]   s_rdata;
+  reg                     s_rvalid;
+  wire                    s_rready;
+
+  reg [7:0] state;
+
+  reg [ADDR_WIDTH-1:0] size;
+  reg [ADDR_WIDTH-1:0] count;
+  reg [ADDR_WIDTH-1:0] recv_size;
+  reg [DATA_WIDTH-1:0] sum;
+  reg [DATA_WIDTH-1:0] wide_sum;
+  reg                  aw_done;
+  reg                  w_done;
+
+  // A burst of 'size' words is written from an address which is not aligned
+  // to the external data width of master 'm' (upsized), and read back by 'm'
+  // and by the wide master 'd' (downsized). 'size' must be even.
+  always @(posedge CLK) begin
+    if(RST) begin
+      LED <= 0;
+      state <= 0;
+      m_awvalid <= 0;
+      m_awaddr <= 0;
+      m_awlen <= 0;
+      m_awid <= 0;
+      m_wdata <= 0;
+      m_wstrb <= 0;
+      m_wlast <= 0;
+      m_wvalid <= 0;
+      m_arvalid <= 0;
+      m_araddr <= 0;
+      m_arlen <= 0;
+      m_arid <= 0;
+      m_rready <= 0;
+      d_arvalid <= 0;
+      d_araddr <= 0;
+      d_arlen <= 0;
+      d_rready <= 0;
+      s_awready <= 0;
+      s_arready <= 0;
+      s_wready <= 0;
+      s_rdata <= 0;
+      s_rvalid <= 0;
+      size <= 0;
+      count <= 0;
+      recv_size <= 0;
+      sum <= 0;
+      wide_sum <= 0;
+      aw_done <= 0;
+      w_done <= 0;
+    end else begin
+      case(state)
+        'h00: begin
+          s_awready <= 1;
+          s_arready <= 0;
+          s_wready <= 0;
+          s_rdata <= 0;
+          s_rvalid <= 0;
+          if(s_awvalid) begin
+            s_wready <= 1;
+            s_awready <= 0;
+            state <= 'h01;
+          end
+        end
+        'h01: begin
+          if(s_wvalid) begin
+            size <= s_wdata;
+            s_wready <= 0;
+            s_awready <= 1;
+            state <= 'h02;
+          end
+        end
+        'h02: begin
+          if(s_awvalid) begin
+            s_wready <= 1;
+            s_awready <= 0;
+            state <= 'h03;
+          end
+        end
+        'h03: begin
+          if(s_wvalid) begin
+            m_awaddr <= s_wdata & 'hffff_fff8;
+            m_awlen <= size - 1;
+            m_awvalid <= 1;
+            m_araddr <= s_wdata & 'hffff_fff8;
+            m_arlen <= size - 1;
+            d_araddr <= s_wdata & 'hffff_fff8;
+            d_arlen <= size / 2 - 1;
+            m_wdata <= 1;
+            m_wstrb <= {(DATA_WIDTH/8){1'b1}};
+            m_wlast <= (size == 1);
+            m_wvalid <= 1;
+            count <= 0;
+            aw_done <= 0;
+            w_done <= 0;
+            s_wready <= 0;
+            state <= 'h04;
+          end
+        end
+        'h04: begin
+          if(m_awvalid && m_awready) begin
+            m_awvalid <= 0;
+            aw_done <= 1;
+          end
+          if(m_wvalid && m_wready) begin
+            m_wdata <= m_wdata + 1;
+            m_wlast <= (count + 2 == size);
+            count <= count + 1;
+            if(m_wlast) begin
+              m_wvalid <= 0;
+              w_done <= 1;
+            end
+          end
+          if(aw_done && w_done) begin
+            m_arvalid <= 1;
+            m_rready <= 1;
+            recv_size <= size;
+            sum <= 0;
+            state <= 'h05;
+          end
+        end
+        'h05: begin
+          if(m_arvalid && m_arready) begin
+            m_arvalid <= 0;
+          end
+          if(m_rvalid && m_rready) begin
+            sum <= sum + m_rdata;
+            recv_size <= recv_size - 1;
+          end
+          if(recv_size == 0) begin
+            m_rready <= 0;
+            d_arvalid <= 1;
+            d_rready <= 1;
+            recv_size <= size / 2;
+            wide_sum <= 0;
+            state <= 'h06;
+          end
+        end
+        'h06: begin
+          if(d_arvalid && d_arready) begin
+            d_arvalid <= 0;
+          end
+          if(d_rvalid && d_rready) begin
+            wide_sum <= wide_sum + d_rdata[DATA_WIDTH-1:0] + d_rdata[WIDE_DATA_WIDTH-1:DATA_WIDTH];
+            recv_size <= recv_size - 1;
+          end
+          if(recv_size == 0) begin
+            d_rready <= 0;
+            s_arready <= 1;
+            state <= 'h07;
+          end
+        end
+        'h07: begin
+          LED <= sum;
+          if(s_arvalid) begin
+            s_arready <= 0;
+            s_rvalid <= 1;
+            s_rdata <= sum;
+            state <= 'h08;
+          end
+        end
+        'h08: begin
+          if(s_rready) begin
+            s_rvalid <= 0;
+            s_arready <= 1;
+            state <= 'h09;
+          end
+        end
+        'h09: begin
+          if(s_arvalid) begin
+            s_arready <= 0;
+            s_rvalid <= 1;
+            s_rdata <= wide_sum;
+            state <= 'h0a;
+          end
+        end
+        'h0a: begin
+          if(s_rready) begin
+            s_rvalid <= 0;
+            state <= 'h00;
+          end
+        end
+      endcase
+    end
+  end
+
+  ipgen_master_memory #
+    (
+     .NAME("m"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(ID_WIDTH),
+     .EXT_DATA_WIDTH(128)
+     )
+  inst_master
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(m_awvalid),
+     .awaddr(m_awaddr),
+     .awlen(m_awlen),
+     .awid(m_awid),
+     .awready(m_awready),
+
+     .wdata(m_wdata),
+     .wstrb(m_wstrb),
+     .wlast(m_wlast),
+     .wvalid(m_wvalid),
+     .wready(m_wready),
+
+     .arvalid(m_arvalid),
+     .araddr(m_araddr),
+     .arlen(m_arlen),
+     .arid(m_arid),
+     .arready(m_arready),
+
+     .rdata(m_rdata),
+     .rlast(m_rlast),
+     .rid(m_rid),
+     .rvalid(m_rvalid),
+     .rready(m_rready)
+     );
+
+  ipgen_master_memory #
+    (
+     .NAME("d"),
+     .ID(0),
+     .DATA_WIDTH(WIDE_DATA_WIDTH),
+     .ADDR_WIDTH(ADDR_WIDTH),
+     .ID_WIDTH(ID_WIDTH),
+     .EXT_DATA_WIDTH(32)
+     )
+  inst_wide_master
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(1'b0),
+     .awaddr({ADDR_WIDTH{1'b0}}),
+     .awlen(8'd0),
+     .awid({ID_WIDTH{1'b0}}),
+     .awready(),
+
+     .wdata({WIDE_DATA_WIDTH{1'b0}}),
+     .wstrb({(WIDE_DATA_WIDTH/8){1'b0}}),
+     .wlast(1'b0),
+     .wvalid(1'b0),
+     .wready(),
+
+     .arvalid(d_arvalid),
+     .araddr(d_araddr),
+     .arlen(d_arlen),
+     .arid({ID_WIDTH{1'b0}}),
+     .arready(d_arready),
+
+     .rdata(d_rdata),
+     .rlast(d_rlast),
+     .rid(d_rid),
+     .rvalid(d_rvalid),
+     .rready(d_rready)
+     );
+
+  ipgen_slave_lite_memory #
+    (
+     .NAME("s"),
+     .ID(0),
+     .DATA_WIDTH(DATA_WIDTH),
+     .ADDR_WIDTH(S_ADDR_WIDTH)
+     )
+  inst_slave
+    (
+     .CLK(CLK),
+     .RST(RST),
+
+     .awvalid(s_awvalid),
+     .awaddr(s_awaddr),
+     .awready(s_awready),
+
+     .wdata(s_wdata),
+     .wstrb(s_wstrb),
+     .wvalid(s_wvalid),
+     .wready(s_wready),
+
+     .arvalid(s_arvalid),
+     .araddr(s_araddr),
+     .arready(s_arready),
+
+     .rdata(s_rdata),
+     .rvalid(s_rvalid),
+     .rready(s_rready)
+     );
+
+endmodule